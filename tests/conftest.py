@@ -3,6 +3,7 @@
 import asyncio
 import inspect
 import os
+import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -24,6 +25,11 @@ os.environ.setdefault("ORCH_REPO_ROOT", str(Path(__file__).parent.parent.resolve
 os.environ.setdefault("DEBUG", "true")
 os.environ.setdefault("ORCH_LICENSE_ALLOW_DEBUG_BYPASS", "true")
 os.environ.setdefault("ORCH_AUDIT_LOG_MAX_BYTES", str(50 * 1024 * 1024))
+# Keep the audit log (and its rotations / index) out of the working tree.
+os.environ.setdefault(
+    "ORCH_AUDIT_LOG_PATH",
+    str(Path(tempfile.mkdtemp(prefix="gimo-test-audit-")) / "orchestrator_audit.log"),
+)
 
 from tools.gimo_server.main import app  # noqa: E402
 
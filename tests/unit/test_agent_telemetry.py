@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+
+from tools.gimo_server.ops_models import AgentActionEvent
+from tools.gimo_server.services.agent_insight_service import AgentInsightService
+from tools.gimo_server.services.agent_telemetry_service import AgentTelemetryService
+
+
+class FakeGics:
+    def __init__(self):
+        self.data = {}
+        self.scans = 0
+
+    def put(self, key, fields):
+        self.data[key] = dict(fields)
+
+    def get(self, key):
+        return {"key": key, "fields": self.data[key]} if key in self.data else None
+
+    def scan(self, prefix="", include_fields=True):
+        self.scans += 1
+        return [{"key": k, "fields": v} for k, v in self.data.items() if k.startswith(prefix)]
+
+
+def _event(agent="a1", tool="shell", outcome="success", minutes_ago=0, **kwargs):
+    return AgentActionEvent(
+        timestamp=datetime.now(timezone.utc) - timedelta(minutes=minutes_ago),
+        agent_id=agent,
+        agent_role="worker",
+        channel="cli",
+        tool=tool,
+        outcome=outcome,
+        **kwargs,
+    )
+
+
+def test_record_event_updates_rolling_aggregates():
+    telemetry = AgentTelemetryService(FakeGics())
+    for i, outcome in enumerate(["success", "error", "timeout", "error"]):
+        telemetry.record_event(_event(outcome=outcome, minutes_ago=i, duration_ms=10))
+    telemetry.record_event(_event(agent="a2", tool="git"))
+
+    agg = telemetry.aggregate(agent_id="a1")
+
+    assert list(agg) == [("a1", "worker", "cli", "shell")]
+    counters = agg[("a1", "worker", "cli", "shell")]
+    assert (counters["total"], counters["error"], counters["timeout"]) == (4, 2, 1)
+    assert counters["duration_ms"] == 40
+    assert len(telemetry.aggregate()) == 2
+
+
+def test_list_events_uses_newest_first_index_without_scanning():
+    gics = FakeGics()
+    telemetry = AgentTelemetryService(gics)
+    for minutes_ago in (5, 1, 3):
+        telemetry.record_event(_event(minutes_ago=minutes_ago))
+    scans = gics.scans
+
+    events = telemetry.list_events(agent_id="a1", limit=2)
+
+    assert gics.scans == scans
+    assert events[0].timestamp > events[1].timestamp
+    assert len(events) == 2
+    assert telemetry.get_event_summary("a1", last_n=3)["count"] == 3
+
+
+def test_aggregates_persist_and_reload():
+    gics = FakeGics()
+    telemetry = AgentTelemetryService(gics)
+    for _ in range(3):
+        telemetry.record_event(_event(outcome="error"))
+    telemetry.flush()
+    assert any(key.startswith("ae_agg:") for key in gics.data)
+
+    # Drop raw events: a fresh instance must rebuild counts from the persisted buckets.
+    for key in [k for k in gics.data if k.startswith("ae:")]:
+        del gics.data[key]
+    reloaded = AgentTelemetryService(gics)
+
+    assert reloaded.aggregate()[("a1", "worker", "cli", "shell")]["error"] == 3
+
+
+def test_aggregates_backfill_from_raw_events():
+    gics = FakeGics()
+    writer = AgentTelemetryService(gics)
+    writer.record_event(_event(outcome="rejected"))
+
+    assert AgentTelemetryService(gics).aggregate()[("a1", "worker", "cli", "shell")]["rejected"] == 1
+
+
+def test_insights_detect_patterns_from_aggregates():
+    telemetry = AgentTelemetryService(FakeGics())
+    for i in range(4):
+        telemetry.record_event(_event(outcome="timeout", minutes_ago=i))
+    telemetry.record_event(_event(tool="git", outcome="success"))
+
+    patterns = AgentInsightService(telemetry).detect_patterns(agent_id="a1")
+
+    assert len(patterns) == 1
+    assert patterns[0]["tool"] == "shell"
+    assert patterns[0]["timeout_count"] == 4
+    assert patterns[0]["severity"] == "high"
+    recs = AgentInsightService(telemetry).get_recommendations(agent_id="a1")
+    assert recs[0].type == "CONFIG_ADJUSTMENT"
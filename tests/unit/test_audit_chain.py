@@ -0,0 +1,89 @@
+import logging
+import queue
+
+from tools.gimo_server.security.audit import (
+    BoundedQueueHandler,
+    ChainedRotatingFileHandler,
+    verify_audit_chain,
+)
+
+
+def _handler(path, **kwargs):
+    return ChainedRotatingFileHandler(path, encoding="utf-8", **kwargs)
+
+
+def _write(handler, *messages):
+    for msg in messages:
+        handler.handle(logging.makeLogRecord({"msg": msg, "levelno": logging.INFO, "levelname": "INFO"}))
+    handler.flush()
+
+
+def test_chain_verifies_and_survives_restart(tmp_path):
+    path = tmp_path / "audit.log"
+    handler = _handler(path)
+    _write(handler, "OP:READ | PATH:a.py", "PANIC_TRACE [x]:\nTraceback line")
+    handler.close()
+
+    handler = _handler(path)  # restart picks up the last hash from disk
+    _write(handler, "OP:WRITE | PATH:b.py")
+    handler.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 4  # anchor + three one-line records
+    report = verify_audit_chain(path)
+    assert report.ok and report.records == 3
+    assert verify_audit_chain(path, expected_last_hash=report.last_hash).ok
+
+
+def test_edits_deletions_and_tail_truncation_are_detected(tmp_path):
+    path = tmp_path / "audit.log"
+    handler = _handler(path)
+    _write(handler, "OP:READ | PATH:a.py", "OP:READ | PATH:b.py", "OP:READ | PATH:c.py")
+    handler.close()
+    original = path.read_text(encoding="utf-8").splitlines()
+    last_hash = verify_audit_chain(path).last_hash
+
+    path.write_text("\n".join(original).replace("b.py", "evil.py") + "\n", encoding="utf-8")
+    edited = verify_audit_chain(path)
+    assert not edited.ok and edited.error == "hash mismatch" and edited.location.endswith(":3")
+
+    path.write_text("\n".join(original[:2] + original[3:]) + "\n", encoding="utf-8")
+    assert not verify_audit_chain(path).ok
+
+    path.write_text("\n".join(original[:-1]) + "\n", encoding="utf-8")
+    assert verify_audit_chain(path).ok
+    assert not verify_audit_chain(path, expected_last_hash=last_hash).ok
+
+
+def test_chain_spans_rotated_files(tmp_path):
+    path = tmp_path / "audit.log"
+    handler = _handler(path, maxBytes=600, backupCount=10)
+    _write(handler, *[f"OP:READ | PATH:file_{i}.py" for i in range(20)])
+    handler.close()
+
+    report = verify_audit_chain(path)
+    assert len(report.files) > 2
+    assert report.ok and report.records == 20
+
+    (tmp_path / "audit.log.2").unlink()
+    broken = verify_audit_chain(path)
+    assert not broken.ok and broken.error == "anchor does not continue the previous record"
+
+
+def test_drop_policy_sheds_info_records_and_reports_the_gap():
+    q = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(q, policy="drop")
+    logger = logging.getLogger("test.audit.backpressure")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for msg in ("first", "second", "third", "fourth"):
+            logger.info(msg)
+        assert handler.dropped == 2
+        assert [q.get_nowait().getMessage() for _ in range(2)] == ["first", "second"]
+
+        logger.info("fifth")
+        assert [q.get_nowait().getMessage() for _ in range(2)] == ["AUDIT_DROPPED | COUNT:2", "fifth"]
+        assert handler.dropped == 0
+    finally:
+        logger.removeHandler(handler)
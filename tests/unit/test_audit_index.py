@@ -0,0 +1,85 @@
+import json
+import logging
+
+from tools.gimo_server.security import audit_index
+from tools.gimo_server.security.audit import ChainedRotatingFileHandler, verify_audit_chain
+
+HOUR = 3600.0
+T0 = 1_800_000_000.0 // HOUR * HOUR
+
+
+def _audit(handler, created, op, actor, path="a.py"):
+    record = logging.makeLogRecord(
+        {
+            "msg": f"OP:{op}",
+            "levelno": logging.INFO,
+            "levelname": "INFO",
+            "created": created,
+            "audit": {"op": op, "path": path, "range": "0", "hash": "h", "actor": actor},
+        }
+    )
+    handler.handle(record)
+
+
+def test_tail_reads_backwards_across_rotation_and_legacy_lines(tmp_path):
+    log = tmp_path / "audit.log"
+    log.write_text("legacy one\nlegacy two\n", encoding="utf-8")
+    handler = ChainedRotatingFileHandler(log, encoding="utf-8", maxBytes=700, backupCount=5)
+    for i in range(8):
+        _audit(handler, T0 + i, "READ", "alice", path=f"f{i}.py")
+    handler.close()
+
+    assert len(audit_index.audit_log_files(log)) > 1
+    lines = audit_index.tail_lines(3, log)
+    assert [line.split("PATH:")[1].split(" |")[0] for line in lines] == ["f5.py", "f6.py", "f7.py"]
+    assert audit_index.tail_lines(10, log)[:2] == ["legacy one", "legacy two"]
+
+
+def test_filtered_query_reads_only_matching_segments(tmp_path, monkeypatch):
+    log = tmp_path / "audit.log"
+    handler = ChainedRotatingFileHandler(log, encoding="utf-8")
+    for i in range(5):
+        _audit(handler, T0 + i, "READ", "alice")
+    _audit(handler, T0 + HOUR + 1, "WRITE_FILE", "bob", path="old.py")
+    _audit(handler, T0 + 2 * HOUR + 1, "WRITE_FILE", "alice", path="x.py")
+    _audit(handler, T0 + 2 * HOUR + 2, "WRITE_FILE", "bob", path="y.py")
+    _audit(handler, T0 + 3 * HOUR + 1, "READ", "bob")  # still in the open segment
+    handler.flush()
+
+    segments = audit_index.load_segments(log)
+    assert [s["ops"] for s in segments] == [{"READ": 5}, {"WRITE_FILE": 1}, {"WRITE_FILE": 2}]
+    assert segments[2]["actors"] == ["alice", "bob"]
+
+    reads = []
+    real_read = audit_index._read_lines
+    monkeypatch.setattr(
+        audit_index, "_read_lines", lambda f, start, end: reads.append((start, end)) or real_read(f, start, end)
+    )
+    records = audit_index.query(operation="WRITE_FILE", actor="bob", since=T0 + 2 * HOUR, path=log)
+
+    assert [r["path"] for r in records] == ["y.py"]
+    size = log.stat().st_size
+    assert reads == [(segments[2]["start"], size)]  # matching segment + unindexed tail, merged
+    handler.close()
+
+
+def test_query_and_verify_cover_gzipped_backups(tmp_path):
+    log = tmp_path / "audit.log"
+    handler = ChainedRotatingFileHandler(log, encoding="utf-8", maxBytes=700, backupCount=10, compress=True)
+    for i in range(12):
+        _audit(handler, T0 + i * HOUR, "WRITE_FILE" if i % 3 == 0 else "READ", "carol", path=f"f{i}.py")
+    handler.close()
+
+    backups = [p.name for p in audit_index.audit_log_files(log)[:-1]]
+    assert backups and all(name.endswith(".gz") for name in backups)
+    for name in backups:
+        assert audit_index.index_path(tmp_path / name).exists()
+
+    records = audit_index.query(operation="WRITE_FILE", path=log)
+    assert [r["path"] for r in records] == ["f0.py", "f3.py", "f6.py", "f9.py"]
+    assert audit_index.query(operation="WRITE_FILE", limit=2, path=log)[0]["path"] == "f6.py"
+
+    report = verify_audit_chain(log)
+    assert report.ok and report.records == 12
+    anchor, first = log.read_text(encoding="utf-8").splitlines()[:2]
+    assert json.loads(anchor)["anchor"] and json.loads(first)["chain"]
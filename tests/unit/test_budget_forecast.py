@@ -0,0 +1,173 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tools.gimo_server.ops_models import CostEvent, ProviderBudget, UserEconomyConfig
+from tools.gimo_server.services.budget_forecast_service import BudgetForecastService
+from tools.gimo_server.services.notification_service import NotificationService
+from tools.gimo_server.services.storage.spend_tracker import SpendTracker
+from tools.gimo_server.services.storage_service import StorageService
+
+
+class FakeGics:
+    def __init__(self):
+        self.data = {}
+        self.scans = 0
+
+    def put(self, key, fields):
+        self.data[key] = dict(fields)
+
+    def get(self, key):
+        return {"key": key, "fields": self.data[key]} if key in self.data else None
+
+    def scan(self, prefix="", include_fields=True):
+        self.scans += 1
+        return [{"key": k, "fields": v} for k, v in self.data.items() if k.startswith(prefix)]
+
+
+def _event(i, cost, provider="openai", ago=timedelta(0)):
+    return CostEvent(
+        id=f"e{i}",
+        workflow_id="wf",
+        node_id=f"n{i}",
+        model="gpt-4o",
+        provider=provider,
+        task_type="code",
+        cost_usd=cost,
+        timestamp=datetime.now(timezone.utc) - ago,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_alerts(monkeypatch):
+    monkeypatch.setattr(BudgetForecastService, "_alert_levels", {})
+    monkeypatch.setattr(BudgetForecastService, "_watched", {})
+
+
+def test_tracker_windows_and_scopes():
+    now = [1_000_000.0]
+    tracker = SpendTracker(clock=lambda: now[0])
+    tracker.record("openai", 1.0, datetime.fromtimestamp(now[0] - 2 * 86400, timezone.utc))
+    tracker.record("openai", 2.0, datetime.fromtimestamp(now[0] - 60, timezone.utc))
+    tracker.record("anthropic", 4.0, datetime.fromtimestamp(now[0], timezone.utc))
+
+    assert tracker.spend("global", 1) == pytest.approx(6.0)
+    assert tracker.spend("global", 7) == pytest.approx(7.0)
+    assert tracker.spend("provider:openai", 1) == pytest.approx(2.0)
+
+    now[0] += 86400 + 120
+    assert tracker.spend("global", 1) == 0.0
+    assert tracker.spend("global", 7) == pytest.approx(7.0)
+
+
+def test_burn_rates_decay_exponentially():
+    now = [0.0]
+    tracker = SpendTracker(clock=lambda: now[0])
+    tracker.record("openai", 3.6, datetime.fromtimestamp(0, timezone.utc))
+
+    fresh = tracker.burn_rates("global")
+    assert fresh["hourly"] == pytest.approx(3.6)
+    assert fresh["daily"] == pytest.approx(3.6)
+
+    now[0] = 3600.0
+    later = tracker.burn_rates("global")
+    assert later["hourly"] == pytest.approx(3.6 * 0.3679, rel=1e-3)
+    assert later["daily"] > later["hourly"]
+
+
+def test_forecast_uses_tracker_without_rescanning():
+    gics = FakeGics()
+    storage = StorageService(gics)
+    storage.cost.save_cost_event(_event(0, 5.0))
+    storage.cost.save_cost_event(_event(1, 1.0, provider="anthropic"))
+    scans = gics.scans
+
+    config = UserEconomyConfig(
+        global_budget_usd=100.0,
+        provider_budgets=[
+            ProviderBudget(provider="openai", max_cost_usd=10.0, period="daily"),
+            ProviderBudget(provider="anthropic", max_cost_usd=10.0),
+        ],
+    )
+    forecasts = {f.scope: f for f in BudgetForecastService(storage).forecast(config)}
+
+    assert gics.scans == scans
+    assert forecasts["global"].current_spend == 6.0
+    assert forecasts["openai"].current_spend == 5.0
+    assert forecasts["openai"].alert_level == "none"
+    assert forecasts["anthropic"].remaining == 9.0
+    assert forecasts["openai"].burn_rate_hourly > forecasts["anthropic"].burn_rate_hourly
+
+
+def test_tracker_backfills_from_existing_events():
+    gics = FakeGics()
+    legacy = _event(0, 2.0, ago=timedelta(hours=3))
+    gics.put("ce:wf:n0:0:e0", {**legacy.model_dump(), "timestamp": legacy.timestamp.isoformat()})
+
+    storage = StorageService(gics)
+    storage.cost.save_cost_event(_event(1, 1.0))
+
+    assert storage.cost.spend_tracker().spend("provider:openai", 1) == pytest.approx(3.0)
+    assert storage.cost.get_cost_stats()[("code", "gpt-4o")].count == 2
+
+
+def test_aggregates_are_backfilled_from_one_event_scan():
+    gics = FakeGics()
+    prefixes = []
+    scan = gics.scan
+    gics.scan = lambda prefix="", include_fields=True: prefixes.append(prefix) or scan(prefix)
+
+    storage = StorageService(gics)
+    storage.cost.save_cost_event(_event(0, 1.0))
+    storage.cost.spend_tracker()
+    StorageService(gics).cost.get_cost_stats()
+
+    assert prefixes == ["ce_stats:", "ce:"]
+
+
+def test_startup_watch_backfills_off_the_event_loop(monkeypatch):
+    from tools.gimo_server.main import _watch_budget_alerts
+
+    gics = FakeGics()
+    scan_threads = []
+    scan = gics.scan
+    gics.scan = lambda prefix="", include_fields=True: scan_threads.append(threading.current_thread()) or scan(prefix)
+    watched = []
+    monkeypatch.setattr(BudgetForecastService, "watch", lambda storage, economy: watched.append(storage) or True)
+
+    asyncio.run(_watch_budget_alerts(gics))
+
+    assert scan_threads and threading.main_thread() not in scan_threads
+    assert [storage.gics for storage in watched] == [gics]
+
+
+def test_watch_publishes_alert_when_threshold_crossed(monkeypatch):
+    published = []
+
+    async def fake_publish(event_type, payload):
+        published.append((event_type, payload))
+
+    monkeypatch.setattr(NotificationService, "publish", fake_publish)
+    gics = FakeGics()
+    storage = StorageService(gics)
+    config = UserEconomyConfig(
+        provider_budgets=[ProviderBudget(provider="openai", max_cost_usd=10.0, period="daily")],
+        alert_thresholds=[50, 25, 10],
+    )
+
+    async def scenario():
+        assert BudgetForecastService.watch(storage, lambda: config)
+        storage.cost.save_cost_event(_event(0, 4.0))
+        storage.cost.save_cost_event(_event(1, 3.6))  # 24% left -> warning
+        storage.cost.save_cost_event(_event(2, 0.1))  # still warning: no repeat
+        storage.cost.save_cost_event(_event(3, 1.5))  # 8% left -> critical
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+    assert [(e, p["scope"], p["alert_level"]) for e, p in published] == [
+        ("budget_alert", "openai", "warning"),
+        ("budget_alert", "openai", "critical"),
+    ]
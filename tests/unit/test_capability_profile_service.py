@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pytest
+
+from tools.gimo_server.services.capability_profile_service import CapabilityProfileService
+from tools.gimo_server.services.ops_service import OpsService
+
+
+class CountingGics:
+    def __init__(self):
+        self.data = {}
+        self.gets = 0
+        self.puts = 0
+
+    def get(self, key):
+        self.gets += 1
+        return {"key": key, "fields": dict(self.data[key])} if key in self.data else None
+
+    def put(self, key, fields):
+        self.puts += 1
+        self.data[key] = dict(fields)
+
+
+@pytest.fixture
+def gics(monkeypatch):
+    fake = CountingGics()
+    monkeypatch.setattr(OpsService, "_gics", fake)
+    monkeypatch.setattr(CapabilityProfileService, "_pending", {})
+    monkeypatch.setattr(CapabilityProfileService, "_pending_index", {})
+    monkeypatch.setattr(CapabilityProfileService, "_stored", {})
+    monkeypatch.setattr(CapabilityProfileService, "FLUSH_INTERVAL_SECONDS", 3600.0)
+    return fake
+
+
+def _record(success, latency=100.0, reason=""):
+    return CapabilityProfileService.record_task_outcome(
+        provider_type="openai",
+        model_id="gpt-4o",
+        task_type="refactor",
+        success=success,
+        latency_ms=latency,
+        cost_usd=0.01,
+        failure_reason=reason,
+    )
+
+
+def test_outcomes_accumulate_without_writes_until_flush(gics):
+    _record(True, latency=100)
+    _record(False, latency=300, reason="syntax")
+    cap = _record(False, latency=200, reason="timeout")
+
+    assert gics.puts == 0
+    assert gics.gets == 1  # first sighting of the key only
+    assert (cap.samples, cap.successes, cap.failures, cap.failure_streak) == (3, 1, 2, 2)
+    assert cap.avg_latency_ms == pytest.approx(200.0)
+    assert cap.last_failure_reason == "timeout"
+
+    assert CapabilityProfileService.flush() == 1
+    assert gics.puts == 2  # one merged task write + one index write
+    stored = gics.data["ops:capability:openai:gpt-4o:refactor"]
+    assert stored["samples"] == 3
+    assert gics.data["ops:capability_index:openai:gpt-4o"]["task_types"] == ["refactor"]
+
+
+def test_reads_overlay_pending_deltas_on_stored_value(gics):
+    _record(False, reason="a")
+    CapabilityProfileService.flush()
+    _record(False, reason="b")
+    _record(True)
+
+    cap = CapabilityProfileService.get_capability(provider_type="openai", model_id="gpt-4o", task_type="refactor")
+    profile = CapabilityProfileService.get_full_profile(provider_type="openai", model_id="gpt-4o")
+
+    assert (cap.samples, cap.failures, cap.failure_streak, cap.last_failure_reason) == (3, 2, 0, "b")
+    assert profile.total_samples == 3
+
+
+def test_flush_merges_with_concurrent_external_writes(gics):
+    _record(True)
+    gics.data["ops:capability:openai:gpt-4o:refactor"] = {"samples": 10, "successes": 5, "failures": 5, "failure_streak": 4}
+
+    CapabilityProfileService.flush()
+
+    stored = gics.data["ops:capability:openai:gpt-4o:refactor"]
+    assert (stored["samples"], stored["successes"], stored["failure_streak"]) == (11, 6, 0)
+
+
+def test_failed_flush_requeues_delta(gics):
+    _record(False)
+    gics.put = None  # daemon down: calling it raises TypeError
+
+    assert CapabilityProfileService.flush() == 0
+    _record(False)
+    del gics.put
+
+    CapabilityProfileService.flush()
+
+    stored = gics.data["ops:capability:openai:gpt-4o:refactor"]
+    assert (stored["samples"], stored["failure_streak"]) == (2, 2)
+    assert gics.data["ops:capability_index:openai:gpt-4o"]["task_types"] == ["refactor"]
+
+
+def test_concurrent_flushes_do_not_lose_counts(gics):
+    key = "ops:capability:openai:gpt-4o:refactor"
+    _record(True)
+    CapabilityProfileService.flush()
+    real_get = gics.get
+    read_done, resume = threading.Event(), threading.Event()
+
+    def stalled_get(k):
+        value = real_get(k)
+        if k == key and not read_done.is_set():
+            read_done.set()  # first flush has read the stored value...
+            resume.wait(5)  # ...and stalls before writing it back
+        return value
+
+    gics.get = stalled_get
+    _record(True)
+    first = threading.Thread(target=CapabilityProfileService.flush)
+    first.start()
+    assert read_done.wait(5)
+    _record(True)
+    second = threading.Thread(target=CapabilityProfileService.flush)
+    second.start()
+    time.sleep(0.05)
+    resume.set()
+    first.join(5)
+    second.join(5)
+
+    assert gics.data[key]["samples"] == 3
@@ -0,0 +1,209 @@
+import asyncio
+import sys
+import textwrap
+from unittest.mock import patch
+
+import pytest
+
+from tools.gimo_server.adapters.base import AgentStatus
+from tools.gimo_server.adapters.cli_pool import CLIProcessPool
+from tools.gimo_server.adapters.generic_cli import GenericCLIAdapter
+
+FAKE_CLI = textwrap.dedent(
+    """
+    import json, os, sys
+
+    for line in sys.stdin:
+        task = line.strip()
+        if not task:
+            continue
+        if task == "crash":
+            sys.exit(3)
+        if task == "chatty":  # keeps talking after the task is done
+            print("TASK_DONE", flush=True)
+            for i in range(3000):
+                print("chatter %d %s" % (i, "x" * 200), flush=True)
+                print("noise %d %s" % (i, "x" * 200), file=sys.stderr, flush=True)
+            continue
+        proposal = {"id": task, "tool": "file_read", "params": {"path": task + ".py"}}
+        print("PROPOSAL:" + json.dumps(proposal), flush=True)
+        answer = sys.stdin.readline().strip()
+        print("pid=%d cwd=%s task=%s answer=%s" % (os.getpid(), os.path.basename(os.getcwd()), task, answer), flush=True)
+        print("TASK_DONE" if answer.startswith("ALLOW") else 'TASK_DONE:{"exit_code": 1}', flush=True)
+    """
+)
+
+
+@pytest.fixture
+def command(tmp_path):
+    script = tmp_path / "fake_cli.py"
+    script.write_text(FAKE_CLI, encoding="utf-8")
+    return [sys.executable, str(script)]
+
+
+@pytest.fixture(autouse=True)
+def permissive():
+    with patch("tools.gimo_server.adapters.generic_cli._process_gics", return_value=None), patch(
+        "tools.gimo_server.adapters.generic_cli.ToolRegistryService.is_allowed", return_value=True
+    ), patch(
+        "tools.gimo_server.adapters.generic_cli.ToolRegistryService.get_tool", return_value=None
+    ), patch(
+        "tools.gimo_server.adapters.generic_cli.PolicyService.decide", return_value={"decision": "allow"}
+    ), patch("tools.gimo_server.adapters.generic_cli.ToolRegistryService.report_tool"):
+        yield
+
+
+async def _run(adapter, task, *, allow=True, context=None):
+    session = await adapter.spawn(task, context=context)
+    for _ in range(500):
+        if await session.capture_proposals() or session._read_task.done():
+            break
+        await asyncio.sleep(0.01)
+    if await session.capture_proposals():
+        if allow:
+            await session.allow(task)
+        else:
+            await session.deny(task, reason="no")
+    result = await asyncio.wait_for(session.get_result(), 10)
+    pid = next((part[4:] for part in result.output.split() if part.startswith("pid=")), None)
+    return result, pid
+
+
+def test_processes_are_reused_then_recycled_after_max_tasks(command):
+    async def scenario():
+        pool = CLIProcessPool.get(command, idle_size=1, max_tasks=2, warm_up=False)
+        adapter = GenericCLIAdapter(command, pooled=True)
+        try:
+            first, pid1 = await _run(adapter, "a")
+            second, pid2 = await _run(adapter, "b")
+            third, pid3 = await _run(adapter, "c")
+            return first, second, third, (pid1, pid2, pid3), pool.stats()
+        finally:
+            await CLIProcessPool.close_all()
+
+    first, second, third, pids, stats = asyncio.run(scenario())
+
+    assert [r.status for r in (first, second, third)] == [AgentStatus.COMPLETED] * 3
+    assert "task=b answer=ALLOW b" in second.output and "TASK_DONE" not in second.output
+    assert pids[0] == pids[1] != pids[2]
+    assert stats["spawned"] == 2 and stats["warm_hits"] == 1 and stats["retired"] == 1
+
+
+def test_failed_or_crashed_tasks_retire_their_process(command):
+    async def scenario():
+        CLIProcessPool.get(command, idle_size=1, max_tasks=10, warm_up=False)
+        adapter = GenericCLIAdapter(command, pooled=True)
+        try:
+            denied, pid1 = await _run(adapter, "a", allow=False)
+            crashed, _ = await _run(adapter, "crash")
+            ok, pid3 = await _run(adapter, "b")
+            return denied, crashed, ok, pid1, pid3
+        finally:
+            await CLIProcessPool.close_all()
+
+    denied, crashed, ok, pid1, pid3 = asyncio.run(scenario())
+
+    assert denied.status == AgentStatus.FAILED
+    assert crashed.status == AgentStatus.FAILED
+    assert ok.status == AgentStatus.COMPLETED and pid3 != pid1
+
+
+def test_warm_up_prespawns_and_pools_are_keyed_by_worktree(command, tmp_path):
+    (tmp_path / "wt1").mkdir()
+    (tmp_path / "wt2").mkdir()
+
+    async def scenario():
+        try:
+            pool = CLIProcessPool.get(command, cwd=str(tmp_path / "wt1"), idle_size=2, warm_up=True)
+            await pool.warm()
+            warmed = pool.stats()["idle"]
+            adapter = GenericCLIAdapter(command, pooled=True)
+            result, _ = await _run(adapter, "a", context={"worktree_path": str(tmp_path / "wt1")})
+            for _ in range(500):  # background refill
+                if pool.stats()["idle"] == 2:
+                    break
+                await asyncio.sleep(0.01)
+            other, _ = await _run(adapter, "b", context={"worktree_path": str(tmp_path / "wt2")})
+            return warmed, result, other, pool.stats(), len(CLIProcessPool.stats_all())
+        finally:
+            await CLIProcessPool.close_all()
+
+    warmed, result, other, stats, pool_count = asyncio.run(scenario())
+
+    assert warmed == 2
+    assert "cwd=wt1" in result.output and "cwd=wt2" in other.output
+    assert stats["warm_hits"] == 1 and stats["cold_starts"] == 0 and stats["idle"] == 2
+    assert pool_count == 2
+
+
+def test_kill_after_release_leaves_the_pooled_process_alone(command):
+    async def scenario():
+        pool = CLIProcessPool.get(command, idle_size=1, max_tasks=10, warm_up=False)
+        adapter = GenericCLIAdapter(command, pooled=True)
+        try:
+            session = await adapter.spawn("a")
+            while not await session.capture_proposals():
+                await asyncio.sleep(0.01)
+            await session.allow("a")
+            await asyncio.wait_for(session.get_result(), 10)
+            await session.kill()  # e.g. a caller's cleanup path after the result
+            reused, _ = await _run(adapter, "b")
+            return session.status, reused, pool.stats()
+        finally:
+            await CLIProcessPool.close_all()
+
+    status, reused, stats = asyncio.run(scenario())
+
+    assert status == AgentStatus.COMPLETED
+    assert reused.status == AgentStatus.COMPLETED
+    assert stats["warm_hits"] == 1 and stats["retired"] == 0
+
+
+def test_pools_are_evicted_when_idle_or_over_the_cap(command, tmp_path, monkeypatch):
+    for name in ("wt1", "wt2", "wt3"):
+        (tmp_path / name).mkdir()
+    monkeypatch.setattr(CLIProcessPool, "MAX_POOLS", 2)
+
+    async def scenario():
+        adapter = GenericCLIAdapter(command, pooled=True)
+        try:
+            for name in ("wt1", "wt2", "wt3"):
+                CLIProcessPool.get(command, cwd=str(tmp_path / name), idle_size=1, warm_up=False)
+                await _run(adapter, name, context={"worktree_path": str(tmp_path / name)})
+            capped = sorted(pool["cwd"] for pool in CLIProcessPool.stats_all())
+            latest = CLIProcessPool._pools[(tuple(command), None, str(tmp_path / "wt3"))]
+            idle_process = latest._idle[0].process
+
+            monkeypatch.setattr(CLIProcessPool, "IDLE_TTL_SECONDS", 0.05)
+            latest._schedule_expiry()
+            for _ in range(200):
+                if latest._closed and idle_process.returncode is not None:
+                    break
+                await asyncio.sleep(0.01)
+            return capped, latest._closed, idle_process.returncode
+        finally:
+            await CLIProcessPool.close_all()
+
+    capped, closed, returncode = asyncio.run(scenario())
+
+    assert capped == [str(tmp_path / "wt2"), str(tmp_path / "wt3")]
+    assert closed and returncode is not None
+
+
+def test_idle_output_is_drained_before_the_next_task(command):
+    async def scenario():
+        CLIProcessPool.get(command, idle_size=1, max_tasks=10, warm_up=False)
+        adapter = GenericCLIAdapter(command, pooled=True)
+        try:
+            chatty, pid1 = await _run(adapter, "chatty")
+            await asyncio.sleep(0.2)
+            after, pid2 = await _run(adapter, "b")
+            return chatty, after, pid1, pid2
+        finally:
+            await CLIProcessPool.close_all()
+
+    chatty, after, _, pid2 = asyncio.run(scenario())
+
+    assert chatty.status == AgentStatus.COMPLETED
+    assert after.status == AgentStatus.COMPLETED and pid2 is not None
+    assert "chatter" not in after.output and "noise" not in after.metrics["stderr"]
@@ -0,0 +1,108 @@
+import json
+import os
+import time
+
+from tools.gimo_server.ops_models import OpsConfig
+from tools.gimo_server.services import config_snapshot
+from tools.gimo_server.services.config_snapshot import ConfigSnapshotCache
+from tools.gimo_server.services.ops_service import OpsService
+
+
+def _age_file(path, seconds=60):
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+
+def test_snapshot_cache_skips_loader_while_file_unchanged(tmp_path):
+    path = tmp_path / "cfg.json"
+    path.write_text(json.dumps({"a": 1}), encoding="utf-8")
+    _age_file(path)
+    calls = []
+
+    def loader(raw):
+        calls.append(raw)
+        return json.loads(raw)
+
+    cache = ConfigSnapshotCache()
+    first = cache.get(path, loader)
+    second = cache.get(path, loader)
+
+    assert first is second
+    assert first.value == {"a": 1}
+    assert len(calls) == 1
+
+
+def test_snapshot_cache_bumps_version_on_content_change(tmp_path):
+    path = tmp_path / "cfg.json"
+    path.write_text(json.dumps({"a": 1}), encoding="utf-8")
+    cache = ConfigSnapshotCache()
+    first = cache.get(path, json.loads)
+
+    # Same size and a possibly identical mtime tick: content digest must still catch it.
+    path.write_text(json.dumps({"a": 2}), encoding="utf-8")
+    second = cache.get(path, json.loads)
+
+    assert second.value == {"a": 2}
+    assert second.version > first.version
+
+
+def test_snapshot_cache_keeps_version_when_only_stamp_changes(tmp_path):
+    path = tmp_path / "cfg.json"
+    path.write_text(json.dumps({"a": 1}), encoding="utf-8")
+    cache = ConfigSnapshotCache()
+    first = cache.get(path, json.loads)
+
+    path.touch()
+    second = cache.get(path, json.loads)
+
+    assert second.version == first.version
+
+
+def test_snapshot_cache_returns_none_for_missing_file(tmp_path):
+    cache = ConfigSnapshotCache()
+    assert cache.get(tmp_path / "missing.json", json.loads) is None
+
+
+def test_snapshot_cache_max_age_forces_reload(tmp_path, monkeypatch):
+    path = tmp_path / "cfg.json"
+    path.write_text("{}", encoding="utf-8")
+    _age_file(path)
+    calls = []
+
+    def loader(raw):
+        calls.append(raw)
+        return json.loads(raw)
+
+    cache = ConfigSnapshotCache(max_age_seconds=10.0)
+    cache.get(path, loader)
+    real_time = time.time
+    monkeypatch.setattr(config_snapshot.time, "time", lambda: real_time() + 30)
+    cache.get(path, loader)
+
+    assert len(calls) == 2
+
+
+def test_ops_service_config_snapshot_roundtrip(monkeypatch, tmp_path):
+    monkeypatch.setattr(OpsService, "OPS_DIR", tmp_path / "ops")
+    monkeypatch.setattr(OpsService, "CONFIG_FILE", tmp_path / "ops" / "config.json")
+    monkeypatch.setattr(OpsService, "_config_cache", ConfigSnapshotCache())
+    for attr in ("DRAFTS_DIR", "APPROVED_DIR", "RUNS_DIR", "RUN_EVENTS_DIR", "RUN_LOGS_DIR", "LOCKS_DIR"):
+        monkeypatch.setattr(OpsService, attr, tmp_path / "ops" / attr.lower())
+
+    assert OpsService.get_config_snapshot() is None
+
+    OpsService.set_config(OpsConfig(max_concurrent_runs=7))
+    snapshot = OpsService.get_config_snapshot()
+    assert snapshot is not None
+    assert snapshot.value.max_concurrent_runs == 7
+
+    cfg = OpsService.get_config()
+    cfg.max_concurrent_runs = 1
+    assert OpsService.get_config_snapshot().value.max_concurrent_runs == 7
+
+    OpsService.CONFIG_FILE.write_text(
+        OpsConfig(max_concurrent_runs=3).model_dump_json(indent=2), encoding="utf-8"
+    )
+    updated = OpsService.get_config_snapshot()
+    assert updated.value.max_concurrent_runs == 3
+    assert updated.version > snapshot.version
@@ -0,0 +1,85 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from tools.gimo_server.services.context_indexer import ContextIndexer
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    ContextIndexer.clear_caches()
+    yield
+    ContextIndexer.clear_caches()
+
+
+def test_build_context_is_reused_until_a_marker_changes(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("[project]\nname='x'\n", encoding="utf-8")
+
+    with patch.object(ContextIndexer, "_compute_context", wraps=ContextIndexer._compute_context) as compute:
+        first = ContextIndexer.build_context(str(tmp_path))
+        first.stack.append("mutated by caller")
+        second = ContextIndexer.build_context(str(tmp_path))
+        assert compute.call_count == 1
+        assert "mutated by caller" not in second.stack
+
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text("[project]\nname='x'\ndependencies=['fastapi']\n", encoding="utf-8")
+        st = pyproject.stat()
+        os.utime(pyproject, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        third = ContextIndexer.build_context(str(tmp_path))
+        (tmp_path / "src").mkdir()
+        fourth = ContextIndexer.build_context(str(tmp_path))
+
+    assert compute.call_count == 3
+    assert "Fastapi" in third.stack
+    assert "src/" in fourth.paths_of_interest
+
+
+def test_identical_files_across_worktrees_are_decoded_once(tmp_path):
+    for name in ("wt1", "wt2"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "app.py").write_text("print('hi')\n", encoding="utf-8")
+
+    real_read_bytes = Path.read_bytes
+    with patch.object(Path, "read_bytes", autospec=True, side_effect=real_read_bytes) as reads:
+        a = ContextIndexer.extract_file_contents(str(tmp_path / "wt1"), ["app.py", "missing.py"])
+        ContextIndexer.extract_file_contents(str(tmp_path / "wt1"), ["app.py"])
+        b = ContextIndexer.extract_file_contents(str(tmp_path / "wt2"), ["/app.py"])
+
+    assert reads.call_count == 2  # once per worktree; the repeat read is a stat hit
+    assert len(ContextIndexer._blobs) == 1
+    assert a == "--- app.py ---\nprint('hi')\n\n\n--- missing.py ---\n[File not found]\n"
+    assert b == "--- /app.py ---\nprint('hi')\n\n"
+
+
+def test_token_budget_keeps_small_files_and_condenses_large_ones(tmp_path):
+    (tmp_path / "small.py").write_text("x = 1\n", encoding="utf-8")
+    big = "\n".join(
+        [f"# header {i}" for i in range(20)]
+        + [f"def func_{i}():\n    return {i}" for i in range(500)]
+        + [f"# footer {i}" for i in range(20)]
+    )
+    (tmp_path / "big.py").write_text(big, encoding="utf-8")
+
+    out = ContextIndexer.extract_file_contents(str(tmp_path), ["small.py", "big.py"], token_budget=300)
+
+    assert "--- small.py ---\nx = 1\n" in out
+    assert len(out) <= 300 * ContextIndexer.CHARS_PER_TOKEN + 100
+    assert "# header 0" in out and "# footer 19" in out
+    assert "lines omitted, outline:]" in out and "def func_" in out
+    assert ContextIndexer._allocate([10, 1000, 1000], 610) == [10, 400, 200]
+
+
+def test_files_over_the_byte_cap_are_skipped_unread(tmp_path, monkeypatch):
+    monkeypatch.setattr(ContextIndexer, "MAX_FILE_BYTES", 16)
+    (tmp_path / "small.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "big.py").write_text("x = 1\n" * 10, encoding="utf-8")
+
+    with patch.object(Path, "read_bytes", autospec=True, side_effect=Path.read_bytes) as read_bytes:
+        out = ContextIndexer.extract_file_contents(str(tmp_path), ["small.py", "big.py"])
+
+    assert "--- small.py ---\nx = 1" in out
+    assert "--- big.py ---\n[Skipped: file larger than 16 bytes]" in out
+    assert [call.args[0].name for call in read_bytes.call_args_list] == ["small.py"]
@@ -0,0 +1,140 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tools.gimo_server.ops_models import CostEvent, UserEconomyConfig, WorkflowNode
+from tools.gimo_server.services.cost_predictor import CostPredictor
+from tools.gimo_server.services.storage.cost_stats import CostStatsTable, P2Quantile
+from tools.gimo_server.services.storage_service import StorageService
+
+
+class FakeGics:
+    def __init__(self):
+        self.data = {}
+        self.scans = []
+
+    def put(self, key, fields):
+        self.data[key] = dict(fields)
+
+    def get(self, key):
+        return {"key": key, "fields": self.data[key]} if key in self.data else None
+
+    def scan(self, prefix="", include_fields=True):
+        self.scans.append(prefix)
+        return [{"key": k, "fields": v} for k, v in self.data.items() if k.startswith(prefix)]
+
+
+def _event(i, cost, task_type="code", model="gpt-4o"):
+    return CostEvent(
+        id=f"e{i}",
+        workflow_id="wf",
+        node_id=f"n{i}",
+        model=model,
+        provider="openai",
+        task_type=task_type,
+        cost_usd=cost,
+    )
+
+
+def _node(i, task_type="code", model="gpt-4o"):
+    return WorkflowNode(id=f"n{i}", type="llm_call", config={"task_type": task_type, "model": model})
+
+
+def test_p2_quantile_tracks_p90():
+    rng = random.Random(7)
+    estimator = P2Quantile(0.9)
+    values = [rng.uniform(0, 100) for _ in range(5000)]
+    for v in values:
+        estimator.add(v)
+
+    exact = sorted(values)[int(0.9 * len(values))]
+    assert estimator.value() == pytest.approx(exact, abs=2.0)
+
+
+def test_save_cost_event_maintains_stats_incrementally():
+    gics = FakeGics()
+    storage = StorageService(gics)
+    costs = [0.01, 0.02, 0.03, 0.04, 0.05]
+    for i, cost in enumerate(costs):
+        storage.cost.save_cost_event(_event(i, cost))
+    storage.cost.save_cost_event(_event(9, 0.5, model="gpt-4o-mini"))
+
+    stats = storage.cost.get_cost_stats()
+    exact = stats[("code", "gpt-4o")]
+    assert exact.count == 5
+    assert exact.mean == pytest.approx(0.03)
+    assert exact.variance == pytest.approx(0.00025)
+    assert stats[("code", "*")].count == 6
+    assert gics.data["ce_stats:code|gpt-4o"]["count"] == 5
+
+
+def test_stats_backfill_from_existing_events_once():
+    gics = FakeGics()
+    ts = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+    for i in range(3):
+        gics.put(f"ce:wf:n{i}:0:e{i}", {**_event(i, 0.1).model_dump(), "timestamp": ts})
+
+    storage = StorageService(gics)
+    storage.cost.save_cost_event(_event(3, 0.1))
+
+    assert storage.cost.get_cost_stats()[("code", "gpt-4o")].count == 4
+    assert StorageService(gics).cost.get_cost_stats()[("code", "gpt-4o")].count == 4
+
+
+def test_stats_only_cover_the_trailing_window():
+    gics = FakeGics()
+    now = [datetime(2026, 6, 1, tzinfo=timezone.utc).timestamp()]
+    table = CostStatsTable(gics, clock=lambda: now[0])
+    # January is outside the 90-day window on June 1st.
+    table.record("code", "gpt-4o", 1.0, datetime(2026, 1, 1, tzinfo=timezone.utc))
+    table.record("code", "gpt-4o", 0.1, datetime(2026, 4, 1, tzinfo=timezone.utc))
+    table.record("code", "gpt-4o", 0.3, datetime(2026, 5, 30, tzinfo=timezone.utc))
+
+    stats = table.snapshot()[("code", "gpt-4o")]
+    assert stats.count == 2
+    assert stats.mean == pytest.approx(0.2)
+    assert stats.variance == pytest.approx(0.02)
+
+    now[0] += 70 * 86400  # the April bucket ages out
+    assert table.snapshot()[("code", "*")].count == 1
+    table.record("other", "gpt-4o", 0.5)
+    assert gics.data["ce_stats:code|gpt-4o"]["count"] == 1
+
+    now[0] += 120 * 86400
+    assert ("code", "gpt-4o") not in table.snapshot()
+
+
+def test_prediction_reads_stats_once_and_uses_variance_interval():
+    gics = FakeGics()
+    storage = StorageService(gics)
+    for i, cost in enumerate([0.08, 0.09, 0.10, 0.11, 0.12]):
+        storage.cost.save_cost_event(_event(i, cost))
+    scans = len(gics.scans)
+
+    result = CostPredictor(storage).predict_workflow_cost(
+        [_node(i) for i in range(10)], {}, UserEconomyConfig()
+    )
+
+    assert len(gics.scans) == scans
+    assert result["estimated_cost"] == pytest.approx(1.0)
+    assert result["samples_found"] == 10
+    # sqrt(10 * 0.00025) * 1.645 ~= 0.0822, much tighter than the 0.8x/1.5x heuristic.
+    assert result["interval"]["low"] == pytest.approx(0.9178, abs=1e-4)
+    assert result["interval"]["high"] == pytest.approx(1.0822, abs=1e-4)
+
+
+def test_prediction_falls_back_to_generic_then_static():
+    gics = FakeGics()
+    storage = StorageService(gics)
+    for i in range(5):
+        storage.cost.save_cost_event(_event(i, 0.2, model=f"m{i}"))
+
+    result = CostPredictor(storage).predict_workflow_cost(
+        [_node(0, model="gpt-4o"), _node(1, task_type="other", model="gpt-4o")], {}, UserEconomyConfig()
+    )
+
+    assert result["samples_found"] == 0.5
+    static = result["estimated_cost"] - 0.2
+    assert result["interval"]["low"] == pytest.approx(0.2 + static * 0.8, abs=1e-4)
+    assert result["interval"]["high"] == pytest.approx(0.2 + static * 1.5, abs=1e-4)
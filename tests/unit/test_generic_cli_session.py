@@ -0,0 +1,117 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from tools.gimo_server.adapters.base import AgentStatus
+from tools.gimo_server.adapters.generic_cli import GenericCLISession
+
+
+def _session(stdout_lines, **kwargs) -> GenericCLISession:
+    lines = iter(list(stdout_lines) + [b""])
+
+    async def readline():
+        await asyncio.sleep(0)
+        return next(lines, b"")
+
+    async def empty():
+        await asyncio.sleep(0)
+        return b""
+
+    async def wait():
+        return 0
+
+    process = MagicMock()
+    process.returncode = None
+    process.stdin = SimpleNamespace(write=MagicMock(), drain=AsyncMock())
+    process.stdout.readline = readline
+    process.stderr.readline = empty
+    process.wait = wait
+    return GenericCLISession(process, "task", **kwargs)
+
+
+def _proposals(*ids):
+    return [f'PROPOSAL:{{"id":"{i}","tool":"file_read","params":{{"path":"{i}.py"}}}}'.encode() for i in ids]
+
+
+def _written(session):
+    return [c.args[0].decode().strip() for c in session.process.stdin.write.call_args_list]
+
+
+@pytest.fixture
+def permissive():
+    with patch(
+        "tools.gimo_server.adapters.generic_cli._process_gics", return_value=None
+    ), patch(
+        "tools.gimo_server.adapters.generic_cli.ToolRegistryService.is_allowed", return_value=True
+    ), patch(
+        "tools.gimo_server.adapters.generic_cli.ToolRegistryService.get_tool", return_value=None
+    ), patch(
+        "tools.gimo_server.adapters.generic_cli.PolicyService.decide", return_value={"decision": "allow"}
+    ):
+        yield
+
+
+def test_concurrent_decisions_are_written_in_arrival_order(permissive):
+    real_validate = GenericCLISession._validate_tool_registry
+
+    async def slow_first(self, action, action_id, snapshot):
+        if action_id == "a1":
+            await asyncio.sleep(0.05)
+        await real_validate(self, action, action_id, snapshot)
+
+    async def scenario():
+        session = _session(_proposals("a1", "a2", "a3"))
+        await asyncio.sleep(0.05)
+        with patch.object(GenericCLISession, "_validate_tool_registry", slow_first):
+            await asyncio.gather(session.allow("a1"), session.allow("a3"), session.deny("a2", reason="nope"))
+
+        assert _written(session) == ["ALLOW a1", "DENY a2 reason=nope", "ALLOW a3"]
+        timings = session.decision_timings()
+        assert set(timings) == {"a1", "a2", "a3"}
+        # a3 was decided right away but had to wait for a1's slow validation.
+        assert timings["a3"]["ordered_wait"] >= 40
+        assert timings["a1"]["ordered_wait"] < 40
+        session._read_task.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_failed_decision_releases_its_slot(permissive):
+    async def boom(self, action, action_id, snapshot):
+        if action_id == "a1":
+            raise RuntimeError("registry down")
+
+    async def scenario():
+        session = _session(_proposals("a1", "a2"))
+        await asyncio.sleep(0.05)
+        with patch.object(GenericCLISession, "_validate_tool_registry", boom):
+            results = await asyncio.gather(session.allow("a1"), session.allow("a2"), return_exceptions=True)
+
+        assert isinstance(results[0], RuntimeError) and results[1] is None
+        assert _written(session) == ["ALLOW a2"]
+        assert not session._pending_verdicts
+        session._read_task.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_output_ring_spills_old_lines_to_a_log_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(GenericCLISession, "OUTPUT_BUFFER_LINES", 3)
+    monkeypatch.setattr(GenericCLISession, "OUTPUT_SPILL_DIR", str(tmp_path))
+
+    async def scenario():
+        session = _session([f"line {i}".encode() for i in range(10)])
+        await asyncio.sleep(0.1)
+        session.process.returncode = 0
+        return await session.get_result()
+
+    result = asyncio.run(scenario())
+
+    assert result.status == AgentStatus.COMPLETED
+    assert result.output == "line 7\nline 8\nline 9"
+    assert result.metrics["stdout_spilled_lines"] == 7
+    with open(result.metrics["stdout_log"], encoding="utf-8") as fh:
+        assert fh.read().splitlines() == [f"line {i}" for i in range(7)]
+    assert "stderr_log" not in result.metrics
@@ -737,6 +737,127 @@ async def test_project_confidence_handles_failed_llm_gracefully():
         result = await service.project_confidence("Task", {})
         assert abs(result["score"] - 0.5) < 0.01
 
+@pytest.mark.asyncio
+async def test_graph_engine_fan_out_runs_siblings_concurrently_and_joins():
+    # A -> (B, C) -> J -> D
+    nodes = [
+        WorkflowNode(id="A", type="transform"),
+        WorkflowNode(id="B", type="transform", config={"item": "b"}),
+        WorkflowNode(id="C", type="transform", config={"item": "c"}),
+        WorkflowNode(id="J", type="join"),
+        WorkflowNode(id="D", type="transform", config={"done": True}),
+    ]
+    edges = [
+        WorkflowEdge(**{"from": "A", "to": "B"}),
+        WorkflowEdge(**{"from": "A", "to": "C"}),
+        WorkflowEdge(**{"from": "B", "to": "J"}),
+        WorkflowEdge(**{"from": "C", "to": "J"}),
+        WorkflowEdge(**{"from": "J", "to": "D"}),
+    ]
+    graph = WorkflowGraph(
+        id="fan_out_join",
+        nodes=nodes,
+        edges=edges,
+        state_schema={"reducers": {"items": "append", "hits": "sum"}},
+    )
+    engine = GraphEngine(graph)
+    counters = {"active": 0, "peak": 0}
+
+    async def mock_execute(node, state):
+        if node.id in {"B", "C"}:
+            counters["active"] += 1
+            counters["peak"] = max(counters["peak"], counters["active"])
+            await asyncio.sleep(0.02)
+            counters["active"] -= 1
+            return {"items": [node.config["item"]], "hits": 1}
+        await asyncio.sleep(0)
+        return dict(node.config)
+
+    engine._execute_node = mock_execute
+    state = await engine.execute()
+
+    assert counters["peak"] == 2
+    assert state.data["items"] == ["b", "c"]
+    assert state.data["hits"] == 2
+    assert state.data["joined_from"] == ["B", "C"]
+    assert state.data["done"] is True
+    assert [cp.node_id for cp in state.checkpoints] == ["A", "B", "C", "J", "D"]
+
+
+@pytest.mark.asyncio
+async def test_graph_engine_join_waits_for_longer_branch():
+    # A -> B1 -> B2 -> J ; A -> C -> J
+    nodes = [
+        WorkflowNode(id="A", type="transform"),
+        WorkflowNode(id="B1", type="transform"),
+        WorkflowNode(id="B2", type="transform"),
+        WorkflowNode(id="C", type="transform"),
+        WorkflowNode(id="J", type="join"),
+    ]
+    edges = [
+        WorkflowEdge(**{"from": "A", "to": "B1"}),
+        WorkflowEdge(**{"from": "A", "to": "C"}),
+        WorkflowEdge(**{"from": "B1", "to": "B2"}),
+        WorkflowEdge(**{"from": "B2", "to": "J"}),
+        WorkflowEdge(**{"from": "C", "to": "J"}),
+    ]
+    graph = WorkflowGraph(id="join_wait", nodes=nodes, edges=edges, state_schema={"reducers": {"seen": "append"}})
+    engine = GraphEngine(graph)
+
+    async def mock_execute(node, state):
+        await asyncio.sleep(0)
+        return {"seen": node.id}
+
+    engine._execute_node = mock_execute
+    state = await engine.execute()
+
+    order = [cp.node_id for cp in state.checkpoints]
+    assert order.index("J") > order.index("B2")
+    assert order.count("J") == 1
+    assert state.data["seen"] == ["A", "B1", "C", "B2"]
+
+
+@pytest.mark.asyncio
+async def test_graph_engine_fan_out_failure_aborts_workflow():
+    nodes = [
+        WorkflowNode(id="A", type="transform"),
+        WorkflowNode(id="B", type="transform"),
+        WorkflowNode(id="C", type="transform"),
+        WorkflowNode(id="J", type="join"),
+    ]
+    edges = [
+        WorkflowEdge(**{"from": "A", "to": "B"}),
+        WorkflowEdge(**{"from": "A", "to": "C"}),
+        WorkflowEdge(**{"from": "B", "to": "J"}),
+        WorkflowEdge(**{"from": "C", "to": "J"}),
+    ]
+    engine = GraphEngine(WorkflowGraph(id="fan_out_fail", nodes=nodes, edges=edges))
+
+    async def mock_execute(node, state):
+        await asyncio.sleep(0)
+        if node.id == "C":
+            raise RuntimeError("boom")
+        return {"ok": node.id}
+
+    engine._execute_node = mock_execute
+    state = await engine.execute()
+
+    assert state.data["aborted_reason"] == "node_failure"
+    statuses = {cp.node_id: cp.status for cp in state.checkpoints}
+    assert statuses == {"A": "completed", "B": "completed", "C": "failed"}
+
+
+def test_graph_engine_rejects_unknown_reducer():
+    graph = WorkflowGraph(
+        id="bad_reducer",
+        nodes=[WorkflowNode(id="A", type="transform")],
+        edges=[],
+        state_schema={"reducers": {"x": "concat"}},
+    )
+    with pytest.raises(ValueError):
+        GraphEngine(graph)
+
+
 # ── Node Execution (Unit) ───────────────────────────────────
 
 @pytest.mark.asyncio
@@ -781,3 +902,86 @@ def test_critical_file_integrity_check():
     content = test_file.read_bytes().replace(b'\r\n', b'\n')
     h = hashlib.sha256(content).hexdigest()
     assert len(h) == 64
+
+
+def _paused_fan_out_engine():
+    # A -> (HR, C) ; C -> C2 ; (HR, C2) -> J -> D
+    nodes = [
+        WorkflowNode(id="A", type="transform"),
+        WorkflowNode(id="HR", type="human_review", config={"timeout_seconds": 60, "default_action": "block"}),
+        WorkflowNode(id="C", type="transform"),
+        WorkflowNode(id="C2", type="transform"),
+        WorkflowNode(id="J", type="join"),
+        WorkflowNode(id="D", type="transform", config={"done": True}),
+    ]
+    edges = [
+        WorkflowEdge(**{"from": "A", "to": "HR"}),
+        WorkflowEdge(**{"from": "A", "to": "C"}),
+        WorkflowEdge(**{"from": "C", "to": "C2"}),
+        WorkflowEdge(**{"from": "HR", "to": "J"}),
+        WorkflowEdge(**{"from": "C2", "to": "J"}),
+        WorkflowEdge(**{"from": "J", "to": "D"}),
+    ]
+    graph = WorkflowGraph(id="fan_out_pause", nodes=nodes, edges=edges, state_schema={"reducers": {"seen": "append"}})
+    engine = GraphEngine(graph)
+
+    async def mock_execute(node, state):
+        await asyncio.sleep(0)
+        return {"seen": node.id, **node.config}
+
+    engine._execute_node = mock_execute
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_graph_engine_fan_out_pause_resumes_every_pending_branch():
+    for from_checkpoint in (False, True):
+        engine = _paused_fan_out_engine()
+
+        paused = await engine.execute()
+        assert paused.data["execution_paused"] is True
+        assert paused.data["pending_branches"]["frontier"] == ["HR", "C2"]
+        assert paused.checkpoints[-1].status == "paused"
+        assert paused.checkpoints[-1].state["pending_branches"]["completed"] == ["A", "C"]
+
+        if from_checkpoint:
+            assert engine.resume_from_checkpoint(-1) == "HR"
+        state = await engine.execute(initial_state={"human_reviews": {"HR": {"decision": "approve"}}})
+
+        assert state.data["execution_paused"] is False
+        assert "pending_branches" not in state.data
+        assert state.data["seen"] == ["A", "C", "C2", "D"]
+        assert state.data["done"] is True
+        completed = [cp.node_id for cp in state.checkpoints if cp.status == "completed"]
+        assert completed == ["A", "C", "HR", "C2", "J", "D"]
+
+
+@pytest.mark.asyncio
+async def test_graph_engine_fan_out_publishes_handover_for_each_paused_branch(monkeypatch):
+    from tools.gimo_server.services.notification_service import NotificationService
+
+    published = []
+
+    async def fake_publish(event, payload):
+        published.append((event, payload))
+
+    monkeypatch.setattr(NotificationService, "publish", fake_publish)
+
+    # A -> (HR1, HR2): both branches pause in the same superstep
+    nodes = [WorkflowNode(id="A", type="transform")] + [
+        WorkflowNode(id=node_id, type="human_review", config={"timeout_seconds": 60, "default_action": "block"})
+        for node_id in ("HR1", "HR2")
+    ]
+    edges = [WorkflowEdge(**{"from": "A", "to": "HR1"}), WorkflowEdge(**{"from": "A", "to": "HR2"})]
+    engine = GraphEngine(WorkflowGraph(id="fan_out_handover", nodes=nodes, edges=edges))
+
+    state = await engine.execute()
+    await asyncio.sleep(0)
+
+    assert state.data["execution_paused"] is True
+    assert [event for event, _ in published] == ["handover_required", "handover_required"]
+    assert sorted(payload["node_id"] for _, payload in published) == ["HR1", "HR2"]
+    for _, payload in published:
+        assert payload["workflow_id"] == "fan_out_handover"
+        assert payload["reason"] == state.data["pause_reason"]
+        assert payload["context"]["pause_execution"] is True
@@ -101,3 +101,121 @@ def test_verify_manifest_invalid_signature(tmp_path):
     ok, reason = IntegrityVerifier(settings).verify_manifest()
     assert ok is False
     assert reason == "invalid_manifest_signature"
+
+
+def _signed_settings(tmp_path: Path, names):
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key().public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo).decode("utf-8")
+    files = {}
+    for name in names:
+        target = tmp_path / name
+        target.write_text(f"{name}\n", encoding="utf-8")
+        files[name] = _sha256_normalized(target)
+    settings = _settings(tmp_path)
+    settings.integrity_public_key_pem = public_key
+    settings.integrity_stat_cache_path = tmp_path / "cache" / "stat_cache.json"
+    settings.integrity_cache_key = "test-cache-key"
+    settings.integrity_manifest_path.write_text(
+        json.dumps(_signed_payload({"files": files}, private_key)), encoding="utf-8"
+    )
+    return settings
+
+
+def _count_hashes(monkeypatch):
+    from tools.gimo_server.security import integrity
+
+    hashed = []
+
+    def counting(path):
+        hashed.append(path.name)
+        return _sha256_normalized(path)
+
+    monkeypatch.setattr(integrity, "_sha256_normalized", counting)
+    monkeypatch.setattr(IntegrityVerifier, "RACY_WINDOW_NS", 0)
+    monkeypatch.setattr(IntegrityVerifier, "_memory", {})
+    return hashed
+
+
+def test_stat_cache_skips_unchanged_files_and_catches_edits(tmp_path, monkeypatch):
+    settings = _signed_settings(tmp_path, ["a.py", "b.py", "c.py"])
+    hashed = _count_hashes(monkeypatch)
+
+    assert IntegrityVerifier(settings).verify_manifest() == (True, "ok")
+    assert sorted(hashed) == ["a.py", "b.py", "c.py"]
+    assert settings.integrity_stat_cache_path.exists()
+
+    hashed.clear()
+    IntegrityVerifier._memory.clear()  # a restart: only the persisted cache is left
+    assert IntegrityVerifier(settings).verify_manifest() == (True, "ok")
+    assert hashed == []
+
+    (tmp_path / "b.py").write_text("tampered\n", encoding="utf-8")
+    assert IntegrityVerifier(settings).verify_manifest() == (False, "hash_mismatch")
+    assert hashed == ["b.py"]
+
+
+def test_forged_or_unkeyed_stat_cache_is_not_trusted(tmp_path, monkeypatch):
+    settings = _signed_settings(tmp_path, ["a.py", "b.py"])
+    hashed = _count_hashes(monkeypatch)
+    IntegrityVerifier(settings).verify_manifest()
+
+    # Tamper with a file, then forge a cache entry that matches its new stat.
+    (tmp_path / "a.py").write_text("tampered\n", encoding="utf-8")
+    cache_path = settings.integrity_stat_cache_path
+    payload = json.loads(cache_path.read_text(encoding="utf-8"))
+    body = json.loads(payload["body"])
+    stat = (tmp_path / "a.py").stat()
+    body["entries"]["a.py"][:4] = [stat.st_size, stat.st_mtime_ns, stat.st_ino, stat.st_ctime_ns]
+    payload["body"] = json.dumps(body, separators=(",", ":"))
+    cache_path.write_text(json.dumps(payload), encoding="utf-8")
+
+    IntegrityVerifier._memory.clear()
+    hashed.clear()
+    assert IntegrityVerifier(settings).verify_manifest() == (False, "hash_mismatch")
+    assert sorted(hashed) == ["a.py", "b.py"]
+
+    # Without a key nothing is persisted; the cache only lives in memory.
+    (tmp_path / "nokey").mkdir()
+    settings = _signed_settings(tmp_path / "nokey", ["c.py"])
+    settings.integrity_cache_key = ""
+    hashed.clear()
+    assert IntegrityVerifier(settings).verify_manifest() == (True, "ok")
+    assert not settings.integrity_stat_cache_path.exists()
+    assert IntegrityVerifier(settings).verify_manifest() == (True, "ok")
+    assert hashed == ["c.py"]
+
+
+def test_full_recheck_ignores_the_stat_cache(tmp_path, monkeypatch):
+    settings = _signed_settings(tmp_path, ["a.py", "b.py"])
+    hashed = _count_hashes(monkeypatch)
+    IntegrityVerifier(settings).verify_manifest()
+
+    hashed.clear()
+    assert IntegrityVerifier(settings).verify_manifest(use_cache=False) == (True, "ok")
+    assert sorted(hashed) == ["a.py", "b.py"]
+
+
+def test_stat_cache_is_discarded_when_manifest_changes(tmp_path, monkeypatch):
+    settings = _signed_settings(tmp_path, ["a.py"])
+    hashed = _count_hashes(monkeypatch)
+    IntegrityVerifier(settings).verify_manifest()
+
+    settings = _signed_settings(tmp_path, ["a.py", "b.py"])
+    hashed.clear()
+    assert IntegrityVerifier(settings).verify_manifest() == (True, "ok")
+    assert sorted(hashed) == ["a.py", "b.py"]
+
+
+def test_verify_paths_rechecks_only_changed_manifest_files(tmp_path, monkeypatch):
+    settings = _signed_settings(tmp_path, ["a.py", "b.py"])
+    hashed = _count_hashes(monkeypatch)
+    verifier = IntegrityVerifier(settings)
+    assert verifier.verify_manifest() == (True, "ok")
+
+    hashed.clear()
+    (tmp_path / "a.py").unlink()
+    assert verifier.verify_paths([tmp_path / "unrelated.txt"]) == (True, "ok")
+    assert verifier.verify_paths([tmp_path / "a.py"]) == (False, "file_missing")
+    (tmp_path / "b.py").write_text("b.py\n", encoding="utf-8")  # same content, new stat
+    assert verifier.verify_paths([tmp_path / "b.py"]) == (True, "ok")
+    assert hashed == ["b.py"]
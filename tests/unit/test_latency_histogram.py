@@ -0,0 +1,22 @@
+from tools.gimo_server.services.latency_histogram import LatencyHistogram
+
+
+def test_quantiles_and_summary_use_bucket_upper_bounds():
+    hist = LatencyHistogram(1.0, base=2.0)
+    for value in (0.5, 3.0, 3.5, 7.0):
+        hist.add(value)
+
+    assert hist.quantile(0.5) == 4.0
+    summary = hist.summary("ms")
+    assert summary["count"] == 4 and summary["mean_ms"] == 3.5
+    assert summary["p99_ms"] == 8.0
+    assert summary["buckets"] == {1.0: 1, 4.0: 2, 8.0: 1}
+
+
+def test_counts_are_halved_at_max_count():
+    hist = LatencyHistogram(1.0, base=2.0, max_count=4)
+    for value in (1.0, 1.0, 8.0, 8.0):
+        hist.add(value)
+
+    assert hist.count == 2 and hist.buckets == {0: 1.0, 3: 1.0}
+    assert hist.summary()["mean"] == 4.5
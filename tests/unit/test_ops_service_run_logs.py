@@ -68,3 +68,43 @@ def test_cleanup_old_runs_removes_run_and_associated_log(monkeypatch, tmp_path):
     assert cleaned == 1
     assert not run_path.exists()
     assert not (OpsService.RUN_LOGS_DIR / "r_old.jsonl").exists()
+
+
+def test_run_locks_are_sharded_per_run(monkeypatch, tmp_path):
+    _configure_ops_dirs(monkeypatch, tmp_path)
+
+    assert OpsService._lock_shard("r_a") == OpsService._lock_shard("r_a")
+    shard_ids = {OpsService._lock_shard(f"r_{i}") for i in range(200)}
+    assert len(shard_ids) > 1
+    assert OpsService._run_lock("r_a") is OpsService._run_lock("r_a")
+    assert OpsService._run_lock("r_a").lock_file != str(OpsService.LOCK_FILE)
+
+
+def test_run_lock_does_not_block_other_runs_or_global_index(monkeypatch, tmp_path):
+    import threading
+
+    _configure_ops_dirs(monkeypatch, tmp_path)
+    other = next(f"r_{i}" for i in range(1000) if OpsService._lock_shard(f"r_{i}") != OpsService._lock_shard("r_a"))
+    acquired = []
+
+    def _worker():
+        with OpsService._run_lock(other):
+            acquired.append("run")
+        with OpsService._lock():
+            acquired.append("global")
+
+    with OpsService._run_lock("r_a"):
+        t = threading.Thread(target=_worker)
+        t.start()
+        t.join(timeout=5)
+
+    assert acquired == ["run", "global"]
+
+
+def test_run_locks_acquires_each_shard_once(monkeypatch, tmp_path):
+    _configure_ops_dirs(monkeypatch, tmp_path)
+
+    with OpsService._run_locks("r_a", "r_b", "r_a"):
+        assert OpsService._run_lock("r_a").is_locked
+        assert OpsService._run_lock("r_b").is_locked
+    assert not OpsService._run_lock("r_a").is_locked
@@ -0,0 +1,135 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from tools.gimo_server.engine.tools.executor import ToolExecutor
+from tools.gimo_server.services.diff_application_service import DiffApplicationService
+from tools.gimo_server.services.patch_engine import PatchEngine, PatchError
+
+
+def _numbered(n):
+    return "".join(f"line{i}\n" for i in range(1, n + 1))
+
+
+def test_unified_diff_applies_with_offset_and_creates_files(tmp_path):
+    # Two extra lines at the top: every hunk lands two lines below where it expects.
+    (tmp_path / "a.py").write_text("extra1\nextra2\n" + _numbered(20))
+    diff = (
+        "diff --git a/a.py b/a.py\n"
+        "--- a/a.py\n"
+        "+++ b/a.py\n"
+        "@@ -5,3 +5,3 @@\n"
+        " line5\n"
+        "-line6\n"
+        "+LINE6\n"
+        " line7\n"
+        "@@ -15,2 +15,3 @@\n"
+        " line15\n"
+        "+inserted\n"
+        " line16\n"
+        "--- /dev/null\n"
+        "+++ b/pkg/new.txt\n"
+        "@@ -0,0 +1,2 @@\n"
+        "+hello\n"
+        "+world\n"
+    )
+
+    result = PatchEngine.apply(tmp_path, diff)
+
+    lines = (tmp_path / "a.py").read_text().splitlines()
+    assert lines[7] == "LINE6"
+    assert lines[16:19] == ["line15", "inserted", "line16"]
+    assert (tmp_path / "pkg" / "new.txt").read_text() == "hello\nworld\n"
+    assert result.files == ["a.py", "pkg/new.txt"]
+    assert result.hunks == 3 and result.fuzzed == 2
+
+
+def test_fuzz_tolerates_stale_context_and_whitespace(tmp_path):
+    target = tmp_path / "m.py"
+    target.write_text("def f():\n    a = 1\n    b = 2    \n    return a\n", newline="")
+    diff = "@@ -1,4 +1,4 @@\n def f():\n     a = 1\n-    b = 2\n+    b = 3\n     return a + b\n"
+
+    PatchEngine.apply_to_file(target, diff)
+
+    assert target.read_text() == "def f():\n    a = 1\n    b = 3\n    return a\n"
+
+
+def test_search_replace_blocks_apply_in_any_order(tmp_path):
+    target = tmp_path / "n.txt"
+    target.write_text("one\ntwo\nthree\n")
+    blocks = (
+        "<<<< SEARCH\nthree\n====\nTHREE\nREPLACE >>>>\n"
+        "<<<< SEARCH\none\n====\nONE\nREPLACE >>>>\n"
+    )
+
+    PatchEngine.apply_to_file(target, blocks)
+
+    assert target.read_text() == "ONE\ntwo\nTHREE\n"
+
+
+def test_failed_hunk_leaves_every_file_untouched(tmp_path):
+    (tmp_path / "a.txt").write_text("one\ntwo\n")
+    (tmp_path / "b.txt").write_text("three\nfour\n")
+    diff = (
+        "--- a/a.txt\n+++ b/a.txt\n@@ -1,2 +1,2 @@\n-one\n+ONE\n two\n"
+        "--- a/b.txt\n+++ b/b.txt\n@@ -1,2 +1,2 @@\n-missing\n+x\n four\n"
+    )
+
+    with pytest.raises(PatchError):
+        PatchEngine.apply(tmp_path, diff)
+
+    assert (tmp_path / "a.txt").read_text() == "one\ntwo\n"
+    assert (tmp_path / "b.txt").read_text() == "three\nfour\n"
+
+
+def test_write_failure_rolls_back_already_replaced_files(tmp_path):
+    (tmp_path / "a.txt").write_text("one\n")
+    (tmp_path / "b.txt").write_text("two\n")
+    diff = (
+        "--- a/a.txt\n+++ b/a.txt\n@@ -1 +1 @@\n-one\n+ONE\n"
+        "--- a/b.txt\n+++ b/b.txt\n@@ -1 +1 @@\n-two\n+TWO\n"
+    )
+    real_write = PatchEngine._write_atomic
+
+    def flaky(target, content):
+        if target.name == "b.txt" and content == "TWO\n":
+            raise OSError("disk full")
+        real_write(target, content)
+
+    with patch.object(PatchEngine, "_write_atomic", staticmethod(flaky)):
+        with pytest.raises(PatchError, match="rolled back"):
+            PatchEngine.apply(tmp_path, diff)
+
+    assert (tmp_path / "a.txt").read_text() == "one\n"
+    assert (tmp_path / "b.txt").read_text() == "two\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.txt", "b.txt"]
+
+
+def test_diff_application_service_search_replace_is_transactional(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("x = 1\ny = 2\n")
+    content = (
+        "Update src/app.py\n<<<< SEARCH\nx = 1\n====\nx = 10\nREPLACE >>>>\n"
+        "Then src/app.py\n<<<< SEARCH\nz = 3\n====\nz = 30\nREPLACE >>>>\n"
+    )
+
+    with pytest.raises(PatchError, match="does not apply"):
+        DiffApplicationService.apply(str(tmp_path), content)
+    assert (tmp_path / "src" / "app.py").read_text() == "x = 1\ny = 2\n"
+
+    DiffApplicationService.apply(str(tmp_path), content.split("Then")[0])
+    assert (tmp_path / "src" / "app.py").read_text() == "x = 10\ny = 2\n"
+
+
+def test_executor_patch_file_reports_success_and_failure(tmp_path):
+    target = tmp_path / "notes.md"
+    target.write_text("alpha\nbeta\n")
+    executor = ToolExecutor(str(tmp_path))
+
+    ok = asyncio.run(executor.handle_patch_file({"path": "notes.md", "diff": "@@ -2 +2 @@\n-beta\n+gamma\n"}))
+    bad = asyncio.run(executor.handle_patch_file({"path": "notes.md", "diff": "@@ -2 +2 @@\n-delta\n+x\n"}))
+
+    assert ok["status"] == "success"
+    assert target.read_text() == "alpha\ngamma\n"
+    assert bad["status"] == "error" and "does not apply" in bad["message"]
@@ -233,3 +233,34 @@ def test_phase4_create_run_maps_invalid_fsm_to_422(monkeypatch):
             assert res.json()["detail"].startswith("INVALID_FSM_TRANSITION")
     finally:
         app.dependency_overrides.clear()
+
+
+def test_phase4_dry_replay_runs_in_background_and_returns_202(monkeypatch):
+    app.dependency_overrides[verify_token] = _override_auth
+
+    from types import SimpleNamespace
+
+    from tools.gimo_server.routers.ops import run_router
+
+    calls = []
+
+    async def fake_dry_replay_run(run_id, from_step, stages):
+        calls.append((run_id, from_step, stages))
+
+    monkeypatch.setattr(run_router.OpsService, "get_run", lambda run_id: SimpleNamespace(id=run_id))
+    monkeypatch.setattr(run_router.RunJournal, "load", lambda self: None)
+    monkeypatch.setattr(run_router.RunJournal, "get_step", lambda self, step_id: SimpleNamespace(step_id=step_id))
+    monkeypatch.setattr(run_router.EngineService, "build_stages", lambda composition: ["stage"])
+    monkeypatch.setattr(run_router.EngineService, "dry_replay_run", fake_dry_replay_run)
+
+    try:
+        with TestClient(app) as client:
+            res = client.post(
+                "/ops/runs/r_phase4/replay",
+                params={"from_step": "s1", "composition": "legacy_run", "dry_run": "true"},
+            )
+            assert res.status_code == 202
+            assert res.json()["status"] == "accepted"
+        assert calls == [("r_phase4", "s1", ["stage"])]
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,91 @@
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from tools.gimo_server.security import rate_limit, threat_engine
+from tools.gimo_server.security.rate_limit import TokenBucketStore, route_class
+from tools.gimo_server.security.threat_level import ThreatLevel
+
+
+def _request(path, method="GET", ip="10.0.0.7", headers=()):
+    return Request({
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+        "client": (ip, 1234),
+        "server": ("testserver", 80),
+        "scheme": "http",
+    })
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_PER_MIN", 10)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_WINDOW_SECONDS", 60)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ROUTE_COSTS", {"default": 1, "search": 5, "execute": 10})
+    monkeypatch.setattr(rate_limit, "rate_limit_store", TokenBucketStore())
+    yield now
+    threat_engine.clear_all()
+
+
+def test_bucket_refills_continuously_without_window_edge_bursts():
+    store = TokenBucketStore(shards=4)
+    key = ("ip:a", "default")
+    assert all(store.take(key, 1, 3, 0.5, 0.0) == 0.0 for _ in range(3))
+    # Empty: the next token is two seconds away, not "at the next window".
+    assert store.take(key, 1, 3, 0.5, 0.0) == pytest.approx(2.0)
+    assert store.take(key, 1, 3, 0.5, 1.0) > 0
+    assert store.take(key, 1, 3, 0.5, 2.0) == 0.0
+    # A long idle period refills to capacity, never beyond it.
+    assert [store.take(key, 1, 3, 0.5, 100.0) for _ in range(4)][-1] > 0
+
+
+def test_route_classes_have_their_own_costs_and_buckets(clock):
+    assert route_class("GET", "/search") == "search"
+    assert route_class("POST", "/ops/search/web") == "search"
+    assert route_class("POST", "/ops/custom-plans/p1/execute") == "execute"
+    assert route_class("GET", "/ops/runs") == "default"
+    assert route_class("POST", "/ops/runs") == "execute"
+
+    rate_limit.check_rate_limit(_request("/search"))
+    rate_limit.check_rate_limit(_request("/search"))
+    with pytest.raises(HTTPException) as exc:
+        rate_limit.check_rate_limit(_request("/search"))
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == "30"  # 5 tokens at 1 token / 6 s
+
+    # Reads are a separate bucket, and so is another client.
+    rate_limit.check_rate_limit(_request("/status"))
+    rate_limit.check_rate_limit(_request("/search", ip="10.0.0.8"))
+
+
+def test_threat_level_slows_refill(clock):
+    for _ in range(10):
+        rate_limit.check_rate_limit(_request("/status"))
+    clock[0] += 6.0
+    rate_limit.check_rate_limit(_request("/status"))  # one token refilled at NOMINAL
+
+    threat_engine.level = ThreatLevel.ALERT
+    clock[0] += 6.0
+    with pytest.raises(HTTPException) as exc:
+        rate_limit.check_rate_limit(_request("/status"))
+    assert exc.value.headers["Retry-After"] == "6"  # half a token so far, half the rate
+    clock[0] += 6.0
+    rate_limit.check_rate_limit(_request("/status"))
+
+
+def test_idle_buckets_are_swept_one_shard_at_a_time(clock, monkeypatch):
+    store = TokenBucketStore(shards=2)
+    store.take(("ip:a", "default"), 1, 10, 1.0, 995.0)
+    store.take(("ip:b", "default"), 1, 10, 1.0, 995.0)
+    store.take(("ip:c", "default"), 10, 10, 1.0, 1000.0)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_CLEANUP_SECONDS", 0)
+
+    store.sweep(1005.0, 10, 1.0)
+    store.sweep(1005.0, 10, 1.0)
+
+    assert len(store) == 1 and store.tokens(("ip:c", "default")) == 0.0
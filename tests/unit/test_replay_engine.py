@@ -0,0 +1,214 @@
+import asyncio
+import json
+
+import pytest
+
+from tools.gimo_server.engine.contracts import StageInput, StageOutput
+from tools.gimo_server.engine.journal import RunJournal
+from tools.gimo_server.engine.pipeline import Pipeline, PipelineConfig
+from tools.gimo_server.engine.replay import ReplayEngine, ReplayIntegrityError
+
+
+class CountingStage:
+    def __init__(self, name, fail_times=0, value=None):
+        self.name = name
+        self.calls = 0
+        self.fail_times = fail_times
+        self.value = value if value is not None else name
+
+    async def execute(self, input: StageInput) -> StageOutput:
+        self.calls += 1
+        if self.calls <= self.fail_times:
+            return StageOutput(status="fail", artifacts={"error": f"{self.name} broke"})
+        seen = sorted(input.artifacts)
+        input.context["mutated_by"] = self.name  # must not leak into the journal
+        return StageOutput(status="continue", artifacts={self.name: self.value, f"{self.name}_saw": seen})
+
+    async def rollback(self, input: StageInput) -> None:
+        return None
+
+
+def _pipeline(stages):
+    return Pipeline(run_id="r1", stages=stages, config=PipelineConfig(max_retries=0, retry_delay_seconds=0))
+
+
+def _first_run(tmp_path):
+    journal_path = tmp_path / "journal.jsonl"
+    plan, llm, write = CountingStage("plan"), CountingStage("llm"), CountingStage("write", fail_times=1)
+    results = asyncio.run(_pipeline([plan, llm, write]).run({"journal_path": str(journal_path), "prompt": "p"}))
+    assert results[-1].status == "fail"
+    journal = RunJournal(storage_path=str(journal_path))
+    journal.load()
+    return journal, (plan, llm, write)
+
+
+def test_resume_skips_completed_stages_and_rehydrates_artifacts(tmp_path):
+    journal, (plan, llm, write) = _first_run(tmp_path)
+
+    pipeline = _pipeline([plan, llm, write])
+    results = asyncio.run(ReplayEngine(journal).resume(pipeline))
+
+    assert (plan.calls, llm.calls, write.calls) == (1, 1, 2)
+    assert [r.status for r in results] == ["continue", "continue", "continue"]
+    assert pipeline.artifacts["write_saw"] == ["llm", "llm_saw", "plan", "plan_saw"]
+    assert journal.entries[0].input_snapshot["context"] == {"journal_path": str(tmp_path / "journal.jsonl"), "prompt": "p"}
+
+    journal.load()
+    rehydrated = ReplayEngine(journal).rehydrate(_pipeline([plan, llm, write]))
+    assert rehydrated.resume_index == 3
+    assert rehydrated.context["prompt"] == "p"
+
+
+def test_rehydrate_rejects_tampered_output(tmp_path):
+    journal, stages = _first_run(tmp_path)
+    path = tmp_path / "journal.jsonl"
+    lines = path.read_text(encoding="utf-8").splitlines()
+    first = json.loads(lines[0])
+    first["output_snapshot"]["artifacts"]["plan"] = "forged"
+    lines[0] = json.dumps(first)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    journal.load()
+
+    with pytest.raises(ReplayIntegrityError):
+        ReplayEngine(journal).rehydrate(_pipeline(list(stages)))
+
+
+def test_dry_replay_reports_divergence(tmp_path):
+    journal, (plan, llm, write) = _first_run(tmp_path)
+
+    reports = asyncio.run(
+        ReplayEngine(journal).dry_replay(_pipeline([plan, CountingStage("llm", value="different"), write]))
+    )
+
+    by_stage = {r["stage"]: r for r in reports}
+    assert by_stage["plan"]["diverged"] is False
+    assert by_stage["llm"]["diverged"] is True
+    assert by_stage["llm"]["changed_artifacts"] == ["llm"]
+    assert by_stage["write"]["recorded_status"] == "fail"
+    assert by_stage["write"]["replayed_status"] == "continue"
+
+
+def test_dry_replay_from_step_skips_earlier_and_side_effecting_stages(tmp_path):
+    journal, (plan, llm, write) = _first_run(tmp_path)
+    llm_step = next(e.step_id for e in journal.entries if e.stage_name == "llm")
+    write.side_effects = True
+
+    output = asyncio.run(ReplayEngine(journal).replay_from(llm_step, _pipeline([plan, llm, write]), dry_run=True))
+
+    assert (plan.calls, llm.calls, write.calls) == (1, 2, 1)
+    assert [r["stage"] for r in output.artifacts["stages"]] == ["llm", "write"]
+    assert output.artifacts["stages"][1]["skipped"] is True
+    assert output.artifacts["skipped"] == ["write"]
+    assert output.artifacts["diverged"] is False
+
+
+def test_replay_from_step_reenters_at_that_stage(tmp_path):
+    journal, (plan, llm, write) = _first_run(tmp_path)
+    llm_step = next(e.step_id for e in journal.entries if e.stage_name == "llm")
+
+    output = asyncio.run(ReplayEngine(journal).replay_from(llm_step, _pipeline([plan, llm, write])))
+
+    assert output.status == "continue"
+    assert (plan.calls, llm.calls, write.calls) == (1, 2, 2)
+    assert output.artifacts["stages"] == {"plan": "continue", "llm": "continue", "write": "continue"}
+
+
+def test_replay_from_without_stages_returns_journal_slice(tmp_path):
+    journal, _ = _first_run(tmp_path)
+    step = journal.entries[1].step_id
+
+    output = asyncio.run(ReplayEngine(journal).replay_from(step, Pipeline(run_id="r1", stages=[])))
+
+    assert output.status == "continue"
+    assert [e["stage_name"] for e in output.artifacts["entries"]] == ["llm", "write"]
+
+
+def test_engine_replay_resumes_with_the_runs_stored_context(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from tools.gimo_server.services.engine_service import EngineService
+    from tools.gimo_server.services.ops_service import OpsService
+
+    journal, _ = _first_run(tmp_path)
+    plan_step = next(e.step_id for e in journal.entries if e.stage_name == "plan")
+    seen = []
+
+    class ContextStage(CountingStage):
+        async def execute(self, input: StageInput) -> StageOutput:
+            seen.append(dict(input.context))
+            return await super().execute(input)
+
+    logs = []
+    monkeypatch.setattr(EngineService, "journal_path", staticmethod(lambda run_id: tmp_path / "journal.jsonl"))
+    monkeypatch.setattr(
+        EngineService, "run_context", classmethod(lambda cls, run, composition=None: ({"prompt": "stored"}, composition))
+    )
+    monkeypatch.setattr(OpsService, "get_run", staticmethod(lambda run_id: SimpleNamespace(id=run_id)))
+    monkeypatch.setattr(OpsService, "append_log", staticmethod(lambda run_id, level, msg: logs.append((level, msg))))
+    statuses = []
+    monkeypatch.setattr(
+        OpsService, "update_run_status", staticmethod(lambda run_id, status, msg=None: statuses.append(status))
+    )
+
+    stages = [ContextStage("plan"), CountingStage("llm"), CountingStage("write")]
+    output = asyncio.run(EngineService.replay_run("r1", plan_step, stages, "legacy_run"))
+
+    assert seen and seen[0]["prompt"] == "stored"
+    assert output.status == "continue"
+    assert logs == [("INFO", f"Replay from {plan_step} finished: continue")]
+    assert statuses == ["running", "done"]
+
+
+def test_engine_replay_moves_a_failed_run_to_done(tmp_path, monkeypatch):
+    from datetime import datetime, timezone
+
+    from tools.gimo_server.ops_models import OpsRun
+    from tools.gimo_server.services.engine_service import EngineService
+    from tools.gimo_server.services.ops_service import OpsService
+
+    for attr in ("DRAFTS_DIR", "APPROVED_DIR", "RUNS_DIR", "RUN_EVENTS_DIR", "RUN_LOGS_DIR", "LOCKS_DIR"):
+        monkeypatch.setattr(OpsService, attr, tmp_path / "ops" / attr.lower())
+    monkeypatch.setattr(OpsService, "OPS_DIR", tmp_path / "ops")
+    monkeypatch.setattr(OpsService, "LOCK_FILE", tmp_path / "ops" / ".ops.lock")
+    OpsService.ensure_dirs()
+    OpsService._persist_run(
+        OpsRun(id="r1", approved_id="a1", status="error", created_at=datetime.now(timezone.utc))
+    )
+
+    journal, _ = _first_run(tmp_path)
+    write_step = next(e.step_id for e in journal.entries if e.stage_name == "write")
+    monkeypatch.setattr(EngineService, "journal_path", staticmethod(lambda run_id: tmp_path / "journal.jsonl"))
+    monkeypatch.setattr(
+        EngineService, "run_context", classmethod(lambda cls, run, composition=None: ({"prompt": "p"}, composition))
+    )
+
+    stages = [CountingStage("plan"), CountingStage("llm"), CountingStage("write")]
+    output = asyncio.run(EngineService.replay_run("r1", write_step, stages, "legacy_run"))
+
+    assert output.status == "continue"
+    run = OpsService.get_run("r1")
+    assert run.status == "done"
+    messages = [entry["msg"] for entry in run.log]
+    assert f"Replay from {write_step} started" in messages
+    assert f"Replay from {write_step} finished: continue" in messages
+
+
+def test_engine_dry_replay_logs_divergence_without_touching_status(tmp_path, monkeypatch):
+    from tools.gimo_server.services.engine_service import EngineService
+    from tools.gimo_server.services.ops_service import OpsService
+
+    journal, _ = _first_run(tmp_path)
+    llm_step = next(e.step_id for e in journal.entries if e.stage_name == "llm")
+    logs = []
+    monkeypatch.setattr(EngineService, "journal_path", staticmethod(lambda run_id: tmp_path / "journal.jsonl"))
+    monkeypatch.setattr(OpsService, "append_log", staticmethod(lambda run_id, level, msg: logs.append((level, msg))))
+    monkeypatch.setattr(OpsService, "update_run_status", staticmethod(lambda *args, **kwargs: pytest.fail("status changed")))
+
+    write = CountingStage("write")
+    write.side_effects = True
+    stages = [CountingStage("plan"), CountingStage("llm", value="different"), write]
+    output = asyncio.run(EngineService.dry_replay_run("r1", llm_step, stages))
+
+    assert output.artifacts["diverged"] is True
+    assert write.calls == 0
+    assert logs == [("WARN", f"Dry replay from {llm_step}: 2 stages, diverged: llm, skipped: write")]
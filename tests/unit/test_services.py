@@ -380,6 +380,46 @@ async def test_evals_service_regression_fails_gate_on_mismatch():
         report = await EvalsService.run_regression(workflow=workflow, dataset=dataset, judge=EvalJudgeConfig(enabled=True, mode="heuristic", output_key="result"), gate=EvalGateConfig(min_pass_rate=1.0, min_avg_score=1.0))
         assert report.gate_passed is False
 
+def test_evals_service_runs_cases_concurrently_and_caches_results():
+    EvalsService.clear_cache()
+    workflow = WorkflowGraph(id="wf_eval_par", nodes=[WorkflowNode(id="A", type="transform", config={})], edges=[])
+    cases = [EvalGoldenCase(case_id=f"c{i}", input_state={"i": i}, expected_state={"result": i}) for i in range(6)]
+    dataset = EvalDataset(workflow_id="wf_eval_par", name="ts", cases=cases)
+    in_flight = {"now": 0, "peak": 0, "calls": 0}
+
+    async def fake_execute(self, initial_state=None):
+        in_flight["now"] += 1
+        in_flight["calls"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return SimpleNamespace(data={"result": initial_state["i"]})
+
+    async def run(ds):
+        return await EvalsService.run_regression(
+            workflow=workflow, dataset=ds, judge=EvalJudgeConfig(), gate=EvalGateConfig(), concurrency=3
+        )
+
+    with patch("tools.gimo_server.services.evals_service.GraphEngine.execute", new=fake_execute), patch(
+        "tools.gimo_server.services.evals_service.NotificationService.publish", new_callable=AsyncMock
+    ) as publish:
+        first = asyncio.run(run(dataset))
+        assert in_flight["peak"] == 3
+        assert [r.case_id for r in first.results] == [f"c{i}" for i in range(6)]
+        assert first.gate_passed is True
+        assert publish.await_args_list[-1].args[1]["completed"] == 6
+
+        changed = dataset.model_copy(deep=True)
+        changed.cases[0].input_state = {"i": 100}
+        changed.cases[1].expected_state = {"result": "other"}  # scoring only, stays cached
+        second = asyncio.run(run(changed))
+
+    assert in_flight["calls"] == 7
+    assert second.results[0].actual_state == {"result": 100}
+    assert second.results[1].passed is False
+    assert publish.await_args_list[-1].args[1]["cached"] == 5
+    EvalsService.clear_cache()
+
 def test_institutional_memory_suggests_promote_auto_approve():
     svc = InstitutionalMemoryService(_StubStorage([{"dimension_key": "f|s/a.py|sonnet|add", "approvals": 25, "rejections": 1, "failures": 0, "score": 0.93, "policy": "require_review"}]))
     suggestions = svc.generate_suggestions(limit=10)
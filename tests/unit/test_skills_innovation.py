@@ -141,6 +141,97 @@ class TestAnalytics:
         a = SkillsService.get_skill_analytics("s4")
         assert a.total_runs == 1
 
+    def test_runs_append_to_ledger_until_compacted(self):
+        import tools.gimo_server.services.skills_service as mod
+
+        for d in (1.0, 2.0, 3.0):
+            SkillsService.record_skill_run("s5", "completed", duration=d, tokens=10)
+        assert not (mod.ANALYTICS_DIR / "s5.json").exists()
+        assert len((mod.ANALYTICS_DIR / "s5.runs.jsonl").read_text().splitlines()) == 3
+
+        SkillsService.compact_skill_analytics("s5")
+        SkillsService.record_skill_run("s5", "failed", duration=4.0)
+
+        view = json.loads((mod.ANALYTICS_DIR / "s5.json").read_text())
+        assert view["analytics"]["total_runs"] == 3
+        a = SkillsService.get_skill_analytics("s5")
+        assert (a.total_runs, a.failed_runs, a.total_tokens_used) == (4, 1, 30)
+        assert a.avg_duration_seconds == pytest.approx(2.5)
+        assert a.last_status == "failed"
+
+    def test_duration_percentiles(self):
+        for i in range(1, 101):
+            SkillsService.record_skill_run("s6", "completed", duration=float(i))
+        a = SkillsService.compact_skill_analytics("s6")
+        assert a.p50_duration_seconds == pytest.approx(50, rel=0.05)
+        assert a.p90_duration_seconds == pytest.approx(90, rel=0.05)
+        assert a.p99_duration_seconds == pytest.approx(99, rel=0.05)
+
+    def test_concurrent_runs_do_not_lose_increments(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: SkillsService.record_skill_run("s7", "completed", duration=1.0), range(200)))
+        assert SkillsService.compact_skill_analytics("s7").total_runs == 200
+
+    def test_compaction_rotates_the_ledger(self):
+        import tools.gimo_server.services.skills_service as mod
+
+        for _ in range(3):
+            SkillsService.record_skill_run("s9", "completed", duration=1.0)
+        assert SkillsService.compact_skill_analytics("s9").total_runs == 3
+        assert not (mod.ANALYTICS_DIR / "s9.runs.jsonl").exists()
+        assert len((mod.ANALYTICS_DIR / "s9.runs.jsonl.1").read_text().splitlines()) == 3
+
+        SkillsService.record_skill_run("s9", "failed", duration=1.0)
+        assert SkillsService.get_skill_analytics("s9").total_runs == 4
+        assert SkillsService.compact_skill_analytics("s9").total_runs == 4
+        assert len((mod.ANALYTICS_DIR / "s9.runs.jsonl.1").read_text().splitlines()) == 1
+        assert SkillsService.compact_skill_analytics("s9").total_runs == 4
+        assert not (mod.ANALYTICS_DIR / "s9.runs.jsonl.1").exists()
+
+    def test_crash_between_rotation_and_view_write_loses_nothing(self, monkeypatch):
+        import os
+
+        import tools.gimo_server.services.skills_service as mod
+
+        for _ in range(3):
+            SkillsService.record_skill_run("s10", "completed", duration=1.0)
+        # First half of a compaction: fold persisted, ledger renamed, then the process dies.
+        view = SkillsService._read_view("s10")
+        SkillsService._catch_up("s10", view)
+        (mod.ANALYTICS_DIR / "s10.json").write_text(json.dumps(view))
+        os.replace(mod.ANALYTICS_DIR / "s10.runs.jsonl", mod.ANALYTICS_DIR / "s10.runs.jsonl.1")
+        monkeypatch.setattr(SkillsService, "_views", {})
+
+        SkillsService.record_skill_run("s10", "failed", duration=1.0)
+
+        assert SkillsService.get_skill_analytics("s10").total_runs == 4
+        assert SkillsService.compact_skill_analytics("s10").total_runs == 4
+
+    def test_recording_runs_reuses_the_in_memory_view(self, monkeypatch):
+        reads = []
+        real_read_view = SkillsService._read_view.__func__
+        monkeypatch.setattr(
+            SkillsService, "_read_view", classmethod(lambda cls, sid: reads.append(sid) or real_read_view(cls, sid))
+        )
+
+        for _ in range(5):
+            SkillsService.record_skill_run("s11", "completed", duration=1.0)
+
+        assert reads == ["s11"]
+        assert SkillsService.get_skill_analytics("s11").total_runs == 5
+
+    def test_legacy_analytics_file_is_extended(self):
+        import tools.gimo_server.services.skills_service as mod
+
+        (mod.ANALYTICS_DIR / "s8.json").write_text(json.dumps({
+            "skill_id": "s8", "total_runs": 2, "successful_runs": 2, "avg_duration_seconds": 3.0,
+        }))
+        a = SkillsService.record_skill_run("s8", "completed", duration=6.0)
+        assert a.total_runs == 3
+        assert a.avg_duration_seconds == pytest.approx(4.0)
+
 
 # ── Marketplace Tests ────────────────────────────────────────────────────────
 
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import subprocess
+
+import pytest
+
+from tools.gimo_server.services import sub_agent_manager as mod
+from tools.gimo_server.services.provider_service import ProviderService
+from tools.gimo_server.services.sub_agent_manager import SubAgentManager
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    _git(repo, "-c", "user.email=t@t", "-c", "user.name=t", "commit", "-q", "--allow-empty", "-m", "init")
+    (repo / "tracked.txt").write_text("v1")
+    _git(repo, "add", "tracked.txt")
+    _git(repo, "-c", "user.email=t@t", "-c", "user.name=t", "commit", "-q", "-m", "file")
+
+    monkeypatch.setattr(mod, "REPO_ROOT_DIR", repo)
+    monkeypatch.setattr(mod, "WORKTREES_DIR", tmp_path / "worktrees")
+    monkeypatch.setattr(mod, "INVENTORY_FILE", tmp_path / "runtime" / "sub_agents.json")
+    monkeypatch.setattr(SubAgentManager, "_sub_agents", {})
+    monkeypatch.setattr(SubAgentManager, "_synced_models", set())
+    monkeypatch.setattr(SubAgentManager, "_worktree_pool", [])
+    monkeypatch.setattr(SubAgentManager, "_model_slots", {})
+    return SubAgentManager
+
+
+def test_records_are_written_per_agent(manager):
+    async def run():
+        a = await manager.create_sub_agent("p", {"modelPreference": "m1"})
+        b = await manager.create_sub_agent("p", {"modelPreference": "m2"})
+        await manager.terminate_sub_agent(a.id)
+        return a, b
+
+    a, b = asyncio.run(run())
+    records = manager._records_dir()
+
+    assert sorted(p.stem for p in records.glob("*.json")) == sorted([a.id, b.id])
+    assert json.loads((records / f"{a.id}.json").read_text())["status"] == "terminated"
+    assert json.loads((records / f"{b.id}.json").read_text())["status"] == "starting"
+    assert not mod.INVENTORY_FILE.exists()
+
+
+def test_worktrees_are_recycled_and_reset(manager):
+    async def run():
+        first = await manager.create_sub_agent("p", {})
+        path = first.worktreePath
+        (mod.WORKTREES_DIR / path.split("/")[-1] / "tracked.txt").write_text("dirty")
+        (mod.WORKTREES_DIR / path.split("/")[-1] / "scratch.tmp").write_text("x")
+        await manager.terminate_sub_agent(first.id)
+        second = await manager.create_sub_agent("p", {})
+        return path, first, second
+
+    path, first, second = asyncio.run(run())
+
+    assert first.worktreePath is None
+    assert second.worktreePath == path
+    wt = mod.WORKTREES_DIR / path.split("/")[-1]
+    assert (wt / "tracked.txt").read_text() == "v1"
+    assert not (wt / "scratch.tmp").exists()
+
+
+def test_reconcile_keeps_idle_pool_and_migrates_legacy_inventory(manager):
+    async def setup():
+        agent = await manager.create_sub_agent("p", {})
+        idle = await manager.create_sub_agent("p", {})
+        await manager.terminate_sub_agent(idle.id)
+        return agent
+
+    agent = asyncio.run(setup())
+    mod.INVENTORY_FILE.write_text(json.dumps({"legacy": {"id": "legacy", "parentId": "x", "model": "m"}}))
+
+    async def no_sync():
+        pass
+
+    manager._sub_agents = {}
+    manager._worktree_pool = []
+    manager.sync_with_ollama = no_sync
+    try:
+        asyncio.run(manager.startup_reconcile())
+    finally:
+        del manager.sync_with_ollama
+
+    assert set(manager._sub_agents) >= {agent.id, "legacy"}
+    assert len(manager._worktree_pool) == 1
+    assert (manager._records_dir() / "legacy.json").exists()
+    assert not mod.INVENTORY_FILE.exists()
+
+
+def test_execute_task_is_bounded_per_model_and_persists_state(manager, monkeypatch):
+    monkeypatch.setattr(manager, "DEFAULT_MODEL_CONCURRENCY", 2)
+    active = {"now": 0, "peak": 0}
+
+    async def fake_generate(prompt, context):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return {"content": f"done:{prompt}"}
+
+    monkeypatch.setattr(ProviderService, "static_generate", fake_generate)
+    monkeypatch.setattr(manager, "_acquire_worktree", classmethod(lambda cls: None))
+
+    async def run():
+        agents = [await manager.create_sub_agent("p", {"modelPreference": "m"}) for _ in range(6)]
+        results = await asyncio.gather(*(manager.execute_task(a.id, f"t{i}") for i, a in enumerate(agents)))
+        return agents, results
+
+    agents, results = asyncio.run(run())
+
+    assert active["peak"] == 2
+    assert results[3] == "done:t3"
+    assert manager.queue_depth("m") == 0
+    record = json.loads((manager._records_dir() / f"{agents[0].id}.json").read_text())
+    assert (record["status"], record["result"]) == ("idle", "done:t0")
+
+
+def test_execute_task_rejects_when_queue_is_full(manager, monkeypatch):
+    monkeypatch.setattr(manager, "MAX_QUEUED_PER_MODEL", 1)
+    gate = None
+
+    async def slow_generate(prompt, context):
+        await gate.wait()
+        return {"content": "ok"}
+
+    monkeypatch.setattr(ProviderService, "static_generate", slow_generate)
+    monkeypatch.setattr(manager, "_acquire_worktree", classmethod(lambda cls: None))
+
+    async def run():
+        nonlocal gate
+        gate = asyncio.Event()
+        a = await manager.create_sub_agent("p", {"modelPreference": "m"})
+        b = await manager.create_sub_agent("p", {"modelPreference": "m"})
+        first = asyncio.create_task(manager.execute_task(a.id, "x"))
+        await asyncio.sleep(0)
+        with pytest.raises(RuntimeError, match="queue"):
+            await manager.execute_task(b.id, "y")
+        gate.set()
+        return await first
+
+    assert asyncio.run(run()) == "ok"
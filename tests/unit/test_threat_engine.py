@@ -0,0 +1,95 @@
+import random
+from unittest.mock import patch
+
+import pytest
+
+from tools.gimo_server.security import threat_level
+from tools.gimo_server.security.threat_level import SecondCounter, ThreatEngine, ThreatLevel, TimingWheel
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(threat_level.time, "time", lambda: now[0])
+    with patch("tools.gimo_server.security.save_security_db"):
+        yield now
+
+
+def test_second_counter_slides_over_its_window():
+    counter = SecondCounter(60)
+    counter.add(100.0)
+    counter.add(130.5, count=2)
+    assert counter.count(159.0) == 3
+    assert counter.count(160.0) == 2  # the event at second 100 left the window
+    assert counter.count(500.0) == 0
+    counter.add(500.0)
+    counter.clear()
+    assert counter.add(501.0) == 1
+
+
+def test_timing_wheel_fires_each_timer_once_on_time():
+    rng = random.Random(7)
+    start = 1_000_000
+    wheel = TimingWheel(start)
+    deadlines = {f"k{i}": start + rng.randint(1, 300_000) for i in range(2000)}
+    for key, at in deadlines.items():
+        wheel.schedule(key, at)
+    wheel.schedule("k0", start + 5)  # rescheduling replaces the earlier deadline
+    deadlines["k0"] = start + 5
+    wheel.cancel("k1")
+    deadlines.pop("k1")
+
+    fired = {}
+    now = start
+    while now < start + 300_001:
+        now += rng.choice([1, 7, 64, 900, 5000])
+        for key in wheel.advance(now):
+            assert key not in fired
+            fired[key] = now
+
+    assert fired.keys() == deadlines.keys()
+    assert len(wheel) == 0
+    for key, at in deadlines.items():
+        assert at <= fired[key]  # never early...
+        assert fired[key] - at < 5000  # ...and no later than the advance step that passed it
+
+
+def test_sources_are_bounded_and_top_k_tracks_worst(clock, monkeypatch):
+    monkeypatch.setattr(threat_level, "MAX_TRACKED_SOURCES", 100)
+    monkeypatch.setattr(threat_level, "TOP_SOURCES", 3)
+    engine = ThreatEngine()
+
+    for i in range(5000):
+        engine.record_auth_failure(f"10.{i // 65536}.{i // 256 % 256}.{i % 256}")
+        if i % 1000 == 0:
+            engine.record_auth_failure("6.6.6.6")
+            engine.record_auth_failure("7.7.7.7")
+
+    snap = engine.snapshot()
+    assert len(engine._sources) == 100 and len(engine._wheel) <= 101
+    assert snap["active_sources"] == 100
+    assert [s["source"] for s in snap["sources"]][:2] == ["6.6.6.6", "7.7.7.7"]
+    assert len(snap["sources"]) == 3
+    assert snap["recent_events_count"] == 500
+
+
+def test_escalation_uses_windows_and_decay_and_expiry_run_on_the_wheel(clock):
+    engine = ThreatEngine()
+
+    engine.record_auth_failure("9.9.9.9")
+    clock[0] += 61  # first failure falls out of the 60 s window
+    engine.record_auth_failure("9.9.9.9")
+    engine.record_auth_failure("9.9.9.9")
+    assert engine.level == ThreatLevel.NOMINAL
+    engine.record_auth_failure("9.9.9.9")
+    assert engine.level == ThreatLevel.ALERT
+
+    clock[0] += 119
+    assert engine.tick_decay() is False
+    clock[0] += 1
+    assert engine.tick_decay() is True
+    assert engine.level == ThreatLevel.NOMINAL
+
+    clock[0] += threat_level.SOURCE_RETENTION_SECONDS + 2
+    assert engine.cleanup_stale_sources() == 1
+    assert engine.snapshot()["sources"] == []
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from tools.gimo_server.ops_models import ToolEntry
+from tools.gimo_server.services.tool_registry_service import ToolRegistryService
+
+
+@pytest.fixture
+def registry(monkeypatch, tmp_path):
+    monkeypatch.setattr(ToolRegistryService, "REGISTRY_PATH", tmp_path / "tool_registry.json")
+    monkeypatch.setattr(ToolRegistryService, "DISCOVERED_PATH", tmp_path / "tool_registry_discovered.json")
+    ToolRegistryService.invalidate()
+    yield ToolRegistryService
+    ToolRegistryService.invalidate()
+
+
+def test_is_allowed_matches_role_rules(registry):
+    registry.upsert_tool(ToolEntry(name="ops_tool", allowed_roles=["operator", "admin"]))
+    registry.upsert_tool(ToolEntry(name="admin_tool", allowed_roles=["admin"]))
+    registry.upsert_tool(ToolEntry(name="open_tool", allowed_roles=[]))
+
+    assert registry.is_allowed("ops_tool")
+    assert not registry.is_allowed("admin_tool")
+    assert registry.is_allowed("admin_tool", role="admin")
+    assert not registry.is_allowed("ops_tool", role="actions")
+    assert registry.is_allowed("open_tool", role="actions")
+    assert not registry.is_allowed("unknown")
+
+
+def test_lookups_do_not_touch_disk_once_indexed(registry, monkeypatch):
+    registry.upsert_tool(ToolEntry(name="t", allowed_roles=["operator"]))
+    registry.is_allowed("t")
+
+    def boom(*_args, **_kwargs):
+        raise AssertionError("registry file re-read")
+
+    monkeypatch.setattr(registry._file_cache, "get", boom)
+    assert registry.is_allowed("t")
+    assert registry.get_tool("t").name == "t"
+
+
+def test_writers_swap_index_versions(registry):
+    registry.upsert_tool(ToolEntry(name="t", allowed_roles=["admin"]))
+    first = registry._current_index()
+    registry.report_tool(name="found", description="d")
+    second = registry._current_index()
+
+    assert second.version > first.version
+    assert "found" not in first.entries
+    assert second.entries["found"].discovered is True
+    assert registry.is_allowed("found", role="admin")
+
+    assert registry.delete_tool("t") is True
+    assert registry.get_tool("t") is None
+    assert registry.delete_tool("t") is False
+
+
+def test_returned_entries_do_not_alias_the_index(registry):
+    registry.upsert_tool(ToolEntry(name="t", allowed_roles=["operator"]))
+    tool = registry.get_tool("t")
+    tool.allowed_roles.append("actions")
+
+    assert not registry.is_allowed("t", role="actions")
+
+
+def test_external_file_edits_are_picked_up(registry, monkeypatch):
+    registry.upsert_tool(ToolEntry(name="t", allowed_roles=["admin"]))
+    assert not registry.is_allowed("t")
+
+    data = json.loads(registry.REGISTRY_PATH.read_text(encoding="utf-8"))
+    data["t"]["allowed_roles"] = ["operator"]
+    registry.REGISTRY_PATH.write_text(json.dumps(data), encoding="utf-8")
+    monkeypatch.setattr(ToolRegistryService, "RELOAD_CHECK_SECONDS", 0.0)
+
+    assert registry.is_allowed("t")
@@ -106,31 +106,22 @@ class TestTrustRoutes:
 # ── Rate Limiting (Migrated from security_core) ──────────────
 
 class TestRateLimiting:
-    def test_rate_limit_functional(self, test_client):
+    def test_rate_limit_functional(self, test_client, monkeypatch):
         """Verify rate limiting triggers 429 after threshold (Consolidated)."""
-        # Test client is whitelisted usually, so we ensure it hits if we spam
-        # or we test the internal check_rate_limit if needed.
         # Here we test via the client to ensure the middleware works.
-        from tools.gimo_server.security.rate_limit import rate_limit_store
-        rate_limit_store.clear()
+        from tools.gimo_server.security import rate_limit
+        rate_limit.rate_limit_store.clear()
         
         # We simulate the token to bypass 401
         headers = {"Authorization": "Bearer " + "a"*32}
         
-        from tools.gimo_server.security import rate_limit
-        from datetime import datetime
-        
-        # Populate real store for multiple common test keys to trigger 429
-        # TestClient can identify as 'testclient', '127.0.0.1', or 'unknown'
-        data = {
-            "count": rate_limit.RATE_LIMIT_PER_MIN + 1,
-            "start_time": datetime.now()
-        }
-        for ip in ["127.0.0.1", "testclient", "unknown"]:
-            rate_limit.rate_limit_store[ip] = data.copy()
+        # A bucket of one token is empty after the first request
+        monkeypatch.setattr(rate_limit, "RATE_LIMIT_PER_MIN", 1)
         
         try:
+            test_client.get("/status", headers=headers)
             res = test_client.get("/status", headers=headers)
             assert res.status_code == 429
+            assert "Retry-After" in res.headers
         finally:
             rate_limit.rate_limit_store.clear()
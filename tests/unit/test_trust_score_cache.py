@@ -0,0 +1,157 @@
+import asyncio
+import random
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from tools.gimo_server.adapters.generic_cli import GenericCLISession
+from tools.gimo_server.services.ops_service import OpsService
+from tools.gimo_server.services.storage.trust_scores import TrustScoreCache
+from tools.gimo_server.services.storage_service import StorageService
+from tools.gimo_server.services.trust_engine import TrustEngine
+
+
+class FakeGics:
+    def __init__(self):
+        self.data = {}
+        self.scans = 0
+
+    def get(self, key):
+        return {"key": key, "fields": dict(self.data[key])} if key in self.data else None
+
+    def put(self, key, fields):
+        self.data[key] = dict(fields)
+
+    def scan(self, prefix="", include_fields=False):
+        self.scans += 1
+        return [{"key": k, "fields": dict(v)} for k, v in self.data.items() if k.startswith(prefix)]
+
+
+@pytest.fixture
+def gics(monkeypatch):
+    TrustScoreCache.invalidate()
+    fake = FakeGics()
+    monkeypatch.setattr(OpsService, "_gics", fake)
+    yield fake
+    TrustScoreCache.invalidate()
+
+
+def _event(key, outcome, ts, post_check_passed=True):
+    return {
+        "dimension_key": key,
+        "outcome": outcome,
+        "timestamp": f"2026-01-01T00:00:{ts:02d}+00:00",
+        "post_check_passed": post_check_passed,
+    }
+
+
+def test_cache_builds_scores_from_stored_events(gics):
+    storage = StorageService(gics)
+    storage.save_trust_events(
+        [_event("file_read|*|m|t", "approved", i) for i in range(6)]
+        + [_event("file_read|*|m|t", "rejected", 7), _event("shell|*|m|t", "error", 8, post_check_passed=False)]
+    )
+    TrustScoreCache.invalidate()
+
+    snapshot = TrustScoreCache.snapshot(gics)
+
+    # 6 approvals, then a rejection resets the streak: 6 / (6 + 1 + 0 + 1)
+    assert snapshot.score("file_read|*|m|t") == 0.75
+    assert snapshot.score("shell|*|m|t") == 0.0
+    assert snapshot.score("unknown|*|m|t") == 0.0
+
+
+def test_saved_events_update_cache_in_place(gics):
+    storage = StorageService(gics)
+    before = TrustScoreCache.snapshot(gics)
+    scans = gics.scans
+
+    storage.save_trust_event(_event("file_read|*|m|t", "approved", 1))
+    storage.save_trust_event(_event("file_read|*|m|t", "approved", 2))
+    after = TrustScoreCache.snapshot(gics)
+
+    assert gics.scans == scans
+    assert before.score("file_read|*|m|t") == 0.0
+    assert after.score("file_read|*|m|t") == pytest.approx(2 / 3 + 0.02, abs=1e-4)
+
+
+def test_foreign_version_stamp_triggers_rebuild(gics, monkeypatch):
+    monkeypatch.setattr(TrustScoreCache, "REFRESH_CHECK_SECONDS", 0.0)
+    TrustScoreCache.snapshot(gics)
+
+    # Another process writes an event and bumps the stamp behind our back.
+    gics.put("te:shell|*|m|t:2026-01-01T00:00:01+00:00", _event("shell|*|m|t", "approved", 1))
+    gics.put(TrustScoreCache.VERSION_KEY, {"stamp": "other-process"})
+
+    assert TrustScoreCache.snapshot(gics).score("shell|*|m|t") == pytest.approx(0.51)
+
+
+def test_scores_only_count_the_newest_events(gics, monkeypatch):
+    monkeypatch.setattr(TrustScoreCache, "EVENTS_LIMIT", 4)
+    storage = StorageService(gics)
+    rng = random.Random(3)
+    outcomes = ["approved", "auto_approved", "rejected", "error", "skipped"]
+    keys = ["a|*|m|t", "b|*|m|t"]
+    TrustScoreCache.snapshot(gics)
+
+    for i in range(40):
+        event = _event(rng.choice(keys), rng.choice(outcomes), i, post_check_passed=rng.random() > 0.2)
+        storage.save_trust_event(event)
+        incremental = TrustScoreCache.snapshot(gics)
+        records = TrustEngine(storage)._build_records(storage.list_trust_events(limit=4))
+        for key in keys:
+            expected = records[key]["score"] if key in records else 0.0
+            assert incremental.score(key) == pytest.approx(expected), (i, key)
+
+    incremental = dict(TrustScoreCache.snapshot(gics).scores)
+    TrustScoreCache.invalidate()
+    assert dict(TrustScoreCache.snapshot(gics).scores) == incremental
+
+
+def _session(proposal: bytes) -> GenericCLISession:
+    lines = iter([proposal, b""])
+
+    async def readline():
+        await asyncio.sleep(0)
+        return next(lines, b"")
+
+    async def empty():
+        await asyncio.sleep(0)
+        return b""
+
+    process = MagicMock()
+    process.returncode = None
+    process.stdin = SimpleNamespace(write=AsyncMock(), drain=AsyncMock())
+    process.stdout.readline = readline
+    process.stderr.readline = empty
+    return GenericCLISession(process, "task", model_name="m", task_type="t")
+
+
+def test_allow_decides_against_one_snapshot_and_records_latency(gics):
+    async def scenario():
+        StorageService(gics).save_trust_event(_event("file_read|*|m|t", "approved", 1))
+        session = _session(b'PROPOSAL:{"id":"a1","tool":"file_read","params":{"path":"x.py"}}')
+        await asyncio.sleep(0.05)
+        before = GenericCLISession.decision_latency()["count"]
+
+        with patch(
+            "tools.gimo_server.adapters.generic_cli.ToolRegistryService.snapshot", return_value="index"
+        ) as snapshot, patch(
+            "tools.gimo_server.adapters.generic_cli.ToolRegistryService.is_allowed", return_value=True
+        ) as is_allowed, patch(
+            "tools.gimo_server.adapters.generic_cli.ToolRegistryService.get_tool", return_value=None
+        ) as get_tool, patch(
+            "tools.gimo_server.adapters.generic_cli.PolicyService.decide", return_value={"decision": "allow"}
+        ) as decide:
+            await session.allow("a1")
+
+        assert snapshot.call_count == 1
+        assert is_allowed.call_args.kwargs["index"] == "index"
+        assert get_tool.call_args.kwargs["index"] == "index"
+        assert decide.call_args.kwargs["trust_score"] == pytest.approx(0.51)
+        assert session._decision_log["a1"] == "allowed"
+        assert GenericCLISession.decision_latency()["count"] == before + 1
+        session._read_task.cancel()
+
+    asyncio.run(scenario())
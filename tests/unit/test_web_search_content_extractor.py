@@ -0,0 +1,188 @@
+import asyncio
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tools.gimo_server.models.web_search import WebSearchResult
+from tools.gimo_server.services import web_search_content_extractor as extractor
+
+
+class _StubState:
+    def __init__(self):
+        self.pages = {}
+        self.requests = []
+        self.chunks_sent = 0
+
+
+@pytest.fixture
+def stub_server():
+    """Local HTTP server: ``state.pages[path] = (body, headers)``; a callable body is streamed."""
+    state = _StubState()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            state.requests.append((self.path, dict(self.headers)))
+            body, headers = state.pages.get(self.path, (None, {}))
+            if body is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            etag = headers.get("ETag")
+            if etag and self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            for name, value in headers.items():
+                self.send_header(name, value)
+            if callable(body):
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for chunk in body():
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                        self.wfile.flush()
+                        state.chunks_sent += 1
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+                return
+            data = body.encode("utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(extractor, "_CACHE_DIR", tmp_path / "cache")
+
+
+def _extract(urls):
+    async def run():
+        try:
+            results = [WebSearchResult(title="t", url=u, provider="duckduckgo") for u in urls]
+            return await extractor.extract_content_for_results(results)
+        finally:
+            await extractor.aclose_client()
+
+    return asyncio.run(run())
+
+
+def test_clean_html_single_pass():
+    html = (
+        "<html><head><style>p{color:red}</style><script>var x = '<p>';</script></head>"
+        "<body><h1>Title</h1><p>Fish &amp; chips&nbsp;&lt;3</p><p>second</p></body></html>"
+    )
+    assert extractor._clean_html(html) == "Title Fish & chips <3 second"
+    assert extractor._clean_html("<p>" + "a" * 50 + "</p>", limit=10) == "a" * 10
+
+
+def test_cache_key_is_the_url_without_its_fragment():
+    assert extractor._cache_key(" http://example.com/a/?b=2&a=1#frag") == "http://example.com/a/?b=2&a=1"
+    assert extractor._cache_path("http://example.com/a/") != extractor._cache_path("http://example.com/a")
+
+
+def test_prune_drops_expired_then_least_recently_used_entries(monkeypatch):
+    monkeypatch.setattr(extractor, "_CACHE_MAX_ENTRIES", 2)
+    monkeypatch.setattr(extractor, "_PRUNE_EVERY_WRITES", 1)
+    now = time.time()
+    for name, age in (("old", 30 * 86400), ("a", 300), ("b", 200)):
+        extractor._write_cache(f"http://x/{name}", {"content": name})
+        os.utime(extractor._cache_path(f"http://x/{name}"), (now - age, now - age))
+
+    assert extractor._read_cache("http://x/a")["content"] == "a"  # a is now the most recent
+    extractor._write_cache("http://x/c", {"content": "c"})
+
+    kept = {name for name in ("old", "a", "b", "c") if extractor._cache_path(f"http://x/{name}").exists()}
+    assert kept == {"a", "c"}
+
+
+def test_streaming_stops_after_max_content(stub_server, monkeypatch):
+    monkeypatch.setattr(extractor, "_MAX_CONTENT_LENGTH", 100)
+    stub_server.pages["/big"] = (lambda: (b"<p>" + b"x" * 8192 + b"</p>" for _ in range(4000)), {})
+
+    [result] = _extract([f"{stub_server.base_url}/big"])
+
+    assert len(result.content) == 100
+    assert stub_server.chunks_sent < 4000
+
+
+def test_cache_hit_and_etag_revalidation(stub_server, monkeypatch):
+    stub_server.pages["/page"] = ("<p>cached body</p>", {"ETag": '"v1"'})
+    url = f"{stub_server.base_url}/page"
+
+    assert _extract([url])[0].content == "cached body"
+    assert _extract([url + "#section"])[0].content == "cached body"
+    assert len(stub_server.requests) == 1  # fresh entry served from disk
+
+    monkeypatch.setattr(extractor, "_CACHE_TTL_SECONDS", 0)
+    assert _extract([url])[0].content == "cached body"
+    assert len(stub_server.requests) == 2
+    assert stub_server.requests[-1][1].get("If-None-Match") == '"v1"'
+
+
+def test_pooled_client_is_shared_and_failures_leave_content_empty(stub_server):
+    async def run():
+        first = extractor._get_client()
+        results = await extractor.extract_content_for_results(
+            [
+                WebSearchResult(title="a", url=f"{stub_server.base_url}/missing", provider="duckduckgo"),
+                WebSearchResult(title="b", url="http://x", content="kept", provider="duckduckgo"),
+            ]
+        )
+        same = extractor._get_client() is first
+        await extractor.aclose_client()
+        return results, same
+
+    results, same = asyncio.run(run())
+    assert same
+    assert results[0].content is None
+    assert results[1].content == "kept"
+
+
+def test_client_of_a_previous_loop_is_closed():
+    async def client():
+        return extractor._get_client()
+
+    stale = asyncio.run(client())  # its loop is closed once asyncio.run returns
+
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        running = asyncio.run_coroutine_threadsafe(client(), other_loop).result(timeout=5)
+
+        async def replace():
+            current = extractor._get_client()
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+            await extractor.aclose_client()
+            return current
+
+        current = asyncio.run(replace())
+        assert stale.is_closed and running.is_closed and current.is_closed
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join(timeout=5)
+        other_loop.close()
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from tools.gimo_server.models.web_search import WebSearchQuery, WebSearchResult
+from tools.gimo_server.services import web_search_providers
+from tools.gimo_server.services.web_search_service import WebSearchService
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch):
+    monkeypatch.setattr(WebSearchService, "_cache", type(WebSearchService._cache)())
+    monkeypatch.setattr(WebSearchService, "_latency", {})
+    monkeypatch.setattr(WebSearchService, "_background", set())
+
+
+def _provider(name, urls, delay=0.0, calls=None):
+    async def search(query, max_results=10):
+        if calls is not None:
+            calls.append(query)
+        await asyncio.sleep(delay)
+        return [
+            WebSearchResult(title=u, url=u, provider=name, relevance_score=0.5, position=i)
+            for i, u in enumerate(urls)
+        ]
+
+    return search
+
+
+def test_repeated_query_is_served_from_cache(monkeypatch):
+    calls = []
+    monkeypatch.setitem(web_search_providers.PROVIDER_REGISTRY, "duckduckgo", _provider("duckduckgo", ["https://a"], calls=calls))
+
+    async def run():
+        first = await WebSearchService.search(WebSearchQuery(query="Python  asyncio"))
+        first.results[0].content = "mutated by caller"
+        second = await WebSearchService.search(WebSearchQuery(query="python asyncio "))
+        other = await WebSearchService.search(WebSearchQuery(query="python asyncio", max_results=5))
+        return first, second, other
+
+    first, second, other = asyncio.run(run())
+
+    assert len(calls) == 2  # max_results is part of the key
+    assert not first.cached and second.cached and not other.cached
+    assert second.results[0].content is None
+
+
+def test_failed_searches_are_not_cached(monkeypatch):
+    calls = []
+
+    async def down(query, max_results=10):
+        calls.append(query)
+        raise ConnectionError("provider down")
+
+    monkeypatch.setitem(web_search_providers.PROVIDER_REGISTRY, "duckduckgo", down)
+
+    async def run():
+        first = await WebSearchService.search(WebSearchQuery(query="outage"))
+        second = await WebSearchService.search(WebSearchQuery(query="outage"))
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first.providers_failed and not second.cached
+    assert len(calls) == 2
+    assert not WebSearchService._cache
+
+
+def test_early_quorum_returns_before_slow_provider_and_enriches_cache(monkeypatch):
+    monkeypatch.setitem(web_search_providers.PROVIDER_REGISTRY, "duckduckgo", _provider("duckduckgo", ["https://a", "https://b"]))
+    monkeypatch.setitem(web_search_providers.PROVIDER_REGISTRY, "brave", _provider("brave", ["https://a", "https://c"], delay=0.3))
+
+    async def run():
+        query = WebSearchQuery(query="q", providers=["duckduckgo", "brave"], early_quorum=2)
+        early = await WebSearchService.search(query)
+        await asyncio.gather(*WebSearchService._background)
+        enriched = await WebSearchService.search(query)
+        return early, enriched
+
+    early, enriched = asyncio.run(run())
+
+    assert early.providers_pending == ["brave"]
+    assert early.fusion_time_ms < 250
+    assert early.total_results == 2
+    assert enriched.cached
+    assert enriched.providers_pending == []
+    assert sorted(enriched.providers_used) == ["brave", "duckduckgo"]
+    assert enriched.total_results == 3
+    # Cross-provider boost is applied once even though results were fused twice.
+    top = enriched.results[0]
+    assert top.url == "https://a" and top.relevance_score == pytest.approx(0.7)
+
+
+def test_provider_timeout_follows_latency_histogram():
+    assert WebSearchService.provider_timeout("exa", 15.0) == 15.0
+    for _ in range(WebSearchService.LATENCY_MIN_SAMPLES):
+        WebSearchService._record_latency("exa", 1.0)
+    assert WebSearchService.provider_timeout("exa", 15.0) == pytest.approx(3.0, rel=0.25)
+    assert WebSearchService.provider_timeout("exa", 2.5) == 2.5
+
+    for _ in range(WebSearchService.LATENCY_MIN_SAMPLES):
+        WebSearchService._record_latency("jina", 0.05)
+    assert WebSearchService.provider_timeout("jina", 15.0) == WebSearchService.MIN_PROVIDER_TIMEOUT
+
+
+def test_slow_provider_is_cut_off_by_its_learned_timeout(monkeypatch):
+    monkeypatch.setattr(WebSearchService, "MIN_PROVIDER_TIMEOUT", 0.05)
+    for _ in range(WebSearchService.LATENCY_MIN_SAMPLES):
+        WebSearchService._record_latency("tavily", 0.02)
+    monkeypatch.setitem(web_search_providers.PROVIDER_REGISTRY, "duckduckgo", _provider("duckduckgo", ["https://a"]))
+    monkeypatch.setitem(web_search_providers.PROVIDER_REGISTRY, "tavily", _provider("tavily", ["https://t"], delay=1.0))
+
+    response = asyncio.run(WebSearchService.search(WebSearchQuery(query="q", providers=["tavily"], use_cache=False)))
+
+    assert response.fusion_time_ms < 800
+    assert response.providers_failed == ["tavily:timeout"]
+    assert response.providers_used == ["duckduckgo"]
@@ -0,0 +1,136 @@
+import json
+
+from tools.gimo_server.services.storage.workflow_storage import (
+    WorkflowStorage,
+    json_diff,
+    json_patch_apply,
+)
+
+
+class FakeGics:
+    def __init__(self):
+        self.data = {}
+
+    def put(self, key, fields):
+        self.data[key] = {"key": key, "fields": dict(fields)}
+        return {"ok": True}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def scan(self, prefix="", include_fields=True):
+        return [item for key, item in self.data.items() if key.startswith(prefix)]
+
+
+def test_json_diff_roundtrip_handles_nested_and_removed_keys():
+    before = {"a": 1, "nested": {"x": [1, 2], "y": "keep"}, "gone": True, "we/ird~": 1}
+    after = {"a": 2, "nested": {"x": [1, 2, 3], "y": "keep", "z": None}, "we/ird~": 2}
+
+    patch = json_diff(before, after)
+
+    assert json_patch_apply(before, patch) == after
+    assert {"op": "remove", "path": "/gone"} in patch
+
+
+def test_checkpoints_store_base_every_n_steps_and_deltas_between():
+    gics = FakeGics()
+    storage = WorkflowStorage(gics=gics, base_snapshot_interval=3)
+    states = []
+    state = {"step_logs": []}
+    for i in range(7):
+        state["step_logs"].append({"step": i})
+        state[f"k{i}"] = i
+        states.append(json.loads(json.dumps(state)))
+        storage.save_checkpoint("wf1", f"n{i}", state, {"i": i}, "completed")
+
+    assert storage.flush()
+    kinds = [
+        item["fields"]["kind"]
+        for item in sorted(gics.data.values(), key=lambda item: item["fields"]["timestamp"])
+    ]
+    assert kinds == ["base", "delta", "delta", "base", "delta", "delta", "base"]
+
+    restored = storage.list_checkpoints("wf1")
+    assert [cp["state"] for cp in restored] == states
+    assert [cp["node_id"] for cp in restored] == [f"n{i}" for i in range(7)]
+    assert restored[2]["output"] == {"i": 2}
+
+
+def test_checkpoint_state_is_captured_at_call_time():
+    gics = FakeGics()
+    storage = WorkflowStorage(gics=gics)
+    state = {"v": 1}
+    storage.save_checkpoint("wf2", "A", state, None, "completed")
+    state["v"] = 2  # engine keeps mutating its live state
+
+    restored = storage.list_checkpoints("wf2")
+
+    assert restored[0]["state"] == {"v": 1}
+
+
+def test_legacy_full_checkpoints_are_still_readable():
+    gics = FakeGics()
+    gics.put(
+        "wf:wf3:cp:1:A",
+        {"workflow_id": "wf3", "node_id": "A", "state": json.dumps({"x": 1}), "output": None,
+         "status": "completed", "timestamp": 1},
+    )
+
+    restored = WorkflowStorage(gics=gics).list_checkpoints("wf3")
+
+    assert restored[0]["state"] == {"x": 1}
+
+
+def test_broken_delta_chain_yields_no_state():
+    gics = FakeGics()
+    storage = WorkflowStorage(gics=gics, base_snapshot_interval=5)
+    storage.save_checkpoint("wf4", "A", {"x": 1}, None, "completed")
+    storage.save_checkpoint("wf4", "B", {"x": 2}, None, "completed")
+    storage.flush()
+    base_key = next(key for key, item in gics.data.items() if item["fields"]["kind"] == "base")
+    del gics.data[base_key]
+
+    restored = storage.list_checkpoints("wf4")
+
+    assert restored == [
+        {"workflow_id": "wf4", "node_id": "B", "state": None, "output": None, "status": "completed",
+         "timestamp": restored[0]["timestamp"]}
+    ]
+
+
+def test_evicted_chain_is_rebuilt_from_its_base_snapshot(monkeypatch):
+    gics = FakeGics()
+    storage = WorkflowStorage(gics=gics, base_snapshot_interval=5)
+    monkeypatch.setattr(WorkflowStorage, "MAX_CHAINS", 2)
+    storage.save_checkpoint("wf5", "A", {"x": 1}, None, "completed")
+    storage.save_checkpoint("wf5", "B", {"x": 2}, None, "completed")
+    storage.save_checkpoint("other1", "A", {}, None, "completed")
+    storage.save_checkpoint("other2", "A", {}, None, "completed")
+    assert list(storage._chains) == ["other1", "other2"]
+
+    storage.save_checkpoint("wf5", "C", {"x": 3, "y": 1}, None, "completed")
+    storage.flush()
+
+    kinds = [
+        item["fields"]["kind"]
+        for key, item in sorted(gics.data.items(), key=lambda kv: kv[1]["fields"]["timestamp"])
+        if key.startswith("wf:wf5:")
+    ]
+    assert kinds == ["base", "delta", "delta"]
+    assert [cp["state"] for cp in storage.list_checkpoints("wf5")] == [
+        {"x": 1}, {"x": 2}, {"x": 3, "y": 1}
+    ]
+    assert len(storage._chains) == 2
+
+
+def test_drop_chain_starts_the_next_run_from_a_base():
+    gics = FakeGics()
+    storage = WorkflowStorage(gics=gics)
+    storage.save_checkpoint("wf6", "A", {"x": 1}, None, "completed")
+    storage.drop_chain("wf6")
+    assert "wf6" not in storage._chains
+
+    storage.save_checkpoint("wf6", "B", {"x": 2}, None, "completed")
+    storage.flush()
+
+    assert [item["fields"]["kind"] for item in gics.data.values()] == ["base", "base"]
@@ -5,6 +5,7 @@ from .base import (
     AgentStatus, 
     ProposedAction
 )
+from .cli_pool import CLIProcessPool
 from .claude_code import ClaudeCodeAdapter, ClaudeCodeSession
 from .codex import CodexAdapter, CodexSession
 from .gemini import GeminiAdapter, GeminiSession
@@ -19,6 +20,7 @@ __all__ = [
     "AgentResult",
     "ClaudeCodeAdapter",
     "ClaudeCodeSession",
+    "CLIProcessPool",
     "CodexAdapter",
     "CodexSession",
     "GeminiAdapter",
@@ -0,0 +1,380 @@
+"""Warm pools of pre-spawned CLI agent processes.
+
+A pooled agent is started once and then serves tasks one after another over
+stdin: it reads one task line, speaks the usual ``PROPOSAL:`` / ``ALLOW``
+protocol while working on it, and prints ``TASK_DONE`` (or
+``TASK_DONE:{"exit_code": n}``) when it is ready for the next one. The
+interpreter boot and auth loading of the CLI are paid once per process
+instead of once per task.
+
+There is one pool per (command, role profile, worktree). A process goes back
+to its pool after a successful task and is retired after ``max_tasks`` tasks,
+on a failed task, or when it exits on its own. With ``warm_up`` enabled the
+pool refills itself to ``idle_size`` in the background. While a process is
+idle its stdout and stderr are read and discarded, so late output neither
+leaks into the next task nor fills a pipe and blocks the agent. A pool with no task
+running is closed once it has been unused for ``IDLE_TTL_SECONDS``, or when
+more than ``MAX_POOLS`` pools exist (least recently used first), so one-off
+worktrees do not keep agent processes alive.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..config import (
+    CLI_POOL_IDLE_SIZE,
+    CLI_POOL_IDLE_TTL_SECONDS,
+    CLI_POOL_MAX_POOLS,
+    CLI_POOL_MAX_TASKS,
+    CLI_POOL_WARM_UP,
+)
+
+logger = logging.getLogger("orchestrator.adapters.cli_pool")
+
+PoolKey = Tuple[Tuple[str, ...], Optional[str], Optional[str]]
+
+ROLE_PROFILE_ENV = "GIMO_ROLE_PROFILE"
+RETIRE_TIMEOUT_SECONDS = 2.0
+
+
+@dataclass
+class _PooledProcess:
+    process: asyncio.subprocess.Process
+    tasks: int = 0
+    # Discards output while idle; set when stdout reached EOF (the process is exiting).
+    drainer: Optional[asyncio.Task] = None
+    exited: bool = False
+
+
+def worktree_for(
+    context: Optional[Dict[str, Any]], policy: Optional[Dict[str, Any]] = None
+) -> Optional[str]:
+    """The worktree a task runs in, which is also the pooled process's working directory."""
+    for source in (context or {}, policy or {}):
+        value = str(source.get("worktree_path") or source.get("workspace_root") or "").strip()
+        if value:
+            return value
+    return None
+
+
+class CLIProcessLease:
+    """A pooled process checked out for one task; return it with ``release``."""
+
+    def __init__(self, pool: "CLIProcessPool", worker: _PooledProcess):
+        self._pool = pool
+        self._worker = worker
+        self._released = False
+
+    @property
+    def process(self) -> asyncio.subprocess.Process:
+        return self._worker.process
+
+    @property
+    def held(self) -> bool:
+        """False once released: the process may already be serving another task."""
+        return not self._released
+
+    async def release(self, healthy: bool) -> None:
+        if self._released:
+            return
+        self._released = True
+        await self._pool._release(self._worker, healthy)
+
+
+class CLIProcessPool:
+    """Idle agent processes for one (command, role profile, worktree)."""
+
+    IDLE_TTL_SECONDS = CLI_POOL_IDLE_TTL_SECONDS
+    MAX_POOLS = CLI_POOL_MAX_POOLS
+
+    # Least recently used first.
+    _pools: "OrderedDict[PoolKey, CLIProcessPool]" = OrderedDict()
+    _closing: Set[asyncio.Task] = set()
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        *,
+        role_profile: Optional[str] = None,
+        cwd: Optional[str] = None,
+        idle_size: Optional[int] = None,
+        max_tasks: Optional[int] = None,
+        warm_up: Optional[bool] = None,
+    ):
+        self.command = tuple(command)
+        self.role_profile = role_profile
+        self.cwd = cwd
+        self.key: PoolKey = (self.command, role_profile, cwd)
+        self.idle_size = CLI_POOL_IDLE_SIZE if idle_size is None else max(0, int(idle_size))
+        self.max_tasks = CLI_POOL_MAX_TASKS if max_tasks is None else max(1, int(max_tasks))
+        self.warm_up = CLI_POOL_WARM_UP if warm_up is None else bool(warm_up)
+        self._loop = asyncio.get_running_loop()
+        self._idle: Deque[_PooledProcess] = deque()
+        self._warming = 0
+        self._refills: Set[asyncio.Task] = set()
+        self._closed = False
+        self._leased = 0
+        self._last_used = time.monotonic()
+        self._expiry: Optional[asyncio.TimerHandle] = None
+        self._stats = {"spawned": 0, "warm_hits": 0, "cold_starts": 0, "retired": 0}
+
+    @classmethod
+    def get(
+        cls,
+        command: Sequence[str],
+        *,
+        role_profile: Optional[str] = None,
+        cwd: Optional[str] = None,
+        **options: Any,
+    ) -> "CLIProcessPool":
+        """The pool for this key, created on first use. Must be called from the event loop."""
+        key: PoolKey = (tuple(command), role_profile, cwd)
+        pool = cls._pools.get(key)
+        if pool is None or pool._closed or pool._loop is not asyncio.get_running_loop():
+            if pool is not None:
+                pool._abandon()
+            pool = cls(command, role_profile=role_profile, cwd=cwd, **options)
+            cls._pools[key] = pool
+            pool._schedule_expiry()
+        cls._pools.move_to_end(key)
+        cls._evict_overflow()
+        return pool
+
+    @classmethod
+    def _evict_overflow(cls) -> None:
+        overflow = len(cls._pools) - cls.MAX_POOLS
+        for pool in list(cls._pools.values()):
+            if overflow <= 0:
+                return
+            if not pool._leased:
+                pool._evict()
+                overflow -= 1
+
+    def _evict(self) -> None:
+        pools = type(self)._pools
+        if pools.get(self.key) is self:
+            del pools[self.key]
+        if self._loop is asyncio.get_running_loop():
+            task = asyncio.create_task(self.close())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        else:
+            self._abandon()
+
+    def _schedule_expiry(self) -> None:
+        if self._expiry is not None:
+            self._expiry.cancel()
+        self._expiry = None
+        if not self._closed and not self._leased:
+            self._expiry = self._loop.call_later(self.IDLE_TTL_SECONDS, self._expire)
+
+    def _expire(self) -> None:
+        self._expiry = None
+        if self._closed or self._leased:
+            return
+        idle_for = time.monotonic() - self._last_used
+        if idle_for < self.IDLE_TTL_SECONDS:
+            self._expiry = self._loop.call_later(self.IDLE_TTL_SECONDS - idle_for, self._expire)
+            return
+        logger.debug("Closing CLI pool idle for %.0fs: %s", idle_for, self.command[0])
+        self._evict()
+
+    @classmethod
+    async def close_all(cls) -> None:
+        pools, cls._pools = list(cls._pools.values()), OrderedDict()
+        for pool in pools:
+            if pool._loop is asyncio.get_running_loop():
+                await pool.close()
+            else:
+                pool._abandon()
+        closing = [task for task in cls._closing if task.get_loop() is asyncio.get_running_loop()]
+        await asyncio.gather(*closing, return_exceptions=True)
+
+    @classmethod
+    def stats_all(cls) -> List[Dict[str, Any]]:
+        return [pool.stats() for pool in cls._pools.values()]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "command": list(self.command),
+            "role_profile": self.role_profile,
+            "cwd": self.cwd,
+            "idle": len(self._idle),
+            "warming": self._warming,
+            "leased": self._leased,
+            **self._stats,
+        }
+
+    async def _spawn(self) -> _PooledProcess:
+        env = None
+        if self.role_profile:
+            env = {**os.environ, ROLE_PROFILE_ENV: self.role_profile}
+        process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.cwd,
+            env=env,
+        )
+        self._stats["spawned"] += 1
+        return _PooledProcess(process)
+
+    async def warm(self) -> None:
+        """Spawn processes until ``idle_size`` are idle or starting."""
+        while not self._closed and len(self._idle) + self._warming < self.idle_size:
+            self._warming += 1
+            try:
+                worker = await self._spawn()
+            except Exception as exc:
+                logger.warning("Failed to pre-spawn %s: %s", self.command[0], exc)
+                return
+            finally:
+                self._warming -= 1
+            if self._closed or len(self._idle) >= self.idle_size:
+                await self._retire(worker)
+                return
+            self._park(worker)
+
+    def _schedule_refill(self) -> None:
+        if not self.warm_up or self._closed or len(self._idle) + self._warming >= self.idle_size:
+            return
+        task = asyncio.create_task(self.warm())
+        self._refills.add(task)
+        task.add_done_callback(self._refills.discard)
+
+    async def acquire(self) -> CLIProcessLease:
+        """Check out an idle process, spawning one cold if none is ready."""
+        worker = None
+        while self._idle:
+            candidate = self._idle.popleft()
+            await self._unpark(candidate)
+            if candidate.process.returncode is None and not candidate.exited:
+                worker = candidate
+                self._stats["warm_hits"] += 1
+                break
+            await self._retire(candidate)
+        if worker is None:
+            worker = await self._spawn()
+            self._stats["cold_starts"] += 1
+        self._leased += 1
+        self._last_used = time.monotonic()
+        self._schedule_expiry()
+        self._schedule_refill()
+        return CLIProcessLease(self, worker)
+
+    async def _release(self, worker: _PooledProcess, healthy: bool) -> None:
+        self._leased -= 1
+        self._last_used = time.monotonic()
+        self._schedule_expiry()
+        worker.tasks += 1
+        if (
+            healthy
+            and not self._closed
+            and worker.process.returncode is None
+            and worker.tasks < self.max_tasks
+            and len(self._idle) < self.idle_size
+        ):
+            self._park(worker)
+            return
+        await self._retire(worker)
+        self._schedule_refill()
+
+    def _park(self, worker: _PooledProcess) -> None:
+        worker.drainer = asyncio.ensure_future(self._drain(worker))
+        self._idle.append(worker)
+
+    @staticmethod
+    async def _unpark(worker: _PooledProcess) -> None:
+        drainer, worker.drainer = worker.drainer, None
+        if drainer is not None:
+            drainer.cancel()
+            await asyncio.wait([drainer])
+
+    async def _drain(self, worker: _PooledProcess) -> None:
+        """Read and drop what an idle process prints until it is leased again."""
+        process = worker.process
+
+        async def discard(stream: Optional[asyncio.StreamReader], name: str) -> None:
+            while stream is not None:
+                line = await stream.readline()
+                if not line:
+                    if name == "stdout":
+                        worker.exited = True
+                    return
+                logger.debug("Idle %s %s: %s", self.command[0], name, line[:200])
+
+        try:
+            await asyncio.gather(
+                discard(process.stdout, "stdout"), discard(process.stderr, "stderr")
+            )
+        except ValueError as exc:  # a line over the stream limit: the pipe is out of sync
+            logger.warning("Recycling idle %s: %s", self.command[0], exc)
+            worker.exited = True
+
+    async def _retire(self, worker: _PooledProcess) -> None:
+        await self._unpark(worker)
+        self._stats["retired"] += 1
+        process = worker.process
+        if process.returncode is not None:
+            return
+        try:
+            if process.stdin:
+                process.stdin.close()
+            await asyncio.wait_for(process.wait(), RETIRE_TIMEOUT_SECONDS)
+        except (asyncio.TimeoutError, OSError):
+            try:
+                process.kill()
+            except ProcessLookupError:
+                return
+            await process.wait()
+
+    async def close(self) -> None:
+        self._closed = True
+        self._schedule_expiry()
+        for task in list(self._refills):
+            task.cancel()
+        idle, self._idle = list(self._idle), deque()
+        await asyncio.gather(*(self._retire(worker) for worker in idle), return_exceptions=True)
+
+    def _abandon(self) -> None:
+        """Drop a pool whose event loop is gone; its processes can only be killed."""
+        self._closed = True
+        if self._expiry is not None:
+            try:
+                self._expiry.cancel()
+            except RuntimeError:
+                pass
+            self._expiry = None
+        for worker in self._idle:
+            try:
+                if worker.drainer is not None:
+                    worker.drainer.cancel()
+                worker.process.kill()
+            except (ProcessLookupError, RuntimeError):
+                pass
+        self._idle.clear()
+
+
+async def lease_for_task(
+    command: Sequence[str],
+    task_line: str,
+    *,
+    role_profile: Optional[str] = None,
+    worktree: Optional[str] = None,
+) -> CLIProcessLease:
+    """Check out a process from the matching pool and hand it ``task_line`` over stdin."""
+    lease = await CLIProcessPool.get(command, role_profile=role_profile, cwd=worktree).acquire()
+    try:
+        lease.process.stdin.write(f"{task_line}\n".encode())
+        await lease.process.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        await lease.release(healthy=False)
+        raise
+    return lease
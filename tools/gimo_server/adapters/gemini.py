@@ -6,6 +6,7 @@ import logging
 from typing import Any, Dict, List, Optional
 
 from .base import AgentAdapter, AgentSession, ProposedAction
+from .cli_pool import lease_for_task, worktree_for
 from .generic_cli import GenericCLISession
 
 logger = logging.getLogger("orchestrator.adapters.gemini")
@@ -61,11 +62,13 @@ class GeminiAdapter(AgentAdapter):
         trust_event_sink: Optional[Any] = None,
         model_name: str = "gemini-cli",
         actor: str = "agent:gemini",
+        pooled: bool = False,
     ):
         self.binary_path = binary_path
         self.trust_event_sink = trust_event_sink
         self.model_name = model_name
         self.actor = actor
+        self.pooled = pooled
 
     async def spawn(
         self,
@@ -73,25 +76,37 @@ class GeminiAdapter(AgentAdapter):
         context: Optional[Dict[str, Any]] = None,
         policy: Optional[Dict[str, Any]] = None,
     ) -> AgentSession:
-        logger.info("Spawning Gemini CLI: %s", self.binary_path)
-
-        command = [self.binary_path, "execute", task, "--output-format", "stream-json"]
-        if context:
-            command.extend(["--context", json.dumps(context)])
-        if policy:
-            command.extend(["--policy", json.dumps(policy)])
-
-        process = await asyncio.create_subprocess_exec(
-            *command,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-
         task_type = str((context or {}).get("task_type") or (policy or {}).get("task_type") or "agent_task")
         role_profile = str((context or {}).get("role_profile") or (policy or {}).get("role_profile") or "").strip() or None
         hitl_enabled = bool((context or {}).get("hitl_enabled") or (policy or {}).get("hitl_enabled") or False)
         hitl_timeout = float((context or {}).get("hitl_timeout_seconds") or (policy or {}).get("hitl_timeout_seconds") or 300.0)
+
+        lease = None
+        if self.pooled:
+            logger.info("Leasing pooled Gemini CLI: %s", self.binary_path)
+            lease = await lease_for_task(
+                [self.binary_path, "execute", "--output-format", "stream-json"],
+                json.dumps({"task": task, "context": context, "policy": policy}),
+                role_profile=role_profile,
+                worktree=worktree_for(context, policy),
+            )
+            process = lease.process
+        else:
+            logger.info("Spawning Gemini CLI: %s", self.binary_path)
+
+            command = [self.binary_path, "execute", task, "--output-format", "stream-json"]
+            if context:
+                command.extend(["--context", json.dumps(context)])
+            if policy:
+                command.extend(["--policy", json.dumps(policy)])
+
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+
         return GeminiSession(
             process,
             task,
@@ -102,4 +117,5 @@ class GeminiAdapter(AgentAdapter):
             role_profile=role_profile,
             hitl_enabled=hitl_enabled,
             hitl_timeout_seconds=hitl_timeout,
+            lease=lease,
         )
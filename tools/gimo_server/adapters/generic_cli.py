@@ -4,8 +4,12 @@ import asyncio
 import logging
 import json
 import inspect
+import tempfile
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from collections import deque
+from dataclasses import dataclass
+from typing import IO, Any, Deque, Dict, List, Optional
 
 from .base import (
     AgentAdapter, 
@@ -14,16 +18,92 @@ from .base import (
     AgentStatus, 
     ProposedAction
 )
+from .cli_pool import CLIProcessLease, lease_for_task, worktree_for
 from ..services.policy_service import PolicyService
 from ..services.storage_service import StorageService
-from ..services.trust_engine import TrustEngine
+from ..services.storage.trust_scores import TrustScoreCache, TrustScoreSnapshot
 from ..services.tool_registry_service import ToolRegistryService
 from ..services.hitl_gate_service import HitlGateService
+from ..services.latency_histogram import LatencyHistogram
 from ..services.role_profiles import assert_tool_allowed, get_role_profile
 
 logger = logging.getLogger("orchestrator.adapters.generic_cli")
 
 
+@dataclass(frozen=True)
+class _DecisionSnapshot:
+    """Registry index and trust scores a single proposal is decided against."""
+
+    registry: Any
+    trust: TrustScoreSnapshot
+
+
+class _SpillingLineBuffer:
+    """Keeps the last ``capacity`` lines in memory and appends older ones to a log file.
+
+    The file is only created once the ring overflows, so short sessions never touch disk.
+    """
+
+    def __init__(self, capacity: int, stream: str, spill_dir: Optional[str] = None) -> None:
+        self._lines: Deque[str] = deque(maxlen=max(1, int(capacity)))
+        self._stream = stream
+        self._spill_dir = spill_dir
+        self._spill: Optional[IO[str]] = None
+        self._spill_disabled = False
+        self.spill_path: Optional[str] = None
+        self.spilled = 0
+
+    def append(self, line: str) -> None:
+        if len(self._lines) == self._lines.maxlen:
+            self._spill_line(self._lines[0])
+        self._lines.append(line)
+
+    def _spill_line(self, line: str) -> None:
+        self.spilled += 1
+        if self._spill_disabled:
+            return
+        if self._spill is None:
+            try:
+                self._spill = tempfile.NamedTemporaryFile(
+                    mode="w",
+                    encoding="utf-8",
+                    prefix=f"gimo-cli-{self._stream}-",
+                    suffix=".log",
+                    dir=self._spill_dir,
+                    delete=False,
+                )
+            except OSError as exc:
+                logger.warning("Cannot open %s spill log, dropping old lines: %s", self._stream, exc)
+                self._spill_disabled = True
+                return
+            self.spill_path = self._spill.name
+        self._spill.write(line + "\n")
+
+    def __iter__(self):
+        return iter(self._lines)
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def text(self) -> str:
+        return "\n".join(self._lines)
+
+    def close(self) -> None:
+        self._spill_disabled = True
+        if self._spill is not None:
+            try:
+                self._spill.close()
+            except OSError as exc:
+                logger.warning("Failed to close %s spill log: %s", self._stream, exc)
+            self._spill = None
+
+
+def _process_gics() -> Any:
+    from ..services.ops_service import OpsService
+
+    return OpsService._gics
+
+
 class GenericCLISession(AgentSession):
     """Session for a generic CLI agent via stdin/stdout.
 
@@ -31,11 +111,24 @@ class GenericCLISession(AgentSession):
     - Listens for `PROPOSAL:{json}` on stdout.
     - Sends `ALLOW {id}` or `DENY {id}` to stdin.
     - Parses metrics and status updates.
+    - When running on a pooled process (``lease``), `TASK_DONE[:{json}]` ends
+      the task and the process goes back to its pool instead of exiting.
+
+    Proposals may be decided concurrently (e.g. ``asyncio.gather`` over ``allow``);
+    a verdict is held back while an earlier proposal is still being decided, so
+    the agent receives them in the order it emitted the proposals. Only the last ``OUTPUT_BUFFER_LINES`` lines of each stream are kept
+    in memory, older ones go to a per-session log file.
     """
 
     PROPOSAL_PREFIX = "PROPOSAL:"
     ALLOW_CMD_PREFIX = "ALLOW"
     DENY_CMD_PREFIX = "DENY"
+    TASK_DONE_PREFIX = "TASK_DONE"
+    OUTPUT_BUFFER_LINES = 2000
+    OUTPUT_SPILL_DIR: Optional[str] = None
+
+    _decision_latency = LatencyHistogram(0.05)  # milliseconds
+    _idempotency_lock = threading.Lock()
 
     def __init__(
         self,
@@ -49,16 +142,26 @@ class GenericCLISession(AgentSession):
         role_profile: Optional[str] = None,
         hitl_enabled: bool = False,
         hitl_timeout_seconds: float = 300.0,
+        lease: Optional[CLIProcessLease] = None,
     ):
         self.process = process
         self.task = task
         self.status = AgentStatus.RUNNING
         self.created_at = time.perf_counter()
-        self._output_buffer: List[str] = []
-        self._error_buffer: List[str] = []
+        self._output_buffer = _SpillingLineBuffer(self.OUTPUT_BUFFER_LINES, "stdout", self.OUTPUT_SPILL_DIR)
+        self._error_buffer = _SpillingLineBuffer(self.OUTPUT_BUFFER_LINES, "stderr", self.OUTPUT_SPILL_DIR)
         self._proposals: List[ProposedAction] = []
         self._proposal_index: Dict[str, ProposedAction] = {}
         self._decision_log: Dict[str, str] = {}
+        # Ordered verdict writer: arrival sequence per proposal, and the
+        # verdicts (None while still being decided) waiting for earlier ones.
+        self._arrival: Dict[str, int] = {}
+        self._arrived_at: Dict[str, float] = {}
+        self._pending_verdicts: Dict[int, Optional[str]] = {}
+        self._verdict_written: Dict[int, asyncio.Future] = {}
+        self._write_lock = asyncio.Lock()
+        self._decided_at: Dict[str, float] = {}
+        self._decision_timings: Dict[str, Dict[str, float]] = {}
         self._metrics: Dict[str, Any] = {}
         self._trust_event_sink = trust_event_sink
         self._model_name = model_name
@@ -67,6 +170,8 @@ class GenericCLISession(AgentSession):
         self._role_profile = role_profile
         self._hitl_enabled = hitl_enabled
         self._hitl_timeout_seconds = float(hitl_timeout_seconds)
+        self._lease = lease
+        self._task_exit_code: Optional[int] = None
         
         # Start background readers
         self._read_task = asyncio.create_task(self._read_streams())
@@ -80,6 +185,9 @@ class GenericCLISession(AgentSession):
                 decoded = line.decode(errors="replace").strip()
                 if not decoded:
                     continue
+                if self._lease is not None and decoded.startswith(self.TASK_DONE_PREFIX):
+                    self._task_exit_code = self._parse_task_done(decoded)
+                    break
                 self._output_buffer.append(decoded)
                 self._handle_stdout_line(decoded)
 
@@ -93,11 +201,36 @@ class GenericCLISession(AgentSession):
                     continue
                 self._error_buffer.append(decoded)
 
+        if self._lease is None:
+            try:
+                await asyncio.gather(_read_stdout(), _read_stderr())
+            except Exception as e:
+                logger.error(f"Error reading from process: {e}")
+                self.status = AgentStatus.FAILED
+            return
+
+        # A pooled process outlives the task: stop reading at TASK_DONE and
+        # leave anything after it in the pipes for the next task.
+        stderr_reader = asyncio.ensure_future(_read_stderr())
         try:
-            await asyncio.gather(_read_stdout(), _read_stderr())
+            await _read_stdout()
         except Exception as e:
             logger.error(f"Error reading from process: {e}")
             self.status = AgentStatus.FAILED
+        finally:
+            stderr_reader.cancel()
+            await asyncio.wait([stderr_reader])
+
+    def _parse_task_done(self, line: str) -> int:
+        raw_payload = line[len(self.TASK_DONE_PREFIX):].lstrip(":").strip()
+        if not raw_payload:
+            return 0
+        try:
+            payload = json.loads(raw_payload)
+            return int(payload.get("exit_code", 0))
+        except (AttributeError, TypeError, ValueError) as exc:
+            logger.warning("Invalid task completion payload, recycling process: %s", exc)
+            return 1
 
     def _handle_stdout_line(self, line: str) -> None:
         """Parse protocol lines emitted by CLI adapters.
@@ -134,6 +267,8 @@ class GenericCLISession(AgentSession):
                 pass
             if action.id not in self._proposal_index:
                 self._proposal_index[action.id] = action
+                self._arrival[action.id] = len(self._proposals)
+                self._arrived_at[action.id] = time.perf_counter()
                 self._proposals.append(action)
         except (KeyError, TypeError, json.JSONDecodeError) as exc:
             logger.warning("Invalid proposal payload ignored: %s", exc)
@@ -147,7 +282,58 @@ class GenericCLISession(AgentSession):
             await maybe_awaitable
         await self.process.stdin.drain()
 
+    def _open_verdict(self, action_id: str) -> int:
+        """Reserve the proposal's slot so later proposals' verdicts wait behind it."""
+        seq = self._arrival[action_id]
+        if seq not in self._verdict_written:
+            self._pending_verdicts[seq] = None
+            self._verdict_written[seq] = asyncio.get_running_loop().create_future()
+        return seq
+
+    async def _send_verdict(self, action_id: str, line: str) -> None:
+        """Queue an ALLOW/DENY line and wait until it (and every earlier verdict) is written."""
+        seq = self._open_verdict(action_id)
+        written = self._verdict_written[seq]
+        if seq in self._pending_verdicts and self._pending_verdicts[seq] is None:
+            self._pending_verdicts[seq] = line
+            self._decided_at[action_id] = time.perf_counter()
+            await self._flush_verdicts()
+        await written
+
+    async def _close_verdict(self, action_id: str) -> None:
+        """Release a slot whose decision ended without a verdict (e.g. an unexpected error)."""
+        seq = self._arrival[action_id]
+        if seq in self._pending_verdicts and self._pending_verdicts[seq] is None:
+            del self._pending_verdicts[seq]
+            written = self._verdict_written.pop(seq)
+            if not written.done():
+                written.set_result(None)
+            await self._flush_verdicts()
+
+    async def _flush_verdicts(self) -> None:
+        async with self._write_lock:
+            while self._pending_verdicts:
+                seq = min(self._pending_verdicts)
+                line = self._pending_verdicts[seq]
+                if line is None:
+                    return
+                del self._pending_verdicts[seq]
+                written = self._verdict_written.pop(seq)
+                try:
+                    await self._send_stdin_line(line)
+                except Exception as exc:
+                    written.set_exception(exc)
+                else:
+                    written.set_result(None)
+
     async def get_status(self) -> AgentStatus:
+        if self._lease is not None and self.status != AgentStatus.KILLED:
+            if self._task_exit_code is not None:
+                self.status = AgentStatus.COMPLETED if self._task_exit_code == 0 else AgentStatus.FAILED
+            elif self.process.returncode is not None or self._read_task.done():
+                # Stdout closed (or the process died) before the task finished.
+                self.status = AgentStatus.FAILED
+            return self.status
         if self.process.returncode is not None:
             if self.process.returncode == 0:
                 self.status = AgentStatus.COMPLETED
@@ -159,17 +345,52 @@ class GenericCLISession(AgentSession):
         # Return a copy to avoid callers mutating the internal buffer
         return list(self._proposals)
 
+    @classmethod
+    def decision_latency(cls) -> Dict[str, Any]:
+        """Histogram summary of how long ``allow`` took to answer a proposal, across sessions."""
+        return cls._decision_latency.summary("ms")
+
+    def decision_timings(self) -> Dict[str, Dict[str, float]]:
+        """Per-proposal latency (ms): ``queued`` before a decision started, ``decide`` until
+        the verdict was written, of which ``ordered_wait`` was spent behind earlier proposals."""
+        return {action_id: dict(timing) for action_id, timing in self._decision_timings.items()}
+
+    def _record_timing(self, action_id: str, started: float, decided: Optional[float]) -> None:
+        finished = time.perf_counter()
+        self._decision_timings[action_id] = {
+            "queued": round((started - self._arrived_at.get(action_id, started)) * 1000, 3),
+            "decide": round((finished - started) * 1000, 3),
+            "ordered_wait": round((finished - decided) * 1000, 3) if decided is not None else 0.0,
+        }
+
     async def allow(self, action_id: str) -> None:
         if action_id not in self._proposal_index:
             raise ValueError(f"Unknown proposal id: {action_id}")
-        action = self._proposal_index[action_id]
+        started = time.perf_counter()
+        self._open_verdict(action_id)
+        try:
+            await self._decide(self._proposal_index[action_id], action_id)
+        finally:
+            await self._close_verdict(action_id)
+            self._decision_latency.add((time.perf_counter() - started) * 1000)
+            self._record_timing(action_id, started, self._decided_at.pop(action_id, None))
+
+    def _decision_snapshot(self) -> _DecisionSnapshot:
+        try:
+            trust = TrustScoreCache.snapshot(_process_gics())
+        except Exception as exc:
+            logger.warning("Trust score snapshot failed: %s", exc)
+            trust = TrustScoreSnapshot()
+        return _DecisionSnapshot(registry=ToolRegistryService.snapshot(), trust=trust)
+
+    async def _decide(self, action: ProposedAction, action_id: str) -> None:
 
         if self._role_profile:
             try:
                 assert_tool_allowed(self._role_profile, action.tool)
             except PermissionError:
                 self._decision_log[action_id] = "blocked:role_profile_denied"
-                await self._send_stdin_line(f"{self.DENY_CMD_PREFIX} {action_id} reason=role_profile_denied")
+                await self._send_verdict(action_id, f"{self.DENY_CMD_PREFIX} {action_id} reason=role_profile_denied")
                 self._emit_trust_event(action_id=action_id, outcome="rejected")
                 raise
 
@@ -183,29 +404,42 @@ class GenericCLISession(AgentSession):
                 )
                 if gate_decision != "allow":
                     self._decision_log[action_id] = "blocked:hitl_rejected"
-                    await self._send_stdin_line(f"{self.DENY_CMD_PREFIX} {action_id} reason=hitl_rejected")
+                    await self._send_verdict(action_id, f"{self.DENY_CMD_PREFIX} {action_id} reason=hitl_rejected")
                     self._emit_trust_event(action_id=action_id, outcome="rejected")
                     raise PermissionError(f"HITL denied tool execution: {action.tool}")
         
-        await self._validate_tool_registry(action, action_id)
-        tool_entry = ToolRegistryService.get_tool(action.tool)
-        
-        await self._validate_idempotency(action, action_id, tool_entry)
-        
-        await self._validate_policy(action, action_id)
+        # Trust scores may need a GICS round-trip; keep it off the loop so other
+        # proposals (and the stream readers) are not stalled behind it.
+        snapshot = await asyncio.to_thread(self._decision_snapshot)
+        await self._validate_tool_registry(action, action_id, snapshot)
+        await self._validate_idempotency(action, action_id, snapshot)
+        await self._validate_policy(action, action_id, snapshot)
 
         self._decision_log[action_id] = "allowed"
-        await self._send_stdin_line(f"{self.ALLOW_CMD_PREFIX} {action_id}")
+        await self._send_verdict(action_id, f"{self.ALLOW_CMD_PREFIX} {action_id}")
         self._emit_trust_event(action_id=action_id, outcome="approved")
 
-    async def _validate_tool_registry(self, action: ProposedAction, action_id: str) -> None:
-        if not ToolRegistryService.is_allowed(action.tool):
+    async def _validate_tool_registry(
+        self, action: ProposedAction, action_id: str, snapshot: _DecisionSnapshot
+    ) -> None:
+        if not ToolRegistryService.is_allowed(action.tool, index=snapshot.registry):
             self._decision_log[action_id] = "blocked:not_in_tool_registry"
-            await self._send_stdin_line(f"{self.DENY_CMD_PREFIX} {action_id} reason=tool_not_registered")
+            await self._send_verdict(action_id, f"{self.DENY_CMD_PREFIX} {action_id} reason=tool_not_registered")
             self._emit_trust_event(action_id=action_id, outcome="rejected")
             raise PermissionError(f"Tool not registered: {action.tool}")
 
-    async def _validate_idempotency(self, action: ProposedAction, action_id: str, tool_entry: Any) -> None:
+    @classmethod
+    def _register_idempotency_key(cls, idem_key: str, tool: str, context: str) -> bool:
+        # The storage check-then-put is not atomic; serialise it across worker threads.
+        with cls._idempotency_lock:
+            return StorageService().register_tool_call_idempotency_key(
+                idempotency_key=idem_key, tool=tool, context=context
+            )
+
+    async def _validate_idempotency(
+        self, action: ProposedAction, action_id: str, snapshot: _DecisionSnapshot
+    ) -> None:
+        tool_entry = ToolRegistryService.get_tool(action.tool, index=snapshot.registry)
         risk = str(getattr(tool_entry, "risk", "read") or "read")
         if risk not in {"write", "destructive"}:
             return
@@ -213,31 +447,28 @@ class GenericCLISession(AgentSession):
         idem_key = str(action.params.get("idempotency_key") or "").strip()
         if not idem_key:
             self._decision_log[action_id] = "blocked:missing_idempotency_key"
-            await self._send_stdin_line(f"{self.DENY_CMD_PREFIX} {action_id} reason=missing_idempotency_key")
+            await self._send_verdict(action_id, f"{self.DENY_CMD_PREFIX} {action_id} reason=missing_idempotency_key")
             self._emit_trust_event(action_id=action_id, outcome="rejected")
             raise PermissionError(f"Missing idempotency_key for {risk} tool: {action.tool}")
 
-        accepted = StorageService().register_tool_call_idempotency_key(
-            idempotency_key=idem_key,
-            tool=action.tool,
-            context=str(action.params.get("path") or action.params.get("cmd") or "*"),
+        accepted = await asyncio.to_thread(
+            self._register_idempotency_key,
+            idem_key,
+            action.tool,
+            str(action.params.get("path") or action.params.get("cmd") or "*"),
         )
         if not accepted:
             self._decision_log[action_id] = "blocked:duplicate_idempotency_key"
-            await self._send_stdin_line(f"{self.DENY_CMD_PREFIX} {action_id} reason=duplicate_idempotency_key")
+            await self._send_verdict(action_id, f"{self.DENY_CMD_PREFIX} {action_id} reason=duplicate_idempotency_key")
             self._emit_trust_event(action_id=action_id, outcome="rejected")
             raise PermissionError(f"Duplicate idempotency_key for tool call: {action.tool}")
 
-    async def _validate_policy(self, action: ProposedAction, action_id: str) -> None:
+    async def _validate_policy(
+        self, action: ProposedAction, action_id: str, snapshot: _DecisionSnapshot
+    ) -> None:
         context_value = str(action.params.get("path") or action.params.get("cmd") or "*")
         dimension_key = f"{action.tool}|*|{self._model_name}|{self._task_type}"
-        trust_score = 0.0
-        try:
-            trust_score = float(
-                TrustEngine(StorageService()).query_dimension(dimension_key).get("score", 0.0) or 0.0
-            )
-        except Exception as exc:
-            logger.warning("Trust query failed for %s: %s", dimension_key, exc)
+        trust_score = snapshot.trust.score(dimension_key)
 
         policy_decision = PolicyService.decide(
             tool=action.tool,
@@ -247,13 +478,13 @@ class GenericCLISession(AgentSession):
 
         if policy_decision.get("decision") == "deny":
             self._decision_log[action_id] = "blocked:policy_deny"
-            await self._send_stdin_line(f"{self.DENY_CMD_PREFIX} {action_id} reason=policy_deny")
+            await self._send_verdict(action_id, f"{self.DENY_CMD_PREFIX} {action_id} reason=policy_deny")
             self._emit_trust_event(action_id=action_id, outcome="rejected")
             raise PermissionError(f"Policy denied tool execution: {action.tool}")
 
         if policy_decision.get("decision") == "require_review":
             self._decision_log[action_id] = "blocked:policy_require_review"
-            await self._send_stdin_line(f"{self.DENY_CMD_PREFIX} {action_id} reason=policy_require_review")
+            await self._send_verdict(action_id, f"{self.DENY_CMD_PREFIX} {action_id} reason=policy_require_review")
             self._emit_trust_event(action_id=action_id, outcome="rejected")
             raise PermissionError(f"Policy requires review for tool execution: {action.tool}")
 
@@ -262,18 +493,23 @@ class GenericCLISession(AgentSession):
             and trust_score >= 0.90
         ):
             self._decision_log[action_id] = "blocked:policy_never_auto_approve"
-            await self._send_stdin_line(f"{self.DENY_CMD_PREFIX} {action_id} reason=policy_never_auto_approve")
+            await self._send_verdict(action_id, f"{self.DENY_CMD_PREFIX} {action_id} reason=policy_never_auto_approve")
             self._emit_trust_event(action_id=action_id, outcome="rejected")
             raise PermissionError(f"Policy override requires manual review: {action.tool}")
 
     async def deny(self, action_id: str, reason: Optional[str] = None) -> None:
         if action_id not in self._proposal_index:
             raise ValueError(f"Unknown proposal id: {action_id}")
+        started = time.perf_counter()
         self._decision_log[action_id] = f"denied:{reason or ''}"
         message = f"{self.DENY_CMD_PREFIX} {action_id}"
         if reason:
             message += f" reason={reason}"
-        await self._send_stdin_line(message)
+        try:
+            await self._send_verdict(action_id, message)
+        finally:
+            await self._close_verdict(action_id)
+            self._record_timing(action_id, started, self._decided_at.pop(action_id, None))
         self._emit_trust_event(action_id=action_id, outcome="rejected")
 
     def _emit_trust_event(self, *, action_id: str, outcome: str) -> None:
@@ -302,24 +538,45 @@ class GenericCLISession(AgentSession):
             logger.warning("Failed to emit trust event: %s", exc)
 
     async def get_result(self) -> AgentResult:
-        await self.process.wait()
+        if self._lease is not None:
+            await asyncio.wait([self._read_task])
+        else:
+            await self.process.wait()
         status = await self.get_status()
+        self._output_buffer.close()
+        self._error_buffer.close()
+        stderr = self._error_buffer.text()
+        metrics: Dict[str, Any] = {
+            "stderr": stderr,
+            "proposal_count": len(self._proposals),
+            "decisions": dict(self._decision_log),
+            "decision_latency_ms": self.decision_timings(),
+        }
+        for name, buffer in (("stdout", self._output_buffer), ("stderr", self._error_buffer)):
+            if buffer.spill_path or buffer.spilled:
+                metrics[f"{name}_log"] = buffer.spill_path
+                metrics[f"{name}_spilled_lines"] = buffer.spilled
+        metrics.update(self._metrics)
+        if self._lease is not None:
+            await self._lease.release(healthy=status == AgentStatus.COMPLETED)
         return AgentResult(
             status=status,
-            output="\n".join(self._output_buffer),
-            metrics={
-                "stderr": "\n".join(self._error_buffer),
-                "proposal_count": len(self._proposals),
-                "decisions": dict(self._decision_log),
-                **self._metrics,
-            },
-            error="\n".join(self._error_buffer) if status == AgentStatus.FAILED else None
+            output=self._output_buffer.text(),
+            metrics=metrics,
+            error=stderr if status == AgentStatus.FAILED else None
         )
 
     async def kill(self) -> None:
+        if self._lease is not None and not self._lease.held:
+            # get_result already handed the process back; it is not ours to kill.
+            return
         if self.process.returncode is None:
             self.process.kill()
             self.status = AgentStatus.KILLED
+        self._output_buffer.close()
+        self._error_buffer.close()
+        if self._lease is not None:
+            await self._lease.release(healthy=False)
 
 
 class GenericCLIAdapter(AgentAdapter):
@@ -332,11 +589,13 @@ class GenericCLIAdapter(AgentAdapter):
         trust_event_sink: Optional[Any] = None,
         model_name: str = "generic-cli",
         actor: str = "agent:generic_cli",
+        pooled: bool = False,
     ):
         self.command = command
         self.trust_event_sink = trust_event_sink
         self.model_name = model_name
         self.actor = actor
+        self.pooled = pooled
         self.role_profile: Optional[str] = None
         self.hitl_enabled: bool = False
         self.hitl_timeout_seconds: float = 300.0
@@ -347,26 +606,35 @@ class GenericCLIAdapter(AgentAdapter):
         context: Optional[Dict[str, Any]] = None, 
         policy: Optional[Dict[str, Any]] = None
     ) -> AgentSession:
-        logger.info(f"Spawning generic CLI: {' '.join(self.command)}")
-        
-        process = await asyncio.create_subprocess_exec(
-            *self.command,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        
-        # Feed task to stdin
-        if process.stdin:
-            maybe_awaitable = process.stdin.write(f"{task}\n".encode())
-            if inspect.isawaitable(maybe_awaitable):
-                await maybe_awaitable
-            await process.stdin.drain()
-            
         task_type = str((context or {}).get("task_type") or (policy or {}).get("task_type") or "agent_task")
         role_profile = str((context or {}).get("role_profile") or (policy or {}).get("role_profile") or "").strip() or None
         hitl_enabled = bool((context or {}).get("hitl_enabled") or (policy or {}).get("hitl_enabled") or self.hitl_enabled)
         hitl_timeout = float((context or {}).get("hitl_timeout_seconds") or (policy or {}).get("hitl_timeout_seconds") or self.hitl_timeout_seconds)
+
+        lease = None
+        if self.pooled:
+            logger.info(f"Leasing pooled generic CLI: {' '.join(self.command)}")
+            lease = await lease_for_task(
+                self.command, task, role_profile=role_profile, worktree=worktree_for(context, policy)
+            )
+            process = lease.process
+        else:
+            logger.info(f"Spawning generic CLI: {' '.join(self.command)}")
+
+            process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+
+            # Feed task to stdin
+            if process.stdin:
+                maybe_awaitable = process.stdin.write(f"{task}\n".encode())
+                if inspect.isawaitable(maybe_awaitable):
+                    await maybe_awaitable
+                await process.stdin.drain()
+
         return GenericCLISession(
             process,
             task,
@@ -377,4 +645,5 @@ class GenericCLIAdapter(AgentAdapter):
             role_profile=role_profile,
             hitl_enabled=hitl_enabled,
             hitl_timeout_seconds=hitl_timeout,
+            lease=lease,
         )
@@ -4,7 +4,7 @@ import secrets
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, List, Set
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -53,12 +53,16 @@ class Settings:
     rate_limit_per_min: int
     rate_limit_window_seconds: int
     rate_limit_cleanup_seconds: int
+    rate_limit_route_costs: Dict[str, int]
     actions_max_payload_bytes: int
     subprocess_timeout: int
     search_exclude_dirs: Set[str]
     audit_log_path: Path
     audit_log_max_bytes: int
     audit_log_backup_count: int
+    audit_queue_size: int
+    audit_backpressure: str
+    audit_compress_rotated: bool
     ops_data_dir: Path
     ops_run_ttl: int
     gics_daemon_script: Path
@@ -87,8 +91,31 @@ class Settings:
     integrity_manifest_path: Path
     integrity_check_enabled: bool
     integrity_public_key_pem: str
+    integrity_stat_cache_path: Path
+    integrity_cache_key: str
+    integrity_watch_enabled: bool
     runtime_guard_enabled: bool
     runtime_guard_block_debugger: bool
+    # Warm CLI agent process pools
+    cli_pool_idle_size: int
+    cli_pool_max_tasks: int
+    cli_pool_warm_up: bool
+    cli_pool_idle_ttl_seconds: float
+    cli_pool_max_pools: int
+
+
+def _parse_route_costs(raw: str) -> Dict[str, int]:
+    """Rate-limit token cost per route class, e.g. ``search=5,execute=10``."""
+    costs = {"default": 1, "search": 5, "execute": 10}
+    for item in raw.split(","):
+        name, sep, value = item.partition("=")
+        if not sep:
+            continue
+        try:
+            costs[name.strip()] = max(1, int(value))
+        except ValueError:
+            logger.warning("Ignoring invalid rate limit cost %r", item)
+    return costs
 
 
 def _load_or_create_token(token_file: Path | None = None, env_key: str = "ORCH_TOKEN") -> str:
@@ -177,12 +204,18 @@ def _build_settings() -> Settings:
     rate_limit_per_min = 100
     rate_limit_window_seconds = int(os.environ.get("ORCH_RATE_LIMIT_WINDOW_SECONDS", "60"))
     rate_limit_cleanup_seconds = int(os.environ.get("ORCH_RATE_LIMIT_CLEANUP_SECONDS", "120"))
+    rate_limit_route_costs = _parse_route_costs(os.environ.get("ORCH_RATE_LIMIT_ROUTE_COSTS", ""))
     actions_max_payload_bytes = int(os.environ.get("ORCH_ACTIONS_MAX_PAYLOAD_BYTES", str(64 * 1024)))
     subprocess_timeout = int(os.environ.get("ORCH_SUBPROCESS_TIMEOUT", "10"))
     search_exclude_dirs = {"tools", "scripts"}
-    audit_log_path = base_dir / "logs" / "orchestrator_audit.log"
+    audit_log_path = Path(
+        os.environ.get("ORCH_AUDIT_LOG_PATH", str(base_dir / "logs" / "orchestrator_audit.log"))
+    )
     audit_log_max_bytes = int(os.environ.get("ORCH_AUDIT_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
     audit_log_backup_count = int(os.environ.get("ORCH_AUDIT_LOG_BACKUP_COUNT", "5"))
+    audit_queue_size = int(os.environ.get("ORCH_AUDIT_QUEUE_SIZE", "10000"))
+    audit_backpressure = os.environ.get("ORCH_AUDIT_BACKPRESSURE", "block").lower()
+    audit_compress_rotated = os.environ.get("ORCH_AUDIT_COMPRESS_ROTATED", "false").lower() in ("true", "1", "yes")
     ops_data_dir = repo_root_dir / ".orch_data" / "ops"
     worktrees_dir = repo_root_dir / ".orch_data" / "worktrees"
     ops_run_ttl = int(os.environ.get("ORCH_OPS_RUN_TTL", "86400"))
@@ -212,12 +245,16 @@ def _build_settings() -> Settings:
         rate_limit_per_min=rate_limit_per_min,
         rate_limit_window_seconds=rate_limit_window_seconds,
         rate_limit_cleanup_seconds=rate_limit_cleanup_seconds,
+        rate_limit_route_costs=rate_limit_route_costs,
         actions_max_payload_bytes=actions_max_payload_bytes,
         subprocess_timeout=subprocess_timeout,
         search_exclude_dirs=search_exclude_dirs,
         audit_log_path=audit_log_path,
         audit_log_max_bytes=audit_log_max_bytes,
         audit_log_backup_count=audit_log_backup_count,
+        audit_queue_size=audit_queue_size,
+        audit_backpressure=audit_backpressure,
+        audit_compress_rotated=audit_compress_rotated,
         ops_data_dir=ops_data_dir,
         ops_run_ttl=ops_run_ttl,
         gics_daemon_script=_resolve_gics_daemon_script(base_dir),
@@ -250,10 +287,22 @@ def _build_settings() -> Settings:
         integrity_check_enabled=os.environ.get("ORCH_INTEGRITY_CHECK", "true").lower()
         in ("true", "1", "yes"),
         integrity_public_key_pem=os.environ.get("ORCH_INTEGRITY_PUBLIC_KEY", ""),
+        integrity_stat_cache_path=ops_data_dir / "integrity_stat_cache.json",
+        # Secret for the persisted stat cache; keep it out of OPS data. Unset = memory only.
+        integrity_cache_key=os.environ.get("ORCH_INTEGRITY_CACHE_KEY", ""),
+        integrity_watch_enabled=os.environ.get("ORCH_INTEGRITY_WATCH", "true").lower()
+        in ("true", "1", "yes"),
         runtime_guard_enabled=os.environ.get("ORCH_RUNTIME_GUARD", "true").lower()
         in ("true", "1", "yes"),
         runtime_guard_block_debugger=os.environ.get("ORCH_BLOCK_DEBUGGER", "false").lower()
         in ("true", "1", "yes"),
+        cli_pool_idle_size=max(0, int(os.environ.get("ORCH_CLI_POOL_IDLE_SIZE", "1"))),
+        cli_pool_max_tasks=max(1, int(os.environ.get("ORCH_CLI_POOL_MAX_TASKS", "20"))),
+        cli_pool_warm_up=os.environ.get("ORCH_CLI_POOL_WARM_UP", "true").lower() in ("true", "1", "yes"),
+        cli_pool_idle_ttl_seconds=max(
+            1.0, float(os.environ.get("ORCH_CLI_POOL_IDLE_TTL_SECONDS", "600"))
+        ),
+        cli_pool_max_pools=max(1, int(os.environ.get("ORCH_CLI_POOL_MAX_POOLS", "16"))),
     )
 
 
@@ -307,12 +356,16 @@ ORCH_OPERATOR_TOKEN = _SETTINGS.operator_token
 RATE_LIMIT_PER_MIN = _SETTINGS.rate_limit_per_min
 RATE_LIMIT_WINDOW_SECONDS = _SETTINGS.rate_limit_window_seconds
 RATE_LIMIT_CLEANUP_SECONDS = _SETTINGS.rate_limit_cleanup_seconds
+RATE_LIMIT_ROUTE_COSTS = _SETTINGS.rate_limit_route_costs
 ACTIONS_MAX_PAYLOAD_BYTES = _SETTINGS.actions_max_payload_bytes
 SUBPROCESS_TIMEOUT = _SETTINGS.subprocess_timeout
 SEARCH_EXCLUDE_DIRS = _SETTINGS.search_exclude_dirs
 AUDIT_LOG_PATH = _SETTINGS.audit_log_path
 AUDIT_LOG_MAX_BYTES = _SETTINGS.audit_log_max_bytes
 AUDIT_LOG_BACKUP_COUNT = _SETTINGS.audit_log_backup_count
+AUDIT_QUEUE_SIZE = _SETTINGS.audit_queue_size
+AUDIT_BACKPRESSURE = _SETTINGS.audit_backpressure
+AUDIT_COMPRESS_ROTATED = _SETTINGS.audit_compress_rotated
 OPS_DATA_DIR = _SETTINGS.ops_data_dir
 OPS_RUN_TTL = _SETTINGS.ops_run_ttl
 GICS_DAEMON_SCRIPT = _SETTINGS.gics_daemon_script
@@ -320,6 +373,11 @@ GICS_SOCKET_PATH = _SETTINGS.gics_socket_path
 GICS_TOKEN_PATH = _SETTINGS.gics_token_path
 DATA_DIR = _SETTINGS.data_dir
 WORKTREES_DIR = _SETTINGS.worktrees_dir
+CLI_POOL_IDLE_SIZE = _SETTINGS.cli_pool_idle_size
+CLI_POOL_MAX_TASKS = _SETTINGS.cli_pool_max_tasks
+CLI_POOL_WARM_UP = _SETTINGS.cli_pool_warm_up
+CLI_POOL_IDLE_TTL_SECONDS = _SETTINGS.cli_pool_idle_ttl_seconds
+CLI_POOL_MAX_POOLS = _SETTINGS.cli_pool_max_pools
 DEBUG = _SETTINGS.debug
 LOG_LEVEL = _SETTINGS.log_level
 GIMO_WEB_URL = _SETTINGS.gimo_web_url
@@ -28,5 +28,8 @@ class StageOutput(BaseModel):
 
 class ExecutionStage(Protocol):
     name: str
+    # True when executing the stage writes files, touches git or changes run records;
+    # dry replays report such stages as skipped instead of executing them.
+    side_effects: bool = False
     async def execute(self, input: StageInput) -> StageOutput: ...
     async def rollback(self, input: StageInput) -> None: ...
@@ -1,10 +1,18 @@
 from __future__ import annotations
+import hashlib
 import json
 import os
 from datetime import datetime
 from typing import List, Optional
+from pydantic import BaseModel
 from .contracts import JournalEntry
 
+
+def snapshot_hash(model: BaseModel) -> str:
+    """Hash used for journal input/output snapshots."""
+    return hashlib.sha256(model.model_dump_json().encode()).hexdigest()
+
+
 class RunJournal:
     def __init__(self, storage_path: str):
         self.storage_path = storage_path
@@ -30,6 +38,10 @@ class RunJournal:
                     self._entries.append(JournalEntry.model_validate_json(line))
         return self._entries
 
+    @property
+    def entries(self) -> List[JournalEntry]:
+        return list(self._entries)
+
     def get_step(self, step_id: str) -> Optional[JournalEntry]:
         for entry in self._entries:
             if entry.step_id == step_id:
@@ -1,12 +1,11 @@
 from __future__ import annotations
 import asyncio
-import hashlib
 import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
 from .contracts import StageInput, StageOutput, ExecutionStage, JournalEntry
-from .journal import RunJournal
+from .journal import RunJournal, snapshot_hash
 
 logger = logging.getLogger(__name__)
 
@@ -42,13 +41,24 @@ class Pipeline:
         if self._journal_store is None:
             self._journal_store = RunJournal(storage_path=str(journal_path))
 
-    async def run(self, initial_context: Dict[str, Any]) -> List[StageOutput]:
+    def restore(self, outputs: Dict[str, StageOutput]) -> None:
+        """Seed results/artifacts with stage outputs recovered from a journal."""
+        for stage_name, output in outputs.items():
+            self.results[stage_name] = output
+            self.artifacts.update(output.artifacts)
+
+    async def run(self, initial_context: Dict[str, Any], *, start_at: int = 0) -> List[StageOutput]:
+        """Run the stages in order, skipping the first ``start_at`` ones.
+
+        Skipped stages are expected to have been seeded via :meth:`restore`; they
+        are not rolled back if a later stage fails.
+        """
         current_context = initial_context.copy()
         self._ensure_journal_store(current_context)
         execution_history: List[tuple[ExecutionStage, StageInput]] = []
         healing_enabled = self._self_healing_enabled(current_context)
         
-        for stage in self.stages:
+        for stage in self.stages[start_at:]:
             stage_input = StageInput(
                 run_id=self.run_id,
                 context=current_context,
@@ -86,6 +96,8 @@ class Pipeline:
         if healing_enabled:
             selected_stages.extend(list(getattr(stage, "alternatives", []) or []))
         last_error: Optional[Exception] = None
+        # Journal the input as the stage received it; stages may mutate their copy.
+        recorded_input = self._snapshot_input(input)
 
         for stage_candidate in selected_stages:
             for attempt in range(self.config.max_retries + 1):
@@ -99,7 +111,7 @@ class Pipeline:
                     if not output.journal_entry:
                         output.journal_entry = self._create_journal_entry(
                             stage_candidate,
-                            input,
+                            recorded_input,
                             output,
                             started_at,
                             finished_at,
@@ -147,7 +159,7 @@ class Pipeline:
         failed_output = StageOutput(status="fail", artifacts={"error": err_text})
         failed_output.journal_entry = self._create_journal_entry(
             stage,
-            input,
+            recorded_input,
             failed_output,
             finished_at,
             finished_at,
@@ -155,14 +167,19 @@ class Pipeline:
         )
         return failed_output
 
+    @staticmethod
+    def _snapshot_input(input: StageInput) -> StageInput:
+        try:
+            return input.model_copy(deep=True)
+        except Exception:
+            return input
+
     def _create_journal_entry(
         self, stage: ExecutionStage, input: StageInput, output: StageOutput, 
         started_at: datetime, finished_at: datetime, status: str
     ) -> JournalEntry:
-        input_json = input.model_dump_json()
-        output_json = output.model_dump_json()
-        input_hash = hashlib.sha256(input_json.encode()).hexdigest()
-        output_hash = hashlib.sha256(output_json.encode()).hexdigest()
+        input_hash = snapshot_hash(input)
+        output_hash = snapshot_hash(output)
         
         return JournalEntry(
             step_id=f"{self.run_id}_{stage.name}_{started_at.timestamp()}",
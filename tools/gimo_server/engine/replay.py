@@ -2,47 +2,203 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from .contracts import StageOutput
-from .journal import RunJournal
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from .contracts import JournalEntry, StageInput, StageOutput
+from .journal import RunJournal, snapshot_hash
 from .pipeline import Pipeline
 
 logger = logging.getLogger(__name__)
 
+
+class ReplayIntegrityError(ValueError):
+    """A journal snapshot no longer matches the hash recorded for it."""
+
+
+class RehydratedRun(BaseModel):
+    """Stage outputs recovered from the journal and where to re-enter the pipeline."""
+
+    outputs: Dict[str, StageOutput] = Field(default_factory=dict)
+    resume_index: int = 0
+    context: Optional[Dict[str, Any]] = None
+
+
 class ReplayEngine:
     """
     Engine for replaying execution from a journal.
+
+    ``resume`` rehydrates the verified outputs of the leading stages that already
+    completed and re-enters the pipeline at the first one that did not, so
+    expensive stages are not executed twice. ``dry_replay`` re-executes recorded
+    stages without side effects against their journaled inputs and reports where
+    the outputs diverge.
     """
     def __init__(self, journal: RunJournal):
         self.journal = journal
 
-    async def replay_from(self, step_id: str, pipeline: Pipeline) -> StageOutput:
+    def _latest_entries(self) -> Dict[str, JournalEntry]:
+        # A resumed run appends to the same journal: the newest entry per stage wins.
+        latest: Dict[str, JournalEntry] = {}
+        for entry in self.journal.entries:
+            latest[entry.stage_name] = entry
+        return latest
+
+    @staticmethod
+    def _verified_snapshots(entry: JournalEntry) -> tuple[StageInput, StageOutput]:
+        stage_input = StageInput.model_validate(entry.input_snapshot)
+        output = StageOutput.model_validate(entry.output_snapshot)
+        if snapshot_hash(stage_input) != entry.input_hash:
+            raise ReplayIntegrityError(f"Input hash mismatch for journal step {entry.step_id}")
+        if snapshot_hash(output) != entry.output_hash:
+            raise ReplayIntegrityError(f"Output hash mismatch for journal step {entry.step_id}")
+        return stage_input, output
+
+    def rehydrate(self, pipeline: Pipeline, *, stop_before: Optional[str] = None) -> RehydratedRun:
+        """Collect the outputs of the leading pipeline stages that completed.
+
+        Stops at the first stage without a completed ``continue`` entry, or at
+        ``stop_before`` when given. Raises ReplayIntegrityError on hash mismatch.
+        """
+        latest = self._latest_entries()
+        rehydrated = RehydratedRun()
+        for stage in pipeline.stages:
+            if stop_before is not None and stage.name == stop_before:
+                break
+            entry = latest.get(stage.name)
+            if entry is None or entry.status != "completed":
+                break
+            stage_input, output = self._verified_snapshots(entry)
+            if output.status != "continue":
+                break
+            rehydrated.outputs[stage.name] = output
+            if rehydrated.context is None:
+                rehydrated.context = dict(stage_input.context)
+        rehydrated.resume_index = len(rehydrated.outputs)
+        return rehydrated
+
+    async def resume(
+        self,
+        pipeline: Pipeline,
+        initial_context: Optional[Dict[str, Any]] = None,
+        *,
+        stop_before: Optional[str] = None,
+    ) -> List[StageOutput]:
+        """Restore completed stages into ``pipeline`` and run the remaining ones."""
+        rehydrated = self.rehydrate(pipeline, stop_before=stop_before)
+        context = initial_context if initial_context is not None else (rehydrated.context or {})
+        pipeline.restore(rehydrated.outputs)
+        logger.info(
+            "Resuming run %s at stage %d/%d (%d restored from journal)",
+            pipeline.run_id,
+            rehydrated.resume_index,
+            len(pipeline.stages),
+            len(rehydrated.outputs),
+        )
+        if rehydrated.resume_index >= len(pipeline.stages):
+            return list(pipeline.results.values())
+        return await pipeline.run(context, start_at=rehydrated.resume_index)
+
+    async def dry_replay(
+        self, pipeline: Pipeline, *, start_at: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Re-execute journaled stages against their recorded inputs.
+
+        Starts at the stage named ``start_at`` when given. Stages with
+        ``side_effects`` are not executed and are reported as ``skipped``.
+        Nothing is journaled or rolled back. Returns one report per journaled
+        stage with ``diverged`` set when the output hash differs from the recorded one.
+        """
+        latest = self._latest_entries()
+        stages = list(pipeline.stages)
+        names = [stage.name for stage in stages]
+        if start_at in names:
+            stages = stages[names.index(start_at):]
+        reports: List[Dict[str, Any]] = []
+        for stage in stages:
+            entry = latest.get(stage.name)
+            if entry is None:
+                continue
+            stage_input, recorded = self._verified_snapshots(entry)
+            report: Dict[str, Any] = {
+                "stage": stage.name,
+                "step_id": entry.step_id,
+                "recorded_status": recorded.status,
+                "recorded_hash": entry.output_hash,
+            }
+            if getattr(stage, "side_effects", False):
+                report.update({"skipped": True, "diverged": False})
+                reports.append(report)
+                continue
+            try:
+                replayed = await stage.execute(stage_input)
+            except Exception as exc:
+                report.update({"diverged": True, "error": str(exc)})
+                reports.append(report)
+                continue
+            replayed = replayed.model_copy(update={"journal_entry": None})
+            replayed_hash = snapshot_hash(replayed)
+            report.update(
+                {
+                    "replayed_status": replayed.status,
+                    "replayed_hash": replayed_hash,
+                    "diverged": replayed_hash != entry.output_hash,
+                    "changed_artifacts": sorted(
+                        key
+                        for key in set(recorded.artifacts) | set(replayed.artifacts)
+                        if recorded.artifacts.get(key) != replayed.artifacts.get(key)
+                    ),
+                }
+            )
+            reports.append(report)
+        return reports
+
+    async def replay_from(
+        self,
+        step_id: str,
+        pipeline: Pipeline,
+        initial_context: Optional[Dict[str, Any]] = None,
+        *,
+        dry_run: bool = False,
+    ) -> StageOutput:
         """
         Replays the execution starting from a specific step.
+
+        With an empty pipeline only the journal slice is returned.
         """
         logger.info("Replaying execution from step: %s", step_id)
         await asyncio.sleep(0)
 
-        
-        # 1. Find the step in the journal
         start_entry = self.journal.get_step(step_id)
         if not start_entry:
             return StageOutput(status="fail", error=f"Step ID {step_id} not found in journal")
 
-        # 2. Reset pipeline state to that step
-        # This is a complex operation that involves restoring context and artifacts
-        # from the journal snapshots
-        
-        # For this implementation, we simply log the replay attempt
-        # In a full implementation, we would truncate the journal and re-run the pipeline
-        # with the restored state.
-        
         replay_entries = self.journal.replay_from(step_id)
-        logger.warning("Deterministic replay fallback used: returning journal slice only")
-        return StageOutput(
-            status="continue",
-            artifacts={
-                "replayed_from": step_id,
-                "entries": [entry.model_dump(mode="json") for entry in replay_entries],
-                "pipeline_run_id": pipeline.run_id,
-            },
-        )
+        artifacts: Dict[str, Any] = {
+            "replayed_from": step_id,
+            "entries": [entry.model_dump(mode="json") for entry in replay_entries],
+            "pipeline_run_id": pipeline.run_id,
+        }
+        if not pipeline.stages:
+            return StageOutput(status="continue", artifacts=artifacts)
+
+        try:
+            if dry_run:
+                reports = await self.dry_replay(pipeline, start_at=start_entry.stage_name)
+                artifacts.update(
+                    {
+                        "dry_run": True,
+                        "stages": reports,
+                        "diverged": any(r["diverged"] for r in reports),
+                        "skipped": [r["stage"] for r in reports if r.get("skipped")],
+                    }
+                )
+                return StageOutput(status="continue", artifacts=artifacts)
+            results = await self.resume(pipeline, initial_context, stop_before=start_entry.stage_name)
+        except ReplayIntegrityError as exc:
+            return StageOutput(status="fail", artifacts=artifacts, error=str(exc))
+
+        artifacts["stages"] = {name: output.status for name, output in pipeline.results.items()}
+        final = results[-1] if results else StageOutput(status="continue")
+        return StageOutput(status=final.status, artifacts=artifacts, error=final.error)
@@ -10,6 +10,8 @@ from ...services.runtime_policy_service import RuntimePolicyService
 logger = logging.getLogger(__name__)
 
 class FileWrite(ExecutionStage):
+    side_effects = True
+
     @property
     def name(self) -> str:
         return "file_write"
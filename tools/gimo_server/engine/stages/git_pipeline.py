@@ -5,6 +5,7 @@ from ...services.merge_gate_service import MergeGateService
 
 class GitPipeline(ExecutionStage):
     name = "git_pipeline"
+    side_effects = True
 
     async def execute(self, input: StageInput) -> StageOutput:
         run_id = input.run_id
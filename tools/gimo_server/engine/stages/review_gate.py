@@ -21,6 +21,7 @@ REVIEW_TIMEOUT = 600.0
 
 class ReviewGate:
     name = "review_gate"
+    side_effects = True
 
     async def execute(self, input: StageInput) -> StageOutput:
         from ...services.ops_service import OpsService
@@ -89,7 +90,7 @@ class ReviewGate:
         _record_capability(run, child_ctx, success=False, failure_reason=reason)
 
         # Re-queue: update child_context with feedback and reset to pending
-        with OpsService._lock():
+        with OpsService._run_lock(input.run_id):
             fresh = OpsService._load_run_metadata(input.run_id)
             if fresh:
                 ctx = dict(fresh.child_context or {})
@@ -37,6 +37,7 @@ def _resolve_task_tier(task: Dict[str, Any]) -> Optional[int]:
 
 class SpawnAgentsStage:
     name = "spawn_agents"
+    side_effects = True
 
     async def execute(self, input: StageInput) -> StageOutput:
         from ...services.ops_service import OpsService
@@ -9,6 +9,7 @@ logger = logging.getLogger(__name__)
 class SubagentGate:
     """Checks if run has pending children and halts (pauses) if so."""
     name = "subagent_gate"
+    side_effects = True
 
     async def execute(self, input: StageInput) -> StageOutput:
         from ...services.ops_service import OpsService
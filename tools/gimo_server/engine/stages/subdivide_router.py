@@ -24,6 +24,7 @@ logger = logging.getLogger(__name__)
 
 class SubdivideRouter:
     name = "subdivide_router"
+    side_effects = True
 
     async def execute(self, input: StageInput) -> StageOutput:
         if not input.context.get("ace_subdivide_mode"):
@@ -51,7 +52,7 @@ class SubdivideRouter:
 
         # Inject child_tasks into this run's child_context so engine_service
         # selects multi_agent composition on the next execution cycle.
-        with OpsService._lock():
+        with OpsService._run_lock(input.run_id):
             run = OpsService._load_run_metadata(input.run_id)
             if run:
                 ctx = dict(run.child_context or {})
@@ -86,8 +86,11 @@ class ToolExecutor:
         full_path = self._to_abs_path(path)
         if not self._is_path_allowed(full_path):
             return ToolExecutionResult("error", f"Path not allowed by runtime policy: {path}")
-        FileService.patch_file(Path(full_path), diff=str(diff), token=self.token)
-        return ToolExecutionResult("success", f"File patched: {path}")
+        try:
+            message = FileService.patch_file(Path(full_path), diff=str(diff), token=self.token)
+        except IOError as exc:
+            return ToolExecutionResult("error", str(exc))
+        return ToolExecutionResult("success", f"File patched: {path}", {"path": full_path, "detail": message})
 
     async def handle_create_dir(self, args: Dict[str, Any]) -> ToolExecutionResult:
         path = args.get("path")
@@ -38,7 +38,10 @@ async def _integrity_recheck_loop(settings):
     while True:
         try:
             await asyncio.sleep(6 * 3600)
-            ok, reason = IntegrityVerifier(settings).verify_manifest()
+            # Full re-hash: the stat cache must not be the only line of defense.
+            ok, reason = await asyncio.to_thread(
+                IntegrityVerifier(settings).verify_manifest, use_cache=False
+            )
             if not ok:
                 logger.critical("INTEGRITY RECHECK FAILED: %s", reason)
                 _sys.exit(1)
@@ -48,6 +51,30 @@ async def _integrity_recheck_loop(settings):
         except Exception as exc:
             logger.warning("Integrity recheck loop error: %s", exc)
 
+async def _integrity_watch_loop(settings):
+    """Re-verify manifest files as soon as they change on disk."""
+    import sys as _sys
+    import asyncio
+    from tools.gimo_server.security.integrity import IntegrityVerifier
+    import logging
+    logger = logging.getLogger("orchestrator")
+    if not getattr(settings, "integrity_watch_enabled", False):
+        return
+    try:
+        verifier = IntegrityVerifier(settings)
+        ok, reason = verifier.verify_manifest()
+        if not ok:
+            return  # startup already decided; the periodic recheck keeps running
+        async for ok, reason in verifier.watch():
+            if not ok:
+                logger.critical("INTEGRITY WATCH FAILED: %s", reason)
+                _sys.exit(1)
+            logger.debug("INTEGRITY WATCH: %s", reason)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        logger.warning("Integrity watch loop error: %s", exc)
+
 async def _threat_decay_loop():
     """Periodically check for threat level decay."""
     import asyncio
@@ -84,6 +111,42 @@ async def _ops_runs_cleanup_loop():
         except Exception as exc:
             logger.warning("OPS run cleanup loop error: %s", exc)
 
+async def _write_behind_flush_loop():
+    """Flush in-process write-behind accumulators to GICS and compact skill run ledgers."""
+    from tools.gimo_server.services.capability_profile_service import CapabilityProfileService
+    from tools.gimo_server.services.ops_service import OpsService
+    from tools.gimo_server.services.skills_service import SkillsService
+    logger = logging.getLogger("orchestrator")
+    while True:
+        try:
+            await asyncio.sleep(CapabilityProfileService.FLUSH_INTERVAL_SECONDS)
+            await asyncio.to_thread(CapabilityProfileService.flush)
+            await asyncio.to_thread(OpsService.flush_telemetry)
+            await asyncio.to_thread(SkillsService.compact_all_analytics)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("Write-behind flush loop error: %s", exc)
+
+async def _watch_budget_alerts(gics_service):
+    """Push budget alerts as cost events land instead of on the next forecast poll.
+
+    The cost aggregates are backfilled from the cost events in a worker thread
+    so startup does not block the event loop on the scan.
+    """
+    from tools.gimo_server.services.budget_forecast_service import BudgetForecastService
+    from tools.gimo_server.services.ops_service import OpsService
+    from tools.gimo_server.services.storage_service import StorageService
+    logger = logging.getLogger("orchestrator")
+    storage = StorageService(gics_service)
+    try:
+        await asyncio.to_thread(storage.cost.spend_tracker)
+        BudgetForecastService.watch(storage, lambda: OpsService.get_config().economy)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        logger.warning("Budget alert watch warning: %s", exc)
+
 async def _notify_sessions_for_run(run, sessions, logger, ops_service):
     ops_service.append_log(run.id, level="INFO", msg="MCP handover notification sent")
     for session in sessions:
@@ -135,6 +198,11 @@ async def _shutdown_services(logger, app, hw_monitor, run_worker, tasks):
         logger.debug("Hardware monitor shutdown warning: %s", exc)
 
     if hasattr(app.state, "gics"):
+        from tools.gimo_server.services.capability_profile_service import CapabilityProfileService
+        from tools.gimo_server.services.ops_service import OpsService
+
+        CapabilityProfileService.flush()
+        OpsService.flush_telemetry()
         try:
             app.state.gics.stop_daemon()
         except Exception as exc:
@@ -147,6 +215,18 @@ async def _shutdown_services(logger, app, hw_monitor, run_worker, tasks):
     except Exception as exc:
         logger.debug("Run worker shutdown warning: %s", exc)
 
+    try:
+        from tools.gimo_server.services.web_search_content_extractor import aclose_client
+        await aclose_client()
+    except Exception as exc:
+        logger.debug("Web content client shutdown warning: %s", exc)
+
+    try:
+        from tools.gimo_server.adapters.cli_pool import CLIProcessPool
+        await CLIProcessPool.close_all()
+    except Exception as exc:
+        logger.debug("CLI process pool shutdown warning: %s", exc)
+
     for t in tasks:
         t.cancel()
 
@@ -258,9 +338,12 @@ async def lifespan(app: FastAPI):
     threat_cleanup_task = asyncio.create_task(_threat_decay_loop())
 
     ops_cleanup_task = asyncio.create_task(_ops_runs_cleanup_loop())
+    write_behind_task = asyncio.create_task(_write_behind_flush_loop())
     integrity_task = asyncio.create_task(_integrity_recheck_loop(settings))
+    integrity_watch_task = asyncio.create_task(_integrity_watch_loop(settings))
 
     mcp_sampling_task = asyncio.create_task(_mcp_sampling_loop())
+    budget_watch_task = asyncio.create_task(_watch_budget_alerts(gics_service))
     
     # Startup reconcile + rotation for runtime consistency
     try:
@@ -364,7 +447,16 @@ async def lifespan(app: FastAPI):
     # Shutdown: Clean up resources (never propagate cancellation errors to TestClient)
     logger.info("Shutting down Repo Orchestrator...")
     try:
-        tasks = [cleanup_task, threat_cleanup_task, ops_cleanup_task, mcp_sampling_task, integrity_task]
+        tasks = [
+            cleanup_task,
+            threat_cleanup_task,
+            ops_cleanup_task,
+            write_behind_task,
+            mcp_sampling_task,
+            budget_watch_task,
+            integrity_task,
+            integrity_watch_task,
+        ]
         await _shutdown_services(logger, app, hw_monitor, run_worker, tasks)
         if hasattr(app.state, "run_worker"):
             delattr(app.state, "run_worker")
@@ -394,7 +486,7 @@ def _register_core_exception_handlers(app: FastAPI, actions_safe_targets: set):
     async def http_exception_handler(request: Request, exc: StarletteHTTPException):
         if _is_actions_safe_request(request, actions_safe_targets) and int(exc.status_code) >= 500:
             return JSONResponse(status_code=exc.status_code, content={"detail": "Internal error."})
-        return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+        return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers)
 
 def _register_core_routes(app: FastAPI, settings):
     @app.get("/")
@@ -30,6 +30,8 @@ class EvalRunRequest(BaseModel):
     judge: EvalJudgeConfig = Field(default_factory=EvalJudgeConfig)
     gate: EvalGateConfig = Field(default_factory=EvalGateConfig)
     case_limit: Optional[int] = Field(default=None, ge=1)
+    concurrency: Optional[int] = Field(default=None, ge=1, le=64)
+    use_cache: bool = True
 
 class EvalCaseResult(BaseModel):
     case_id: str
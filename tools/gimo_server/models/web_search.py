@@ -21,6 +21,9 @@ class WebSearchQuery(BaseModel):
     providers: List[WebSearchProvider] = Field(default_factory=lambda: ["duckduckgo"])
     include_content: bool = False
     timeout_seconds: float = Field(default=15.0, ge=1.0, le=60.0)
+    # Return as soon as this many fused results are in; slower providers finish in the background.
+    early_quorum: Optional[int] = Field(default=None, ge=1, le=50)
+    use_cache: bool = True
 
 
 class WebSearchResult(BaseModel):
@@ -38,6 +41,8 @@ class WebSearchFusionResponse(BaseModel):
     results: List[WebSearchResult] = Field(default_factory=list)
     providers_used: List[WebSearchProvider] = Field(default_factory=list)
     providers_failed: List[str] = Field(default_factory=list)
+    providers_pending: List[WebSearchProvider] = Field(default_factory=list)
+    cached: bool = False
     total_results: int = 0
     fusion_time_ms: float = 0.0
     deduplicated_count: int = 0
@@ -7,7 +7,7 @@ class WorkflowNode(BaseModel):
     id: str
     type: Literal[
         "llm_call", "tool_call", "human_review", "eval",
-        "transform", "sub_graph", "agent_task", "contract_check",
+        "transform", "sub_graph", "agent_task", "contract_check", "join",
     ]
     config: Dict[str, Any] = Field(default_factory=dict)
     agent: Optional[str] = None
@@ -32,7 +32,7 @@ class WorkflowCheckpoint(BaseModel):
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     state: Dict[str, Any]
     output: Any
-    status: Literal["completed", "failed"]
+    status: Literal["completed", "failed", "paused"]
 
 class WorkflowState(BaseModel):
     version: int = 1
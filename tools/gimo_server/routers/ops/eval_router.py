@@ -27,6 +27,8 @@ async def evals_run(
         judge=body.judge,
         gate=body.gate,
         case_limit=body.case_limit,
+        concurrency=body.concurrency,
+        use_cache=body.use_cache,
     )
     storage = StorageService(gics=getattr(request.app.state, "gics", None))
     report_id = storage.save_eval_report(report)
@@ -239,6 +239,7 @@ async def predict_workflow_cost(
     """Predicts cost for a proposed workflow."""
     from ...services.ops_service import OpsService
     from ...services.cost_predictor import CostPredictor
+    from ...services.storage_service import StorageService
     from ...ops_models import WorkflowNode
 
     nodes_data = request.get("nodes", [])
@@ -253,7 +254,7 @@ async def predict_workflow_cost(
     if not config.economy.show_cost_predictions:
         raise HTTPException(status_code=403, detail="Cost predictions are disabled in economy settings.")
 
-    predictor = CostPredictor()
+    predictor = CostPredictor(StorageService(OpsService._gics))
 
     prediction = predictor.predict_workflow_cost(nodes, state, config.economy)
     return prediction
@@ -287,7 +288,7 @@ async def get_budget_forecast(auth: Annotated[AuthContext, Depends(verify_token)
     from ...services.storage_service import StorageService
     
     config = OpsService.get_config()
-    storage = StorageService()
+    storage = StorageService(OpsService._gics)
     
     forecaster = BudgetForecastService(storage)
     return forecaster.forecast(config.economy)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import List, Optional, Annotated
 import asyncio
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from tools.gimo_server.security import audit_log, check_rate_limit, verify_token
 from tools.gimo_server.security.auth import AuthContext
 from tools.gimo_server.ops_models import (
@@ -27,6 +27,9 @@ router = APIRouter()
 
 RUN_NOT_FOUND = "Run not found"
 
+# Strong references to background replays so they are not garbage collected mid-run.
+_REPLAY_TASKS: set[asyncio.Task] = set()
+
 
 @router.get("/action-drafts", response_model=List[ActionDraft])
 async def list_action_drafts(
@@ -250,27 +253,58 @@ async def get_run(
 
 @router.post(
     "/runs/{run_id}/replay",
-    responses={404: {"description": RUN_NOT_FOUND}},
+    responses={
+        202: {"description": "Replay started in the background"},
+        404: {"description": RUN_NOT_FOUND},
+    },
 )
 async def replay_run(
     request: Request,
+    response: Response,
     run_id: str,
     auth: Annotated[AuthContext, Depends(verify_token)],
     rl: Annotated[None, Depends(check_rate_limit)],
     from_step: Annotated[str, Query(..., description="Stage step id to replay from")],
+    composition: Annotated[
+        Optional[str], Query(description="Pipeline composition to resume; omit to only list the journal slice")
+    ] = None,
+    dry_run: Annotated[
+        bool, Query(description="Re-run side-effect-free stages and log their divergence")
+    ] = False,
 ):
     _require_role(auth, "operator")
     run = OpsService.get_run(run_id)
     if not run:
         raise HTTPException(status_code=404, detail=RUN_NOT_FOUND)
 
-    journal_path = str((OpsService.OPS_DIR / "run_journals" / f"{run_id}.jsonl"))
-    journal = RunJournal(storage_path=journal_path)
+    journal_path = EngineService.journal_path(run_id)
+    journal = RunJournal(storage_path=str(journal_path))
     journal.load()
     replay = ReplayEngine(journal)
 
-    # Replay currently returns deterministic journal slice. Pipeline provided for API contract.
-    output = await replay.replay_from(from_step, Pipeline(run_id=run_id, stages=[]))
+    stages = []
+    if composition:
+        try:
+            stages = EngineService.build_stages(composition)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    if stages:
+        # Resuming and dry replays re-execute stages: run them in the background like any other run.
+        if not journal.get_step(from_step):
+            raise HTTPException(status_code=404, detail=f"Step ID {from_step} not found in journal")
+        if dry_run:
+            replay_coro = EngineService.dry_replay_run(run_id, from_step, stages)
+        else:
+            replay_coro = EngineService.replay_run(run_id, from_step, stages, composition)
+        task = asyncio.create_task(replay_coro)
+        _REPLAY_TASKS.add(task)
+        task.add_done_callback(_REPLAY_TASKS.discard)
+        audit_log(
+            "OPS", f"/ops/runs/{run_id}/replay", run_id, operation="WRITE", actor=_actor_label(auth)
+        )
+        response.status_code = 202
+        return {"run_id": run_id, "from_step": from_step, "status": "accepted"}
+    output = await replay.replay_from(from_step, Pipeline(run_id=run_id, stages=stages))
     return {
         "run_id": run_id,
         "from_step": from_step,
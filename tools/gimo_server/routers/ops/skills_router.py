@@ -217,7 +217,10 @@ async def get_skill_analytics(
     rl: Annotated[None, Depends(check_rate_limit)],
 ):
     """Get execution analytics for a skill."""
-    return SkillsService.get_skill_analytics(skill_id)
+    try:
+        return SkillsService.get_skill_analytics(skill_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 # ── Marketplace ───────────────────────────────────────────────────────────────
@@ -23,6 +23,7 @@ from tools.gimo_server.security import (
     validate_path,
     verify_token,
 )
+from tools.gimo_server.security import audit_index
 from tools.gimo_server.security.auth import AuthContext
 from tools.gimo_server.services.file_service import FileService
 from tools.gimo_server.services.repo_service import RepoService
@@ -162,11 +163,27 @@ def get_ui_status_handler(
 
 def get_ui_audit_handler(
     limit: int = Query(200, ge=10, le=500),
+    operation: Optional[str] = Query(None, max_length=64),
+    actor: Optional[str] = Query(None, max_length=128),
+    path: Optional[str] = Query(None, max_length=512),
+    since_minutes: Optional[int] = Query(None, ge=1, le=60 * 24 * 31),
     auth: AuthContext = Depends(require_read_only_access),
     rl: None = Depends(check_rate_limit),
 ):
+    if not (operation or actor or path or since_minutes):
+        return {
+            "lines": FileService.tail_audit_lines(limit=limit),
+        }
+    records = FileService.query_audit(
+        operation=operation,
+        actor=actor,
+        path=path,
+        since=time.time() - since_minutes * 60 if since_minutes else None,
+        limit=limit,
+    )
     return {
-        "lines": FileService.tail_audit_lines(limit=limit),
+        "lines": [audit_index.format_record(record) for record in records],
+        "records": records,
     }
 
 
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the project root to sys.path to allow imports if run as a script
+project_root = Path(__file__).parent.parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from tools.gimo_server.config import AUDIT_LOG_PATH
+from tools.gimo_server.security.audit import verify_audit_chain
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Verify the hash chain of the GIMO audit log")
+    parser.add_argument("path", nargs="?", default=str(AUDIT_LOG_PATH), help="Active audit log file")
+    parser.add_argument("--expect-last", help="Last chain hash previously recorded out of band")
+    args = parser.parse_args()
+
+    report = verify_audit_chain(Path(args.path), expected_last_hash=args.expect_last)
+    print(f"files: {len(report.files)}  records: {report.records}  unchained: {report.unchained}")
+    print(f"last hash: {report.last_hash}")
+    if not report.ok:
+        print(f"CHAIN BROKEN: {report.error}" + (f" at {report.location}" if report.location else ""), file=sys.stderr)
+        sys.exit(1)
+    print("chain OK")
+
+
+if __name__ == "__main__":
+    main()
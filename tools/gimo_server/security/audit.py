@@ -1,12 +1,36 @@
+import atexit
+import gzip
+import hashlib
+import json
 import logging
 import os
+import queue
 import re
-from logging.handlers import RotatingFileHandler
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from tools.gimo_server.config import (
+    AUDIT_BACKPRESSURE,
+    AUDIT_COMPRESS_ROTATED,
     AUDIT_LOG_BACKUP_COUNT,
     AUDIT_LOG_MAX_BYTES,
     AUDIT_LOG_PATH,
+    AUDIT_QUEUE_SIZE,
+)
+
+from .audit_index import (
+    SegmentBuilder,
+    append_segment,
+    audit_log_files,
+    index_path,
+    is_anchor,
+    open_log,
 )
 
 # Redaction Patterns
@@ -25,20 +49,383 @@ def redact_sensitive_data(content: str) -> str:
     return content
 
 
+# Hash chain
+# Records are single-line JSON objects whose last field is
+# ``"chain":"<sha256(previous hash + "\n" + record without that field)>"``.
+# Each file starts with an ``{"anchor":"<hash>"}`` line carrying the last hash
+# of the previous file, so the chain survives rotation and restarts. The
+# verifier also accepts the earlier text layout (`` | CHAIN:<hash>`` suffix and
+# ``CHAIN-ANCHOR:<hash>`` lines).
+CHAIN_FIELD = ',"chain":"'
+CHAIN_SEPARATOR = " | CHAIN:"
+ANCHOR_PREFIX = "CHAIN-ANCHOR:"
+GENESIS_HASH = "0" * 64
+_TAIL_SCAN_BYTES = 64 * 1024
+
+
+def chain_hash(prev: str, line: str) -> str:
+    return hashlib.sha256(f"{prev}\n{line}".encode("utf-8")).hexdigest()
+
+
+def _split_chained(line: str) -> Optional[Tuple[str, str]]:
+    """(hashed body, digest) of a chained record line, or None."""
+    if line.startswith("{") and line.endswith('"}'):
+        idx = line.rfind(CHAIN_FIELD)
+        if idx != -1 and len(line) - idx == len(CHAIN_FIELD) + 64 + 2:
+            return line[:idx] + "}", line[idx + len(CHAIN_FIELD):-2]
+    if CHAIN_SEPARATOR in line:
+        body, digest = line.rsplit(CHAIN_SEPARATOR, 1)
+        return body, digest.strip()
+    return None
+
+
+def _anchor_of(line: str) -> Optional[str]:
+    if line.startswith(ANCHOR_PREFIX):
+        return line[len(ANCHOR_PREFIX):].strip()
+    if is_anchor(line):
+        try:
+            return str(json.loads(line)["anchor"])
+        except (ValueError, KeyError):
+            return None
+    return None
+
+
+def _last_chain_hash(path: Path) -> Optional[str]:
+    """Hash the chain continues from, read from the tail of ``path``; None if it has none."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - _TAIL_SCAN_BYTES))
+            tail = f.read().decode("utf-8", errors="replace")
+    except OSError:
+        return None
+    for line in reversed(tail.split("\n")):
+        line = line.rstrip("\r")
+        chained = _split_chained(line)
+        if chained is not None:
+            return chained[1]
+        anchor = _anchor_of(line)
+        if anchor is not None:
+            return anchor
+    return None
+
+
+class AuditJsonFormatter(logging.Formatter):
+    """One JSON object per record; ``audit_log`` records carry fixed op/path/range/hash/actor fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+        }
+        fields = getattr(record, "audit", None)
+        if isinstance(fields, dict):
+            payload.update(fields)
+        else:
+            message = record.getMessage()
+            if record.exc_info and not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            if record.exc_text:
+                message = f"{message}\n{record.exc_text}"
+            payload["logger"] = record.name
+            payload["msg"] = message
+        return json.dumps(payload, separators=(",", ":"))
+
+
+def _gzip_namer(name: str) -> str:
+    return name + ".gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+class ChainedRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler that hash-chains one-line records and indexes them by segment.
+
+    Records are formatted with :class:`AuditJsonFormatter` by default. Every
+    hour boundary, ``SEGMENT_MAX_BYTES`` of records or rotation closes the
+    current segment and appends its summary to the sidecar index (see
+    :mod:`.audit_index`); the index follows its file through rotation. With
+    ``compress`` rotated files are gzipped. The stream is flushed every
+    ``FLUSH_EVERY`` records or when :meth:`flush` is called (the queue
+    listener does so whenever its queue drains).
+    """
+
+    FLUSH_EVERY = 256
+
+    def __init__(
+        self, filename, mode="a", maxBytes=0, backupCount=0, encoding=None, delay=False, compress=False
+    ):
+        recovered = _last_chain_hash(Path(filename))
+        self._prev = recovered or GENESIS_HASH
+        # A pre-existing file without chained lines still needs an anchor before our first record.
+        self._needs_anchor = recovered is None
+        self._pending = 0
+        self._offset = 0
+        self._segment_start: Optional[int] = None
+        self._segment: Optional[SegmentBuilder] = None
+        super().__init__(filename, mode, maxBytes, backupCount, encoding, delay)
+        self.setFormatter(AuditJsonFormatter())
+        if compress:
+            self.namer = _gzip_namer
+            self.rotator = _gzip_rotator
+
+    def _line_bytes(self, line: str) -> int:
+        return len(line.encode(self.encoding or "utf-8")) + len(os.linesep)
+
+    def _open(self):
+        stream = super()._open()
+        self._offset = os.path.getsize(self.baseFilename)
+        self._segment_start = self._offset  # the first segment also covers the anchor
+        if self._needs_anchor or self._offset == 0:
+            anchor = json.dumps({"anchor": self._prev}, separators=(",", ":"))
+            stream.write(anchor + "\n")
+            self._offset += self._line_bytes(anchor)
+            self._needs_anchor = False
+        return stream
+
+    def _close_segment(self) -> None:
+        if self._segment is not None:
+            append_segment(Path(self.baseFilename), self._segment)
+            self._segment = None
+
+    def _move_index(self, src_log: str, dst_log: str) -> None:
+        src, dst = index_path(Path(src_log)), index_path(Path(dst_log))
+        if src.exists():
+            os.replace(src, dst)
+        else:
+            dst.unlink(missing_ok=True)
+
+    def doRollover(self) -> None:
+        self._close_segment()
+        if self.backupCount > 0:
+            # Same shifts as RotatingFileHandler.doRollover, applied to the sidecar indexes.
+            for i in range(self.backupCount - 1, 0, -1):
+                sfn = self.rotation_filename(f"{self.baseFilename}.{i}")
+                if os.path.exists(sfn):
+                    self._move_index(sfn, self.rotation_filename(f"{self.baseFilename}.{i + 1}"))
+            self._move_index(self.baseFilename, self.rotation_filename(f"{self.baseFilename}.1"))
+        super().doRollover()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            body = self.format(record)
+            hour = int(record.created // 3600)
+            if self._segment is not None and (self._segment.hour != hour or self._segment.full()):
+                self._close_segment()
+            if self._segment is None:
+                start = self._offset if self._segment_start is None else self._segment_start
+                self._segment = SegmentBuilder(start, hour)
+                self._segment_start = None
+
+            if body.startswith("{") and body.endswith("}"):
+                digest = chain_hash(self._prev, body)
+                line = f'{body[:-1]}{CHAIN_FIELD}{digest}"}}'
+            else:
+                body = body.replace("\r", "\\r").replace("\n", "\\n")
+                digest = chain_hash(self._prev, body)
+                line = f"{body}{CHAIN_SEPARATOR}{digest}"
+            self.stream.write(line + "\n")
+            self._prev = digest
+            self._offset += self._line_bytes(line)
+
+            fields = getattr(record, "audit", None) or {}
+            self._segment.add(self._offset, record.created, fields.get("op"), fields.get("actor"))
+            self._pending += 1
+            if self._pending >= self.FLUSH_EVERY:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        super().flush()
+        self._pending = 0
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            self._close_segment()
+        finally:
+            self.release()
+        super().close()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Queue handler with an explicit policy for a full queue.
+
+    ``block`` waits up to ``BLOCK_TIMEOUT_SECONDS`` for room. ``drop`` sheds
+    INFO and DEBUG records immediately; WARNING and above still wait. Whatever
+    is shed is counted and reported by an ``AUDIT_DROPPED`` record as soon as
+    the queue has room again, so gaps are visible in the chain.
+    """
+
+    BLOCK_TIMEOUT_SECONDS = 5.0
+
+    def __init__(self, q: "queue.Queue[logging.LogRecord]", policy: str = "block"):
+        super().__init__(q)
+        self.policy = policy if policy in {"block", "drop"} else "block"
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def _drop(self) -> None:
+        with self._dropped_lock:
+            self.dropped += 1
+
+    def _report_drops(self) -> None:
+        with self._dropped_lock:
+            count, self.dropped = self.dropped, 0
+        if not count:
+            return
+        notice = logging.makeLogRecord(
+            {"name": "orchestrator.audit", "levelno": logging.WARNING, "levelname": "WARNING",
+             "msg": f"AUDIT_DROPPED | COUNT:{count}"}
+        )
+        try:
+            self.queue.put_nowait(notice)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += count
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.dropped:
+            self._report_drops()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.policy == "drop" and record.levelno < logging.WARNING:
+                self._drop()
+                return
+            try:
+                self.queue.put(record, timeout=self.BLOCK_TIMEOUT_SECONDS)
+            except queue.Full:
+                self._drop()
+
+
+class _BatchingQueueListener(QueueListener):
+    """Flushes its handlers only once the queue has drained, batching disk writes."""
+
+    def dequeue(self, block):
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return super().dequeue(block)
+
+
 # Audit Logger
 os.makedirs(AUDIT_LOG_PATH.parent, exist_ok=True)
-_audit_handler = RotatingFileHandler(
+_audit_handler = ChainedRotatingFileHandler(
     AUDIT_LOG_PATH,
     maxBytes=AUDIT_LOG_MAX_BYTES,
     backupCount=AUDIT_LOG_BACKUP_COUNT,
     encoding="utf-8",
+    compress=AUDIT_COMPRESS_ROTATED,
 )
+_audit_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=max(1, AUDIT_QUEUE_SIZE))
+_queue_handler = BoundedQueueHandler(_audit_queue, AUDIT_BACKPRESSURE)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+_audit_listener = _BatchingQueueListener(_audit_queue, _audit_handler, respect_handler_level=True)
+_audit_listener.start()
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s",
-    handlers=[_audit_handler],
+    handlers=[_queue_handler],
 )
 
+
+def flush_audit_log(timeout: float = 5.0) -> bool:
+    """Wait until every queued record is on disk. Returns False on timeout."""
+    deadline = time.monotonic() + timeout
+    while _audit_queue.unfinished_tasks:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.005)
+    _audit_handler.acquire()
+    try:
+        _audit_handler.flush()
+    finally:
+        _audit_handler.release()
+    return True
+
+
+def _stop_audit_listener() -> None:
+    if _audit_listener._thread is not None:
+        _audit_listener.stop()
+    _audit_handler.close()
+
+
+atexit.register(_stop_audit_listener)
+
+
+@dataclass
+class AuditChainReport:
+    ok: bool
+    records: int = 0
+    files: List[str] = field(default_factory=list)
+    unchained: int = 0  # lines written before chaining was enabled
+    last_hash: Optional[str] = None
+    error: Optional[str] = None
+    location: Optional[str] = None
+
+
+def verify_audit_chain(
+    path: Path = AUDIT_LOG_PATH, *, expected_last_hash: Optional[str] = None
+) -> AuditChainReport:
+    """Walk the hash chain across ``path`` and its rotated backups.
+
+    Detects edited, inserted or removed records and missing rotated files.
+    Truncating the newest records is only detectable when ``expected_last_hash``
+    (a previously observed ``last_hash``) is supplied.
+    """
+    report = AuditChainReport(ok=True)
+    prev: Optional[str] = None
+
+    def fail(message: str, where: str) -> AuditChainReport:
+        report.ok, report.error, report.location = False, message, where
+        return report
+
+    for file_path in audit_log_files(path):
+        report.files.append(str(file_path))
+        with open_log(file_path) as f:
+            for lineno, raw in enumerate(f, start=1):
+                line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                where = f"{file_path}:{lineno}"
+                anchor = _anchor_of(line)
+                chained = _split_chained(line) if anchor is None else None
+                if anchor is not None:
+                    if prev is not None and anchor != prev:
+                        return fail("anchor does not continue the previous record", where)
+                    prev = anchor
+                elif chained is not None:
+                    if prev is None:
+                        return fail("chained record before any anchor", where)
+                    body, digest = chained
+                    if chain_hash(prev, body) != digest:
+                        return fail("hash mismatch", where)
+                    prev = digest
+                    report.records += 1
+                elif not line:
+                    continue
+                elif prev is None:
+                    report.unchained += 1
+                else:
+                    return fail("unchained line inside the chain", where)
+
+    report.last_hash = prev
+    if expected_last_hash and prev != expected_last_hash:
+        report.ok = False
+        report.error = "chain does not end at the expected hash (records removed from the end)"
+    return report
+
+
 from .common import get_safe_actor
 
 
@@ -50,7 +437,8 @@ def audit_log(
     log_msg = (
         f"OP:{operation} | PATH:{path} | RANGE:{ranges} | HASH:{res_hash} | ACTOR:{safe_actor}"
     )
-    logging.info(log_msg)
+    fields = {"op": operation, "path": path, "range": ranges, "hash": res_hash, "actor": safe_actor}
+    logging.info(log_msg, extra={"audit": fields})
 
 
 def log_panic(
@@ -0,0 +1,347 @@
+"""Reading side of the audit log: sidecar segment index, tail reads and filtered queries.
+
+The writer (:class:`~tools.gimo_server.security.audit.ChainedRotatingFileHandler`)
+emits one JSON record per line and, every time it closes a segment (an hour
+boundary, ``SEGMENT_MAX_BYTES`` of records or a rotation), appends a summary to
+``<logfile>.idx``: the segment's byte range, time span, operation counts and
+actors. Queries only read the segments whose summary can match, plus any byte
+ranges the index does not cover (the open segment, or records written before
+a restart). Rotated files may be gzipped; offsets always refer to the
+uncompressed stream.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+
+from tools.gimo_server.config import AUDIT_LOG_PATH
+
+logger = logging.getLogger("orchestrator.security.audit_index")
+
+INDEX_SUFFIX = ".idx"
+SEGMENT_MAX_BYTES = 256 * 1024
+SEGMENT_MAX_ACTORS = 64
+_TAIL_BLOCK_BYTES = 64 * 1024
+
+AuditRecord = Dict[str, Any]
+
+
+def index_path(log_file: Path) -> Path:
+    """Sidecar index of ``log_file`` (``audit.log.3.gz`` -> ``audit.log.3.idx``)."""
+    name = log_file.name[:-3] if log_file.name.endswith(".gz") else log_file.name
+    return log_file.with_name(name + INDEX_SUFFIX)
+
+
+def audit_log_files(path: Path = AUDIT_LOG_PATH) -> List[Path]:
+    """The active log and its rotated (optionally gzipped) backups, oldest first."""
+    path = Path(path)
+    backups = []
+    for candidate in path.parent.glob(f"{path.name}.*"):
+        suffix = candidate.name[len(path.name) + 1:]
+        if suffix.endswith(".gz"):
+            suffix = suffix[:-3]
+        if suffix.isdigit():
+            backups.append((int(suffix), candidate))
+    files = [p for _, p in sorted(backups, reverse=True)]
+    if path.exists():
+        files.append(path)
+    return files
+
+
+def open_log(log_file: Path) -> IO[bytes]:
+    if log_file.name.endswith(".gz"):
+        return gzip.open(log_file, "rb")
+    return open(log_file, "rb")
+
+
+def is_anchor(line: str) -> bool:
+    return line.startswith('{"anchor":') or line.startswith("CHAIN-ANCHOR:")
+
+
+def parse_record(line: str) -> Optional[AuditRecord]:
+    """Decode one structured record; None for anchors and pre-structured text lines."""
+    if not line.startswith("{") or is_anchor(line):
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def record_epoch(record: AuditRecord) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(str(record.get("ts"))).timestamp()
+    except ValueError:
+        return None
+
+
+def format_record(record: AuditRecord) -> str:
+    """Human-readable one-liner in the legacy ``ts | LEVEL | OP:... | ...`` layout."""
+    head = f"{record.get('ts')} | {record.get('level')}"
+    if "op" in record:
+        return (
+            f"{head} | OP:{record.get('op')} | PATH:{record.get('path')}"
+            f" | RANGE:{record.get('range')} | HASH:{record.get('hash')}"
+            f" | ACTOR:{record.get('actor')}"
+        )
+    return f"{head} | {record.get('msg', '')}"
+
+
+# ── Sidecar index ─────────────────────────────────────────
+
+
+class SegmentBuilder:
+    """Accumulates the summary of the segment currently being written."""
+
+    def __init__(self, start: int, hour: int):
+        self.start = start
+        self.end = start
+        self.hour = hour
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+        self.ops: Dict[str, int] = {}
+        self.actors: Optional[set] = set()
+
+    def add(self, end: int, ts: float, op: Optional[str], actor: Optional[str]) -> None:
+        self.end = end
+        if self.first_ts is None:
+            self.first_ts = ts
+        self.last_ts = ts
+        key = op or "_log"
+        self.ops[key] = self.ops.get(key, 0) + 1
+        if self.actors is not None and actor is not None:
+            self.actors.add(actor)
+            if len(self.actors) > SEGMENT_MAX_ACTORS:
+                self.actors = None  # too many to list: the segment matches any actor
+
+    def full(self) -> bool:
+        return self.end - self.start >= SEGMENT_MAX_BYTES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "start": self.start,
+            "end": self.end,
+            "hour": self.hour,
+            "first_ts": self.first_ts,
+            "last_ts": self.last_ts,
+            "ops": self.ops,
+            "actors": sorted(self.actors) if self.actors is not None else None,
+        }
+
+
+def append_segment(log_file: Path, segment: SegmentBuilder) -> None:
+    if segment.end <= segment.start:
+        return
+    try:
+        with open(index_path(log_file), "a", encoding="utf-8") as f:
+            f.write(json.dumps(segment.to_dict(), separators=(",", ":")) + "\n")
+    except OSError as exc:
+        logger.warning("Failed to append audit index segment for %s: %s", log_file, exc)
+
+
+def load_segments(log_file: Path) -> List[Dict[str, Any]]:
+    segments: List[Dict[str, Any]] = []
+    try:
+        with open(index_path(log_file), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    segments.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        return []
+    segments.sort(key=lambda s: s.get("start", 0))
+    return segments
+
+
+def _uncompressed_size(log_file: Path) -> int:
+    if not log_file.name.endswith(".gz"):
+        return log_file.stat().st_size
+    # ISIZE trailer of a single-member gzip file (rotated logs stay far below 4 GiB).
+    with open(log_file, "rb") as f:
+        f.seek(-4, os.SEEK_END)
+        return int.from_bytes(f.read(4), "little")
+
+
+def _segment_matches(
+    segment: Dict[str, Any],
+    operation: Optional[str],
+    actor: Optional[str],
+    since: Optional[float],
+    until: Optional[float],
+) -> bool:
+    if since is not None and (segment.get("last_ts") or 0.0) < since:
+        return False
+    if until is not None and (segment.get("first_ts") or 0.0) > until:
+        return False
+    if operation is not None and operation not in (segment.get("ops") or {}):
+        return False
+    actors = segment.get("actors")
+    if actor is not None and actors is not None and actor not in actors:
+        return False
+    return True
+
+
+def candidate_ranges(
+    log_file: Path,
+    *,
+    operation: Optional[str] = None,
+    actor: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+) -> List[Tuple[int, int]]:
+    """Byte ranges of ``log_file`` that may hold matching records, in file order."""
+    ranges: List[Tuple[int, int]] = []
+    cursor = 0
+    for segment in load_segments(log_file):
+        start, end = int(segment.get("start", 0)), int(segment.get("end", 0))
+        if start > cursor:
+            ranges.append((cursor, start))  # not covered by the index
+        if _segment_matches(segment, operation, actor, since, until):
+            ranges.append((start, end))
+        cursor = max(cursor, end)
+    size = _uncompressed_size(log_file)
+    if size > cursor:
+        ranges.append((cursor, size))
+    merged: List[Tuple[int, int]] = []
+    for start, end in ranges:
+        if merged and merged[-1][1] == start:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+# ── Reads ─────────────────────────────────────────────────
+
+
+def _read_lines(log_file: Path, start: int, end: int) -> List[str]:
+    with open_log(log_file) as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return data.decode("utf-8", errors="replace").splitlines()
+
+
+def _reverse_lines(log_file: Path) -> Iterator[str]:
+    """Lines of ``log_file`` newest first, reading fixed blocks backwards from the end."""
+    if log_file.name.endswith(".gz"):
+        with gzip.open(log_file, "rb") as f:
+            lines = f.read().decode("utf-8", errors="replace").splitlines()
+        yield from reversed(lines)
+        return
+    with open(log_file, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while pos > 0:
+            step = min(_TAIL_BLOCK_BYTES, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + remainder
+            parts = chunk.split(b"\n")
+            remainder = parts.pop(0)
+            for part in reversed(parts):
+                if part:
+                    yield part.decode("utf-8", errors="replace").rstrip("\r")
+        if remainder:
+            yield remainder.decode("utf-8", errors="replace").rstrip("\r")
+
+
+def tail_lines(limit: int = 200, path: Path = AUDIT_LOG_PATH) -> List[str]:
+    """Last ``limit`` entries across the active log and backups, oldest first.
+
+    Structured records are rendered with :func:`format_record`; chain anchors are skipped.
+    """
+    out: List[str] = []
+    if limit <= 0:
+        return out
+    for log_file in reversed(audit_log_files(path)):
+        try:
+            for line in _reverse_lines(log_file):
+                if not line or is_anchor(line):
+                    continue
+                record = parse_record(line)
+                out.append(format_record(record) if record is not None else line)
+                if len(out) >= limit:
+                    return out[::-1]
+        except OSError as exc:
+            logger.warning("Failed to read audit log %s: %s", log_file, exc)
+    return out[::-1]
+
+
+def _matches(
+    record: AuditRecord,
+    operation: Optional[str],
+    actor: Optional[str],
+    path_contains: Optional[str],
+    since: Optional[float],
+    until: Optional[float],
+) -> bool:
+    if operation is not None and record.get("op") != operation:
+        return False
+    if actor is not None and record.get("actor") != actor:
+        return False
+    if path_contains is not None and path_contains not in str(record.get("path", "")):
+        return False
+    if since is None and until is None:
+        return True
+    ts = record_epoch(record)
+    if ts is None:
+        return False
+    return (since is None or ts >= since) and (until is None or ts <= until)
+
+
+def query(
+    *,
+    operation: Optional[str] = None,
+    actor: Optional[str] = None,
+    path_contains: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    limit: int = 200,
+    path: Path = AUDIT_LOG_PATH,
+) -> List[AuditRecord]:
+    """Most recent ``limit`` structured records matching every given filter, oldest first.
+
+    ``since`` / ``until`` are epoch seconds. Files and segments whose index
+    summary rules them out are never read.
+    """
+    matches: List[AuditRecord] = []
+    for log_file in reversed(audit_log_files(path)):
+        if since is not None and _older_than(log_file, since):
+            break
+        try:
+            ranges = candidate_ranges(
+                log_file, operation=operation, actor=actor, since=since, until=until
+            )
+            for start, end in reversed(ranges):
+                hits = [
+                    record
+                    for record in map(parse_record, _read_lines(log_file, start, end))
+                    if record is not None
+                    and _matches(record, operation, actor, path_contains, since, until)
+                ]
+                matches.extend(reversed(hits))
+                if len(matches) >= limit:
+                    return matches[:limit][::-1]
+        except OSError as exc:
+            logger.warning("Failed to query audit log %s: %s", log_file, exc)
+    return matches[::-1]
+
+
+def _older_than(log_file: Path, since: float) -> bool:
+    """True when the index proves ``log_file`` ends before ``since`` (so older backups do too)."""
+    segments = load_segments(log_file)
+    if not segments:
+        return False
+    last = segments[-1]
+    try:
+        covered = int(last.get("end", 0)) >= _uncompressed_size(log_file)
+    except OSError:
+        return False
+    return covered and (last.get("last_ts") or 0.0) < since
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import hashlib
+import hmac
 import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
 from cryptography.hazmat.primitives.serialization import load_pem_public_key
 
+logger = logging.getLogger("orchestrator.security.integrity")
 
 _EMBEDDED_INTEGRITY_PUBLIC_KEY = """-----BEGIN PUBLIC KEY-----
 MCowBQYDK2VwAyEA5E1Dqf8m7bYQYICcT6VNojJJEcR4cSxC11K3P0kVh6s=
@@ -20,12 +29,55 @@ def _sha256_normalized(file_path: Path) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+StatKey = Tuple[int, int, int, int]
+
+
+def _stat_key(file_path: Path) -> Optional[StatKey]:
+    """(size, mtime_ns, inode, ctime_ns) of a regular file, None if missing."""
+    try:
+        st = file_path.stat()
+    except OSError:
+        return None
+    if not os.path.isfile(file_path):
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ino, st.st_ctime_ns)
+
+
 class IntegrityVerifier:
+    """Verifies the signed file manifest.
+
+    File hashes are remembered in a stat cache: a file whose (size, mtime_ns,
+    inode, ctime_ns) is unchanged since it was last hashed is not read again.
+    ctime cannot be set from user space, so touching a file back to its old
+    mtime still forces a re-hash. Files modified within ``RACY_WINDOW_NS`` of
+    the check are never cached, since a second write in the same timestamp
+    tick would be invisible. Cache misses are hashed in parallel.
+
+    The cache lives in process memory. It is only persisted (for faster
+    restarts) when ``integrity_cache_key`` is configured, and then carries an
+    HMAC under that key: whoever can edit a manifest file and the OPS data dir
+    must not be able to forge a matching cache entry. A persisted cache that
+    fails authentication is ignored.
+    """
+
+    HASH_WORKERS = 8
+    RACY_WINDOW_NS = 2_000_000_000
+    CACHE_VERSION = 2
+
+    _memory: Dict[Tuple[str, str], Dict[str, list]] = {}
+    _memory_lock = threading.Lock()
+
     def __init__(self, settings):
         self._enabled = bool(getattr(settings, "integrity_check_enabled", True))
         self._manifest_path = Path(getattr(settings, "integrity_manifest_path", ".gimo_manifest"))
         self._base_dir = Path(getattr(settings, "base_dir", Path.cwd()))
         self._debug = bool(getattr(settings, "debug", False))
+        cache_path = getattr(settings, "integrity_stat_cache_path", None)
+        self._cache_path = Path(cache_path) if cache_path else None
+        cache_key = str(getattr(settings, "integrity_cache_key", "") or "")
+        self._cache_key = cache_key.encode("utf-8") if cache_key else None
+        self._files: Dict[str, str] = {}
+        self._manifest_digest = ""
 
         configured_key = str(getattr(settings, "integrity_public_key_pem", "") or "").strip()
         pem = configured_key.replace("\\n", "\n") if configured_key else _EMBEDDED_INTEGRITY_PUBLIC_KEY
@@ -53,7 +105,11 @@ class IntegrityVerifier:
             return True, f"{reason}_debug_bypass"
         return False, reason
 
-    def verify_manifest(self) -> tuple[bool, str]:
+    def verify_manifest(self, *, use_cache: bool = True) -> tuple[bool, str]:
+        """Check the manifest signature and every listed file.
+
+        ``use_cache=False`` re-hashes every file regardless of the stat cache.
+        """
         if not self._enabled:
             return True, "disabled"
 
@@ -96,17 +152,145 @@ class IntegrityVerifier:
         files = manifest.get("files")
         if not isinstance(files, dict):
             return False, "invalid_manifest"
-
         for rel_path, expected_hash in files.items():
             if not isinstance(rel_path, str) or not isinstance(expected_hash, str):
                 return False, "invalid_manifest"
 
-            abs_path = (self._base_dir / rel_path).resolve()
-            if not abs_path.exists() or not abs_path.is_file():
-                return False, "file_missing"
+        self._files = dict(files)
+        self._manifest_digest = hashlib.sha256(manifest_bytes).hexdigest()
+        return self._verify_files(self._files, use_cache=use_cache)
 
-            actual_hash = _sha256_normalized(abs_path)
-            if actual_hash != expected_hash:
-                return False, "hash_mismatch"
+    # -- File verification --------------------------------------------------
+
+    def _abs_path(self, rel_path: str) -> Path:
+        return (self._base_dir / rel_path).resolve()
+
+    def _memory_key(self) -> Tuple[str, str]:
+        return (str(self._cache_path or ""), self._manifest_digest)
+
+    def _mac(self, body: bytes) -> str:
+        assert self._cache_key is not None
+        return hmac.new(self._cache_key, body, hashlib.sha256).hexdigest()
 
+    def _load_cache(self) -> Dict[str, list]:
+        with self._memory_lock:
+            entries = self._memory.get(self._memory_key())
+        if entries is not None:
+            return dict(entries)
+        if self._cache_path is None or self._cache_key is None:
+            return {}
+        try:
+            data = json.loads(self._cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or not isinstance(data.get("body"), str):
+            return {}
+        expected = self._mac(data["body"].encode("utf-8"))
+        if not hmac.compare_digest(str(data.get("mac", "")), expected):
+            logger.warning("Ignoring integrity stat cache with a bad MAC: %s", self._cache_path)
+            return {}
+        try:
+            body = json.loads(data["body"])
+        except ValueError:
+            return {}
+        if (
+            not isinstance(body, dict)
+            or body.get("version") != self.CACHE_VERSION
+            or body.get("manifest") != self._manifest_digest
+            or not isinstance(body.get("entries"), dict)
+        ):
+            return {}
+        return body["entries"]
+
+    def _save_cache(self, entries: Dict[str, list]) -> None:
+        with self._memory_lock:
+            self._memory[self._memory_key()] = dict(entries)
+        if self._cache_path is None or self._cache_key is None:
+            return
+        body = json.dumps(
+            {"version": self.CACHE_VERSION, "manifest": self._manifest_digest, "entries": entries},
+            separators=(",", ":"),
+        )
+        payload = {"body": body, "mac": self._mac(body.encode("utf-8"))}
+        tmp = self._cache_path.with_name(self._cache_path.name + ".tmp")
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self._cache_path)
+        except OSError as exc:
+            logger.warning("Failed to persist integrity stat cache: %s", exc)
+
+    def _verify_files(self, files: Dict[str, str], *, use_cache: bool = True) -> tuple[bool, str]:
+        """Check ``files`` (rel path -> expected hash).
+
+        Reports the first failure in manifest order.
+        """
+        cache = self._load_cache()
+        lookup = cache if use_cache else {}
+        stats: Dict[str, Optional[StatKey]] = {rel: _stat_key(self._abs_path(rel)) for rel in files}
+        actual: Dict[str, str] = {}
+        misses: List[str] = []
+        for rel, key in stats.items():
+            entry = lookup.get(rel)
+            if key is not None and isinstance(entry, list) and len(entry) == 5 and tuple(entry[:4]) == key:
+                actual[rel] = entry[4]
+            elif key is not None:
+                misses.append(rel)
+
+        if misses:
+            workers = max(1, min(self.HASH_WORKERS, len(misses)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="integrity") as pool:
+                hashed = pool.map(lambda rel: _sha256_normalized(self._abs_path(rel)), misses)
+                actual.update(zip(misses, hashed))
+
+        racy_before = time.time_ns() - self.RACY_WINDOW_NS
+        entries = {
+            rel: [*key, actual[rel]]
+            for rel, key in stats.items()
+            if key is not None and rel in actual and key[1] < racy_before and key[3] < racy_before
+        }
+        merged = {rel: entry for rel, entry in cache.items() if rel not in stats}
+        merged.update(entries)
+        if merged != cache:
+            self._save_cache(merged)
+
+        for rel, expected_hash in files.items():
+            if stats[rel] is None:
+                return False, "file_missing"
+            if actual[rel] != expected_hash:
+                return False, "hash_mismatch"
         return True, "ok"
+
+    def verify_paths(self, changed: Iterable[Path]) -> tuple[bool, str]:
+        """Re-verify only the manifest files among ``changed``.
+
+        Only meaningful after :meth:`verify_manifest` succeeded.
+        """
+        changed_abs = {Path(p).resolve() for p in changed}
+        subset = {rel: h for rel, h in self._files.items() if self._abs_path(rel) in changed_abs}
+        if not subset:
+            return True, "ok"
+        return self._verify_files(subset)
+
+    async def watch(self) -> AsyncIterator[tuple[bool, str]]:
+        """Yield a verification result each time a manifest file changes on disk.
+
+        Uses ``watchfiles`` (inotify on Linux) on the manifest files' directories;
+        yields nothing when it is not installed or the manifest was not verified.
+        """
+        if not self._files:
+            return
+        try:
+            from watchfiles import awatch
+        except ImportError:
+            logger.info("watchfiles not installed; integrity relies on the periodic recheck")
+            return
+        targets = {self._abs_path(rel) for rel in self._files}
+        dirs = sorted({str(p.parent) for p in targets if p.parent.exists()})
+        async for changes in awatch(
+            *dirs,
+            recursive=False,
+            watch_filter=lambda _change, path: Path(path).resolve() in targets,
+        ):
+            changed = [Path(path) for _change, path in changes]
+            yield await asyncio.to_thread(self.verify_paths, changed)
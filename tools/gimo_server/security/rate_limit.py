@@ -1,45 +1,136 @@
-from datetime import datetime
+"""Token-bucket rate limiting keyed by (principal, route class).
+
+Each bucket holds up to ``RATE_LIMIT_PER_MIN`` tokens and refills continuously
+at ``RATE_LIMIT_PER_MIN / RATE_LIMIT_WINDOW_SECONDS`` tokens per second, scaled
+down by the current threat level. A request spends the cost of its route class
+(``RATE_LIMIT_ROUTE_COSTS``), so searches and executions drain faster than
+plain reads. Refill happens lazily when a bucket is touched; there is no timer.
+
+Buckets live in ``SHARD_COUNT`` plain dicts. Reads and writes of a single key
+rely on the atomicity of dict operations instead of a lock, so two concurrent
+requests on the same bucket may both be admitted with the same tokens; that
+slack of one request is accepted in exchange for never serialising the
+request path. Idle buckets are pruned one shard at a time.
+"""
+import hashlib
+import math
+import re
+import time
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, Request
 
 from tools.gimo_server.config import (
     RATE_LIMIT_CLEANUP_SECONDS,
     RATE_LIMIT_PER_MIN,
+    RATE_LIMIT_ROUTE_COSTS,
     RATE_LIMIT_WINDOW_SECONDS,
+    TOKENS,
 )
+from tools.gimo_server.security.threat_level import RATE_LIMIT_REFILL_FACTORS
+
+SHARD_COUNT = 16
+
+# (route class, methods or None for any, path pattern), first match wins.
+ROUTE_CLASSES: List[Tuple[str, Optional[frozenset], "re.Pattern[str]"]] = [
+    ("search", None, re.compile(r"^/search$|^/ops/search/")),
+    (
+        "execute",
+        frozenset({"POST", "PUT"}),
+        re.compile(
+            r"/(execute|approve|batch-approve|generate|generate-plan|slice0-pipeline|spawn|fork)$"
+            r"|^/ops/(runs|evals/run|workflows/execute)$"
+        ),
+    ),
+]
+
+BucketKey = Tuple[str, str]
+
+
+class TokenBucketStore:
+    """Sharded ``(principal, route class) -> [tokens, last refill]`` map."""
+
+    def __init__(self, shards: int = SHARD_COUNT):
+        self._shards: List[Dict[BucketKey, List[float]]] = [{} for _ in range(shards)]
+        self._next_sweep = 0
+        self._last_sweep = time.monotonic()
+
+    def _shard(self, key: BucketKey) -> Dict[BucketKey, List[float]]:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def take(self, key: BucketKey, cost: float, capacity: float, rate: float, now: float) -> float:
+        """Spend ``cost`` tokens; returns 0.0 on success or the seconds until enough have refilled."""
+        shard = self._shard(key)
+        bucket = shard.get(key)
+        if bucket is None:
+            bucket = shard.setdefault(key, [capacity, now])
+        tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens >= cost:
+            bucket[0] = tokens - cost
+            return 0.0
+        bucket[0] = tokens
+        return (cost - tokens) / rate if rate > 0 else float("inf")
+
+    def tokens(self, key: BucketKey) -> Optional[float]:
+        bucket = self._shard(key).get(key)
+        return bucket[0] if bucket is not None else None
 
-rate_limit_store = {}
-_last_cleanup = datetime.now()
+    def sweep(self, now: float, capacity: float, rate: float) -> None:
+        """Drop buckets of one shard that have refilled completely (they equal a fresh bucket)."""
+        if now - self._last_sweep < RATE_LIMIT_CLEANUP_SECONDS / len(self._shards):
+            return
+        self._last_sweep = now
+        shard = self._shards[self._next_sweep]
+        self._next_sweep = (self._next_sweep + 1) % len(self._shards)
+        for key, bucket in list(shard.items()):
+            if bucket[0] + (now - bucket[1]) * rate >= capacity:
+                shard.pop(key, None)
 
+    def clear(self) -> None:
+        for shard in self._shards:
+            shard.clear()
 
-def _cleanup_rate_limits(now: datetime):
-    global _last_cleanup
-    if (now - _last_cleanup).total_seconds() < RATE_LIMIT_CLEANUP_SECONDS:
-        return
-    to_delete = [
-        ip
-        for ip, data in rate_limit_store.items()
-        if (now - data["start_time"]).total_seconds() > RATE_LIMIT_WINDOW_SECONDS
-    ]
-    for ip in to_delete:
-        del rate_limit_store[ip]
-    _last_cleanup = now
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+rate_limit_store = TokenBucketStore()
+
+
+def route_class(method: str, path: str) -> str:
+    for name, methods, pattern in ROUTE_CLASSES:
+        if (methods is None or method in methods) and pattern.search(path):
+            return name
+    return "default"
+
+
+def _principal(request: Request) -> str:
+    """The caller's token when it is a known one, otherwise its client address."""
+    auth = request.headers.get("authorization", "")
+    if auth[:7].lower() == "bearer ":
+        token = auth[7:].strip()
+        if token in TOKENS:
+            return "token:" + hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+    return "ip:" + (request.client.host if request.client else "unknown")
+
+
+def _refill_factor() -> float:
+    from tools.gimo_server.security import threat_engine
+
+    return RATE_LIMIT_REFILL_FACTORS.get(threat_engine.level, 1.0)
 
 
 def check_rate_limit(request: Request):
-    now = datetime.now()
-    _cleanup_rate_limits(now)
-
-    client_ip = request.client.host if request.client else "unknown"
-    if client_ip not in rate_limit_store:
-        rate_limit_store[client_ip] = {"count": 1, "start_time": now}
-    else:
-        data = rate_limit_store[client_ip]
-        if (now - data["start_time"]).total_seconds() > RATE_LIMIT_WINDOW_SECONDS:
-            data["count"] = 1
-            data["start_time"] = now
-        else:
-            data["count"] += 1
-            if data["count"] > RATE_LIMIT_PER_MIN:
-                raise HTTPException(status_code=429, detail="Too many requests")
+    now = time.monotonic()
+    capacity = float(RATE_LIMIT_PER_MIN)
+    rate = capacity / max(1, RATE_LIMIT_WINDOW_SECONDS) * _refill_factor()
+    rate_limit_store.sweep(now, capacity, rate)
+
+    klass = route_class(request.method, request.url.path)
+    cost = min(capacity, float(RATE_LIMIT_ROUTE_COSTS.get(klass, RATE_LIMIT_ROUTE_COSTS.get("default", 1))))
+    wait = rate_limit_store.take((_principal(request), klass), cost, capacity, rate, now)
+    if wait > 0:
+        retry_after = str(math.ceil(wait)) if math.isfinite(wait) else str(RATE_LIMIT_WINDOW_SECONDS)
+        raise HTTPException(status_code=429, detail="Too many requests", headers={"Retry-After": retry_after})
     return None
@@ -10,10 +10,13 @@ Replaces the binary panic_mode with a 4-level defense system that:
 from __future__ import annotations
 
 import logging
+import math
 import time
+from array import array
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from enum import IntEnum
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, Hashable, List, Optional
 
 logger = logging.getLogger("orchestrator.security.threat")
 
@@ -57,6 +60,14 @@ EXCEPTION_GUARDED_THRESHOLD = 5           # security exceptions for GUARDED
 EXCEPTION_LOCKDOWN_THRESHOLD = 8          # security exceptions for LOCKDOWN
 EXCEPTION_WINDOW_SECONDS = 60
 
+# Share of the normal rate-limit refill rate granted at each level
+RATE_LIMIT_REFILL_FACTORS: Dict[ThreatLevel, float] = {
+    ThreatLevel.NOMINAL: 1.0,
+    ThreatLevel.ALERT: 0.5,
+    ThreatLevel.GUARDED: 0.25,
+    ThreatLevel.LOCKDOWN: 0.1,
+}
+
 # IPs that never cause threat escalation
 WHITELISTED_SOURCES = frozenset({
     "127.0.0.1",
@@ -81,6 +92,11 @@ OPERATIONAL_EXCEPTIONS = (
 # Source tracking cleanup (remove sources inactive for >24h)
 SOURCE_RETENTION_SECONDS = 86400
 
+# Memory bounds: least recently seen sources are evicted beyond this many,
+# and the status snapshot lists the worst TOP_SOURCES of them.
+MAX_TRACKED_SOURCES = 10000
+TOP_SOURCES = 20
+
 # ---------------------------------------------------------------------------
 # Event types
 # ---------------------------------------------------------------------------
@@ -102,6 +118,150 @@ class ThreatEvent:
     resolved: bool = False
 
 
+# ---------------------------------------------------------------------------
+# Counters and timers
+# ---------------------------------------------------------------------------
+
+class SecondCounter:
+    """Events over the last ``window`` seconds, in a fixed ring of per-second buckets."""
+
+    __slots__ = ("_buckets", "_last", "_total")
+
+    def __init__(self, window: int) -> None:
+        self._buckets = array("I", bytes(4 * max(1, window)))
+        self._last = 0
+        self._total = 0
+
+    def _advance(self, second: int) -> None:
+        gap = second - self._last
+        if gap <= 0:
+            return
+        size = len(self._buckets)
+        if gap >= size:
+            for i in range(size):
+                self._buckets[i] = 0
+            self._total = 0
+        else:
+            for s in range(self._last + 1, second + 1):
+                i = s % size
+                self._total -= self._buckets[i]
+                self._buckets[i] = 0
+        self._last = second
+
+    def add(self, now: float, count: int = 1) -> int:
+        second = int(now)
+        self._advance(second)
+        self._buckets[second % len(self._buckets)] += count
+        self._total += count
+        return self._total
+
+    def count(self, now: float) -> int:
+        self._advance(int(now))
+        return self._total
+
+    def clear(self) -> None:
+        for i in range(len(self._buckets)):
+            self._buckets[i] = 0
+        self._total = 0
+
+
+class TimingWheel:
+    """Hierarchical timing wheel with one-second resolution.
+
+    ``LEVELS`` wheels of ``2**SLOT_BITS`` slots each (64 s, ~68 min, ~3 days,
+    ~194 days). Timers are keyed so they can be rescheduled or cancelled in
+    O(1); :meth:`advance` fires due keys, cascading coarser slots down as their
+    boundary passes, and skips ahead over empty wheels.
+    """
+
+    SLOT_BITS = 6
+    LEVELS = 4
+
+    def __init__(self, now: float) -> None:
+        slots = 1 << self.SLOT_BITS
+        self._current = int(now)
+        self._wheels: List[List[Dict[Hashable, int]]] = [[{} for _ in range(slots)] for _ in range(self.LEVELS)]
+        self._counts = [0] * self.LEVELS
+        self._where: Dict[Hashable, tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def _place(self, key: Hashable, deadline: int, due: List[Hashable]) -> None:
+        if deadline <= self._current:
+            due.append(key)
+            return
+        top_shift = self.SLOT_BITS * self.LEVELS
+        # Beyond the outermost wheel: fire at its end; callers re-check and reschedule.
+        deadline = min(deadline, ((self._current >> top_shift) + 1 << top_shift) - 1)
+        for level in range(self.LEVELS):
+            shift = self.SLOT_BITS * (level + 1)
+            if deadline >> shift == self._current >> shift:
+                break
+        slot = (deadline >> (self.SLOT_BITS * level)) & ((1 << self.SLOT_BITS) - 1)
+        self._wheels[level][slot][key] = deadline
+        self._counts[level] += 1
+        self._where[key] = (level, slot)
+
+    def schedule(self, key: Hashable, at: float) -> None:
+        """(Re)schedule ``key`` to fire at epoch second ``at`` (rounded up)."""
+        self.cancel(key)
+        due: List[Hashable] = []
+        self._place(key, max(int(math.ceil(at)), self._current + 1), due)
+
+    def cancel(self, key: Hashable) -> None:
+        where = self._where.pop(key, None)
+        if where is not None:
+            level, slot = where
+            del self._wheels[level][slot][key]
+            self._counts[level] -= 1
+
+    def advance(self, now: float) -> List[Hashable]:
+        """Move the wheel to ``now`` and return the keys whose deadline has passed."""
+        target = int(now)
+        mask = (1 << self.SLOT_BITS) - 1
+        due: List[Hashable] = []
+        while self._current < target:
+            empty = 0
+            while empty < self.LEVELS and self._counts[empty] == 0:
+                empty += 1
+            if empty == self.LEVELS:
+                self._current = target
+                break
+            if empty:
+                # Nothing can fire before the next boundary of the first non-empty wheel.
+                span = 1 << (self.SLOT_BITS * empty)
+                self._current = min(target, ((self._current >> (self.SLOT_BITS * empty)) + 1) * span - 1)
+                if self._current >= target:
+                    break
+            self._current += 1
+            t = self._current
+            for level in range(self.LEVELS - 1, 0, -1):
+                shift = self.SLOT_BITS * level
+                if t & ((1 << shift) - 1):
+                    continue
+                bucket = self._wheels[level][(t >> shift) & mask]
+                if bucket:
+                    entries = list(bucket.items())
+                    bucket.clear()
+                    self._counts[level] -= len(entries)
+                    for key, deadline in entries:
+                        del self._where[key]
+                        self._place(key, deadline, due)
+            bucket = self._wheels[0][t & mask]
+            if bucket:
+                self._counts[0] -= len(bucket)
+                for key in bucket:
+                    del self._where[key]
+                    due.append(key)
+                bucket.clear()
+        return due
+
+    def clear(self) -> None:
+        for key in list(self._where):
+            self.cancel(key)
+
+
 # ---------------------------------------------------------------------------
 # Source Tracker
 # ---------------------------------------------------------------------------
@@ -114,6 +274,13 @@ class SourceRecord:
     exceptions: int = 0
     first_seen: float = 0.0
     last_seen: float = 0.0
+    recent_auth: SecondCounter = field(
+        default_factory=lambda: SecondCounter(AUTH_FAILURE_WINDOW_SECONDS), repr=False, compare=False
+    )
+
+    @property
+    def score(self) -> int:
+        return self.auth_failures + self.exceptions
 
     def is_expired(self, now: float) -> bool:
         return (now - self.last_seen) > SOURCE_RETENTION_SECONDS
@@ -123,19 +290,37 @@ class SourceRecord:
 # Threat Engine
 # ---------------------------------------------------------------------------
 
+_DECAY_TIMER = ("decay",)
+
+
 class ThreatEngine:
     """Adaptive threat evaluation engine.
 
     Singleton-like: meant to be instantiated once at app startup and shared
     across the middlewares via ``app.state.threat_engine``.
+
+    Memory stays flat however many sources show up: window counts live in
+    fixed per-second rings, at most ``MAX_TRACKED_SOURCES`` sources are kept
+    (least recently seen evicted first), recent events are a bounded deque,
+    and the worst ``TOP_SOURCES`` are maintained incrementally (and exempt
+    from eviction). Level decay
+    and source expiry are timers on a :class:`TimingWheel` advanced by
+    :meth:`tick_decay`. A source that leaves the top set (expiry, eviction)
+    is not replaced until another source is recorded.
     """
 
     def __init__(self) -> None:
+        now = time.time()
         self._level: ThreatLevel = ThreatLevel.NOMINAL
-        self._level_since: float = time.time()
-        self._events: List[ThreatEvent] = []
-        self._sources: Dict[str, SourceRecord] = {}
+        self._level_since: float = now
         self._max_events = 500  # ring-buffer cap
+        self._events: Deque[ThreatEvent] = deque(maxlen=self._max_events)
+        self._sources: "OrderedDict[str, SourceRecord]" = OrderedDict()
+        self._top: Dict[str, SourceRecord] = {}
+        self._recent_auth = SecondCounter(AUTH_FAILURE_WINDOW_SECONDS)
+        self._recent_exceptions = SecondCounter(EXCEPTION_WINDOW_SECONDS)
+        self._wheel = TimingWheel(now)
+        self._decayed = False
 
     # -- Public API ---------------------------------------------------------
 
@@ -170,23 +355,26 @@ class ThreatEngine:
     def snapshot(self) -> Dict[str, Any]:
         """Return a JSON-serialisable snapshot for the status endpoint."""
         now = time.time()
-        active_sources = [
-            {
-                "source": s.source,
-                "auth_failures": s.auth_failures,
-                "exceptions": s.exceptions,
-                "last_seen_ago": round(now - s.last_seen, 1),
-            }
-            for s in self._sources.values()
-            if not s.is_expired(now)
-        ]
+        top = sorted(
+            (s for s in self._top.values() if not s.is_expired(now)),
+            key=lambda s: (s.score, s.last_seen),
+            reverse=True,
+        )
         return {
             "threat_level": int(self._level),
             "threat_level_label": self.level_label,
             "threat_level_since": self._level_since,
             "auto_decay_remaining": self.decay_remaining_seconds(),
-            "active_sources": len(active_sources),
-            "sources": active_sources[:20],  # cap for response size
+            "active_sources": len(self._sources),
+            "sources": [
+                {
+                    "source": s.source,
+                    "auth_failures": s.auth_failures,
+                    "exceptions": s.exceptions,
+                    "last_seen_ago": round(now - s.last_seen, 1),
+                }
+                for s in top
+            ],
             "recent_events_count": len(self._events),
             # Backward compat
             "panic_mode": self._level >= ThreatLevel.LOCKDOWN,
@@ -201,7 +389,8 @@ class ThreatEngine:
             return self._level
 
         now = time.time()
-        self._touch_source(source, now, auth_failure=True)
+        rec = self._touch_source(source, now, auth_failure=True)
+        self._recent_auth.add(now)
         self._add_event(ThreatEvent(
             timestamp=now,
             event_type="auth_failure",
@@ -209,7 +398,7 @@ class ThreatEngine:
             source=source,
             detail=detail,
         ))
-        self._evaluate(now)
+        self._evaluate(now, rec.recent_auth.count(now))
         return self._level
 
     def record_exception(self, source: str, exc: Exception, *, detail: str = "") -> ThreatLevel:
@@ -223,6 +412,7 @@ class ThreatEngine:
         if not is_whitelisted:
             self._touch_source(source, now, exception=True)
 
+        self._recent_exceptions.add(now)
         self._add_event(ThreatEvent(
             timestamp=now,
             event_type="exception",
@@ -230,7 +420,7 @@ class ThreatEngine:
             source=source,
             detail=detail or str(exc)[:200],
         ))
-        self._evaluate(now)
+        self._evaluate(now, 0)
         return self._level
 
     # -- Admin actions ------------------------------------------------------
@@ -241,6 +431,10 @@ class ThreatEngine:
         for evt in self._events:
             evt.resolved = True
         self._sources.clear()
+        self._top.clear()
+        self._recent_auth.clear()
+        self._recent_exceptions.clear()
+        self._wheel.clear()
         logger.info("Threat level manually reset to NOMINAL")
 
     def downgrade(self) -> ThreatLevel:
@@ -255,41 +449,30 @@ class ThreatEngine:
 
     def tick_decay(self) -> bool:
         """Called periodically (every ~30s). Returns True if level changed."""
-        timer = DECAY_TIMERS.get(self._level)
-        if timer is None:
-            return False
-
-        elapsed = time.time() - self._level_since
-        if elapsed >= timer:
-            old = self._level
-            new_level = ThreatLevel(self._level - 1)
-            self._set_level(new_level)
-            logger.info(
-                "Threat auto-decayed %s → %s after %ds inactivity",
-                THREAT_LABELS[old], self.level_label, int(elapsed),
-            )
-            return True
-        return False
+        self._advance(time.time())
+        decayed, self._decayed = self._decayed, False
+        return decayed
 
     def cleanup_stale_sources(self) -> int:
         """Remove expired source records. Returns count removed."""
-        now = time.time()
-        stale = [k for k, v in self._sources.items() if v.is_expired(now)]
-        for k in stale:
-            del self._sources[k]
-        return len(stale)
+        before = len(self._sources)
+        self._advance(time.time())
+        return before - len(self._sources)
 
     def cleanup_old_events(self, max_age: float = SOURCE_RETENTION_SECONDS) -> int:
         """Trim old events from the ring buffer."""
         now = time.time()
-        before = len(self._events)
-        self._events = [e for e in self._events if (now - e.timestamp) < max_age]
-        return before - len(self._events)
+        removed = 0
+        while self._events and (now - self._events[0].timestamp) >= max_age:
+            self._events.popleft()
+            removed += 1
+        return removed
 
     # -- Persistence helpers ------------------------------------------------
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialise state for saving to security_db.json."""
+        recent = list(self._events)[-100:]  # persist last 100
         return {
             "threat_level": int(self._level),
             "threat_level_since": self._level_since,
@@ -303,7 +486,7 @@ class ThreatEngine:
                     "detail": e.detail,
                     "resolved": e.resolved,
                 }
-                for e in self._events[-100:]  # persist last 100
+                for e in recent
             ],
         }
 
@@ -320,6 +503,11 @@ class ThreatEngine:
     def _set_level(self, level: ThreatLevel, reason: str = "") -> None:
         self._level = level
         self._level_since = time.time()
+        timer = DECAY_TIMERS.get(level)
+        if timer is None:
+            self._wheel.cancel(_DECAY_TIMER)
+        else:
+            self._wheel.schedule(_DECAY_TIMER, self._level_since + timer)
         if reason:
             logger.info("Threat level changed to %s: %s", self.level_label, reason)
         
@@ -330,59 +518,93 @@ class ThreatEngine:
         except Exception as e:
             logger.error("Failed to persist threat level change: %s", e)
 
+    def _advance(self, now: float) -> None:
+        """Fire due timers: level decay and source expiry."""
+        for key in self._wheel.advance(now):
+            if key == _DECAY_TIMER:
+                self._decay(now)
+                continue
+            rec = self._sources.get(key)
+            if rec is None:
+                continue
+            if rec.is_expired(now):
+                self._drop_source(key)
+            else:
+                self._wheel.schedule(key, rec.last_seen + SOURCE_RETENTION_SECONDS + 1)
+
+    def _decay(self, now: float) -> None:
+        timer = DECAY_TIMERS.get(self._level)
+        if timer is None:
+            return
+        elapsed = now - self._level_since
+        if elapsed < timer:
+            self._wheel.schedule(_DECAY_TIMER, self._level_since + timer)
+            return
+        old = self._level
+        self._set_level(ThreatLevel(self._level - 1))
+        self._decayed = True
+        logger.info(
+            "Threat auto-decayed %s → %s after %ds inactivity",
+            THREAT_LABELS[old], self.level_label, int(elapsed),
+        )
+
     def _is_whitelisted(self, source: str) -> bool:
         return source in WHITELISTED_SOURCES
 
-    def _touch_source(self, source: str, now: float, *, auth_failure: bool = False, exception: bool = False) -> None:
+    def _drop_source(self, source: str) -> None:
+        self._sources.pop(source, None)
+        self._top.pop(source, None)
+        self._wheel.cancel(source)
+
+    def _touch_source(self, source: str, now: float, *, auth_failure: bool = False, exception: bool = False) -> SourceRecord:
         rec = self._sources.get(source)
         if rec is None:
             rec = SourceRecord(source=source, first_seen=now)
             self._sources[source] = rec
+            if len(self._sources) > MAX_TRACKED_SOURCES:
+                # Least recently seen first, but never one of the reported worst offenders.
+                for victim in self._sources:
+                    if victim not in self._top:
+                        break
+                self._drop_source(victim)
+            self._wheel.schedule(source, now + SOURCE_RETENTION_SECONDS + 1)
+        else:
+            self._sources.move_to_end(source)
+        # Expiry timers are refreshed lazily: when one fires, it is pushed back to last_seen + retention.
         rec.last_seen = now
         if auth_failure:
             rec.auth_failures += 1
+            rec.recent_auth.add(now)
         if exception:
             rec.exceptions += 1
+        self._update_top(rec)
+        return rec
+
+    def _update_top(self, rec: SourceRecord) -> None:
+        if rec.source in self._top or len(self._top) < TOP_SOURCES:
+            self._top[rec.source] = rec
+            return
+        weakest = min(self._top.values(), key=lambda s: (s.score, s.last_seen))
+        if (rec.score, rec.last_seen) > (weakest.score, weakest.last_seen):
+            del self._top[weakest.source]
+            self._top[rec.source] = rec
 
     def _add_event(self, event: ThreatEvent) -> None:
         self._events.append(event)
-        # Cap ring buffer
-        if len(self._events) > self._max_events:
-            self._events = self._events[-self._max_events:]
-
-    def _evaluate(self, now: float) -> None:
-        """Re-evaluate threat level based on current events."""
-        window_start = now - AUTH_FAILURE_WINDOW_SECONDS
-        exc_window_start = now - EXCEPTION_WINDOW_SECONDS
-
-        # Count recent security events
-        recent_auth = [
-            e for e in self._events
-            if e.event_type == "auth_failure"
-            and e.timestamp >= window_start
-            and not e.resolved
-        ]
-        recent_exceptions = [
-            e for e in self._events
-            if e.event_type == "exception"
-            and e.severity == EventSeverity.SECURITY
-            and e.timestamp >= exc_window_start
-            and not e.resolved
-        ]
-
-        # Per-source auth failures (for ALERT)
-        source_counts: Dict[str, int] = {}
-        for e in recent_auth:
-            source_counts[e.source] = source_counts.get(e.source, 0) + 1
-
-        max_per_source = max(source_counts.values()) if source_counts else 0
-        total_auth = len(recent_auth)
-        total_exc = len(recent_exceptions)
+
+    def _evaluate(self, now: float, source_auth: int) -> None:
+        """Re-evaluate threat level from the window counters.
+
+        ``source_auth`` is the windowed auth-failure count of the source that
+        just reported; only it can have crossed the per-source threshold.
+        """
+        total_auth = self._recent_auth.count(now)
+        total_exc = self._recent_exceptions.count(now)
 
         # Determine appropriate level (only escalate, never auto-downgrade here)
         target = ThreatLevel.NOMINAL
 
-        if max_per_source >= AUTH_FAILURE_ALERT_THRESHOLD:
+        if source_auth >= AUTH_FAILURE_ALERT_THRESHOLD:
             target = max(target, ThreatLevel.ALERT)
 
         if total_auth >= AUTH_FAILURE_GUARDED_THRESHOLD or total_exc >= EXCEPTION_GUARDED_THRESHOLD:
@@ -397,5 +619,5 @@ class ThreatEngine:
             self._set_level(target)
             logger.warning(
                 "THREAT ESCALATED %s → %s (auth_failures=%d, exceptions=%d, per_source_max=%d)",
-                THREAT_LABELS[old], self.level_label, total_auth, total_exc, max_per_source,
+                THREAT_LABELS[old], self.level_label, total_auth, total_exc, source_auth,
             )
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional, Tuple
-from collections import defaultdict
+from typing import Any, Dict, List, Optional
 
 from .agent_telemetry_service import AgentTelemetryService
 from ..ops_models import AgentInsight
@@ -16,29 +15,25 @@ class AgentInsightService:
     def __init__(self, telemetry: AgentTelemetryService):
         self.telemetry = telemetry
 
-    def detect_patterns(self, *, agent_id: Optional[str] = None, limit: int = 500) -> List[Dict[str, Any]]:
-        """Identify combinations of (agent, tool, channel) with high failure rates."""
-        events = self.telemetry.list_events(agent_id=agent_id, limit=limit)
-        if not events:
-            return []
+    def detect_patterns(
+        self,
+        *,
+        agent_id: Optional[str] = None,
+        limit: int = 500,
+        window_seconds: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Identify combinations of (agent, tool, channel) with high failure rates.
 
-        # Count outcomes for each combination
-        # key: (agent_id, agent_role, channel, tool)
-        stats: Dict[Tuple[str, str, str, Optional[str]], Dict[str, int]] = defaultdict(lambda: {"total": 0, "error": 0, "rejected": 0, "timeout": 0})
-        
-        for e in events:
-            key = (e.agent_id, e.agent_role, e.channel, e.tool)
-            stats[key]["total"] += 1
-            if e.outcome == "error":
-                stats[key]["error"] += 1
-            elif e.outcome == "rejected":
-                stats[key]["rejected"] += 1
-            elif e.outcome == "timeout":
-                stats[key]["timeout"] += 1
+        Reads the telemetry rolling aggregates (default window: the telemetry
+        retention window); ``limit`` caps the number of patterns returned.
+        """
+        stats = self.telemetry.aggregate(agent_id=agent_id, window_seconds=window_seconds)
+        if not stats:
+            return []
 
         patterns = []
         for key, counts in stats.items():
-            total = counts["total"]
+            total = int(counts["total"])
             if total < 3: # Need at least 3 samples to call it a pattern
                 continue
                 
@@ -51,15 +46,15 @@ class AgentInsightService:
                     "tool": key[3],
                     "total_samples": total,
                     "failure_rate": round(error_rate, 2),
-                    "error_count": counts["error"],
-                    "timeout_count": counts["timeout"],
-                    "rejection_count": counts["rejected"],
+                    "error_count": int(counts["error"]),
+                    "timeout_count": int(counts["timeout"]),
+                    "rejection_count": int(counts["rejected"]),
                     "severity": "high" if error_rate > 0.7 else "medium"
                 })
 
         # Sort by failure rate descending
         patterns.sort(key=lambda p: p["failure_rate"], reverse=True)
-        return patterns
+        return patterns[:limit]
 
     def get_recommendations(self, *, agent_id: Optional[str] = None) -> List[AgentInsight]:
         """Generate actionable recommendations based on detected patterns."""
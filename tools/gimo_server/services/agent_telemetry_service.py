@@ -1,61 +1,228 @@
 from __future__ import annotations
 
+import bisect
 import logging
+import threading
 import time
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from ..ops_models import AgentActionEvent
 from .gics_service import GicsService
 
 logger = logging.getLogger("orchestrator.services.telemetry")
 
+# (agent_id, agent_role, channel, tool)
+AggregateKey = Tuple[str, str, str, Optional[str]]
+
+_COUNTER_FIELDS = ("total", "success", "error", "rejected", "timeout", "duration_ms", "cost_usd")
+
+
+def _empty_counters() -> Dict[str, float]:
+    return {**{name: 0 for name in _COUNTER_FIELDS}, "last_ts_ms": 0}
+
 
 class AgentTelemetryService:
-    """Service to persist and retrieve Agent Action Events (IDS) via GICS."""
+    """Service to persist and retrieve Agent Action Events (IDS) via GICS.
+
+    Besides the raw ``ae:`` events, ``record_event`` maintains rolling
+    per-(agent, role, channel, tool) counters in ``BUCKET_SECONDS`` time buckets,
+    persisted to ``ae_agg:{bucket}`` keys at most every ``FLUSH_INTERVAL_SECONDS``,
+    and a bounded newest-first index of recent events per agent so "last N"
+    reads do not scan GICS.
+    """
+
+    AGG_PREFIX = "ae_agg:"
+    BUCKET_SECONDS = 3600
+    WINDOW_BUCKETS = 24 * 7
+    FLUSH_INTERVAL_SECONDS = 30.0
+    RECENT_INDEX_SIZE = 500
 
     def __init__(self, gics: GicsService):
         self.gics = gics
+        self._lock = threading.RLock()
+        self._buckets: Dict[int, Dict[AggregateKey, Dict[str, float]]] = {}
+        self._dirty: Set[int] = set()
+        # agent_id (None = all agents) -> [(-ts_ms, key, event)], newest first.
+        self._recent: Dict[Optional[str], List[Tuple[int, str, AgentActionEvent]]] = {}
+        self._loaded = False
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def _event_key(event: AgentActionEvent) -> Tuple[int, str]:
+        # Key format: ae:{agent_id}:{timestamp_ms}
+        # This allows prefix scanning by agent_id
+        ts_ms = int(event.timestamp.timestamp() * 1000)
+        return ts_ms, f"ae:{event.agent_id}:{ts_ms}"
+
+    def _bucket_of(self, ts_ms: int) -> int:
+        return (ts_ms // 1000) // self.BUCKET_SECONDS * self.BUCKET_SECONDS
+
+    def _window_start(self, window_seconds: Optional[float] = None) -> int:
+        span = window_seconds if window_seconds is not None else self.BUCKET_SECONDS * self.WINDOW_BUCKETS
+        return self._bucket_of(int((time.time() - span) * 1000))
 
     def record_event(self, event: AgentActionEvent) -> None:
-        """Persist an agent action event to GICS."""
+        """Persist an agent action event to GICS and update the rolling aggregates."""
+        with self._lock:
+            self._ensure_loaded()
         try:
-            # Key format: ae:{agent_id}:{timestamp_ms}
-            # This allows prefix scanning by agent_id
-            ts_ms = int(event.timestamp.timestamp() * 1000)
-            key = f"ae:{event.agent_id}:{ts_ms}"
-            
+            ts_ms, key = self._event_key(event)
+
             # Ensure timestamp is ISO string for GICS storage if needed,
             # but AgentActionEvent.model_dump() usually handles datetime if using serializable pydantic
             data = event.model_dump()
             if isinstance(data.get("timestamp"), datetime):
                 data["timestamp"] = data["timestamp"].isoformat()
-                
+
             self.gics.put(key, data)
         except Exception as e:
             logger.error("Failed to record agent event: %s", e)
+            return
+
+        with self._lock:
+            self._apply(event, ts_ms, key)
+            self._dirty.add(self._bucket_of(ts_ms))
+            due = time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL_SECONDS
+        if due:
+            self.flush()
+
+    def _apply(self, event: AgentActionEvent, ts_ms: int, key: str, *, count: bool = True) -> None:
+        if count:
+            bucket = self._buckets.setdefault(self._bucket_of(ts_ms), {})
+            counters = bucket.setdefault(
+                (event.agent_id, event.agent_role, event.channel, event.tool), _empty_counters()
+            )
+            counters["total"] += 1
+            counters[event.outcome] += 1
+            counters["duration_ms"] += float(event.duration_ms or 0.0)
+            counters["cost_usd"] += float(event.cost_usd or 0.0)
+            counters["last_ts_ms"] = max(counters["last_ts_ms"], ts_ms)
+
+        for index_key in (None, event.agent_id):
+            recent = self._recent.setdefault(index_key, [])
+            entry = (-ts_ms, key, event)
+            if len(recent) >= self.RECENT_INDEX_SIZE and entry[:2] >= recent[-1][:2]:
+                continue
+            pos = bisect.bisect_left(recent, entry[:2], key=lambda item: item[:2])
+            if pos < len(recent) and recent[pos][1] == key:
+                recent[pos] = entry  # same key rewritten in GICS
+            else:
+                recent.insert(pos, entry)
+                del recent[self.RECENT_INDEX_SIZE :]
+
+    def _ensure_loaded(self) -> None:
+        """Load persisted aggregates once; backfill from raw events if there are none."""
+        if self._loaded:
+            return
+        self._loaded = True
+        window_start = self._window_start()
+        try:
+            for item in self.gics.scan(prefix=self.AGG_PREFIX, include_fields=True) or []:
+                fields = item.get("fields") or {}
+                bucket_start = int(fields.get("bucket", 0))
+                if bucket_start < window_start:
+                    continue
+                bucket = self._buckets.setdefault(bucket_start, {})
+                for row in fields.get("counters") or []:
+                    key = (row.get("agent_id"), row.get("agent_role"), row.get("channel"), row.get("tool"))
+                    bucket[key] = {**_empty_counters(), **{k: row.get(k, 0) for k in (*_COUNTER_FIELDS, "last_ts_ms")}}
+            has_aggregates = bool(self._buckets)
+            for event in self._scan_events("ae:"):
+                ts_ms, key = self._event_key(event)
+                backfill = not has_aggregates and self._bucket_of(ts_ms) >= window_start
+                self._apply(event, ts_ms, key, count=backfill)
+                if backfill:
+                    self._dirty.add(self._bucket_of(ts_ms))
+        except Exception as e:
+            logger.error("Failed to load agent telemetry aggregates: %s", e)
+
+    def flush(self) -> None:
+        """Persist dirty aggregate buckets and drop buckets outside the window."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            window_start = self._window_start()
+            for bucket_start in [b for b in self._buckets if b < window_start]:
+                self._buckets.pop(bucket_start, None)
+            payloads = {
+                bucket_start: {
+                    "bucket": bucket_start,
+                    "bucket_seconds": self.BUCKET_SECONDS,
+                    "counters": [
+                        {
+                            "agent_id": key[0],
+                            "agent_role": key[1],
+                            "channel": key[2],
+                            "tool": key[3],
+                            **counters,
+                        }
+                        for key, counters in self._buckets[bucket_start].items()
+                    ],
+                }
+                for bucket_start in self._dirty
+                if bucket_start in self._buckets
+            }
+            self._dirty.clear()
+        for bucket_start, payload in payloads.items():
+            try:
+                self.gics.put(f"{self.AGG_PREFIX}{bucket_start}", payload)
+            except Exception as e:
+                logger.error("Failed to persist telemetry bucket %s: %s", bucket_start, e)
+                with self._lock:
+                    self._dirty.add(bucket_start)
+
+    def aggregate(
+        self, *, agent_id: Optional[str] = None, window_seconds: Optional[float] = None
+    ) -> Dict[AggregateKey, Dict[str, float]]:
+        """Sum the bucketed counters per (agent, role, channel, tool) over the window."""
+        with self._lock:
+            self._ensure_loaded()
+            window_start = self._window_start(window_seconds)
+            totals: Dict[AggregateKey, Dict[str, float]] = {}
+            for bucket_start, bucket in self._buckets.items():
+                if bucket_start < window_start:
+                    continue
+                for key, counters in bucket.items():
+                    if agent_id and key[0] != agent_id:
+                        continue
+                    acc = totals.setdefault(key, _empty_counters())
+                    for name in _COUNTER_FIELDS:
+                        acc[name] += counters[name]
+                    acc["last_ts_ms"] = max(acc["last_ts_ms"], counters["last_ts_ms"])
+            return totals
+
+    def _scan_events(self, prefix: str) -> List[AgentActionEvent]:
+        items = self.gics.scan(prefix=prefix)
+        events: List[AgentActionEvent] = []
+        for item in items or []:
+            fields = item.get("fields")
+            if fields:
+                try:
+                    events.append(AgentActionEvent.model_validate(fields))
+                except Exception as ve:
+                    logger.warning("Failed to validate event item: %s", ve)
+        return events
 
     def list_events(
-        self, 
-        *, 
-        agent_id: Optional[str] = None, 
+        self,
+        *,
+        agent_id: Optional[str] = None,
         limit: int = 100,
         prefix_override: Optional[str] = None
     ) -> List[AgentActionEvent]:
-        """List events from GICS, optionally filtered by agent_id."""
+        """List events newest first, optionally filtered by agent_id.
+
+        Served from the recent-event index when ``limit`` fits in it.
+        """
         try:
+            if prefix_override is None and limit <= self.RECENT_INDEX_SIZE:
+                with self._lock:
+                    self._ensure_loaded()
+                    recent = self._recent.get(agent_id, [])
+                    return [event for _, _, event in recent[:limit]]
+
             prefix = prefix_override or (f"ae:{agent_id}:" if agent_id else "ae:")
-            items = self.gics.scan(prefix=prefix)
-            
-            events: List[AgentActionEvent] = []
-            for item in items:
-                fields = item.get("fields")
-                if fields:
-                    try:
-                        events.append(AgentActionEvent.model_validate(fields))
-                    except Exception as ve:
-                        logger.warning("Failed to validate event item: %s", ve)
-            
+            events = self._scan_events(prefix)
             # Sort by timestamp descending (newest first)
             events.sort(key=lambda e: e.timestamp, reverse=True)
             return events[:limit]
@@ -68,11 +235,11 @@ class AgentTelemetryService:
         events = self.list_events(agent_id=agent_id, limit=last_n)
         if not events:
             return {"agent_id": agent_id, "count": 0}
-            
+
         successes = sum(1 for e in events if e.outcome == "success")
         errors = sum(1 for e in events if e.outcome == "error")
         rejections = sum(1 for e in events if e.outcome == "rejected")
-        
+
         return {
             "agent_id": agent_id,
             "count": len(events),
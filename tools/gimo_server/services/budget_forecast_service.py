@@ -1,57 +1,129 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from ..ops_models import BudgetForecast, UserEconomyConfig
+from .storage.spend_tracker import GLOBAL_SCOPE, SpendTracker, provider_scope
 from .storage_service import StorageService
 
 logger = logging.getLogger("orchestrator.ops.budget")
 
+_ALERT_RANK = {"none": 0, "warning": 1, "critical": 2}
+
+# Map provider budget periods to days
+PERIOD_DAYS = {
+    "daily": 1,
+    "weekly": 7,
+    "monthly": 30,
+    "total": 365
+}
+
+
 class BudgetForecastService:
-    """Service to predict budget exhaustion and provide alerts."""
+    """Service to predict budget exhaustion and provide alerts.
+
+    Spend and burn rates come from the storage's ``SpendTracker`` when it has
+    one, so a forecast costs O(budgets) instead of a cost-event scan per
+    budget. ``watch`` re-evaluates the affected budgets on every cost write and
+    publishes ``budget_alert`` as soon as a scope escalates to a new level.
+    """
+
+    _alert_levels: Dict[str, str] = {}
+    _watch_lock = threading.Lock()
+    _watched: Dict[int, Callable[[List[str]], None]] = {}
 
     def __init__(self, storage: StorageService):
         self.storage = storage
 
+    @classmethod
+    def watch(
+        cls,
+        storage: StorageService,
+        economy_provider: Callable[[], UserEconomyConfig],
+    ) -> bool:
+        """Evaluate budgets on every cost write and publish threshold crossings immediately."""
+        tracker = storage.cost.spend_tracker()
+        if tracker is None:
+            return False
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        forecaster = cls(storage)
+
+        def on_spend(scopes: List[str]) -> None:
+            for forecast in forecaster._forecasts_for(economy_provider(), scopes):
+                cls._maybe_alert(forecast, loop)
+
+        with cls._watch_lock:
+            previous = cls._watched.pop(id(tracker), None)
+            if previous is not None:
+                tracker.unsubscribe(previous)
+            tracker.subscribe(on_spend)
+            cls._watched[id(tracker)] = on_spend
+        return True
+
+    @classmethod
+    def _maybe_alert(cls, forecast: BudgetForecast, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        with cls._watch_lock:
+            previous = cls._alert_levels.get(forecast.scope, "none")
+            cls._alert_levels[forecast.scope] = forecast.alert_level
+        if _ALERT_RANK[forecast.alert_level] <= _ALERT_RANK[previous]:
+            return
+        from .notification_service import NotificationService
+        payload = {**forecast.model_dump(), "critical": True}
+        coro = NotificationService.publish("budget_alert", payload)
+        try:
+            asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            if loop is not None and loop.is_running():
+                asyncio.run_coroutine_threadsafe(coro, loop)
+            else:
+                coro.close()
+        logger.warning(
+            "Budget %s reached %s: %.1f%% remaining", forecast.scope, forecast.alert_level, forecast.remaining_pct
+        )
+
     def forecast(self, economy_config: UserEconomyConfig) -> List[BudgetForecast]:
         """Generates budget forecasts based on recent spend and user configuration."""
-        forecasts = []
+        return self._forecasts_for(economy_config)
+
+    @staticmethod
+    def _budgets(economy_config: UserEconomyConfig) -> List[Tuple[str, float, int, bool]]:
+        """(label, budget_usd, period_days, is_provider) for every configured budget."""
+        budgets = []
 
-        # 1. Global Budget Forecast
+        # 1. Global Budget Forecast (monthly by default)
         if economy_config.global_budget_usd is not None:
-            global_forecast = self._calculate_forecast(
-                label="global", 
-                budget_usd=economy_config.global_budget_usd, 
-                thresholds=economy_config.alert_thresholds,
-                period_days=30 # Global budget is monthly by default
-            )
-            if global_forecast:
-                forecasts.append(global_forecast)
+            budgets.append(("global", economy_config.global_budget_usd, 30, False))
 
         # 2. Per-Provider Forecasts
         for pb in economy_config.provider_budgets:
             if pb.max_cost_usd is not None:
-                # Map period to days
-                period_map = {
-                    "daily": 1,
-                    "weekly": 7,
-                    "monthly": 30,
-                    "total": 365
-                }
-                days = period_map.get(pb.period, 30)
-                
-                provider_forecast = self._calculate_forecast(
-                    label=pb.provider,
-                    budget_usd=pb.max_cost_usd,
-                    thresholds=economy_config.alert_thresholds,
-                    period_days=days,
-                    is_provider=True
-                )
-                if provider_forecast:
-                    forecasts.append(provider_forecast)
+                budgets.append((pb.provider, pb.max_cost_usd, PERIOD_DAYS.get(pb.period, 30), True))
+        return budgets
 
+    def _forecasts_for(
+        self, economy_config: UserEconomyConfig, scopes: Optional[List[str]] = None
+    ) -> List[BudgetForecast]:
+        forecasts = []
+        for label, budget_usd, days, is_provider in self._budgets(economy_config):
+            scope = provider_scope(label) if is_provider else GLOBAL_SCOPE
+            if scopes is not None and scope not in scopes:
+                continue
+            forecast = self._calculate_forecast(
+                label=label,
+                budget_usd=budget_usd,
+                thresholds=economy_config.alert_thresholds,
+                period_days=days,
+                is_provider=is_provider,
+            )
+            if forecast:
+                forecasts.append(forecast)
         return forecasts
 
     def _calculate_forecast(
@@ -64,16 +136,24 @@ class BudgetForecastService:
     ) -> Optional[BudgetForecast]:
         """Calculates a single forecast for a given budget."""
         try:
-            # Get spend for the relevant period
-            if is_provider:
-                current_spend = self.storage.cost.get_provider_spend(label, days=period_days)
+            tracker: Optional[SpendTracker] = self.storage.cost.spend_tracker()
+            if tracker is not None:
+                scope = provider_scope(label) if is_provider else GLOBAL_SCOPE
+                current_spend = tracker.spend(scope, period_days)
+                # Project with the faster of the 1h and 24h weighted rates so a
+                # sudden spike shortens the horizon right away.
+                rates = tracker.burn_rates(scope)
+                burn_rate_hourly = max(rates["hourly"], rates["daily"] / 24)
             else:
-                current_spend = self.storage.cost.get_total_spend(days=period_days)
+                # Get spend for the relevant period
+                if is_provider:
+                    current_spend = self.storage.cost.get_provider_spend(label, days=period_days)
+                else:
+                    current_spend = self.storage.cost.get_total_spend(days=period_days)
+                # Get burn rate from the last 24 hours (most representative of recent traffic)
+                burn_rate_hourly = self.storage.cost.get_spend_rate(hours=24)
 
             remaining = max(0.0, budget_usd - current_spend)
-            
-            # Get burn rate from the last 24 hours (most representative of recent traffic)
-            burn_rate_hourly = self.storage.cost.get_spend_rate(hours=24)
             burn_rate_daily = burn_rate_hourly * 24
 
             # If no burn rate but budget exceeded, 0.0 days remaining
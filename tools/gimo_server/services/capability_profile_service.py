@@ -8,10 +8,15 @@ intelligent strategy decisions.
 Keys in GICS:
     ops:capability:{provider}:{model}:{task_type}  →  task-specific scores
     ops:capability_index:{provider}:{model}        →  list of known task_types
+
+Outcomes are merged in-process as per-key deltas and written behind: one
+merged write per key every ``FLUSH_INTERVAL_SECONDS`` (or on ``flush()``).
+Reads overlay the pending deltas on the stored value.
 """
 from __future__ import annotations
 
 import logging
+import threading
 import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
@@ -46,9 +51,98 @@ class ModelProfile:
     overall_success_rate: float = 0.0
 
 
+@dataclass
+class _OutcomeDelta:
+    """Outcomes recorded for one task key since the last flush."""
+    provider_type: str
+    model_id: str
+    task_type: str
+    samples: int = 0
+    successes: int = 0
+    failures: int = 0
+    latency_sum: float = 0.0
+    cost_sum: float = 0.0
+    # Whether a success reset the streak, and failures recorded after the last reset.
+    streak_reset: bool = False
+    trailing_failures: int = 0
+    last_failure_reason: Optional[str] = None
+    updated_at: int = 0
+
+    def add(self, *, success: bool, latency_ms: float, cost_usd: float, failure_reason: str) -> None:
+        self.samples += 1
+        self.latency_sum += latency_ms
+        self.cost_sum += cost_usd
+        if success:
+            self.successes += 1
+            self.streak_reset = True
+            self.trailing_failures = 0
+        else:
+            self.failures += 1
+            self.trailing_failures += 1
+            self.last_failure_reason = failure_reason
+        self.updated_at = int(time.time())
+
+    def merge(self, newer: "_OutcomeDelta") -> None:
+        """Fold ``newer`` (recorded after this delta) into this one."""
+        self.samples += newer.samples
+        self.successes += newer.successes
+        self.failures += newer.failures
+        self.latency_sum += newer.latency_sum
+        self.cost_sum += newer.cost_sum
+        if newer.streak_reset:
+            self.streak_reset = True
+            self.trailing_failures = newer.trailing_failures
+        else:
+            self.trailing_failures += newer.trailing_failures
+        if newer.last_failure_reason is not None:
+            self.last_failure_reason = newer.last_failure_reason
+        self.updated_at = max(self.updated_at, newer.updated_at)
+
+    def apply(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the stored ``fields`` with this delta applied."""
+        prev_samples = int(fields.get("samples", 0))
+        samples = prev_samples + self.samples
+        successes = int(fields.get("successes", 0)) + self.successes
+        prev_lat = float(fields.get("avg_latency_ms", 0.0))
+        prev_cost = float(fields.get("avg_cost_usd", 0.0))
+        if self.streak_reset:
+            streak = self.trailing_failures
+        else:
+            streak = int(fields.get("failure_streak", 0)) + self.trailing_failures
+        return {
+            "task_type": self.task_type,
+            "provider_type": self.provider_type,
+            "model_id": self.model_id,
+            "samples": samples,
+            "successes": successes,
+            "failures": int(fields.get("failures", 0)) + self.failures,
+            "success_rate": successes / max(1, samples),
+            "avg_latency_ms": ((prev_lat * prev_samples) + self.latency_sum) / max(1, samples),
+            "avg_cost_usd": ((prev_cost * prev_samples) + self.cost_sum) / max(1, samples),
+            "failure_streak": streak,
+            "last_failure_reason": (
+                self.last_failure_reason
+                if self.last_failure_reason is not None
+                else fields.get("last_failure_reason", "")
+            ),
+            "updated_at": self.updated_at or int(fields.get("updated_at", 0)),
+        }
+
+
 class CapabilityProfileService:
     """Builds and queries per-model-per-task_type capability profiles from GICS."""
 
+    FLUSH_INTERVAL_SECONDS = 5.0
+
+    _lock = threading.RLock()
+    # Serializes flushes: two read-merge-put passes over the same key would lose updates.
+    _flush_lock = threading.Lock()
+    _pending: Dict[str, _OutcomeDelta] = {}
+    _pending_index: Dict[str, List[str]] = {}
+    # Last value known to be stored per task key (read or written by this process).
+    _stored: Dict[str, Dict[str, Any]] = {}
+    _last_flush: float = time.monotonic()
+
     @staticmethod
     def _task_key(provider_type: str, model_id: str, task_type: str) -> str:
         p = provider_type.strip().lower().replace(" ", "_")
@@ -81,73 +175,112 @@ class CapabilityProfileService:
     ) -> Optional[TaskCapability]:
         """Record outcome for a specific model+task_type combination.
         Returns the updated TaskCapability or None if GICS unavailable.
+
+        The outcome is merged into the in-process accumulator; GICS is written
+        by the next flush.
         """
         gics = cls._gics()
         if not gics:
             return None
 
         key = cls._task_key(provider_type, model_id, task_type)
+        with cls._lock:
+            if key not in cls._stored:
+                cls._stored[key] = cls._read_fields(gics, key)
+            delta = cls._pending.get(key)
+            if delta is None:
+                delta = cls._pending[key] = _OutcomeDelta(provider_type, model_id, task_type)
+            delta.add(
+                success=success,
+                latency_ms=float(latency_ms or 0.0),
+                cost_usd=float(cost_usd or 0.0),
+                failure_reason=failure_reason,
+            )
+            cls._queue_index(provider_type, model_id, task_type)
+            updated = delta.apply(cls._stored[key])
+            due = time.monotonic() - cls._last_flush >= cls.FLUSH_INTERVAL_SECONDS
+
+        if due:
+            cls.flush()
+        return TaskCapability(**{k: updated[k] for k in TaskCapability.__dataclass_fields__})
+
+    @staticmethod
+    def _read_fields(gics: Any, key: str) -> Dict[str, Any]:
         try:
             existing = gics.get(key)
-            fields = dict((existing or {}).get("fields") or {})
+            return dict((existing or {}).get("fields") or {})
         except Exception:
-            fields = {}
+            return {}
+
+    @classmethod
+    def _queue_index(cls, provider_type: str, model_id: str, task_type: str) -> None:
+        idx_key = cls._index_key(provider_type, model_id)
+        pending = cls._pending_index.setdefault(idx_key, [])
+        if task_type not in pending:
+            pending.append(task_type)
 
-        samples = int(fields.get("samples", 0)) + 1
-        successes = int(fields.get("successes", 0)) + (1 if success else 0)
-        failures = int(fields.get("failures", 0)) + (0 if success else 1)
-        streak = 0 if success else int(fields.get("failure_streak", 0)) + 1
+    @classmethod
+    def flush(cls) -> int:
+        """Write pending deltas as one merged write per key. Returns keys written."""
+        gics = cls._gics()
+        with cls._flush_lock:
+            with cls._lock:
+                cls._last_flush = time.monotonic()
+                if not gics or (not cls._pending and not cls._pending_index):
+                    return 0
+                pending, cls._pending = cls._pending, {}
+                pending_index, cls._pending_index = cls._pending_index, {}
+            return cls._write_pending(gics, pending, pending_index)
 
-        prev_lat = float(fields.get("avg_latency_ms", 0.0))
-        prev_cost = float(fields.get("avg_cost_usd", 0.0))
-        new_lat = float(latency_ms or 0.0)
-        new_cost = float(cost_usd or 0.0)
-        avg_lat = ((prev_lat * (samples - 1)) + new_lat) / max(1, samples)
-        avg_cost = ((prev_cost * (samples - 1)) + new_cost) / max(1, samples)
-
-        updated = {
-            "task_type": task_type,
-            "provider_type": provider_type,
-            "model_id": model_id,
-            "samples": samples,
-            "successes": successes,
-            "failures": failures,
-            "success_rate": successes / max(1, samples),
-            "avg_latency_ms": avg_lat,
-            "avg_cost_usd": avg_cost,
-            "failure_streak": streak,
-            "last_failure_reason": failure_reason if not success else fields.get("last_failure_reason", ""),
-            "updated_at": int(time.time()),
-        }
+    @classmethod
+    def _write_pending(
+        cls,
+        gics: Any,
+        pending: Dict[str, _OutcomeDelta],
+        pending_index: Dict[str, List[str]],
+    ) -> int:
+        written = 0
+        for key, delta in pending.items():
+            # Re-read so outcomes written by other processes are not overwritten.
+            merged = delta.apply(cls._read_fields(gics, key))
+            try:
+                gics.put(key, merged)
+            except Exception as exc:
+                logger.warning("GICS capability write failed: %s", exc)
+                cls._requeue(key, delta)
+                continue
+            with cls._lock:
+                cls._stored[key] = merged
+            written += 1
 
-        try:
-            gics.put(key, updated)
-            # Update the task_type index for this model
-            cls._add_to_index(provider_type, model_id, task_type)
-        except Exception as exc:
-            logger.warning("GICS capability write failed: %s", exc)
-            return None
+        for idx_key, task_types in pending_index.items():
+            try:
+                fields = cls._read_fields(gics, idx_key)
+                known = list(fields.get("task_types", []))
+                missing = [tt for tt in task_types if tt not in known]
+                if missing:
+                    gics.put(idx_key, {"task_types": known + missing, "updated_at": int(time.time())})
+            except Exception as exc:
+                logger.warning("GICS capability index write failed: %s", exc)
+                with cls._lock:
+                    for tt in task_types:
+                        pending = cls._pending_index.setdefault(idx_key, [])
+                        if tt not in pending:
+                            pending.append(tt)
+        return written
 
-        return TaskCapability(**{k: updated[k] for k in TaskCapability.__dataclass_fields__})
+    @classmethod
+    def _requeue(cls, key: str, delta: _OutcomeDelta) -> None:
+        with cls._lock:
+            newer = cls._pending.get(key)
+            if newer is not None:
+                delta.merge(newer)
+            cls._pending[key] = delta
 
     @classmethod
-    def _add_to_index(cls, provider_type: str, model_id: str, task_type: str) -> None:
-        gics = cls._gics()
-        if not gics:
-            return
-        idx_key = cls._index_key(provider_type, model_id)
-        try:
-            existing = gics.get(idx_key)
-            fields = dict((existing or {}).get("fields") or {})
-            known = list(fields.get("task_types", []))
-            if task_type not in known:
-                known.append(task_type)
-                gics.put(idx_key, {"task_types": known, "updated_at": int(time.time())})
-        except Exception:
-            try:
-                gics.put(idx_key, {"task_types": [task_type], "updated_at": int(time.time())})
-            except Exception:
-                pass
+    def _pending_task_types(cls, provider_type: str, model_id: str) -> List[str]:
+        with cls._lock:
+            return list(cls._pending_index.get(cls._index_key(provider_type, model_id), []))
 
     @classmethod
     def get_capability(
@@ -164,9 +297,20 @@ class CapabilityProfileService:
         key = cls._task_key(provider_type, model_id, task_type)
         try:
             result = gics.get(key)
-            if not result or "fields" not in result:
+        except Exception:
+            return None
+        stored = dict(result["fields"]) if result and "fields" in result else None
+        with cls._lock:
+            if stored is not None:
+                cls._stored[key] = stored
+            delta = cls._pending.get(key)
+            if delta is not None:
+                f = delta.apply(stored or {})
+            elif stored is None:
                 return None
-            f = result["fields"]
+            else:
+                f = stored
+        try:
             return TaskCapability(**{k: f[k] for k in TaskCapability.__dataclass_fields__ if k in f})
         except Exception:
             return None
@@ -186,6 +330,7 @@ class CapabilityProfileService:
             task_types = list((idx or {}).get("fields", {}).get("task_types", []))
         except Exception:
             return profile
+        task_types += [tt for tt in cls._pending_task_types(provider_type, model_id) if tt not in task_types]
 
         total_samples = 0
         total_successes = 0
@@ -52,8 +52,8 @@ class ChildRunService:
             model_tier=child_tier,
         )
 
-        # OpsService is file-backed — use its internal persistence API under the file lock
-        with OpsService._lock():
+        # OpsService is file-backed — use its internal persistence API under the run shard locks
+        with OpsService._run_locks(child_id, parent_run_id):
             OpsService.RUNS_DIR.mkdir(parents=True, exist_ok=True)
             OpsService._persist_run(child)
             OpsService._append_run_log_entry(child_id, level="INFO", msg=f"Child run created from parent {parent_run_id}")
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+import itertools
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+# A file whose mtime is this close to the moment we last verified its content may still
+# be rewritten within the same filesystem timestamp tick, so its stat stamp alone is not
+# trusted (same idea as git's "racily clean" index entries).
+_RACY_WINDOW_SECONDS = 2.0
+
+_versions = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot(Generic[T]):
+    """Parsed config value plus the on-disk stamp it was loaded from."""
+
+    version: int
+    path: Path
+    stamp: tuple[int, int, int]
+    digest: str
+    value: T
+    loaded_at: float
+    verified_at: float
+
+
+def _stamp(st: os.stat_result) -> tuple[int, int, int]:
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _digest(raw: str) -> str:
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ConfigSnapshotCache(Generic[T]):
+    """In-memory, versioned cache of JSON config files with mtime invalidation.
+
+    ``get`` costs a single ``stat`` while the file is unchanged. A changed stamp
+    triggers a re-read; if the content digest is unchanged the existing snapshot
+    (and its version) is kept, otherwise ``loader`` parses the new content and a
+    new snapshot with a fresh version is swapped in. Snapshots are never mutated,
+    so callers can compare ``version`` to detect changes without re-reading.
+    """
+
+    def __init__(self, *, max_age_seconds: Optional[float] = None):
+        self.max_age_seconds = max_age_seconds
+        self._entries: Dict[Path, ConfigSnapshot[T]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, loader: Callable[[str], T]) -> Optional[ConfigSnapshot[T]]:
+        """Return the current snapshot for ``path`` or None when the file is missing.
+
+        Errors raised by ``loader`` propagate and leave the cache untouched.
+        """
+        with self._lock:
+            try:
+                st = path.stat()
+            except OSError:
+                self._entries.pop(path, None)
+                return None
+            now = time.time()
+            current = self._entries.get(path)
+            if current is not None and self._is_fresh(current, st, now):
+                return current
+
+            raw = path.read_text(encoding="utf-8")
+            digest = _digest(raw)
+            if current is not None and current.digest == digest and not self._is_expired(current, now):
+                refreshed = ConfigSnapshot(
+                    version=current.version,
+                    path=path,
+                    stamp=_stamp(st),
+                    digest=digest,
+                    value=current.value,
+                    loaded_at=current.loaded_at,
+                    verified_at=now,
+                )
+                self._entries[path] = refreshed
+                return refreshed
+
+            value = loader(raw)
+            return self._store(path, _stamp(st), digest, value, now)
+
+    def publish(self, path: Path, value: T, raw: str) -> ConfigSnapshot[T]:
+        """Install ``value`` right after the caller wrote ``raw`` to ``path``."""
+        with self._lock:
+            try:
+                stamp = _stamp(path.stat())
+            except OSError:
+                stamp = (0, 0, 0)
+            return self._store(path, stamp, _digest(raw), value, time.time())
+
+    def peek(self, path: Path) -> Optional[ConfigSnapshot[T]]:
+        """Return the cached snapshot without touching the filesystem."""
+        return self._entries.get(path)
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def _store(
+        self, path: Path, stamp: tuple[int, int, int], digest: str, value: T, now: float
+    ) -> ConfigSnapshot[T]:
+        snapshot = ConfigSnapshot(
+            version=next(_versions),
+            path=path,
+            stamp=stamp,
+            digest=digest,
+            value=value,
+            loaded_at=now,
+            verified_at=now,
+        )
+        self._entries[path] = snapshot
+        return snapshot
+
+    def _is_expired(self, snapshot: ConfigSnapshot[T], now: float) -> bool:
+        return self.max_age_seconds is not None and now - snapshot.loaded_at >= self.max_age_seconds
+
+    def _is_fresh(self, snapshot: ConfigSnapshot[T], st: os.stat_result, now: float) -> bool:
+        if snapshot.stamp != _stamp(st) or self._is_expired(snapshot, now):
+            return False
+        # Only trust the stamp once the file is older than our last content check.
+        return st.st_mtime < snapshot.verified_at - _RACY_WINDOW_SECONDS
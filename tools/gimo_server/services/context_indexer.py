@@ -1,19 +1,86 @@
+import hashlib
 import json
+import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
 from tools.gimo_server.ops_models import RepoContext
 
+_OUTLINE_LINE = re.compile(
+    r"^\s*(?:async\s+def|def|class|function|export|interface|type|struct|func|impl|fn|pub\s+fn)\b"
+)
+
+
 class ContextIndexer:
-    """Service to analyze the repository and build the RepoContext for the LLM."""
+    """Service to analyze the repository and build the RepoContext for the LLM.
+
+    ``build_context`` is memoized per workspace and recomputed only when one of
+    the marker files (or interest directories) changes. File contents go
+    through a content-addressed cache shared by every workspace, so worktrees
+    of the same repo decode each distinct file once.
+    """
 
     PKG_JSON = "package.json"
     PYPROJECT = "pyproject.toml"
     REQ_TXT = "requirements.txt"
+    MARKER_FILES = (PKG_JSON, PYPROJECT, REQ_TXT, "go.mod", "Dockerfile")
+    INTEREST_DIRS = ("src", "lib", "tools", "tests", "docs", "apps", "packages", "scripts")
+
+    CHARS_PER_TOKEN = 4
+    SCOPED_TOKEN_BUDGET = 24_000
+    CONTEXT_CACHE_SIZE = 64
+    BLOB_CACHE_BYTES = 64 * 1024 * 1024
+    STAT_INDEX_SIZE = 50_000
+    MAX_FILE_BYTES = 2 * 1024 * 1024
+
+    _lock = threading.Lock()
+    _contexts: "OrderedDict[str, Tuple[tuple, RepoContext]]" = OrderedDict()
+    _stat_index: "OrderedDict[tuple, str]" = OrderedDict()
+    _blobs: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()  # digest -> (text, size in bytes)
+    _blob_bytes = 0
+
+    @classmethod
+    def _signature(cls, root: Path) -> tuple:
+        markers = []
+        for name in cls.MARKER_FILES:
+            try:
+                st = (root / name).stat()
+                markers.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                markers.append(None)
+        return tuple(markers) + tuple((root / d).is_dir() for d in cls.INTEREST_DIRS)
+
+    @classmethod
+    def build_context(cls, workspace_root: str) -> RepoContext:
+        root = Path(workspace_root).resolve()
+        key = str(root)
+        signature = cls._signature(root)
+        with cls._lock:
+            cached = cls._contexts.get(key)
+            if cached is not None and cached[0] == signature:
+                cls._contexts.move_to_end(key)
+                return cached[1].model_copy(deep=True)
+
+        context = cls._compute_context(root)
+        with cls._lock:
+            cls._contexts[key] = (signature, context)
+            cls._contexts.move_to_end(key)
+            while len(cls._contexts) > cls.CONTEXT_CACHE_SIZE:
+                cls._contexts.popitem(last=False)
+        return context.model_copy(deep=True)
+
+    @classmethod
+    def clear_caches(cls) -> None:
+        with cls._lock:
+            cls._contexts.clear()
+            cls._stat_index.clear()
+            cls._blobs.clear()
+            cls._blob_bytes = 0
 
     @staticmethod
-    def build_context(workspace_root: str) -> RepoContext:
-        root = Path(workspace_root)
+    def _compute_context(root: Path) -> RepoContext:
         stack: set[str] = set()
         commands: set[str] = set()
         paths: set[str] = set()
@@ -95,31 +162,149 @@ class ContextIndexer:
 
     @staticmethod
     def _detect_paths(root: Path, paths: set[str]) -> None:
-        for d in ["src", "lib", "tools", "tests", "docs", "apps", "packages", "scripts"]:
+        for d in ContextIndexer.INTEREST_DIRS:
             if (root / d).is_dir():
                 paths.add(f"{d}/")
         if not paths:
             paths.add(".")
 
-    @staticmethod
-    def extract_file_contents(workspace_root: str, path_scope: List[str]) -> str:
-        """Reads specific files from the workspace and formats them for the LLM context."""
+    # ── File contents ─────────────────────────────────────
+
+    @classmethod
+    def _read_text(cls, path: Path) -> Optional[str]:
+        """UTF-8 text of ``path`` through the stat index and content-addressed blob cache.
+
+        Returns ``None`` without reading the file when it exceeds ``MAX_FILE_BYTES``.
+        """
+        st = path.stat()
+        if st.st_size > cls.MAX_FILE_BYTES:
+            return None
+        stat_key = (str(path), st.st_size, st.st_mtime_ns, st.st_ino)
+        with cls._lock:
+            digest = cls._stat_index.get(stat_key)
+            blob = cls._blobs.get(digest) if digest else None
+            if blob is not None:
+                cls._blobs.move_to_end(digest)
+                return blob[0]
+
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        with cls._lock:
+            blob = cls._blobs.get(digest)
+        text = blob[0] if blob is not None else data.decode("utf-8")
+
+        with cls._lock:
+            cls._stat_index[stat_key] = digest
+            cls._stat_index.move_to_end(stat_key)
+            if digest not in cls._blobs:
+                cls._blobs[digest] = (text, len(data))
+                cls._blob_bytes += len(data)
+            cls._blobs.move_to_end(digest)
+            while cls._blob_bytes > cls.BLOB_CACHE_BYTES and len(cls._blobs) > 1:
+                _, (_, size) = cls._blobs.popitem(last=False)
+                cls._blob_bytes -= size
+            while len(cls._stat_index) > cls.STAT_INDEX_SIZE:
+                cls._stat_index.popitem(last=False)
+        return text
+
+    @classmethod
+    def _allocate(cls, sizes: List[int], budget: int) -> List[int]:
+        """Split ``budget`` tokens over files of ``sizes`` tokens, earlier files weighted higher.
+
+        Weighted max-min fairness: files that fit in their share get all they
+        need and the remainder is redistributed among the larger ones.
+        """
+        n = len(sizes)
+        weights = [n - i for i in range(n)]
+        grant = [0] * n
+        pending = [i for i in range(n) if sizes[i] > 0]
+        remaining = budget
+        while pending and remaining > 0:
+            total_weight = sum(weights[i] for i in pending)
+            fits = [i for i in pending if sizes[i] <= remaining * weights[i] / total_weight]
+            if not fits:
+                for i in pending:
+                    grant[i] = int(remaining * weights[i] / total_weight)
+                break
+            for i in fits:
+                grant[i] = sizes[i]
+                remaining -= sizes[i]
+            pending = [i for i in pending if i not in fits]
+        return grant
+
+    @classmethod
+    def _condense(cls, text: str, max_chars: int) -> str:
+        """Head and tail of ``text`` within ``max_chars``, with an outline of the omitted middle."""
+        if len(text) <= max_chars:
+            return text
+        lines = text.splitlines()
+        head_chars, tail_chars = max_chars * 2 // 3, max_chars // 4
+        head: List[str] = []
+        used = 0
+        for line in lines:
+            if used + len(line) + 1 > head_chars:
+                break
+            head.append(line)
+            used += len(line) + 1
+        tail: List[str] = []
+        used = 0
+        for line in reversed(lines[len(head):]):
+            if used + len(line) + 1 > tail_chars:
+                break
+            tail.append(line)
+            used += len(line) + 1
+        tail.reverse()
+        middle = lines[len(head):len(lines) - len(tail)]
+        outline: List[str] = []
+        budget = max_chars - sum(len(kept) + 1 for kept in head + tail)
+        for line in middle:
+            if _OUTLINE_LINE.match(line) and len(line) + 1 <= budget:
+                outline.append(line.rstrip())
+                budget -= len(line) + 1
+        marker = f"# ... [{len(middle)} lines omitted"
+        marker += ", outline:]" if outline else "] ..."
+        return "\n".join(head + [marker] + outline + (["# ... [end of outline] ..."] if outline else []) + tail)
+
+    @classmethod
+    def extract_file_contents(
+        cls, workspace_root: str, path_scope: List[str], token_budget: Optional[int] = None
+    ) -> str:
+        """Reads specific files from the workspace and formats them for the LLM context.
+
+        With ``token_budget``, files are shortened (head, outline, tail) so the
+        whole block stays within roughly that many tokens; files listed first
+        get a larger share.
+        """
         root = Path(workspace_root).resolve()
-        contents = []
+        entries: List[Tuple[str, Optional[str], Optional[str]]] = []  # (label, text, note)
         for path_str in path_scope:
             path_str_safe = path_str.lstrip('/')
             path = (root / path_str_safe).resolve()
             
             if not str(path).startswith(str(root)):
-                contents.append(f"--- {path_str} ---\n[Access denied: Path outside workspace]\n")
+                entries.append((path_str, None, "[Access denied: Path outside workspace]"))
                 continue
                 
             if path.is_file():
                 try:
-                    text_content = path.read_text(encoding="utf-8")
-                    contents.append(f"--- {path_str} ---\n{text_content}\n")
+                    text = cls._read_text(path)
+                    if text is None:
+                        note = f"[Skipped: file larger than {cls.MAX_FILE_BYTES} bytes]"
+                        entries.append((path_str, None, note))
+                    else:
+                        entries.append((path_str, text, None))
                 except Exception as e:
-                    contents.append(f"--- {path_str} ---\n[Error reading file: {e}]\n")
+                    entries.append((path_str, None, f"[Error reading file: {e}]"))
             else:
-                contents.append(f"--- {path_str} ---\n[File not found]\n")
+                entries.append((path_str, None, "[File not found]"))
+
+        if token_budget is not None:
+            sizes = [-(-len(text) // cls.CHARS_PER_TOKEN) if text is not None else 0 for _, text, _ in entries]
+            grants = cls._allocate(sizes, token_budget)
+            entries = [
+                (label, cls._condense(text, grant * cls.CHARS_PER_TOKEN) if text is not None else None, note)
+                for (label, text, note), grant in zip(entries, grants)
+            ]
+
+        contents = [f"--- {label} ---\n{text if text is not None else note}\n" for label, text, note in entries]
         return "\n".join(contents)
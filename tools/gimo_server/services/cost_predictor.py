@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import logging
+import math
 from typing import Any, Dict, List, Optional
 
 from ..ops_models import WorkflowNode, UserEconomyConfig
 from .cost_service import CostService
+from .storage.cost_stats import ANY_MODEL, CostStats, CostStatsKey
 from .storage_service import StorageService
 
 logger = logging.getLogger("orchestrator.services.cost_predictor")
@@ -12,6 +14,9 @@ logger = logging.getLogger("orchestrator.services.cost_predictor")
 class CostPredictor:
     """Predicts workflow costs based on historical usage and static pricing."""
 
+    MIN_SAMPLES = 5
+    INTERVAL_Z = 1.645  # two-sided 90% band
+
     def __init__(self, storage: Optional[StorageService] = None):
         self.storage = storage or StorageService()
 
@@ -36,28 +41,39 @@ class CostPredictor:
         samples_found = 0
         total_nodes = len(nodes)
         total_llm_nodes = 0
+        # Historical nodes contribute mean/variance; static-priced ones keep the heuristic band.
+        historical_variance = 0.0
+        static_cost = 0.0
 
         # Build set of allowed providers from user config
         allowed_providers: Optional[set] = None
         if economy_config.provider_budgets:
             allowed_providers = {b.provider for b in economy_config.provider_budgets}
 
+        stats: Optional[Dict[CostStatsKey, CostStats]] = None
+        default_model: Optional[str] = None
+
         for node in nodes:
             if node.type != "llm_call":
                 continue
 
             total_llm_nodes += 1
+            if stats is None:
+                # One snapshot of the statistics table serves every node.
+                stats = self.storage.cost.get_cost_stats()
 
             task_type = node.config.get("task_type", "generic")
             model = node.config.get("model")
 
             if not model:
-                from .provider_service import ProviderService
-                provider_cfg = ProviderService.get_config()
-                if provider_cfg and provider_cfg.active in provider_cfg.providers:
-                    model = provider_cfg.providers[provider_cfg.active].model
-                else:
-                    model = "haiku"
+                if default_model is None:
+                    from .provider_service import ProviderService
+                    provider_cfg = ProviderService.get_config()
+                    if provider_cfg and provider_cfg.active in provider_cfg.providers:
+                        default_model = provider_cfg.providers[provider_cfg.active].model
+                    else:
+                        default_model = "haiku"
+                model = default_model
 
             # Filter: skip models whose provider is not in user's configured providers
             if allowed_providers:
@@ -66,26 +82,28 @@ class CostPredictor:
                     # Use fallback model from an allowed provider or local
                     model = "local"
             
-            # 1. Try historical lookup by task_type AND model
-            hist = self.storage.cost.get_avg_cost_by_task_type(task_type, model=model)
-            
-            if hist["sample_count"] >= 5:
+            # 1. Try historical stats by task_type AND model
+            hist = stats.get((task_type, model))
+            # 2. Then by task_type only (any model)
+            hist_generic = stats.get((task_type, ANY_MODEL))
+
+            if hist and hist.count >= self.MIN_SAMPLES:
                 # Use historical average for this specific model/task combo
-                estimated_node_cost = hist["avg_cost"]
+                estimated_node_cost = hist.mean
+                historical_variance += hist.variance
                 samples_found += 1
+            elif hist_generic and hist_generic.count >= self.MIN_SAMPLES:
+                # Use generic average but maybe adjust it? 
+                # For now, we take it as is, but we could scale it by model price ratios.
+                estimated_node_cost = hist_generic.mean
+                historical_variance += hist_generic.variance
+                samples_found += 0.5 # Partial weight for non-exact match
             else:
-                # 2. Try historical lookup by task_type only (any model)
-                hist_generic = self.storage.cost.get_avg_cost_by_task_type(task_type)
-                if hist_generic["sample_count"] >= 5:
-                    # Use generic average but maybe adjust it? 
-                    # For now, we take it as is, but we could scale it by model price ratios.
-                    estimated_node_cost = hist_generic["avg_cost"]
-                    samples_found += 0.5 # Partial weight for non-exact match
-                else:
-                    # 3. Fallback to static pricing (assuming generic token counts)
-                    input_tokens = 1000
-                    output_tokens = 500
-                    estimated_node_cost = CostService.calculate_cost(model, input_tokens, output_tokens)
+                # 3. Fallback to static pricing (assuming generic token counts)
+                input_tokens = 1000
+                output_tokens = 500
+                estimated_node_cost = CostService.calculate_cost(model, input_tokens, output_tokens)
+                static_cost += estimated_node_cost
             
             total_estimated_cost += estimated_node_cost
             
@@ -102,9 +120,12 @@ class CostPredictor:
             # If no LLM nodes but there are other nodes, we are "confident" in the zero cost
             confidence_score = 1.0
             
-        # Standard deviation heuristic if we have history
-        low_bound = total_estimated_cost * 0.8
-        high_bound = total_estimated_cost * 1.5
+        # Node costs are treated as independent: the historical part gets a
+        # normal-approximation band, the static part the fixed heuristic.
+        historical_cost = total_estimated_cost - static_cost
+        spread = self.INTERVAL_Z * math.sqrt(historical_variance)
+        low_bound = max(0.0, historical_cost - spread) + static_cost * 0.8
+        high_bound = historical_cost + spread + static_cost * 1.5
         
         return {
             "estimated_cost": round(total_estimated_cost, 4),
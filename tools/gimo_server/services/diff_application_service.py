@@ -1,8 +1,8 @@
-import os
 import re
 import logging
 from pathlib import Path
-import subprocess
+
+from tools.gimo_server.services.patch_engine import PatchEngine, path_hint
 
 logger = logging.getLogger("orchestrator.services.diff_application_service")
 
@@ -18,13 +18,14 @@ class DiffApplicationService:
         # Strategy 1: Search-Replace Blocks
         if DiffApplicationService.SEARCH_TAG in agent_content and DiffApplicationService.REPLACE_TAG in agent_content:
             logger.info("Detected Search-Replace format.")
-            DiffApplicationService._apply_search_replace(worktree_path, agent_content)
+            DiffApplicationService._apply_patch(worktree_path, agent_content)
             return
             
-        # Strategy 2: Git patch (Unified Diff)
+        # Strategy 2: Unified Diff
         if "diff --git" in agent_content and "--- a/" in agent_content and "+++ b/" in agent_content:
             logger.info("Detected Unified Diff format.")
-            DiffApplicationService._apply_git_patch(worktree_path, agent_content)
+            match = re.search(r'```(?:diff|patch)?\n(diff --git.*?)\n```', agent_content, re.DOTALL)
+            DiffApplicationService._apply_patch(worktree_path, match.group(1) + "\n" if match else agent_content)
             return
 
         # Strategy 3: Full file write / Artifact markdown
@@ -43,75 +44,19 @@ class DiffApplicationService:
 
     @staticmethod
     def _extract_filepath(preceding_text: str) -> str | None:
-        lines = preceding_text.split('\n')
-        for line in reversed(lines):
-            line = line.strip()
-            if not line: continue
-            match = re.search(r'([a-zA-Z0-9_\-\./\\]+\.[a-zA-Z0-9]+)', line)
-            if match:
-                return match.group(1).replace('\\', '/').lstrip('./')
-        return None
+        return path_hint(preceding_text)
 
     @staticmethod
-    def _apply_search_replace(worktree_path: str, agent_content: str) -> None:
-        blocks = agent_content.split(DiffApplicationService.SEARCH_TAG)
+    def _apply_patch(worktree_path: str, patch_text: str) -> None:
+        """Applies every hunk in ``patch_text`` or none of them (raises ``PatchError``)."""
         root = Path(worktree_path)
-        
-        for i in range(1, len(blocks)):
-            block = blocks[i]
-            if DiffApplicationService.DIVIDER_TAG not in block or DiffApplicationService.REPLACE_TAG not in block:
-                continue
-                
-            preceding = blocks[i-1]
-            filepath = DiffApplicationService._extract_filepath(preceding)
-            
-            if not filepath:
-                logger.error("Could not determine filepath for search/replace block.")
-                continue
-                
-            parts = block.split(DiffApplicationService.DIVIDER_TAG)
-            search_str = parts[0].strip('\n')
-            replace_str = parts[1].split(DiffApplicationService.REPLACE_TAG)[0].strip('\n')
-            
-            full_path = root / filepath
-            if not DiffApplicationService._is_safe_path(root, full_path):
-                logger.error(f"Path traversal blocked for: {filepath}")
-                continue
-                
-            if full_path.exists():
-                content = full_path.read_text(encoding='utf-8')
-                if search_str in content:
-                    content = content.replace(search_str, replace_str)
-                    full_path.write_text(content, encoding='utf-8')
-                    logger.info(f"Applied search/replace to {filepath}")
-                else:
-                    logger.error(f"Search string not found in {filepath} (Exact match failed)")
-
-    @staticmethod
-    def _apply_git_patch(worktree_path: str, agent_content: str) -> None:
-        import tempfile
-        patch_text = agent_content
-        match = re.search(r'```(?:diff|patch)?\n(diff --git.*?)\n```', agent_content, re.DOTALL)
-        if match:
-            patch_text = match.group(1)
-            
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.patch', delete=False, encoding='utf-8') as f:
-            f.write(patch_text)
-            patch_file = f.name
-            
-        try:
-            result = subprocess.run(
-                ['git', 'apply', patch_file],
-                cwd=worktree_path,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                logger.info("Successfully applied git patch.")
-            else:
-                logger.error(f"Git apply failed: {result.stderr}")
-        finally:
-            os.remove(patch_file)
+        result = PatchEngine.apply(
+            root, patch_text, is_safe=lambda target: DiffApplicationService._is_safe_path(root, target)
+        )
+        logger.info(
+            f"Applied {result.hunks} hunk(s) to {len(result.files)} file(s)"
+            + (f" ({result.fuzzed} with fuzzy matching)" if result.fuzzed else "")
+        )
 
     @staticmethod
     def _apply_file_writes(worktree_path: str, agent_content: str) -> None:
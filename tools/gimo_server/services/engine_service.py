@@ -1,6 +1,7 @@
 from __future__ import annotations
 from importlib import import_module
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from ..engine.pipeline import Pipeline
 
 class EngineService:
@@ -67,42 +68,35 @@ class EngineService:
         return getattr(module, class_name)
 
     @classmethod
-    def _build_stages(cls, composition_name: str) -> List[Any]:
+    def build_stages(cls, composition_name: str) -> List[Any]:
+        """Fresh stage instances for ``composition_name``; raises ValueError if unknown."""
         stage_refs = cls._COMPOSITION_MAP.get(composition_name)
         if not stage_refs:
             raise ValueError(f"Unknown composition: {composition_name}")
         stage_types = [cls._resolve_stage(ref) for ref in stage_refs]
         return [stage_type() for stage_type in stage_types]
 
+    @staticmethod
+    def journal_path(run_id: str) -> Path:
+        from .ops_service import OpsService
+
+        return OpsService.OPS_DIR / "run_journals" / f"{run_id}.jsonl"
+
     @staticmethod
     async def run_composition(
         composition_name: str, 
         run_id: str, 
         initial_context: Dict[str, Any]
     ) -> List[Any]:
-        stages = EngineService._build_stages(composition_name)
+        stages = EngineService.build_stages(composition_name)
         pipeline = Pipeline(run_id=run_id, stages=stages)
         return await pipeline.run(initial_context)
 
     @classmethod
-    async def execute_run(cls, run_id: str, composition: Optional[str] = None):
-        """Unified execution for any run."""
+    def run_context(cls, run: Any, composition: Optional[str] = None) -> Tuple[Dict[str, Any], str]:
+        """The initial pipeline context of ``run`` and its composition (inferred if not given)."""
         from .ops_service import OpsService
 
-        run = OpsService.get_run(run_id)
-        if not run:
-            return []
-
-        # Ensure the run is in 'running' state before executing.
-        # When the worker picks up a 'pending' run directly (e.g. child runs
-        # or re-queued runs from SubdivideRouter), the HTTP router has NOT
-        # set the status yet — so we do it here to satisfy ChildRunService's
-        # spawnable-state check and to have accurate status tracking.
-        if run.status == "pending":
-            OpsService.update_run_status(
-                run_id, "running", msg="Execution started via RunWorker"
-            )
-
         approved = OpsService.get_approved(run.approved_id)
         draft = OpsService.get_draft(approved.draft_id) if approved else None
         context = dict((draft.context if draft else {}) or {})
@@ -128,6 +122,11 @@ class EngineService:
             if not own_child_tasks:
                 context.pop("child_tasks", None)
 
+        # Journal stage outputs so a failed run can be resumed via ReplayEngine.
+        refactor_cfg = getattr(OpsService.get_config(), "refactor", None)
+        if getattr(refactor_cfg, "journal_replay_enabled", False):
+            context.setdefault("journal_path", str(cls.journal_path(run.id)))
+
         # Infer composition if not provided
         if not composition:
             if context.get("custom_plan_id"):
@@ -169,6 +168,29 @@ class EngineService:
                 f"Task: {context['prompt']}"
             )
 
+        return context, composition
+
+    @classmethod
+    async def execute_run(cls, run_id: str, composition: Optional[str] = None):
+        """Unified execution for any run."""
+        from .ops_service import OpsService
+
+        run = OpsService.get_run(run_id)
+        if not run:
+            return []
+
+        # Ensure the run is in 'running' state before executing.
+        # When the worker picks up a 'pending' run directly (e.g. child runs
+        # or re-queued runs from SubdivideRouter), the HTTP router has NOT
+        # set the status yet — so we do it here to satisfy ChildRunService's
+        # spawnable-state check and to have accurate status tracking.
+        if run.status == "pending":
+            OpsService.update_run_status(
+                run_id, "running", msg="Execution started via RunWorker"
+            )
+
+        context, composition = cls.run_context(run, composition)
+
         # Start pipeline
         try:
             results = await cls.run_composition(composition, run_id, context)
@@ -190,3 +212,82 @@ class EngineService:
 
         OpsService.update_run_status(run_id, final_status, msg=final_msg)
         return results
+
+    @classmethod
+    async def replay_run(
+        cls, run_id: str, from_step: str, stages: List[Any], composition: str
+    ) -> Any:
+        """Resume ``run_id`` at ``from_step`` with its stored context.
+
+        The run moves to ``running`` for the replay and then to ``done`` or
+        ``error`` like :meth:`execute_run`; the outcome is appended to the run log.
+        """
+        from ..engine.journal import RunJournal
+        from ..engine.replay import ReplayEngine
+        from .ops_service import OpsService
+
+        run = OpsService.get_run(run_id)
+        if not run:
+            return None
+        context, _ = cls.run_context(run, composition)
+        journal = RunJournal(storage_path=str(cls.journal_path(run_id)))
+        journal.load()
+        pipeline = Pipeline(run_id=run_id, stages=stages)
+        OpsService.update_run_status(run_id, "running", msg=f"Replay from {from_step} started")
+        try:
+            output = await ReplayEngine(journal).replay_from(from_step, pipeline, context)
+        except Exception as exc:
+            OpsService.update_run_status(
+                run_id, "error", msg=f"Replay from {from_step} failed: {str(exc)[:200]}"
+            )
+            raise
+        msg = f"Replay from {from_step} finished: {output.status}"
+        if output.error:
+            msg += f" ({str(output.error)[:200]})"
+        OpsService.append_log(run_id, level="ERROR" if output.status == "fail" else "INFO", msg=msg)
+        if output.status == "fail":
+            OpsService.update_run_status(
+                run_id, "error", msg=str(output.error or "Stage failed")[:200]
+            )
+        elif output.status != "halt":
+            # Halted (e.g. HUMAN_APPROVAL_REQUIRED) — leave status as-is
+            OpsService.update_run_status(run_id, "done", msg="Replay completed successfully")
+        return output
+
+    @classmethod
+    async def dry_replay_run(cls, run_id: str, from_step: str, stages: List[Any]) -> Any:
+        """Re-execute ``run_id``'s journaled stages from ``from_step`` without side effects.
+
+        The run status is left untouched; the divergence summary is appended to the run log.
+        """
+        from ..engine.journal import RunJournal
+        from ..engine.replay import ReplayEngine
+        from .ops_service import OpsService
+
+        journal = RunJournal(storage_path=str(cls.journal_path(run_id)))
+        journal.load()
+        pipeline = Pipeline(run_id=run_id, stages=stages)
+        try:
+            output = await ReplayEngine(journal).replay_from(from_step, pipeline, dry_run=True)
+        except Exception as exc:
+            OpsService.append_log(
+                run_id, level="ERROR", msg=f"Dry replay from {from_step} failed: {str(exc)[:200]}"
+            )
+            raise
+        if output.status == "fail":
+            OpsService.append_log(
+                run_id, level="ERROR", msg=f"Dry replay from {from_step} failed: {output.error}"
+            )
+            return output
+        reports = output.artifacts["stages"]
+        diverged = [r["stage"] for r in reports if r["diverged"]]
+        OpsService.append_log(
+            run_id,
+            level="WARN" if diverged else "INFO",
+            msg=(
+                f"Dry replay from {from_step}: {len(reports)} stages, "
+                f"diverged: {', '.join(diverged) or 'none'}, "
+                f"skipped: {', '.join(output.artifacts['skipped']) or 'none'}"
+            ),
+        )
+        return output
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
 
 from ..ops_models import (
     EvalCaseResult,
@@ -11,10 +18,55 @@ from ..ops_models import (
     WorkflowGraph,
 )
 from .graph_engine import GraphEngine
+from .notification_service import NotificationService
+
+logger = logging.getLogger("orchestrator.services.evals")
+
+
+def _stable_hash(payload: Any) -> str:
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
 class EvalsService:
-    """Regression/evals runner for workflow graphs (Fase 4.4 MVP)."""
+    """Regression/evals runner for workflow graphs (Fase 4.4 MVP).
+
+    Cases run concurrently (``concurrency`` at a time) on forks of a single
+    compiled GraphEngine. The final state of each case is cached by
+    ``(workflow hash, input hash)``, so re-running an unchanged suite only
+    executes cases whose graph or input changed; scoring is always recomputed.
+    """
+
+    DEFAULT_CONCURRENCY = 4
+    CASE_CACHE_MAX_ENTRIES = 2048
+
+    _case_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        with cls._cache_lock:
+            cls._case_cache.clear()
+
+    @classmethod
+    def _cache_get(cls, key: str) -> Optional[Dict[str, Any]]:
+        with cls._cache_lock:
+            state = cls._case_cache.get(key)
+            if state is not None:
+                cls._case_cache.move_to_end(key)
+            return state
+
+    @classmethod
+    def _cache_put(cls, key: str, state: Dict[str, Any]) -> None:
+        with cls._cache_lock:
+            cls._case_cache[key] = state
+            cls._case_cache.move_to_end(key)
+            while len(cls._case_cache) > cls.CASE_CACHE_MAX_ENTRIES:
+                cls._case_cache.popitem(last=False)
+
+    @staticmethod
+    def workflow_hash(workflow: WorkflowGraph) -> str:
+        return _stable_hash(workflow.model_dump(mode="json"))
 
     @classmethod
     async def run_regression(
@@ -25,33 +77,47 @@ class EvalsService:
         judge: EvalJudgeConfig,
         gate: EvalGateConfig,
         case_limit: int | None = None,
+        concurrency: int | None = None,
+        use_cache: bool = True,
     ) -> EvalRunReport:
         cases = dataset.cases[: int(case_limit)] if case_limit else list(dataset.cases)
-        results: List[EvalCaseResult] = []
-
-        for case in cases:
-            engine = GraphEngine(workflow)
-            state = await engine.execute(initial_state=dict(case.input_state))
-            actual_state = dict(state.data)
+        compiled = GraphEngine(workflow)
+        wf_hash = cls.workflow_hash(workflow)
+        semaphore = asyncio.Semaphore(max(1, int(concurrency or cls.DEFAULT_CONCURRENCY)))
+        progress = {"id": f"eval_{uuid.uuid4().hex[:12]}", "completed": 0, "cached": 0}
+
+        async def run_case(case) -> EvalCaseResult:
+            cache_key = f"{wf_hash}:{_stable_hash(case.input_state)}"
+            actual_state = cls._cache_get(cache_key) if use_cache else None
+            cached = actual_state is not None
+            if actual_state is None:
+                async with semaphore:
+                    state = await compiled.fork().execute(initial_state=dict(case.input_state))
+                actual_state = dict(state.data)
+                if use_cache:
+                    cls._cache_put(cache_key, actual_state)
 
             score, reason = cls._score_case(
                 expected_state=case.expected_state,
                 actual_state=actual_state,
                 judge=judge,
             )
-            passed = score >= float(case.threshold)
-
-            results.append(
-                EvalCaseResult(
-                    case_id=case.case_id,
-                    passed=passed,
-                    score=round(score, 4),
-                    input_state=dict(case.input_state),
-                    expected_state=dict(case.expected_state),
-                    actual_state=cls._project_actual_state(actual_state, case.expected_state, judge),
-                    reason=reason,
-                )
+            result = EvalCaseResult(
+                case_id=case.case_id,
+                passed=score >= float(case.threshold),
+                score=round(score, 4),
+                input_state=dict(case.input_state),
+                expected_state=dict(case.expected_state),
+                actual_state=cls._project_actual_state(actual_state, case.expected_state, judge),
+                reason=reason,
             )
+            progress["completed"] += 1
+            progress["cached"] += int(cached)
+            await cls._publish_progress(workflow.id, progress, len(cases), result, cached)
+            return result
+
+        # gather keeps dataset order in the report regardless of completion order.
+        results: List[EvalCaseResult] = list(await asyncio.gather(*(run_case(case) for case in cases)))
 
         total_cases = len(results)
         passed_cases = sum(1 for item in results if item.passed)
@@ -59,6 +125,13 @@ class EvalsService:
         pass_rate = (passed_cases / total_cases) if total_cases else 0.0
         avg_score = (sum(item.score for item in results) / total_cases) if total_cases else 0.0
         gate_passed = pass_rate >= gate.min_pass_rate and avg_score >= gate.min_avg_score
+        logger.info(
+            "Eval regression %s: %d cases (%d from cache), pass_rate=%.4f",
+            workflow.id,
+            total_cases,
+            progress["cached"],
+            pass_rate,
+        )
 
         return EvalRunReport(
             workflow_id=workflow.id,
@@ -72,6 +145,32 @@ class EvalsService:
             results=results,
         )
 
+    @staticmethod
+    async def _publish_progress(
+        workflow_id: str,
+        progress: Dict[str, Any],
+        total: int,
+        result: EvalCaseResult,
+        cached: bool,
+    ) -> None:
+        try:
+            await NotificationService.publish(
+                "eval_progress",
+                {
+                    "run_id": progress["id"],
+                    "workflow_id": workflow_id,
+                    "completed": progress["completed"],
+                    "total": total,
+                    "cached": progress["cached"],
+                    "case_id": result.case_id,
+                    "passed": result.passed,
+                    "from_cache": cached,
+                    "done": progress["completed"] >= total,
+                },
+            )
+        except Exception as exc:  # progress is best-effort
+            logger.debug("Failed to publish eval progress: %s", exc)
+
     @staticmethod
     def _project_actual_state(
         actual_state: Dict[str, Any],
@@ -1,9 +1,10 @@
 import hashlib
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from tools.gimo_server.config import AUDIT_LOG_PATH, MAX_BYTES, MAX_LINES
-from tools.gimo_server.security import audit_log, redact_sensitive_data
+from tools.gimo_server.security import audit_index, audit_log, redact_sensitive_data
+from tools.gimo_server.services.patch_engine import PatchEngine
 from tools.gimo_server.services.snapshot_service import SnapshotService
 
 
@@ -11,14 +12,36 @@ class FileService:
     """Centraliza las operaciones de lectura y escritura de archivos en el workspace."""
     @staticmethod
     def tail_audit_lines(limit: int = 200) -> List[str]:
-        if not AUDIT_LOG_PATH.exists():
-            return []
+        """Last ``limit`` audit entries, read backwards from the end of the log."""
         try:
-            lines = AUDIT_LOG_PATH.read_text(encoding="utf-8", errors="ignore").splitlines()
-            return lines[-limit:]
+            return audit_index.tail_lines(limit, AUDIT_LOG_PATH)
         except Exception:
             return []
 
+    @staticmethod
+    def query_audit(
+        *,
+        operation: Optional[str] = None,
+        actor: Optional[str] = None,
+        path: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 200,
+    ) -> List[Dict[str, Any]]:
+        """Structured audit records matching every given filter.
+
+        ``since`` / ``until`` are epoch seconds.
+        """
+        return audit_index.query(
+            operation=operation,
+            actor=actor,
+            path_contains=path,
+            since=since,
+            until=until,
+            limit=limit,
+            path=AUDIT_LOG_PATH,
+        )
+
     @staticmethod
     def get_file_content(
         target_path: Path,
@@ -88,12 +111,25 @@ class FileService:
     @staticmethod
     def patch_file(target_path: Path, diff: str, token: str = "SYSTEM") -> str:
         """
-        Applies a patch to a file. (Placeholder for real diff logic).
+        Applies a unified diff or SEARCH/REPLACE blocks to a single file.
+        Either every hunk applies and the file is replaced atomically, or the
+        file is left untouched and IOError is raised.
         """
         try:
-            # In a real impl, we'd use a patch utility
-            audit_log(str(target_path), "0", "patch", operation="PATCH_FILE", actor=token)
-            return f"Successfully patched {target_path}"
+            result = PatchEngine.apply_to_file(target_path, diff)
+            content_hash = (
+                hashlib.sha256(target_path.read_bytes()).hexdigest()
+                if target_path.exists()
+                else "deleted"
+            )
+            audit_log(
+                str(target_path),
+                f"hunks={result.hunks},fuzzed={result.fuzzed}",
+                content_hash,
+                operation="PATCH_FILE",
+                actor=token,
+            )
+            return f"Successfully patched {target_path} ({result.hunks} hunk(s))"
         except Exception as e:
             raise IOError(f"Failed to patch {target_path}: {e}")
 
@@ -3,6 +3,7 @@ import json
 import logging
 import socket
 import subprocess
+import threading
 import time
 import os
 import uuid
@@ -24,6 +25,8 @@ class GicsService:
         self._pipe_file: Optional[Any] = None  # For Windows Named Pipe
         self._actual_socket_path: Optional[str] = None
         self._health_task: Optional[asyncio.Task] = None
+        # Request/response pairs share one socket; background writers must not interleave.
+        self._io_lock = threading.RLock()
         
     def start_daemon(self) -> None:
         """Start the GICS daemon subprocess."""
@@ -231,6 +234,10 @@ class GicsService:
 
     def send_command(self, method: str, params: Dict[str, Any] = None) -> Any:
         """Send a JSON-RPC 2.0 command to the daemon."""
+        with self._io_lock:
+            return self._send_command_locked(method, params)
+
+    def _send_command_locked(self, method: str, params: Dict[str, Any] = None) -> Any:
         if not self._token:
             raise RuntimeError("GICS Token not available")
             
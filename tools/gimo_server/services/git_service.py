@@ -108,6 +108,15 @@ class GitService:
         except Exception as e:
             raise RuntimeError(f"Internal git worktree remove error: {str(e)}")
 
+    @staticmethod
+    def reset_worktree(worktree_path: Path, ref: str = "HEAD") -> None:
+        """Force an existing worktree back to a pristine detached checkout of ``ref``."""
+        safe_ref = _sanitize_git_ref(ref)
+        for args in (["checkout", "-f", "--detach", safe_ref], ["clean", "-fdx"]):
+            code, _, err = GitService._run_git(worktree_path, args)
+            if code != 0:
+                raise RuntimeError(f"Git worktree reset error ({args[0]}): {err}")
+
     @staticmethod
     def list_worktrees(base_dir: Path) -> list[str]:
         """Lists active git worktrees."""
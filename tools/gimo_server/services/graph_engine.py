@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 from datetime import datetime, timezone
 import inspect
 import logging
@@ -33,6 +34,29 @@ from ..adapters.mcp_client import McpClient
 logger = logging.getLogger("orchestrator.services.graph_engine")
 
 
+def _reduce_append(current: Any, value: Any) -> List[Any]:
+    base = list(current) if isinstance(current, list) else ([] if current is None else [current])
+    return base + (list(value) if isinstance(value, list) else [value])
+
+
+def _reduce_merge(current: Any, value: Any) -> Any:
+    if isinstance(current, dict) and isinstance(value, dict):
+        return {**current, **value}
+    return value
+
+
+# State reducers declared per key in ``WorkflowGraph.state_schema["reducers"]``.
+# Undeclared keys use "overwrite" (last writer wins, in edge declaration order).
+STATE_REDUCERS = {
+    "overwrite": lambda current, value: value,
+    "append": _reduce_append,
+    "merge": _reduce_merge,
+    "sum": lambda current, value: (current or 0) + (value or 0),
+    "max": lambda current, value: value if current is None else max(current, value),
+    "min": lambda current, value: value if current is None else min(current, value),
+}
+
+
 class GraphEngine:
     """MVP Graph Execution Engine."""
 
@@ -57,12 +81,32 @@ class GraphEngine:
         self._resume_from_node_id: Optional[str] = None
         self._execution_started_at: Optional[float] = None
         self._edges_from = {}
+        self._edges_to: Dict[str, List[str]] = {}
         for edge in self.graph.edges:
             self._edges_from.setdefault(edge.from_node, []).append(edge)
+            self._edges_to.setdefault(edge.to_node, []).append(edge.from_node)
+        schema = self.graph.state_schema if isinstance(self.graph.state_schema, dict) else {}
+        self._reducers: Dict[str, str] = dict(schema.get("reducers") or {})
+        unknown = sorted(set(self._reducers.values()) - set(STATE_REDUCERS))
+        if unknown:
+            raise ValueError(f"Unknown state reducer(s): {unknown}")
+        self._max_parallel_branches = int(schema.get("max_parallel_branches", 0) or 0)
         self._model_router = ModelRouterService(storage=self.storage, confidence_service=self._confidence_service)
         self._provider_service = provider_service or ProviderService()
         self._cascade_service = CascadeService(self._provider_service, self._model_router)
 
+    def fork(self) -> "GraphEngine":
+        """Return an engine with fresh run state sharing this one's compiled graph.
+
+        Node/edge indices, reducers and the router/provider services are reused,
+        so running many inputs through one graph skips rebuilding them per run.
+        """
+        clone = copy.copy(self)
+        clone.state = WorkflowState()
+        clone._resume_from_node_id = None
+        clone._execution_started_at = None
+        return clone
+
     async def execute(self, initial_state: Optional[Dict[str, Any]] = None) -> WorkflowState:
         if initial_state:
             self.state.data.update(initial_state)
@@ -84,10 +128,21 @@ class GraphEngine:
             if not self.graph.nodes:
                 return self.state
 
+            pending = self.state.data.pop("pending_branches", None)
             current_node_id = self._resume_from_node_id or self.graph.nodes[0].id
             self._resume_from_node_id = None
             iterations = 0
-            
+            if pending:
+                # A fan-out paused last time: resume every branch it left pending.
+                current_node_id, iterations, stopped = await self._execute_fan_out(
+                    pending["frontier"],
+                    iterations,
+                    completed=set(pending["completed"]),
+                    limit=int(pending.get("limit") or 0),
+                )
+                if stopped:
+                    current_node_id = None
+
 
             while current_node_id and iterations < self.max_iterations:
                 node = self._nodes_by_id[current_node_id]
@@ -115,8 +170,7 @@ class GraphEngine:
                     output = await self._run_node_with_retries(node)
 
                     # Every node can mutate state by returning a dict
-                    if isinstance(output, dict):
-                        self.state.data.update(output)
+                    self._merge_state(output)
 
                     self._update_budget_counters(output)
 
@@ -132,32 +186,11 @@ class GraphEngine:
                             started_at=started_at,
                             output=output,
                         )
-                        
-                        # Trigger MCP Notification / Global SSE
-                        from tools.gimo_server.services.notification_service import NotificationService
-                        try:
-                            loop = asyncio.get_running_loop()
-                            loop.create_task(NotificationService.publish("handover_required", {
-                                "workflow_id": self.graph.id,
-                                "node_id": node.id,
-                                "reason": reason,
-                                "context": output
-                            }))
-                        except Exception as ne:
-                            logger.error(f"Failed to publish notification: {ne}")
-                            
+                        self._notify_handover(node, reason, output)
                         break
 
                     self.state.data["execution_paused"] = False
-
-                    checkpoint = WorkflowCheckpoint(
-                        node_id=node.id,
-                        state=self.state.data.copy(),
-                        output=output,
-                        status="completed"
-                    )
-                    self.state.checkpoints.append(checkpoint)
-                    self._persist_checkpoint(checkpoint)
+                    self._record_checkpoint(node, output, "completed")
 
                     self._append_step_log(
                         step_id=step_id,
@@ -167,28 +200,32 @@ class GraphEngine:
                         output=output,
                     )
 
-                    # Determine next node
-                    current_node_id = self._get_next_node(node.id, output)
+                    # Determine next node(s)
+                    next_node_ids = self._get_next_nodes(node.id, output)
+                    current_node_id = next_node_ids[0] if next_node_ids else None
 
                     budget_reason = self._check_budget_after_step()
                     if budget_reason:
                         self._handle_budget_exceeded(budget_reason)
                         break
-                    
+
+                    if len(next_node_ids) > 1:
+                        current_node_id, iterations, stopped = await self._execute_fan_out(
+                            next_node_ids,
+                            iterations,
+                            completed={node.id},
+                            limit=int(node.config.get("max_parallel_branches", 0) or 0),
+                        )
+                        if stopped:
+                            break
+
                 except Exception as e:
                     logger.error(f"Error executing node {node.id}: {e}")
                     if isinstance(e, TimeoutError):
                         error_text = "timed out"
                     else:
                         error_text = str(e) or e.__class__.__name__
-                    checkpoint = WorkflowCheckpoint(
-                        node_id=node.id,
-                        state=self.state.data.copy(),
-                        output=None,
-                        status="failed"
-                    )
-                    self.state.checkpoints.append(checkpoint)
-                    self._persist_checkpoint(checkpoint)
+                    self._record_checkpoint(node, None, "failed")
                     self._append_step_log(
                         step_id=step_id,
                         node=node,
@@ -217,6 +254,8 @@ class GraphEngine:
                 trace_id, 
                 status=workflow_status
             )
+            if workflow_status != "paused":
+                self._end_checkpoint_chain()
 
         return self.state
 
@@ -246,7 +285,182 @@ class GraphEngine:
 
         raise RuntimeError(str(last_error) if last_error else f"Node failed without error: {node.id}")
 
+    async def _execute_fan_out(
+        self, targets: List[str], iterations: int, *, completed: set[str], limit: int = 0
+    ) -> tuple[Optional[str], int, bool]:
+        """Run parallel branches in supersteps until they converge on a single node.
+
+        Every superstep runs all ready nodes concurrently (bounded by
+        ``max_parallel_branches``) against the state left by the previous step, then
+        merges their dict outputs through the declared reducers in a deterministic
+        order. A ``join`` node only becomes ready once all of its predecessors have
+        completed, or once no other branch is still running that could reach it.
+
+        ``completed`` holds the nodes already done (the fan-out source, or those
+        restored from a paused fan-out) and ``limit`` the source node's own
+        ``max_parallel_branches``. If a branch pauses, the superstep still
+        finishes and the whole pending set (paused nodes, waiting joins and the
+        successors of the nodes that completed) is stored in
+        ``state.data["pending_branches"]`` and in a ``paused`` checkpoint, so a
+        resume restarts every branch, not just one node.
+
+        Returns ``(next_node_id, iterations, stopped)``; ``stopped`` means the
+        workflow failed, paused or hit a limit and the caller must not continue.
+        """
+        source_limit = limit
+        limit = limit or self._max_parallel_branches
+        completed = set(completed)
+        frontier: List[str] = list(targets)
+
+        while frontier:
+            ready: List[str] = []
+            waiting: List[str] = []
+            has_running_branches = any(not self._is_join_node(nid) for nid in frontier)
+            for node_id in dict.fromkeys(frontier):
+                if self._is_join_node(node_id) and has_running_branches and not all(
+                    pred in completed for pred in self._edges_to.get(node_id, [])
+                ):
+                    waiting.append(node_id)
+                else:
+                    ready.append(node_id)
+
+            if len(ready) == 1 and not waiting:
+                # Branches converged: hand the single node back to the sequential loop.
+                return ready[0], iterations, False
+
+            if iterations + len(ready) > self.max_iterations:
+                logger.warning("max_iterations reached (%s) during fan-out", self.max_iterations)
+                self.state.data["aborted_reason"] = "max_iterations_exceeded"
+                return None, iterations, True
+
+            timeout_reason = self._check_workflow_timeout()
+            if timeout_reason:
+                self.state.data["aborted_reason"] = timeout_reason
+                return None, iterations, True
+
+            nodes = [self._nodes_by_id[node_id] for node_id in ready]
+            for node in nodes:
+                try:
+                    await self._ensure_budget_guard(node)
+                except RuntimeError as e:
+                    if "budget" in str(e).lower():
+                        return None, iterations, True
+                    raise
+
+            semaphore = asyncio.Semaphore(max(1, limit or len(nodes)))
+
+            async def _run_bounded(node: WorkflowNode) -> tuple[float, Any]:
+                async with semaphore:
+                    started_at = time.perf_counter()
+                    try:
+                        return started_at, await self._run_node_with_retries(node)
+                    except Exception as exc:
+                        return started_at, exc
+
+            results = await asyncio.gather(*[_run_bounded(node) for node in nodes])
+
+            stopped = False
+            paused: List[tuple[WorkflowNode, Any]] = []
+            next_frontier: List[str] = []
+            for node, (started_at, output) in zip(nodes, results):
+                iterations += 1
+                step_id = f"step_{iterations}"
+                if isinstance(output, Exception):
+                    logger.error(f"Error executing node {node.id}: {output}")
+                    error_text = "timed out" if isinstance(output, TimeoutError) else (str(output) or output.__class__.__name__)
+                    self._record_checkpoint(node, None, "failed")
+                    self._append_step_log(
+                        step_id=step_id, node=node, status="failed", started_at=started_at, output={"error": error_text}
+                    )
+                    if not self.state.data.get("aborted_reason") and not self.state.data.get("pause_reason"):
+                        self.state.data["aborted_reason"] = "node_failure"
+                    stopped = True
+                    continue
+
+                self._merge_state(output)
+                self._update_budget_counters(output)
+                if isinstance(output, dict) and output.get("pause_execution"):
+                    if not paused:
+                        self._resume_from_node_id = node.id
+                    self.state.data["execution_paused"] = True
+                    reason = output.get("pause_reason", "human_review_pending")
+                    self.state.data["pause_reason"] = reason
+                    self._append_step_log(
+                        step_id=step_id, node=node, status="paused", started_at=started_at, output=output
+                    )
+                    self._notify_handover(node, reason, output)
+                    paused.append((node, output))
+                    stopped = True
+                    continue
+
+                self._record_checkpoint(node, output, "completed")
+                self._append_step_log(
+                    step_id=step_id, node=node, status="completed", started_at=started_at, output=output
+                )
+                completed.add(node.id)
+                next_frontier.extend(self._get_next_nodes(node.id, output))
+
+            if paused and not self.state.data.get("aborted_reason"):
+                pending = [paused_node.id for paused_node, _ in paused] + waiting + next_frontier
+                self.state.data["pending_branches"] = {
+                    "frontier": list(dict.fromkeys(pending)),
+                    "completed": sorted(completed),
+                    "limit": source_limit,
+                }
+                self._record_checkpoint(paused[0][0], paused[0][1], "paused")
+            if stopped:
+                return None, iterations, True
+            self.state.data["execution_paused"] = False
+
+            budget_reason = self._check_budget_after_step()
+            if budget_reason:
+                self._handle_budget_exceeded(budget_reason)
+                return None, iterations, True
+
+            frontier = list(dict.fromkeys(waiting + next_frontier))
+
+        return None, iterations, False
+
+    def _notify_handover(self, node: WorkflowNode, reason: str, output: Any) -> None:
+        """Trigger MCP Notification / Global SSE for a node that paused for a handover."""
+        from tools.gimo_server.services.notification_service import NotificationService
+        try:
+            loop = asyncio.get_running_loop()
+            loop.create_task(NotificationService.publish("handover_required", {
+                "workflow_id": self.graph.id,
+                "node_id": node.id,
+                "reason": reason,
+                "context": output
+            }))
+        except Exception as ne:
+            logger.error(f"Failed to publish notification: {ne}")
+
+    def _record_checkpoint(self, node: WorkflowNode, output: Any, status: str) -> None:
+        checkpoint = WorkflowCheckpoint(
+            node_id=node.id,
+            state=self.state.data.copy(),
+            output=output,
+            status=status,
+        )
+        self.state.checkpoints.append(checkpoint)
+        self._persist_checkpoint(checkpoint)
+
+    def _is_join_node(self, node_id: str) -> bool:
+        node = self._nodes_by_id.get(node_id)
+        return bool(node and node.type == "join")
+
+    def _merge_state(self, output: Any) -> None:
+        """Apply a node's dict output to state through the declared per-key reducers."""
+        if not isinstance(output, dict):
+            return
+        for key, value in output.items():
+            reducer = STATE_REDUCERS[self._reducers.get(key, "overwrite")]
+            self.state.data[key] = reducer(self.state.data.get(key), value)
+
     async def _run_node(self, node: WorkflowNode) -> Any:
+        if node.type == "join":
+            return {"joined_from": list(self._edges_to.get(node.id, []))}
+
         if node.type == "human_review":
             return await self._run_human_review(node)
 
@@ -1032,7 +1246,16 @@ class GraphEngine:
         }
         self.state.data["execution_paused"] = False
 
-        next_node = self._get_next_node(checkpoint.node_id, checkpoint.output)
+        pending = self.state.data.get("pending_branches")
+        if checkpoint.status == "paused" and pending:
+            # A fan-out paused here: ``execute`` restarts all of its pending branches.
+            self._resume_from_node_id = None
+            return pending["frontier"][0] if pending["frontier"] else None
+        self.state.data.pop("pending_branches", None)
+        if checkpoint.status == "paused":
+            next_node = checkpoint.node_id
+        else:
+            next_node = self._get_next_node(checkpoint.node_id, checkpoint.output)
         self._resume_from_node_id = next_node
         return next_node
 
@@ -1076,6 +1299,15 @@ class GraphEngine:
         except Exception as exc:
             logger.error("Failed to persist checkpoint for node=%s: %s", checkpoint.node_id, exc)
 
+    def _end_checkpoint_chain(self) -> None:
+        end_chain = getattr(self.storage, "end_checkpoint_chain", None)
+        if not (self.persist_checkpoints and callable(end_chain)):
+            return
+        try:
+            end_chain(self.graph.id)
+        except Exception as exc:
+            logger.warning("Failed to release checkpoint chain for %s: %s", self.graph.id, exc)
+
     async def _execute_node(self, node: WorkflowNode, state: Optional[Dict[str, Any]] = None) -> Any:
         """Execute a single node based on its type."""
         if node.type == "llm_call":
@@ -1347,6 +1579,17 @@ class GraphEngine:
             "reason": reason
         }
 
+    def _get_next_nodes(self, node_id: str, output: Any) -> List[str]:
+        """Fan out to every target when all outgoing edges are unconditional.
+
+        Mixed or conditional edges keep first-match routing via ``_get_next_node``.
+        """
+        edges = self._edges_from.get(node_id, [])
+        if len(edges) > 1 and all(not edge.condition for edge in edges):
+            return list(dict.fromkeys(edge.to_node for edge in edges))
+        next_node = self._get_next_node(node_id, output)
+        return [next_node] if next_node else []
+
     def _get_next_node(self, node_id: str, output: Any) -> Optional[str]:
         edges = self._edges_from.get(node_id, [])
         if not edges:
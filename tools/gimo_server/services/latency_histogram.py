@@ -0,0 +1,74 @@
+"""Log-bucketed latency histogram shared by the services that track latency."""
+from __future__ import annotations
+
+import math
+import threading
+from typing import Dict, Optional
+
+
+class LatencyHistogram:
+    """Thread-safe log-bucketed histogram of latencies, in whatever unit the caller uses.
+
+    Bucket ``i`` holds samples up to ``min_value * base ** i``. With ``max_count``
+    set, counts are halved once it is reached so recent samples dominate.
+    """
+
+    def __init__(
+        self, min_value: float, *, base: float = 1.25, max_count: Optional[float] = None
+    ):
+        self.min_value = min_value
+        self.base = base
+        self.max_count = max_count
+        self.buckets: Dict[int, float] = {}
+        self.count: float = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, value: float) -> None:
+        idx = max(0, math.ceil(math.log(max(value, self.min_value) / self.min_value, self.base)))
+        with self._lock:
+            self.buckets[idx] = self.buckets.get(idx, 0) + 1
+            self.count += 1
+            self.total += value
+            if self.max_count is not None and self.count >= self.max_count:
+                self.buckets = {k: v / 2 for k, v in self.buckets.items() if v >= 1}
+                count = sum(self.buckets.values())
+                self.total *= count / self.count
+                self.count = count
+
+    def bound(self, idx: int) -> float:
+        """Upper bound of bucket ``idx``."""
+        return self.min_value * self.base ** idx
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile."""
+        with self._lock:
+            return self._quantile(q)
+
+    def _quantile(self, q: float) -> float:
+        rank, seen = q * self.count, 0.0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen >= rank:
+                return self.bound(idx)
+        return 0.0
+
+    def summary(self, unit: str = "", digits: int = 3) -> Dict[str, object]:
+        """Count, mean, p50/p90/p99 and bucket counts; ``unit`` suffixes the value keys."""
+        suffix = f"_{unit}" if unit else ""
+        with self._lock:
+            buckets = {round(self.bound(idx), digits): n for idx, n in sorted(self.buckets.items())}
+            return {
+                "count": self.count,
+                f"mean{suffix}": round(self.total / self.count, digits) if self.count else 0.0,
+                f"p50{suffix}": round(self._quantile(0.5), digits),
+                f"p90{suffix}": round(self._quantile(0.9), digits),
+                f"p99{suffix}": round(self._quantile(0.99), digits),
+                "buckets": buckets,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.buckets.clear()
+            self.count = 0
+            self.total = 0.0
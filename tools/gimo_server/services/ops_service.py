@@ -5,9 +5,10 @@ import hashlib
 import logging
 import os
 import time
+from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from filelock import FileLock
 
@@ -16,6 +17,7 @@ from ..ops_models import OpsApproved, OpsConfig, OpsDraft, OpsPlan, OpsRun, Agen
 from .gics_service import GicsService
 from .agent_telemetry_service import AgentTelemetryService
 from .agent_insight_service import AgentInsightService
+from .config_snapshot import ConfigSnapshot, ConfigSnapshotCache
 
 logger = logging.getLogger("orchestrator.ops")
 
@@ -32,6 +34,21 @@ class OpsService:
     """File-backed OPS storage service.
 
     Data lives in `.orch_data/ops` under repo base dir.
+
+    Locking is striped so unrelated runs do not block each other:
+
+    * ``_lock()`` — global index lock (``.ops.lock``). Guards run creation,
+      where run_key dedupe and attempt numbering scan every run.
+    * ``_draft_lock(draft_id)`` — hash-sharded lock for draft edits and the
+      draft → approved promotion.
+    * ``_merge_guard(repo_id)`` — one lock per repo merge-lock file.
+    * ``_run_lock(run_id)`` / ``_run_locks(*ids)`` — hash-sharded locks for
+      run-scoped mutations (status, stage, logs, metadata, child links).
+
+    Lock ordering rule (deadlock prevention): acquire only in the order
+    global → draft shard → merge guard → run shards, and take several run
+    shards only through ``_run_locks`` (ascending shard index). Never take a
+    lock that comes earlier in this order while holding a later one.
     """
 
     OPS_DIR = OPS_DATA_DIR
@@ -46,6 +63,7 @@ class OpsService:
 
     CONFIG_FILE = OPS_DIR / "config.json"
     LOCK_FILE = OPS_DIR / ".ops.lock"
+    LOCK_SHARDS = 64
 
     _RUN_GLOB = "*.json"  # matches both r_* and legacy run_* ids
     _DRAFT_GLOB = "d_*.json"
@@ -81,8 +99,13 @@ class OpsService:
         "MERGE_CONFLICT": {"pending", "error", "cancelled"},
         "HUMAN_APPROVAL_REQUIRED": {"running", "cancelled", "error"},
         "WORKER_CRASHED_RECOVERABLE": {"pending", "error", "cancelled"},
+        # Replaying a journaled run (EngineService.replay_run) re-enters it at a step.
+        "error": {"running"},
+        "done": {"running"},
     }
 
+    _config_cache: ConfigSnapshotCache[OpsConfig] = ConfigSnapshotCache()
+
     _gics: Optional[GicsService] = None
     _telemetry: Optional[AgentTelemetryService] = None
     _insights: Optional[AgentInsightService] = None
@@ -90,6 +113,9 @@ class OpsService:
     @classmethod
     def set_gics(cls, gics: Optional[GicsService]) -> None:
         cls._gics = gics
+        if gics and cls._telemetry is not None and cls._telemetry.gics is gics:
+            return  # keep the in-memory telemetry aggregates of the current client
+        cls.flush_telemetry()
         if gics:
             cls._telemetry = AgentTelemetryService(gics)
             cls._insights = AgentInsightService(cls._telemetry)
@@ -97,6 +123,16 @@ class OpsService:
             cls._telemetry = None
             cls._insights = None
 
+    @classmethod
+    def flush_telemetry(cls) -> None:
+        """Persist pending agent telemetry aggregates."""
+        if not cls._telemetry:
+            return
+        try:
+            cls._telemetry.flush()
+        except Exception as e:
+            logger.error("Failed to flush agent telemetry: %s", e)
+
     @classmethod
     def record_agent_event(cls, event: Any) -> None:
         """Record an agent action event (IDS)."""
@@ -184,10 +220,60 @@ class OpsService:
         cls.RUN_LOGS_DIR.mkdir(parents=True, exist_ok=True)
         cls.LOCKS_DIR.mkdir(parents=True, exist_ok=True)
 
+    _file_locks: Dict[str, FileLock] = {}
+
+    @classmethod
+    def _file_lock(cls, path: Path) -> FileLock:
+        # One instance per path keeps same-thread re-acquisition reentrant.
+        key = str(path)
+        lock = cls._file_locks.get(key)
+        if lock is None:
+            lock = cls._file_locks.setdefault(key, FileLock(key))
+        return lock
+
     @classmethod
     def _lock(cls) -> FileLock:
+        """Global index lock. See the class docstring for the ordering rule."""
         cls.ensure_dirs()
-        return FileLock(str(cls.LOCK_FILE))
+        return cls._file_lock(cls.LOCK_FILE)
+
+    @classmethod
+    def _lock_shard(cls, key: str) -> int:
+        # sha256 (not hash()) so every worker process maps a key to the same shard.
+        digest = hashlib.sha256(str(key).encode("utf-8", errors="ignore")).digest()
+        return int.from_bytes(digest[:4], "big") % cls.LOCK_SHARDS
+
+    @classmethod
+    def _shard_lock(cls, kind: str, shard: int) -> FileLock:
+        path = cls.LOCKS_DIR / kind / f"{kind}_{shard:02d}.lock"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return cls._file_lock(path)
+
+    @classmethod
+    def _run_lock(cls, run_id: str) -> FileLock:
+        """Shard lock for run-scoped mutations of ``run_id``."""
+        return cls._shard_lock("run", cls._lock_shard(run_id))
+
+    @classmethod
+    @contextmanager
+    def _run_locks(cls, *run_ids: str) -> Iterator[None]:
+        """Hold the shard locks of several runs, acquired in ascending shard order."""
+        shards = sorted({cls._lock_shard(run_id) for run_id in run_ids if run_id})
+        with ExitStack() as stack:
+            for shard in shards:
+                stack.enter_context(cls._shard_lock("run", shard))
+            yield
+
+    @classmethod
+    def _draft_lock(cls, draft_id: str) -> FileLock:
+        """Shard lock for draft mutations and draft → approved promotion."""
+        return cls._shard_lock("draft", cls._lock_shard(draft_id))
+
+    @classmethod
+    def _merge_guard(cls, repo_id: str) -> FileLock:
+        """Lock serializing access to one repo's merge-lock file."""
+        cls.LOCKS_DIR.mkdir(parents=True, exist_ok=True)
+        return cls._file_lock(cls._merge_lock_path(repo_id).with_suffix(".lock"))
 
     @classmethod
     def _draft_path(cls, draft_id: str) -> Path:
@@ -410,15 +496,26 @@ class OpsService:
     # Config
     # -----------------
 
+    @classmethod
+    def get_config_snapshot(cls) -> Optional[ConfigSnapshot[OpsConfig]]:
+        """Return the cached config snapshot backed by ``CONFIG_FILE``.
+
+        The snapshot value is shared and must be treated as read-only; hot paths
+        compare ``version`` instead of re-reading the file.
+        """
+        try:
+            return cls._config_cache.get(cls.CONFIG_FILE, OpsConfig.model_validate_json)
+        except Exception as exc:
+            logger.error("Failed to load ops config: %s", exc)
+            return None
+
     @classmethod
     def get_config(cls) -> OpsConfig:
         # 1. Try local cache
-        if cls.CONFIG_FILE.exists():
-            try:
-                return OpsConfig.model_validate_json(cls.CONFIG_FILE.read_text(encoding="utf-8"))
-            except Exception as exc:
-                logger.error("Failed to load ops config: %s", exc)
-        
+        snapshot = cls.get_config_snapshot()
+        if snapshot is not None:
+            return snapshot.value.model_copy(deep=True)
+
         # 2. Try GICS (SSOT)
         if cls._gics:
             try:
@@ -427,13 +524,15 @@ class OpsService:
                     return OpsConfig.model_validate(result["fields"])
             except Exception as e:
                 logger.error("Failed to fallback to GICS for ops config: %s", e)
-        
+
         return OpsConfig()
 
     @classmethod
     def set_config(cls, config: OpsConfig) -> OpsConfig:
         cls.ensure_dirs()
-        cls.CONFIG_FILE.write_text(config.model_dump_json(indent=2), encoding="utf-8")
+        raw = config.model_dump_json(indent=2)
+        cls.CONFIG_FILE.write_text(raw, encoding="utf-8")
+        cls._config_cache.publish(cls.CONFIG_FILE, config.model_copy(deep=True), raw)
         if cls._gics:
             try:
                 cls._gics.put("ops:config", config.model_dump())
@@ -511,7 +610,7 @@ class OpsService:
 
     @classmethod
     def update_draft(cls, draft_id: str, *, prompt: Optional[str], content: Optional[str], context: Optional[Dict[str, Any]]) -> OpsDraft:
-        with cls._lock():
+        with cls._draft_lock(draft_id):
             draft = cls.get_draft(draft_id)
             if not draft:
                 raise ValueError(f"Draft {draft_id} not found")
@@ -526,7 +625,7 @@ class OpsService:
 
     @classmethod
     def reject_draft(cls, draft_id: str) -> OpsDraft:
-        with cls._lock():
+        with cls._draft_lock(draft_id):
             draft = cls.get_draft(draft_id)
             if not draft:
                 raise ValueError(f"Draft {draft_id} not found")
@@ -536,7 +635,7 @@ class OpsService:
 
     @classmethod
     def approve_draft(cls, draft_id: str, *, approved_by: Optional[str] = None) -> OpsApproved:
-        with cls._lock():
+        with cls._draft_lock(draft_id):
             draft = cls.get_draft(draft_id)
             if not draft:
                 raise ValueError(f"Draft {draft_id} not found")
@@ -661,9 +760,10 @@ class OpsService:
                 if heartbeat < stale_threshold:
                     logger.warning("Recovering stale run %s for run_key %s", active.id, run_key)
                     # Force move to error so it's no longer 'active'
-                    cls._append_run_log_entry(active.id, level="ERROR", msg="Marked as STALE by new run attempt")
-                    active.status = "error"
-                    cls._persist_run(active)
+                    with cls._run_lock(active.id):
+                        cls._append_run_log_entry(active.id, level="ERROR", msg="Marked as STALE by new run attempt")
+                        active.status = "error"
+                        cls._persist_run(active)
                     active = None # Allow new run
             
             if active:
@@ -717,13 +817,14 @@ class OpsService:
             raise RuntimeError(f"RERUN_SOURCE_ACTIVE:{source.id}")
 
         rerun = cls.create_run(source.approved_id)
-        rerun.rerun_of = source.id
-        cls._persist_run(rerun)
+        with cls._run_lock(rerun.id):
+            rerun.rerun_of = source.id
+            cls._persist_run(rerun)
         return rerun
 
     @classmethod
     def append_log(cls, run_id: str, *, level: str, msg: str) -> OpsRun:
-        with cls._lock():
+        with cls._run_lock(run_id):
             run = cls._load_run_metadata(run_id)
             if not run:
                 raise ValueError(f"Run {run_id} not found")
@@ -733,7 +834,7 @@ class OpsService:
 
     @classmethod
     def update_run_status(cls, run_id: str, status: str, *, msg: str | None = None) -> OpsRun:
-        with cls._lock():
+        with cls._run_lock(run_id):
             run = cls._load_run_metadata(run_id)
             if not run:
                 raise ValueError(f"Run {run_id} not found")
@@ -775,7 +876,7 @@ class OpsService:
 
     @classmethod
     def set_run_stage(cls, run_id: str, stage: str, *, msg: str | None = None) -> OpsRun:
-        with cls._lock():
+        with cls._run_lock(run_id):
             run = cls._load_run_metadata(run_id)
             if not run:
                 raise ValueError(f"Run {run_id} not found")
@@ -805,7 +906,7 @@ class OpsService:
         lock_expires_at: Optional[datetime] = None,
         heartbeat_at: Optional[datetime] = None,
     ) -> OpsRun:
-        with cls._lock():
+        with cls._run_lock(run_id):
             run = cls._load_run_metadata(run_id)
             if not run:
                 raise ValueError(f"Run {run_id} not found")
@@ -859,7 +960,7 @@ class OpsService:
         """Acquire a file-based merge lock. Raises RuntimeError if already locked."""
         lock_path = cls._merge_lock_path(repo_id)
         expires_at = _utcnow() + timedelta(seconds=ttl_seconds)
-        with cls._lock():
+        with cls._merge_guard(repo_id):
             if lock_path.exists():
                 try:
                     data = json.loads(lock_path.read_text(encoding="utf-8"))
@@ -891,7 +992,7 @@ class OpsService:
         if not lock_path.exists():
             return
         try:
-            with cls._lock():
+            with cls._merge_guard(repo_id):
                 data = json.loads(lock_path.read_text(encoding="utf-8"))
                 if data.get("run_id") == run_id:
                     lock_path.unlink(missing_ok=True)
@@ -904,7 +1005,7 @@ class OpsService:
         lock_path = cls._merge_lock_path(repo_id)
         if not lock_path.exists():
             raise RuntimeError(f"No merge lock found for repo={repo_id}")
-        with cls._lock():
+        with cls._merge_guard(repo_id):
             data = json.loads(lock_path.read_text(encoding="utf-8"))
             if data.get("run_id") != run_id:
                 raise RuntimeError(
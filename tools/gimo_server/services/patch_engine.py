@@ -0,0 +1,421 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("orchestrator.services.patch_engine")
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_PATH_HINT = re.compile(r"([a-zA-Z0-9_\-\./\\]+\.[a-zA-Z0-9]+)")
+# "<<<< SEARCH / ==== / REPLACE >>>>" (house format) and
+# "<<<<<<< SEARCH / ======= / >>>>>>> REPLACE".
+_SEARCH_REPLACE = re.compile(
+    r"^(?:<{4,} SEARCH)[ \t]*\n(.*?)^={4,}[ \t]*\n(.*?)^(?:REPLACE >{4,}|>{4,} REPLACE)[ \t]*$",
+    re.MULTILINE | re.DOTALL,
+)
+
+
+class PatchError(ValueError):
+    """A patch could not be parsed or one of its hunks did not apply; nothing was written."""
+
+
+@dataclass
+class Hunk:
+    """One change: ``lines`` are ``(op, text)`` with op ``" "`` (context), ``"-"`` or ``"+"``.
+
+    ``old_start`` is the 1-based line the hunk expects to start at, or None
+    when the position is unknown (SEARCH/REPLACE blocks).
+    """
+
+    old_start: Optional[int]
+    lines: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def old(self) -> List[str]:
+        return [text for op, text in self.lines if op != "+"]
+
+    @property
+    def new(self) -> List[str]:
+        return [text for op, text in self.lines if op != "-"]
+
+    def trimmed(self, fuzz: int) -> Tuple["Hunk", int]:
+        """Copy without up to ``fuzz`` leading/trailing context lines.
+
+        Also returns how many leading lines were dropped.
+        """
+        lead = 0
+        while lead < min(fuzz, len(self.lines)) and self.lines[lead][0] == " ":
+            lead += 1
+        trail = 0
+        while trail < fuzz and len(self.lines) - trail > lead and self.lines[-1 - trail][0] == " ":
+            trail += 1
+        lines = self.lines[lead:len(self.lines) - trail]
+        start = self.old_start + lead if self.old_start is not None else None
+        return Hunk(start, lines), lead
+
+
+@dataclass
+class FilePatch:
+    path: Optional[str]
+    hunks: List[Hunk] = field(default_factory=list)
+    create: bool = False
+    delete: bool = False
+
+
+@dataclass
+class PatchResult:
+    files: List[str] = field(default_factory=list)
+    hunks: int = 0
+    # hunks that needed an offset, trimmed context or whitespace-insensitive matching
+    fuzzed: int = 0
+
+
+def path_hint(preceding_text: str) -> Optional[str]:
+    """Last thing that looks like a file path in ``preceding_text``."""
+    for line in reversed(preceding_text.split("\n")):
+        line = line.strip()
+        if not line:
+            continue
+        match = _PATH_HINT.search(line)
+        if match:
+            return match.group(1).replace("\\", "/").lstrip("./")
+    return None
+
+
+def _strip_diff_path(raw: str) -> Optional[str]:
+    path = raw.split("\t", 1)[0].strip()
+    if path == "/dev/null":
+        return None
+    if path.startswith(("a/", "b/")):
+        path = path[2:]
+    return path
+
+
+class PatchEngine:
+    """In-process patch engine for unified diffs and SEARCH/REPLACE blocks.
+
+    Hunks are located at their expected line first, then up to ``MAX_OFFSET``
+    lines away; failing that, up to ``MAX_FUZZ`` context lines are dropped from
+    each end, and finally lines are compared ignoring surrounding whitespace.
+    All new file contents are computed in memory before anything is written;
+    files are then swapped in through temp-file-and-rename, and already
+    replaced files are restored if a later one fails.
+    """
+
+    MAX_OFFSET = 200
+    MAX_FUZZ = 2
+
+    # ── Parsing ───────────────────────────────────────────
+
+    @staticmethod
+    def is_search_replace(text: str) -> bool:
+        return _SEARCH_REPLACE.search(text) is not None
+
+    @staticmethod
+    def is_unified_diff(text: str) -> bool:
+        return bool(re.search(r"^@@ -\d+", text, re.MULTILINE)) and bool(
+            re.search(r"^(---|\+\+\+) ", text, re.MULTILINE)
+        )
+
+    @classmethod
+    def parse(cls, text: str, default_path: Optional[str] = None) -> List[FilePatch]:
+        if cls.is_search_replace(text):
+            return cls.parse_search_replace(text, default_path)
+        if cls.is_unified_diff(text) or re.search(r"^@@ -\d+", text, re.MULTILINE):
+            return cls.parse_unified_diff(text, default_path)
+        raise PatchError("Patch is neither a unified diff nor SEARCH/REPLACE blocks")
+
+    @staticmethod
+    def parse_unified_diff(text: str, default_path: Optional[str] = None) -> List[FilePatch]:
+        patches: List[FilePatch] = []
+        current: Optional[FilePatch] = None
+        hunk: Optional[Hunk] = None
+        remaining = [0, 0]  # old / new lines still expected in the current hunk
+        old_path: Optional[str] = None
+        lines = text.replace("\r\n", "\n").split("\n")
+
+        for i, line in enumerate(lines):
+            if hunk is not None and (remaining[0] > 0 or remaining[1] > 0):
+                op = line[:1] if line else " "
+                if op == "\\":
+                    continue
+                if op not in (" ", "-", "+"):
+                    raise PatchError(f"Malformed hunk line {i + 1}: {line[:60]!r}")
+                hunk.lines.append((op, line[1:]))
+                if op != "+":
+                    remaining[0] -= 1
+                if op != "-":
+                    remaining[1] -= 1
+                continue
+            if line.startswith("\\"):
+                continue
+            if line.startswith("--- ") and i + 1 < len(lines) and lines[i + 1].startswith("+++ "):
+                old_path = line[4:]
+                continue
+            if line.startswith("+++ ") and old_path is not None:
+                old = _strip_diff_path(old_path)
+                new = _strip_diff_path(line[4:])
+                current = FilePatch(path=new or old, create=old is None, delete=new is None)
+                patches.append(current)
+                old_path = None
+                continue
+            match = _HUNK_HEADER.match(line)
+            if match:
+                if current is None:
+                    current = FilePatch(path=default_path)
+                    patches.append(current)
+                old_start, old_len, _, new_len = match.groups()
+                hunk = Hunk(old_start=int(old_start))
+                remaining = [
+                    int(old_len) if old_len is not None else 1,
+                    int(new_len) if new_len is not None else 1,
+                ]
+                current.hunks.append(hunk)
+
+        if hunk is not None and (remaining[0] > 0 or remaining[1] > 0):
+            raise PatchError("Unified diff ends in the middle of a hunk")
+        patches = [p for p in patches if p.hunks or p.create or p.delete]
+        if not patches:
+            raise PatchError("No hunks found in unified diff")
+        for patch in patches:
+            if patch.path is None:
+                patch.path = default_path
+        return patches
+
+    @staticmethod
+    def parse_search_replace(text: str, default_path: Optional[str] = None) -> List[FilePatch]:
+        by_path: Dict[Optional[str], FilePatch] = {}
+        cursor = 0
+        text = text.replace("\r\n", "\n")
+        for match in _SEARCH_REPLACE.finditer(text):
+            path = path_hint(text[cursor:match.start()]) or default_path
+            cursor = match.end()
+            search = match.group(1)[:-1].split("\n") if match.group(1) else []
+            replace = match.group(2)[:-1].split("\n") if match.group(2) else []
+            patch = by_path.get(path)
+            if patch is None:
+                patch = by_path[path] = FilePatch(path=path)
+            if not search:
+                patch.create = True
+            patch.hunks.append(Hunk(None, [("-", s) for s in search] + [("+", r) for r in replace]))
+        if not by_path:
+            raise PatchError("No SEARCH/REPLACE blocks found")
+        return list(by_path.values())
+
+    # ── Matching ──────────────────────────────────────────
+
+    @staticmethod
+    def _matches_at(lines: Sequence[str], pos: int, old: Sequence[str], loose: bool) -> bool:
+        if pos < 0 or pos + len(old) > len(lines):
+            return False
+        if loose:
+            return all(lines[pos + k].strip() == old[k].strip() for k in range(len(old)))
+        return all(lines[pos + k] == old[k] for k in range(len(old)))
+
+    @classmethod
+    def _locate(
+        cls,
+        lines: Sequence[str],
+        old: Sequence[str],
+        expected: Optional[int],
+        floor: int,
+        loose: bool,
+    ) -> Optional[int]:
+        last = len(lines) - len(old)
+        if last < floor:
+            return None
+        if expected is None:
+            for pos in range(floor, last + 1):
+                if cls._matches_at(lines, pos, old, loose):
+                    return pos
+            return None
+        expected = min(max(expected, floor), last)
+        for delta in range(cls.MAX_OFFSET + 1):
+            for pos in ((expected - delta, expected + delta) if delta else (expected,)):
+                if floor <= pos <= last and cls._matches_at(lines, pos, old, loose):
+                    return pos
+        return None
+
+    @classmethod
+    def apply_hunks(
+        cls, lines: List[str], hunks: Sequence[Hunk], label: str = ""
+    ) -> Tuple[List[str], int]:
+        """Apply ``hunks`` in order to ``lines``.
+
+        Returns the new lines and how many hunks needed fuzz.
+        """
+        out = list(lines)
+        shift = 0  # lines added minus lines removed so far
+        floor = 0  # unified hunks may not match inside text produced by earlier hunks
+        fuzzed = 0
+        for number, hunk in enumerate(hunks, start=1):
+            # SEARCH/REPLACE blocks carry no position and may come in any order:
+            # they are searched from the top of the current content.
+            hunk_floor = floor if hunk.old_start is not None else 0
+            placed = None
+            for loose in (False, True):
+                for fuzz in range(0, cls.MAX_FUZZ + 1):
+                    candidate, _ = hunk.trimmed(fuzz) if fuzz else (hunk, 0)
+                    old = candidate.old
+                    if not old and (candidate.old_start is None or hunk.old):
+                        break  # nothing left to anchor on: only valid on an empty file
+                    expected = None
+                    if candidate.old_start is not None:
+                        # "-N,0" inserts after line N; otherwise line N is the first old line.
+                        expected = candidate.old_start + shift - (1 if old else 0)
+                    if not old:
+                        at = expected if expected is not None else len(out)
+                        pos = max(hunk_floor, min(len(out), at))
+                    else:
+                        pos = cls._locate(out, old, expected, hunk_floor, loose)
+                    if pos is not None:
+                        shifted = expected is not None and pos != expected
+                        placed = (candidate, pos, bool(fuzz) or loose or shifted)
+                        break
+                if placed:
+                    break
+            if placed is None:
+                if not hunk.old and not out:
+                    placed = (hunk, 0, False)
+                else:
+                    where = f" in {label}" if label else ""
+                    raise PatchError(f"Hunk {number}{where} does not apply")
+            candidate, pos, was_fuzzed = placed
+            old, new = candidate.old, candidate.new
+            out[pos:pos + len(old)] = new
+            shift += len(new) - len(old)
+            if hunk.old_start is not None:
+                floor = pos + len(new)
+            fuzzed += int(was_fuzzed)
+        return out, fuzzed
+
+    # ── Transactions ──────────────────────────────────────
+
+    @staticmethod
+    def _split(content: str) -> Tuple[List[str], str, bool]:
+        newline = "\r\n" if "\r\n" in content else "\n"
+        text = content.replace("\r\n", "\n")
+        trailing = text.endswith("\n")
+        if trailing:
+            text = text[:-1]
+        return (text.split("\n") if text else []), newline, trailing
+
+    @staticmethod
+    def _join(lines: List[str], newline: str, trailing: bool) -> str:
+        if not lines:
+            return ""
+        return newline.join(lines) + (newline if trailing else "")
+
+    @classmethod
+    def plan(
+        cls,
+        root: Path,
+        patches: Sequence[FilePatch],
+        *,
+        is_safe: Optional[Callable[[Path], bool]] = None,
+    ) -> Tuple[Dict[Path, Optional[str]], PatchResult]:
+        """Compute the new content of every touched file (None = delete) without writing."""
+        planned: Dict[Path, Optional[str]] = {}
+        result = PatchResult()
+        for patch in patches:
+            if not patch.path:
+                raise PatchError("Could not determine the target file of a patch")
+            target = (root / patch.path) if not Path(patch.path).is_absolute() else Path(patch.path)
+            if is_safe is not None and not is_safe(target):
+                raise PatchError(f"Path not allowed: {patch.path}")
+            if patch.delete:
+                planned[target] = None
+                result.files.append(patch.path)
+                continue
+            if target in planned:
+                current = planned[target] or ""
+            elif target.exists():
+                current = target.read_text(encoding="utf-8")
+            elif patch.create:
+                current = ""
+            else:
+                raise PatchError(f"File not found: {patch.path}")
+            lines, newline, trailing = cls._split(current)
+            if not current:
+                trailing = True
+            new_lines, fuzzed = cls.apply_hunks(lines, patch.hunks, patch.path)
+            planned[target] = cls._join(new_lines, newline, trailing)
+            result.hunks += len(patch.hunks)
+            result.fuzzed += fuzzed
+            if patch.path not in result.files:
+                result.files.append(patch.path)
+        return planned, result
+
+    @staticmethod
+    def _write_atomic(target: Path, content: str) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                f.write(content)
+            if target.exists():
+                shutil.copymode(target, tmp)
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def commit(cls, planned: Dict[Path, Optional[str]]) -> None:
+        """Write ``planned`` file by file; on failure restore every file already touched."""
+        originals: List[Tuple[Path, Optional[bytes]]] = []
+        try:
+            for target, content in planned.items():
+                originals.append((target, target.read_bytes() if target.exists() else None))
+                if content is None:
+                    target.unlink(missing_ok=True)
+                else:
+                    cls._write_atomic(target, content)
+        except Exception as exc:
+            for target, original in reversed(originals):
+                try:
+                    if original is None:
+                        target.unlink(missing_ok=True)
+                    else:
+                        cls._write_atomic(target, original.decode("utf-8"))
+                except Exception as restore_exc:
+                    logger.error("Failed to roll back %s: %s", target, restore_exc)
+            raise PatchError(f"Patch write failed, changes rolled back: {exc}") from exc
+
+    @classmethod
+    def apply(
+        cls,
+        root: Path,
+        text: str,
+        *,
+        default_path: Optional[str] = None,
+        is_safe: Optional[Callable[[Path], bool]] = None,
+    ) -> PatchResult:
+        """Parse ``text`` and apply it under ``root`` as one all-or-nothing transaction."""
+        patches = cls.parse(text, default_path)
+        planned, result = cls.plan(Path(root), patches, is_safe=is_safe)
+        cls.commit(planned)
+        return result
+
+    @classmethod
+    def apply_to_file(cls, target: Path, text: str) -> PatchResult:
+        """Apply a single-file patch to ``target``, ignoring any paths named in the patch."""
+        patches = cls.parse(text, target.name)
+        for patch in patches:
+            patch.path = str(target)
+        merged = FilePatch(
+            path=str(target),
+            hunks=[h for p in patches for h in p.hunks],
+            create=any(p.create for p in patches),
+            delete=all(p.delete for p in patches),
+        )
+        planned, result = cls.plan(target.parent, [merged])
+        cls.commit(planned)
+        result.files = [str(target)]
+        return result
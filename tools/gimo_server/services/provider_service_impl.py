@@ -24,6 +24,7 @@ from .provider_service_adapter_registry import build_provider_adapter
 from .provider_config_change_service import ProviderConfigChangeService
 from .provider_topology_service import ProviderTopologyService
 from .llm_cache import NormalizedLLMCache
+from .config_snapshot import ConfigSnapshot, ConfigSnapshotCache
 from .model_router_service import ModelRouterService
 from .observability_service import ObservabilityService
 
@@ -32,6 +33,9 @@ logger = logging.getLogger("orchestrator.ops.provider")
 class ProviderService:
     """Punto de entrada unificado para interactuar y enviar prompts a LLMs."""
     CONFIG_FILE = OPS_DATA_DIR / "provider.json"
+    # Normalization depends on which CLIs are installed, so snapshots are also
+    # re-normalized periodically even when provider.json is untouched.
+    _config_cache: ConfigSnapshotCache[ProviderConfig] = ConfigSnapshotCache(max_age_seconds=60.0)
 
     @classmethod
     def ensure_default_config(cls) -> None:
@@ -200,19 +204,36 @@ class ProviderService:
         return ProviderTopologyService.normalize_roles(cfg, providers)
 
     @classmethod
-    def get_config(cls) -> Optional[ProviderConfig]:
+    def _load_config_text(cls, content: str) -> ProviderConfig:
+        cfg = ProviderConfig.model_validate_json(content.lstrip('\ufeff'))
+        normalized_cfg = cls._normalize_config(cfg)
+        if normalized_cfg.model_dump() != cfg.model_dump():
+            cls.CONFIG_FILE.write_text(normalized_cfg.model_dump_json(indent=2), encoding="utf-8")
+        return normalized_cfg
+
+    @classmethod
+    def _write_config(cls, cfg: ProviderConfig) -> None:
+        raw = cfg.model_dump_json(indent=2)
+        cls.CONFIG_FILE.write_text(raw, encoding="utf-8")
+        cls._config_cache.publish(cls.CONFIG_FILE, cfg.model_copy(deep=True), raw)
+
+    @classmethod
+    def get_config_snapshot(cls) -> Optional[ConfigSnapshot[ProviderConfig]]:
+        """Return the cached, normalized config snapshot (read-only, versioned)."""
         cls.ensure_default_config()
         try:
-            content = cls.CONFIG_FILE.read_text(encoding="utf-8").lstrip('\ufeff')
-            cfg = ProviderConfig.model_validate_json(content)
-            normalized_cfg = cls._normalize_config(cfg)
-            if normalized_cfg.model_dump() != cfg.model_dump():
-                cls.CONFIG_FILE.write_text(normalized_cfg.model_dump_json(indent=2), encoding="utf-8")
-            return normalized_cfg
+            return cls._config_cache.get(cls.CONFIG_FILE, cls._load_config_text)
         except Exception as exc:
             logger.error(f"Failed to load provider config from {cls.CONFIG_FILE}: {exc}", exc_info=True)
             return None
 
+    @classmethod
+    def get_config(cls) -> Optional[ProviderConfig]:
+        snapshot = cls.get_config_snapshot()
+        if snapshot is None:
+            return None
+        return snapshot.value.model_copy(deep=True)
+
     @classmethod
     def get_public_config(cls) -> Optional[ProviderConfig]:
         cfg = cls.get_config()
@@ -269,7 +290,7 @@ class ProviderService:
             raise ValueError(f"Unknown provider: {active}")
         cfg.active = active
         normalized_cfg = cls._normalize_config(cfg)
-        cls.CONFIG_FILE.write_text(normalized_cfg.model_dump_json(indent=2), encoding="utf-8")
+        cls._write_config(normalized_cfg)
         return normalized_cfg
 
     @classmethod
@@ -311,7 +332,7 @@ class ProviderService:
         OPS_DATA_DIR.mkdir(parents=True, exist_ok=True)
         before = cls.get_config()
         normalized_cfg = cls._normalize_config(cfg)
-        cls.CONFIG_FILE.write_text(normalized_cfg.model_dump_json(indent=2), encoding="utf-8")
+        cls._write_config(normalized_cfg)
         cls._invalidate_caches_on_config_change(before, normalized_cfg)
         return normalized_cfg
 
@@ -374,7 +395,7 @@ class ProviderService:
                 "warnings": list(warnings or []),
             }
         )
-        cls.CONFIG_FILE.write_text(cfg.model_dump_json(indent=2), encoding="utf-8")
+        cls._write_config(cfg)
         return cfg
 
     @classmethod
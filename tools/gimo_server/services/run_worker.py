@@ -96,7 +96,9 @@ class RunWorker:
 
     async def _tick(self) -> None:
         await asyncio.sleep(0)
-        config = OpsService.get_config()
+        # Read-only use: the shared snapshot avoids a deep copy on every tick.
+        snapshot = OpsService.get_config_snapshot()
+        config = snapshot.value if snapshot is not None else OpsService.get_config()
         max_concurrent = config.max_concurrent_runs
 
         # Clean finished IDs
@@ -493,7 +495,7 @@ class RunWorker:
         })
 
         # Reload from disk, decrement, and persist under lock to avoid lost-update
-        with OpsService._lock():
+        with OpsService._run_lock(child_run.parent_run_id):
             fresh = OpsService._load_run_metadata(child_run.parent_run_id)
             if not fresh:
                 return
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import json
 import logging
+import math
 import os
 import re
+import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -146,6 +148,9 @@ class SkillAnalytics(BaseModel):
     failed_runs: int = 0
     success_rate: float = 0.0
     avg_duration_seconds: float = 0.0
+    p50_duration_seconds: float = 0.0
+    p90_duration_seconds: float = 0.0
+    p99_duration_seconds: float = 0.0
     total_tokens_used: int = 0
     last_run_at: Optional[str] = None
     last_status: Optional[str] = None
@@ -612,45 +617,280 @@ class SkillsService:
 
     # ── Analytics ──────────────────────────────────────────────────────────────
 
+    # Runs are appended to ``{skill_id}.runs.jsonl``; the compactor folds the
+    # ledger into ``{skill_id}.json`` and then rotates it to
+    # ``{skill_id}.runs.jsonl.1`` so it starts over empty. The rotated file is
+    # kept until the next compaction to pick up appends that raced the
+    # rename. The view records the inode of each ledger it has read from, so
+    # a crash between rotation and the view write is detected on the next
+    # read. The folded view is kept in memory per process and only re-read
+    # when the view file changes.
+    ANALYTICS_COMPACT_EVERY = 256
+    _DURATION_BUCKET_BASE = 1.05  # log-scale histogram, ~2.5% percentile error
+
+    # analytics path -> {"view", "stat" (of the view file), "pending" (runs not persisted)}
+    _views: Dict[str, Dict[str, Any]] = {}
+    _views_lock = threading.Lock()
+
     @classmethod
     def _analytics_path(cls, skill_id: str) -> Path:
+        if not SAFE_ID_RE.fullmatch(skill_id):
+            raise ValueError("Invalid skill_id")
         ANALYTICS_DIR.mkdir(parents=True, exist_ok=True)
         return ANALYTICS_DIR / f"{skill_id}.json"
 
+    @classmethod
+    def _ledger_path(cls, skill_id: str) -> Path:
+        return cls._analytics_path(skill_id).with_suffix(".runs.jsonl")
+
+    @classmethod
+    def _rotated_ledger_path(cls, skill_id: str) -> Path:
+        ledger = cls._ledger_path(skill_id)
+        return ledger.with_name(ledger.name + ".1")
+
+    @staticmethod
+    def _inode(path: Path) -> Optional[int]:
+        try:
+            return path.stat().st_ino
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _file_stat(path: Path) -> Optional[tuple]:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    @classmethod
+    def _read_view(cls, skill_id: str) -> Dict[str, Any]:
+        """Materialized view: analytics plus the state needed to keep folding runs into it."""
+        view: Dict[str, Any] = {
+            "analytics": {"skill_id": skill_id},
+            "ledger_offset": 0,
+            "duration_count": 0,
+            "duration_sum": 0.0,
+            "duration_histogram": {},
+        }
+        path = cls._analytics_path(skill_id)
+        if not path.exists():
+            return view
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return view
+        if "analytics" in data:
+            view.update(data)
+        else:
+            # Pre-ledger file: plain SkillAnalytics with a running mean.
+            view["analytics"] = data
+            runs = int(data.get("total_runs", 0) or 0)
+            avg = float(data.get("avg_duration_seconds", 0.0) or 0.0)
+            if avg > 0:
+                view["duration_count"] = runs
+                view["duration_sum"] = avg * runs
+        return view
+
+    @classmethod
+    def _read_ledger(
+        cls, skill_id: str, path: Path, offset: int
+    ) -> tuple[List[Dict[str, Any]], int]:
+        """Complete ledger lines after ``offset`` and the offset just past them."""
+        try:
+            with path.open("rb") as fh:
+                fh.seek(offset)
+                chunk = fh.read()
+        except FileNotFoundError:
+            return [], offset
+        end = chunk.rfind(b"\n") + 1  # ignore a partially written last line
+        runs = []
+        for line in chunk[:end].splitlines():
+            try:
+                runs.append(json.loads(line))
+            except ValueError:
+                logger.warning("Skipping corrupt run ledger line for skill %s", skill_id)
+        return runs, offset + end
+
+    @classmethod
+    def _fold_runs(cls, view: Dict[str, Any], runs: List[Dict[str, Any]]) -> None:
+        a = view["analytics"]
+        hist: Dict[str, int] = view["duration_histogram"]
+        for run in runs:
+            a["total_runs"] = a.get("total_runs", 0) + 1
+            if run.get("status") == "completed":
+                a["successful_runs"] = a.get("successful_runs", 0) + 1
+            else:
+                a["failed_runs"] = a.get("failed_runs", 0) + 1
+            duration = float(run.get("duration", 0.0) or 0.0)
+            if duration > 0:
+                view["duration_count"] += 1
+                view["duration_sum"] += duration
+                bucket = str(math.floor(math.log(duration, cls._DURATION_BUCKET_BASE)))
+                hist[bucket] = hist.get(bucket, 0) + 1
+            a["total_tokens_used"] = a.get("total_tokens_used", 0) + int(run.get("tokens", 0) or 0)
+            a["last_run_at"] = run.get("ts")
+            a["last_status"] = run.get("status")
+
+    @classmethod
+    def _duration_percentile(cls, view: Dict[str, Any], q: float) -> float:
+        hist = sorted((int(k), v) for k, v in view["duration_histogram"].items())
+        total = sum(v for _, v in hist)
+        if not total:
+            return 0.0
+        rank, seen = q * total, 0
+        for bucket, count in hist:
+            seen += count
+            if seen >= rank:
+                # geometric midpoint of [base^b, base^(b+1))
+                return cls._DURATION_BUCKET_BASE ** (bucket + 0.5)
+        return cls._DURATION_BUCKET_BASE ** (hist[-1][0] + 0.5)
+
+    @classmethod
+    def _to_analytics(cls, view: Dict[str, Any]) -> SkillAnalytics:
+        analytics = SkillAnalytics.model_validate(view["analytics"])
+        analytics.success_rate = analytics.successful_runs / max(analytics.total_runs, 1)
+        if view["duration_count"]:
+            analytics.avg_duration_seconds = view["duration_sum"] / view["duration_count"]
+        if view["duration_histogram"]:
+            analytics.p50_duration_seconds = round(cls._duration_percentile(view, 0.50), 3)
+            analytics.p90_duration_seconds = round(cls._duration_percentile(view, 0.90), 3)
+            analytics.p99_duration_seconds = round(cls._duration_percentile(view, 0.99), 3)
+        return analytics
+
+    @classmethod
+    def _catch_up(cls, skill_id: str, view: Dict[str, Any]) -> int:
+        """Fold the ledger runs ``view`` has not seen yet; returns how many."""
+        ledger, rotated = cls._ledger_path(skill_id), cls._rotated_ledger_path(skill_id)
+        live_ino, rotated_ino = cls._inode(ledger), cls._inode(rotated)
+        runs: List[Dict[str, Any]] = []
+        offset = int(view.get("ledger_offset", 0))
+        seen_ino = view.get("ledger_ino")
+        if seen_ino is not None and seen_ino != live_ino:
+            # Rotated since the view last read it: finish the old ledger first.
+            if rotated_ino == seen_ino:
+                tail, end = cls._read_ledger(skill_id, rotated, offset)
+                runs += tail
+                view["rotated_ino"], view["rotated_offset"] = rotated_ino, end
+            offset = 0
+        elif view.get("rotated_ino") is not None and view["rotated_ino"] == rotated_ino:
+            # Appends that raced the last rotation.
+            tail, view["rotated_offset"] = cls._read_ledger(
+                skill_id, rotated, int(view.get("rotated_offset", 0))
+            )
+            runs += tail
+        tail, view["ledger_offset"] = cls._read_ledger(skill_id, ledger, offset)
+        runs += tail
+        view["ledger_ino"] = live_ino
+        cls._fold_runs(view, runs)
+        return len(runs)
+
+    @classmethod
+    def _cached_view(cls, skill_id: str) -> Dict[str, Any]:
+        """The in-memory view entry, reloaded if another process rewrote the view file."""
+        path = cls._analytics_path(skill_id)
+        stat = cls._file_stat(path)
+        entry = cls._views.get(str(path))
+        if entry is None or entry["stat"] != stat:
+            entry = cls._views[str(path)] = {
+                "view": cls._read_view(skill_id), "stat": stat, "pending": 0
+            }
+        return entry
+
+    @classmethod
+    def _current_analytics(cls, skill_id: str) -> tuple[SkillAnalytics, int]:
+        """Analytics including unflushed runs, and how many runs are not persisted yet."""
+        with cls._views_lock:
+            entry = cls._cached_view(skill_id)
+            entry["pending"] += cls._catch_up(skill_id, entry["view"])
+            return cls._to_analytics(entry["view"]), entry["pending"]
+
     @classmethod
     def get_skill_analytics(cls, skill_id: str) -> SkillAnalytics:
-        """Get execution analytics for a skill."""
+        """Get execution analytics for a skill (materialized view plus unflushed runs)."""
+        analytics, _ = cls._current_analytics(skill_id)
+        return analytics
+
+    @classmethod
+    def compact_skill_analytics(cls, skill_id: str) -> SkillAnalytics:
+        """Fold unflushed ledger runs into the materialized view and rotate the ledger."""
         path = cls._analytics_path(skill_id)
-        if path.exists():
+        ledger, rotated = cls._ledger_path(skill_id), cls._rotated_ledger_path(skill_id)
+        with FileLock(str(path.with_suffix(".lock"))), cls._views_lock:
+            entry = cls._cached_view(skill_id)
+            view = entry["view"]
+            changed = bool(entry["pending"] + cls._catch_up(skill_id, view))
+            if view["ledger_offset"]:
+                # Persist the fold first: if we die after the rename, the
+                # recorded ledger inode points the next reader at the rotated file.
+                cls._atomic_write(path, json.dumps(view, indent=2))
+                os.replace(ledger, rotated)
+                tail, end = cls._read_ledger(skill_id, rotated, int(view["ledger_offset"]))
+                cls._fold_runs(view, tail)
+                view.update(
+                    {
+                        "ledger_ino": None,
+                        "ledger_offset": 0,
+                        "rotated_ino": cls._inode(rotated),
+                        "rotated_offset": end,
+                    }
+                )
+                changed = True
+            elif view.get("rotated_ino") is not None:
+                # A whole compaction cycle after its rotation nothing writes to it anymore.
+                if cls._inode(rotated) == view["rotated_ino"]:
+                    rotated.unlink()
+                view.update({"rotated_ino": None, "rotated_offset": 0})
+                changed = True
+            if changed:
+                cls._atomic_write(path, json.dumps(view, indent=2))
+            entry.update({"stat": cls._file_stat(path), "pending": 0})
+            return cls._to_analytics(view)
+
+    @classmethod
+    def compact_all_analytics(cls) -> int:
+        """Compact every skill that has a run ledger; returns how many were processed."""
+        if not ANALYTICS_DIR.exists():
+            return 0
+        skill_ids = {
+            ledger.name.split(".runs.jsonl", 1)[0]
+            for pattern in ("*.runs.jsonl", "*.runs.jsonl.1")
+            for ledger in ANALYTICS_DIR.glob(pattern)
+        }
+        count = 0
+        for skill_id in sorted(skill_ids):
             try:
-                return SkillAnalytics.model_validate_json(path.read_text(encoding="utf-8"))
-            except Exception:
-                pass
-        return SkillAnalytics(skill_id=skill_id)
+                cls.compact_skill_analytics(skill_id)
+                count += 1
+            except Exception as exc:
+                logger.warning("Failed to compact analytics for skill '%s': %s", skill_id, exc)
+        return count
 
     @classmethod
     def record_skill_run(
         cls, skill_id: str, status: str, duration: float = 0.0, tokens: int = 0
     ) -> SkillAnalytics:
-        """Record a completed skill run in analytics."""
-        analytics = cls.get_skill_analytics(skill_id)
-        analytics.total_runs += 1
-        if status == "completed":
-            analytics.successful_runs += 1
-        else:
-            analytics.failed_runs += 1
-        analytics.success_rate = (
-            analytics.successful_runs / max(analytics.total_runs, 1)
-        )
-        # Running average for duration
-        if duration > 0:
-            prev_total = analytics.avg_duration_seconds * max(analytics.total_runs - 1, 1)
-            analytics.avg_duration_seconds = (prev_total + duration) / analytics.total_runs
-        analytics.total_tokens_used += tokens
-        analytics.last_run_at = datetime.now(timezone.utc).isoformat()
-        analytics.last_status = status
-
-        cls._atomic_write(cls._analytics_path(skill_id), analytics.model_dump_json(indent=2))
+        """Record a completed skill run in analytics.
+
+        The run is appended to the skill's ledger with a single ``O_APPEND``
+        write, so concurrent runs never lose increments.
+        """
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "status": status,
+            "duration": float(duration),
+            "tokens": int(tokens),
+        }
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        fd = os.open(cls._ledger_path(skill_id), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+        analytics, pending = cls._current_analytics(skill_id)
+        if pending >= cls.ANALYTICS_COMPACT_EVERY:
+            return cls.compact_skill_analytics(skill_id)
         return analytics
 
     # ── Marketplace ────────────────────────────────────────────────────────────
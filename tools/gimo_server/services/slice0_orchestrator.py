@@ -48,7 +48,9 @@ class Slice0Orchestrator:
             path_scope = getattr(contract.execution, "path_scope", [])
             scoped_files_content = ""
             if path_scope:
-                scoped_files_content = ContextIndexer.extract_file_contents(worktree_path, path_scope)
+                scoped_files_content = ContextIndexer.extract_file_contents(
+                    worktree_path, path_scope, token_budget=ContextIndexer.SCOPED_TOKEN_BUDGET
+                )
             
             files_context_str = f"Relevant File Contents:\n{scoped_files_content}\n\n" if scoped_files_content else ""
 
@@ -145,7 +147,9 @@ class Slice0Orchestrator:
                 
                 # RE-EVALUATE context explicitly so worker can apply patches over the modified sandbox
                 if path_scope:
-                    scoped_files_content = ContextIndexer.extract_file_contents(worktree_path, path_scope)
+                    scoped_files_content = ContextIndexer.extract_file_contents(
+                        worktree_path, path_scope, token_budget=ContextIndexer.SCOPED_TOKEN_BUDGET
+                    )
                 files_context_str = f"Relevant File Contents:\n{scoped_files_content}\n\n" if scoped_files_content else ""
                 
                 worker_prompt = (
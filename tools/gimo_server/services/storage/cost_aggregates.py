@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Any, Callable, Dict, List
+
+from .cost_stats import CostStatsTable
+from .spend_tracker import SpendTracker
+
+# Longest history any aggregate needs: the spend windows, and the stats window
+# plus the week its oldest bucket may start before it.
+BACKFILL_DAYS = max(max(SpendTracker.WINDOWS), CostStatsTable.WINDOW_DAYS + 7)
+
+
+class CostAggregates:
+    """In-memory cost aggregates shared by every storage on one GICS client.
+
+    Built on first use: the stats table loads its persisted rows, then a single
+    scan of raw cost events over ``BACKFILL_DAYS`` backfills the spend tracker
+    and, if it had no rows yet, the stats table.
+    """
+
+    _registry: "weakref.WeakKeyDictionary[Any, CostAggregates]" = weakref.WeakKeyDictionary()
+    _registry_lock = threading.Lock()
+
+    def __init__(self, stats: CostStatsTable, spend: SpendTracker):
+        self.stats = stats
+        self.spend = spend
+
+    @classmethod
+    def for_gics(
+        cls, gics: Any, fetch_events: Callable[[int], List[Dict[str, Any]]]
+    ) -> "CostAggregates":
+        """Aggregates for ``gics``; ``fetch_events(days)`` is called at most once per client."""
+        with cls._registry_lock:
+            aggregates = cls._registry.get(gics)
+            if aggregates is None:
+                aggregates = cls(CostStatsTable(gics), SpendTracker())
+                stats_loaded = aggregates.stats.load()
+                events = fetch_events(BACKFILL_DAYS)
+                if not stats_loaded:
+                    aggregates.stats.backfill(events)
+                aggregates.spend.backfill(events)
+                cls._registry[gics] = aggregates
+            return aggregates
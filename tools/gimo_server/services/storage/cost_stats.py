@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .spend_tracker import _event_ts
+
+logger = logging.getLogger("orchestrator.services.storage.cost_stats")
+
+ANY_MODEL = "*"
+
+CostStatsKey = Tuple[str, str]  # (task_type, model)
+
+
+class P2Quantile:
+    """Streaming quantile estimate in O(1) space (Jain & Chlamtac P² algorithm)."""
+
+    def __init__(self, p: float = 0.9, state: Optional[Dict[str, Any]] = None):
+        self.p = p
+        state = state or {}
+        self.count: int = int(state.get("count", 0))
+        self.heights: List[float] = [float(h) for h in state.get("heights", [])]
+        self.positions: List[float] = [float(n) for n in state.get("positions", [])]
+        self.desired: List[float] = [float(n) for n in state.get("desired", [])]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "heights": list(self.heights),
+            "positions": list(self.positions),
+            "desired": list(self.desired),
+        }
+
+    def add(self, x: float) -> None:
+        p = self.p
+        if self.count < 5:
+            self.heights.append(float(x))
+            self.heights.sort()
+            self.count += 1
+            if self.count == 5:
+                self.positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+                self.desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+            return
+
+        h, n = self.heights, self.positions
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if h[i] <= x < h[i + 1])
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i, step in enumerate((0.0, p / 2, p, (1 + p) / 2, 1.0)):
+            self.desired[i] += step
+
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                candidate = h[i] + s / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + s) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - s) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not h[i - 1] < candidate < h[i + 1]:
+                    candidate = h[i] + s * (h[i + s] - h[i]) / (n[i + s] - n[i])
+                h[i] = candidate
+                n[i] += s
+        self.count += 1
+
+    def value(self) -> float:
+        if self.count == 0:
+            return 0.0
+        if self.count <= 5:
+            ordered = sorted(self.heights)
+            return ordered[min(len(ordered) - 1, math.ceil(self.p * len(ordered)) - 1)]
+        return self.heights[2]
+
+
+@dataclass(frozen=True)
+class CostStats:
+    """Cost distribution of one (task_type, model) pair."""
+
+    task_type: str
+    model: str
+    count: int
+    mean: float
+    variance: float
+    p90: float
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class _Bucket:
+    """Welford running mean/variance plus a P² p90 for one time bucket."""
+
+    def __init__(self, start: int, fields: Optional[Dict[str, Any]] = None):
+        fields = fields or {}
+        self.start = start
+        self.count = int(fields.get("count", 0))
+        self.mean = float(fields.get("mean", 0.0))
+        self.m2 = float(fields.get("m2", 0.0))
+        self.p90 = P2Quantile(0.9, fields.get("p90_state"))
+
+    def add(self, cost: float) -> None:
+        self.count += 1
+        delta = cost - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (cost - self.mean)
+        self.p90.add(cost)
+
+    def to_fields(self) -> Dict[str, Any]:
+        return {
+            "start": self.start,
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "p90_state": self.p90.to_dict(),
+        }
+
+
+class _Row:
+    """Weekly cost buckets of one (task_type, model) inside the trailing window."""
+
+    def __init__(self, task_type: str, model: str, fields: Optional[Dict[str, Any]] = None):
+        fields = fields or {}
+        self.task_type = task_type
+        self.model = model
+        self.buckets: Dict[int, _Bucket] = {}
+        for raw in fields.get("buckets") or []:
+            bucket = _Bucket(int(raw["start"]), raw)
+            self.buckets[bucket.start] = bucket
+
+    def add(self, cost: float, start: int) -> None:
+        bucket = self.buckets.get(start)
+        if bucket is None:
+            bucket = self.buckets[start] = _Bucket(start)
+        bucket.add(cost)
+
+    def prune(self, cutoff: int) -> bool:
+        expired = [start for start in self.buckets if start < cutoff]
+        for start in expired:
+            del self.buckets[start]
+        return bool(expired)
+
+    def to_fields(self) -> Dict[str, Any]:
+        return {
+            "task_type": self.task_type,
+            "model": self.model,
+            "count": sum(b.count for b in self.buckets.values()),
+            "buckets": [self.buckets[start].to_fields() for start in sorted(self.buckets)],
+            "updated_at": int(time.time()),
+        }
+
+    def stats(self) -> CostStats:
+        # Chan et al. merge of the per-bucket moments; the window p90 is the
+        # count-weighted mean of the bucket estimates (P² states do not merge).
+        count, mean, m2, p90_sum = 0, 0.0, 0.0, 0.0
+        for bucket in self.buckets.values():
+            if not bucket.count:
+                continue
+            total = count + bucket.count
+            delta = bucket.mean - mean
+            mean += delta * bucket.count / total
+            m2 += bucket.m2 + delta * delta * count * bucket.count / total
+            p90_sum += bucket.p90.value() * bucket.count
+            count = total
+        variance = m2 / (count - 1) if count > 1 else 0.0
+        p90 = p90_sum / count if count else 0.0
+        return CostStats(self.task_type, self.model, count, mean, variance, p90)
+
+
+class CostStatsTable:
+    """Per-(task_type, model) cost statistics, kept in memory and mirrored to GICS.
+
+    Rows live under ``ce_stats:{task_type}|{model}``; ``model == "*"`` aggregates
+    every model for the task type. Each row keeps weekly buckets and only those
+    overlapping the last ``WINDOW_DAYS`` count, so statistics follow price
+    changes instead of averaging over all history. The table is loaded with a
+    single scan (backfilled from raw cost events the first time) and then
+    updated incrementally by :meth:`record`; see ``CostAggregates`` for sharing.
+    """
+
+    PREFIX = "ce_stats:"
+    WINDOW_DAYS = 90
+    BUCKET_SECONDS = 7 * 86400
+
+    def __init__(self, gics: Any, clock: Callable[[], float] = time.time):
+        self.gics = gics
+        self._clock = clock
+        self._rows: Dict[CostStatsKey, _Row] = {}
+        self._pruned: Set[CostStatsKey] = set()  # rows whose GICS copy still holds expired buckets
+        self._lock = threading.Lock()
+
+    def load(self) -> bool:
+        """Load the persisted rows with one scan; False means the table needs a backfill."""
+        try:
+            for item in self.gics.scan(self.PREFIX, include_fields=True) or []:
+                fields = item.get("fields") or {}
+                if "buckets" not in fields:
+                    continue  # all-time row from before windowing; rebuilt by the backfill
+                key = (str(fields.get("task_type")), str(fields.get("model")))
+                self._rows[key] = _Row(key[0], key[1], fields)
+        except Exception as e:
+            logger.error("Failed to load cost stats: %s", e)
+            return True  # do not backfill on top of rows we could not read
+        self._prune()
+        return bool(self._rows)
+
+    def backfill(self, events: Iterable[Dict[str, Any]]) -> None:
+        touched = set()
+        for event in events:
+            task_type, model = str(event.get("task_type")), str(event.get("model"))
+            ts = _event_ts(event.get("timestamp"))
+            touched.update(self._add(task_type, model, event.get("cost_usd"), ts))
+        self._persist(touched)
+
+    def _cutoff(self) -> int:
+        now = self._clock()
+        return int((now - self.WINDOW_DAYS * 86400) // self.BUCKET_SECONDS * self.BUCKET_SECONDS)
+
+    def _prune(self) -> None:
+        cutoff = self._cutoff()
+        self._pruned.update(key for key, row in self._rows.items() if row.prune(cutoff))
+
+    def _add(
+        self, task_type: str, model: str, cost: Any, ts: Optional[float]
+    ) -> List[CostStatsKey]:
+        ts = self._clock() if ts is None else ts
+        start = int(ts // self.BUCKET_SECONDS * self.BUCKET_SECONDS)
+        if start < self._cutoff():
+            return []
+        keys = [(task_type, model), (task_type, ANY_MODEL)]
+        for key in keys:
+            row = self._rows.get(key)
+            if row is None:
+                row = self._rows[key] = _Row(*key)
+            row.add(float(cost or 0.0), start)
+        return keys
+
+    def _persist(self, keys: Iterable[CostStatsKey]) -> None:
+        for key in keys:
+            try:
+                self.gics.put(f"{self.PREFIX}{key[0]}|{key[1]}", self._rows[key].to_fields())
+            except Exception as e:
+                logger.error("Failed to persist cost stats %s: %s", key, e)
+
+    def record(self, task_type: str, model: str, cost_usd: float, timestamp: Any = None) -> None:
+        ts = _event_ts(timestamp) if timestamp is not None else None
+        with self._lock:
+            self._prune()
+            keys = self._pruned | set(self._add(task_type, model, cost_usd, ts))
+            self._pruned.clear()
+            self._persist(keys)
+
+    def snapshot(self) -> Dict[CostStatsKey, CostStats]:
+        with self._lock:
+            self._prune()
+            rows = {key: row.stats() for key, row in self._rows.items()}
+        return {key: stats for key, stats in rows.items() if stats.count}
@@ -6,6 +6,9 @@ from typing import Any, Dict, List, Optional
 from collections import defaultdict
 
 from ...ops_models import CostEvent, NodeEconomyMetrics, PlanEconomySnapshot
+from .cost_aggregates import CostAggregates
+from .cost_stats import CostStats, CostStatsKey, CostStatsTable
+from .spend_tracker import SpendTracker
 
 logger = logging.getLogger("orchestrator.ops.cost")
 
@@ -23,15 +26,40 @@ class CostStorage:
         """No-op: using GICS."""
         pass
 
+    def _aggregates(self) -> Optional[CostAggregates]:
+        if not self.gics:
+            return None
+        return CostAggregates.for_gics(self.gics, lambda days: self._fetch_events(days=days))
+
+    def _stats_table(self) -> Optional[CostStatsTable]:
+        aggregates = self._aggregates()
+        return aggregates.stats if aggregates is not None else None
+
+    def spend_tracker(self) -> Optional[SpendTracker]:
+        """Rolling spend/burn-rate tracker shared by every storage on this GICS client."""
+        aggregates = self._aggregates()
+        return aggregates.spend if aggregates is not None else None
+
     def save_cost_event(self, event: CostEvent) -> None:
         """Save a cost event to storage."""
         if not self.gics:
             return
+        # Load (and backfill) the aggregates before the write so the new event is counted once.
+        aggregates = self._aggregates()
         try:
             key = f"ce:{event.workflow_id}:{event.node_id}:{int(event.timestamp.timestamp())}:{event.id}"
             self.gics.put(key, event.model_dump())
         except Exception as e:
             logger.error(f"Failed to save cost event {event.id}: {e}")
+            return
+        if aggregates is not None:
+            aggregates.stats.record(event.task_type, event.model, event.cost_usd, event.timestamp)
+            aggregates.spend.record(event.provider, event.cost_usd, event.timestamp)
+
+    def get_cost_stats(self) -> Dict[CostStatsKey, CostStats]:
+        """Snapshot of per-(task_type, model) cost statistics; model ``"*"`` is any model."""
+        table = self._stats_table()
+        return table.snapshot() if table is not None else {}
 
     def _fetch_events(self, days: Optional[int] = 30, hours: Optional[int] = None) -> List[Dict[str, Any]]:
         if not self.gics:
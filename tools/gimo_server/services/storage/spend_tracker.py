@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+logger = logging.getLogger("orchestrator.services.storage.spend_tracker")
+
+GLOBAL_SCOPE = "global"
+
+SpendListener = Callable[[List[str]], None]
+
+
+def provider_scope(provider: str) -> str:
+    return f"provider:{provider}"
+
+
+def _event_ts(value: Any) -> Optional[float]:
+    if isinstance(value, datetime):
+        ts = value
+    else:
+        raw = str(value or "")
+        if raw.endswith("Z"):
+            raw = raw[:-1] + "+00:00"
+        try:
+            ts = datetime.fromisoformat(raw)
+        except ValueError:
+            return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+class _RollingWindow:
+    """Sum of spend over the last ``span`` seconds, kept in fixed-size buckets.
+
+    Reads expire old buckets from the front and return the running total, so
+    both reads and in-order writes are amortized O(1).
+    """
+
+    def __init__(self, span: float, bucket_seconds: int):
+        self.span = span
+        self.bucket_seconds = bucket_seconds
+        self.buckets: Deque[List[float]] = deque()  # [bucket_start, amount], ascending
+        self.total = 0.0
+
+    def add(self, ts: float, amount: float, now: float) -> None:
+        start = ts // self.bucket_seconds * self.bucket_seconds
+        if start < self._cutoff(now):
+            return
+        if not self.buckets or self.buckets[-1][0] < start:
+            self.buckets.append([start, amount])
+        elif self.buckets[-1][0] == start:
+            self.buckets[-1][1] += amount
+        else:  # late write (backfill, clock skew)
+            idx = bisect.bisect_left([b[0] for b in self.buckets], start)
+            if self.buckets[idx][0] == start:
+                self.buckets[idx][1] += amount
+            else:
+                self.buckets.insert(idx, [start, amount])
+        self.total += amount
+
+    def value(self, now: float) -> float:
+        cutoff = self._cutoff(now)
+        while self.buckets and self.buckets[0][0] < cutoff:
+            self.total -= self.buckets.popleft()[1]
+        if not self.buckets:
+            self.total = 0.0  # drop accumulated float error
+        return max(0.0, self.total)
+
+    def _cutoff(self, now: float) -> float:
+        return (now - self.span) // self.bucket_seconds * self.bucket_seconds
+
+
+class _EwRate:
+    """Exponentially weighted spend rate (USD/second) with time constant ``tau``."""
+
+    def __init__(self, tau: float):
+        self.tau = tau
+        self.level = 0.0
+        self.at = 0.0
+
+    def add(self, ts: float, amount: float) -> None:
+        if ts >= self.at:
+            self.level = self.level * math.exp(-(ts - self.at) / self.tau) + amount / self.tau
+            self.at = ts
+        else:
+            self.level += amount / self.tau * math.exp(-(self.at - ts) / self.tau)
+
+    def value(self, now: float) -> float:
+        return self.level * math.exp(-max(0.0, now - self.at) / self.tau)
+
+
+class _ScopeSpend:
+    def __init__(self, windows: Dict[int, int]):
+        self.windows = {days: _RollingWindow(days * 86400, bucket) for days, bucket in windows.items()}
+        self.hourly = _EwRate(3600.0)
+        self.daily = _EwRate(86400.0)
+
+    def add(self, ts: float, amount: float, now: float) -> None:
+        for window in self.windows.values():
+            window.add(ts, amount, now)
+        self.hourly.add(ts, amount)
+        self.daily.add(ts, amount)
+
+
+class SpendTracker:
+    """Rolling spend and burn rates per scope, fed by cost event writes.
+
+    Scopes are ``"global"`` and ``"provider:{name}"``. Each scope keeps a
+    rolling window per supported budget period (minute buckets for the daily
+    window, hour buckets beyond that) and two exponentially weighted rates:
+    one with a 1h time constant and one with a 24h time constant. Trackers are
+    shared per GICS client through ``CostAggregates``, which backfills them.
+    """
+
+    # period length in days -> bucket size in seconds
+    WINDOWS: Dict[int, int] = {1: 60, 7: 3600, 30: 3600, 365: 3600}
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._scopes: Dict[str, _ScopeSpend] = {}
+        self._listeners: List[SpendListener] = []
+        self._lock = threading.Lock()
+
+    def backfill(self, events: Iterable[Dict[str, Any]]) -> None:
+        """Replay past cost events, oldest first, before any live record."""
+        dated = sorted(
+            ((_event_ts(e.get("timestamp")), e) for e in events),
+            key=lambda item: item[0] or 0.0,
+        )
+        with self._lock:
+            for ts, event in dated:
+                if ts is not None:
+                    provider = str(event.get("provider"))
+                    self._add(provider, float(event.get("cost_usd", 0.0) or 0.0), ts)
+
+    def _scope(self, scope: str) -> _ScopeSpend:
+        state = self._scopes.get(scope)
+        if state is None:
+            state = self._scopes[scope] = _ScopeSpend(self.WINDOWS)
+        return state
+
+    def _add(self, provider: str, cost_usd: float, ts: float) -> List[str]:
+        now = self._clock()
+        scopes = [GLOBAL_SCOPE, provider_scope(provider)]
+        for scope in scopes:
+            self._scope(scope).add(ts, cost_usd, now)
+        return scopes
+
+    def record(self, provider: str, cost_usd: float, timestamp: Any = None) -> None:
+        ts = _event_ts(timestamp) if timestamp is not None else None
+        with self._lock:
+            scopes = self._add(provider, cost_usd, ts if ts is not None else self._clock())
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(scopes)
+            except Exception as e:
+                logger.error("Spend listener failed: %s", e)
+
+    def subscribe(self, listener: SpendListener) -> None:
+        """Call ``listener(scopes)`` after every recorded cost."""
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def unsubscribe(self, listener: SpendListener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def spend(self, scope: str, days: int) -> float:
+        """Spend in ``scope`` over the last ``days`` (one of ``WINDOWS``)."""
+        if days not in self.WINDOWS:
+            raise ValueError(f"Unsupported spend window: {days} days")
+        with self._lock:
+            state = self._scopes.get(scope)
+            return state.windows[days].value(self._clock()) if state else 0.0
+
+    def burn_rates(self, scope: str) -> Dict[str, float]:
+        """Exponentially weighted burn rates: USD/hour (1h constant) and USD/day (24h constant)."""
+        with self._lock:
+            state = self._scopes.get(scope)
+            if state is None:
+                return {"hourly": 0.0, "daily": 0.0}
+            now = self._clock()
+            return {
+                "hourly": state.hourly.value(now) * 3600.0,
+                "daily": state.daily.value(now) * 86400.0,
+            }
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Deque, Dict, Iterable, Mapping, Optional, Tuple
+
+logger = logging.getLogger("orchestrator.services.storage.trust_scores")
+
+
+# (approvals, rejections, failures, sequence number) one event added to a dimension
+_Effect = Tuple[int, int, int, int]
+
+
+class _Dimension:
+    """Running counters of one trust dimension, folded exactly like ``TrustEngine._build_records``.
+
+    Events can also be removed oldest-first, which keeps the counters equal to
+    a fold over only the events still in the window.
+    """
+
+    __slots__ = ("approvals", "rejections", "failures", "streak", "events", "last_reset")
+
+    def __init__(self) -> None:
+        self.approvals = 0
+        self.rejections = 0
+        self.failures = 0
+        self.streak = 0
+        self.events = 0
+        self.last_reset = -1  # sequence number of the newest event that reset the streak
+
+    def add(self, event: Dict[str, Any], seq: int) -> _Effect:
+        outcome = str(event.get("outcome") or "")
+        approval = int(outcome in {"approved", "auto_approved"})
+        rejection = int(outcome == "rejected")
+        failure = int(outcome in {"error", "timeout"})
+        if not bool(event.get("post_check_passed", True)):
+            failure += 1
+        self.approvals += approval
+        self.rejections += rejection
+        self.failures += failure
+        self.events += 1
+        if rejection or failure:
+            self.streak = 0
+            self.last_reset = seq
+        elif approval:
+            self.streak += 1
+        return approval, rejection, failure, seq
+
+    def remove(self, effect: _Effect) -> None:
+        """Undo the oldest event still folded in."""
+        approval, rejection, failure, seq = effect
+        self.approvals -= approval
+        self.rejections -= rejection
+        self.failures -= failure
+        self.events -= 1
+        if approval and not (rejection or failure) and seq > self.last_reset:
+            self.streak -= 1  # it was the first approval of the current streak
+
+    def score(self) -> float:
+        base = self.approvals / (self.approvals + self.rejections + self.failures + 1)
+        return round(max(0.0, min(1.0, base + min(self.streak * 0.01, 0.1))), 4)
+
+
+@dataclass(frozen=True)
+class TrustScoreSnapshot:
+    """Immutable dimension_key -> score view; replaced wholesale, never mutated."""
+
+    stamp: Optional[str] = None
+    scores: Mapping[str, float] = field(default_factory=dict)
+
+    def score(self, dimension_key: str) -> float:
+        return self.scores.get(dimension_key, 0.0)
+
+
+_EMPTY = TrustScoreSnapshot()
+
+
+class TrustScoreCache:
+    """Process-wide trust scores keyed by dimension key, served from memory.
+
+    The cache is built with one scan of the ``te:`` trust events and afterwards
+    folded in place by :meth:`record_events` whenever trust events are saved.
+    Like ``TrustEngine`` it only counts the newest ``EVENTS_LIMIT`` events; older
+    ones are folded back out as new ones arrive.
+    Every write bumps a version stamp stored under ``VERSION_KEY``; readers
+    compare it with their own at most every ``REFRESH_CHECK_SECONDS`` and
+    rebuild when another process has written events in the meantime.
+    """
+
+    EVENT_PREFIX = "te:"
+    VERSION_KEY = "te_meta:version"
+    REFRESH_CHECK_SECONDS: float = 2.0
+    EVENTS_LIMIT = 5000
+
+    _lock = threading.RLock()
+    _gics: Any = None
+    _dimensions: Dict[str, _Dimension] = {}
+    _window: Deque[Tuple[str, _Effect]] = deque()  # folded events, oldest first
+    _seq = 0
+    _snapshot: TrustScoreSnapshot = _EMPTY
+    _loaded = False
+    _checked_at = 0.0
+
+    @classmethod
+    def _read_stamp(cls, gics: Any) -> Optional[str]:
+        try:
+            result = gics.get(cls.VERSION_KEY)
+        except Exception as e:
+            logger.warning("Failed to read trust score version: %s", e)
+            return None
+        if result and isinstance(result.get("fields"), dict):
+            return result["fields"].get("stamp")
+        return None
+
+    @classmethod
+    def _rebuild(cls, gics: Any, stamp: Optional[str]) -> None:
+        try:
+            items = gics.scan(prefix=cls.EVENT_PREFIX, include_fields=True) or []
+        except Exception as e:
+            logger.error("Failed to load trust events for score cache: %s", e)
+            return
+        events = [item.get("fields") or {} for item in items]
+        events = [event for event in events if event.get("dimension_key")]
+        events.sort(key=lambda e: str(e.get("timestamp") or ""))
+        dimensions: Dict[str, _Dimension] = {}
+        window: Deque[Tuple[str, _Effect]] = deque()
+        for seq, event in enumerate(events[-cls.EVENTS_LIMIT :]):
+            key = str(event["dimension_key"])
+            window.append((key, dimensions.setdefault(key, _Dimension()).add(event, seq)))
+        cls._gics = gics
+        cls._dimensions = dimensions
+        cls._window = window
+        cls._seq = len(window)
+        cls._snapshot = TrustScoreSnapshot(
+            stamp=stamp,
+            scores=MappingProxyType({key: dim.score() for key, dim in dimensions.items()}),
+        )
+        cls._loaded = True
+
+    @classmethod
+    def snapshot(cls, gics: Any) -> TrustScoreSnapshot:
+        """Current scores for ``gics``; checks the version stamp at most every ``REFRESH_CHECK_SECONDS``."""
+        if gics is None:
+            return _EMPTY
+        now = time.monotonic()
+        if cls._loaded and cls._gics is gics and now - cls._checked_at < cls.REFRESH_CHECK_SECONDS:
+            return cls._snapshot
+        with cls._lock:
+            stamp = cls._read_stamp(gics)
+            if not cls._loaded or cls._gics is not gics or stamp != cls._snapshot.stamp:
+                cls._rebuild(gics, stamp)
+            cls._checked_at = now
+            return cls._snapshot
+
+    @classmethod
+    def record_events(cls, gics: Any, events: Iterable[Dict[str, Any]]) -> None:
+        """Fold freshly saved trust events into the cache and publish a new version stamp."""
+        if gics is None:
+            return
+        with cls._lock:
+            foreign = cls._read_stamp(gics) != cls._snapshot.stamp
+            stamp = uuid.uuid4().hex
+            try:
+                gics.put(cls.VERSION_KEY, {"stamp": stamp, "updated_at": int(time.time())})
+            except Exception as e:
+                logger.error("Failed to publish trust score version: %s", e)
+                cls._loaded = False
+                return
+            if not cls._loaded or cls._gics is not gics or foreign:
+                # Someone else wrote since our last look: the next snapshot rescans.
+                cls._loaded = False
+                return
+            scores = dict(cls._snapshot.scores)
+            for event in events:
+                key = event.get("dimension_key")
+                if not key:
+                    continue
+                dim = cls._dimensions.setdefault(str(key), _Dimension())
+                cls._window.append((str(key), dim.add(event, cls._seq)))
+                cls._seq += 1
+                scores[str(key)] = dim.score()
+            while len(cls._window) > cls.EVENTS_LIMIT:
+                key, effect = cls._window.popleft()
+                dim = cls._dimensions[key]
+                dim.remove(effect)
+                if dim.events:
+                    scores[key] = dim.score()
+                else:
+                    del cls._dimensions[key]
+                    scores.pop(key, None)
+            cls._snapshot = TrustScoreSnapshot(stamp=stamp, scores=MappingProxyType(scores))
+
+    @classmethod
+    def invalidate(cls) -> None:
+        with cls._lock:
+            cls._gics = None
+            cls._dimensions = {}
+            cls._window = deque()
+            cls._seq = 0
+            cls._snapshot = _EMPTY
+            cls._loaded = False
+            cls._checked_at = 0.0
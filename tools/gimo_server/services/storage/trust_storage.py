@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from ...ops_models import TrustEvent
+from .trust_scores import TrustScoreCache
 
 logger = logging.getLogger("orchestrator.services.storage.trust")
 
@@ -40,11 +41,14 @@ class TrustStorage:
             self.gics.put(event_key, event_data)
         except Exception as e:
             logger.error("Failed to push trust event to GICS: %s", e)
+            return
+        TrustScoreCache.record_events(self.gics, [event_data])
 
     def save_trust_events(self, events: List[TrustEvent | Dict[str, Any]]) -> None:
         if not events or not self.gics:
             return
             
+        saved: List[Dict[str, Any]] = []
         for event in events:
             try:
                 event_data = event.model_dump() if isinstance(event, TrustEvent) else dict(event)
@@ -52,8 +56,11 @@ class TrustStorage:
                 event_data["timestamp"] = timestamp
                 event_key = f"te:{event_data.get('dimension_key')}:{timestamp}"
                 self.gics.put(event_key, event_data)
+                saved.append(event_data)
             except Exception as e:
                 logger.error("Failed to push batch trust event to GICS: %s", e)
+        if saved:
+            TrustScoreCache.record_events(self.gics, saved)
 
     def list_trust_events(self, limit: int = 100) -> List[Dict[str, Any]]:
         if not self.gics:
@@ -1,20 +1,169 @@
 from __future__ import annotations
 
+import copy
 import json
 import logging
+import queue
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger("orchestrator.services.storage.workflow")
 
+_MISSING = object()
+
+
+def _escape_pointer(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape_pointer(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def json_diff(before: Any, after: Any, path: str = "") -> List[Dict[str, Any]]:
+    """Build an RFC 6902 patch turning ``before`` into ``after``.
+
+    Dicts are diffed key by key; lists and scalars are replaced wholesale.
+    """
+    if isinstance(before, dict) and isinstance(after, dict):
+        ops: List[Dict[str, Any]] = []
+        for key in before:
+            if key not in after:
+                ops.append({"op": "remove", "path": f"{path}/{_escape_pointer(str(key))}"})
+        for key, value in after.items():
+            child = f"{path}/{_escape_pointer(str(key))}"
+            if key not in before:
+                ops.append({"op": "add", "path": child, "value": value})
+            elif before[key] != value:
+                ops.extend(json_diff(before[key], value, child))
+        return ops
+    if before == after:
+        return []
+    return [{"op": "replace", "path": path, "value": after}]
+
+
+def json_patch_apply(doc: Any, patch: List[Dict[str, Any]]) -> Any:
+    """Apply an RFC 6902 patch produced by :func:`json_diff` (add/remove/replace)."""
+    doc = copy.deepcopy(doc)
+    for op in patch:
+        tokens = [_unescape_pointer(t) for t in op["path"].split("/")[1:]]
+        if not tokens:
+            doc = copy.deepcopy(op.get("value"))
+            continue
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        leaf = tokens[-1]
+        if isinstance(parent, list):
+            leaf = int(leaf)
+        if op["op"] == "remove":
+            del parent[leaf]
+        elif op["op"] in {"add", "replace"}:
+            parent[leaf] = copy.deepcopy(op.get("value"))
+        else:
+            raise ValueError(f"Unsupported patch op: {op['op']}")
+    return doc
+
+
+_WriteJob = Tuple[Any, str, Dict[str, Any], Callable[[], None]]
+
+
+class _CheckpointWriter:
+    """Single background thread that drains checkpoint writes in batches.
+
+    Node execution only enqueues; the GICS round trips happen here.
+    """
+
+    def __init__(self, max_pending: int = 1024, batch_size: int = 64):
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[_WriteJob]" = queue.Queue(max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def submit(
+        self, gics: Any, key: str, fields: Dict[str, Any], on_error: Callable[[], None]
+    ) -> None:
+        self._ensure_started()
+        # A full queue means GICS is far behind: block rather than drop history.
+        self._queue.put((gics, key, fields, on_error))
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def _ensure_started(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="gimo-checkpoint-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for gics, key, fields, on_error in batch:
+                try:
+                    gics.put(key, fields)
+                except Exception as e:
+                    logger.error("Failed to push checkpoint %s to GICS: %s", key, e)
+                    on_error()
+                finally:
+                    self._queue.task_done()
+
+
+_WRITER = _CheckpointWriter()
+
+
 class WorkflowStorage:
     """Storage logic for workflows and checkpoints.
     Persists entirely via GICS.
+
+    Checkpoints are stored as a full ``base`` snapshot every
+    ``base_snapshot_interval`` steps with JSON-patch ``delta`` records in
+    between; :meth:`list_checkpoints` replays the deltas onto their base.
+    Writes are queued to a background writer so they never block node execution.
+
+    The last state of at most ``MAX_CHAINS`` workflows is kept in memory to
+    diff against. A chain is dropped when its workflow finishes; when an
+    evicted chain is continued, its state is rebuilt from the base snapshot
+    in GICS.
     """
 
-    def __init__(self, conn: Optional[Any] = None, gics: Optional[Any] = None):
+    BASE_SNAPSHOT_INTERVAL = 10
+    MAX_CHAINS = 128
+
+    def __init__(
+        self,
+        conn: Optional[Any] = None,
+        gics: Optional[Any] = None,
+        *,
+        base_snapshot_interval: Optional[int] = None,
+    ):
         self._conn = conn # Kept for backward compatibility
         self.gics = gics
+        interval = base_snapshot_interval or self.BASE_SNAPSHOT_INTERVAL
+        self.base_snapshot_interval = max(1, int(interval))
+        # workflow_id -> {state, key, base_key, steps (since base), timestamp} of the last
+        # checkpoint, least recently used first
+        self._chains: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Same without the state, for chains pushed out by MAX_CHAINS.
+        self._evicted: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._chains_lock = threading.Lock()
 
     def ensure_tables(self) -> None:
         """No-op: using GICS."""
@@ -23,10 +172,10 @@ class WorkflowStorage:
     def save_workflow(self, workflow_id: str, data: str) -> None:
         if not self.gics:
             return
-            
+
         if not isinstance(data, str):
             data = json.dumps(data)
-            
+
         try:
             self.gics.put(f"wf:{workflow_id}", {"data": data})
         except Exception as e:
@@ -42,28 +191,104 @@ class WorkflowStorage:
     ) -> None:
         if not self.gics:
             return
-            
-        state_payload = state if isinstance(state, str) else json.dumps(state)
+
         output_payload = output if isinstance(output, str) or output is None else json.dumps(output)
-        
+
         try:
+            # Snapshot the state now: the engine keeps mutating it after this call.
+            raw = state if isinstance(state, str) else json.dumps(state)
+            state_doc = json.loads(raw)
+        except Exception as e:
+            logger.error("Failed to serialize checkpoint state for %s: %s", workflow_id, e)
+            return
+
+        with self._chains_lock:
+            evicted = None
+            if workflow_id not in self._chains:
+                evicted = self._evicted.pop(workflow_id, None)
+        reloaded = self._reload_chain(workflow_id, evicted) if evicted else None
+
+        with self._chains_lock:
+            chain = self._chains.get(workflow_id) or reloaded
             timestamp = int(time.time() * 1000)
+            if chain and timestamp <= chain["timestamp"]:
+                timestamp = chain["timestamp"] + 1  # keep keys unique and ordered
             cp_key = f"wf:{workflow_id}:cp:{timestamp}:{node_id}"
-            self.gics.put(cp_key, {
+            fields: Dict[str, Any] = {
                 "workflow_id": workflow_id,
                 "node_id": node_id,
-                "state": state_payload,
                 "output": output_payload,
                 "status": status,
-                "timestamp": timestamp
-            })
+                "timestamp": timestamp,
+            }
+            if chain is None or chain["steps"] >= self.base_snapshot_interval:
+                fields.update({"kind": "base", "state": json.dumps(state_doc)})
+                chain = {"base_key": cp_key, "steps": 0}
+            else:
+                fields.update(
+                    {
+                        "kind": "delta",
+                        "base_key": chain["base_key"],
+                        "parent_key": chain["key"],
+                        "patch": json.dumps(json_diff(chain["state"], state_doc)),
+                    }
+                )
+            steps = chain["steps"] + 1
+            chain.update({"state": state_doc, "key": cp_key, "timestamp": timestamp, "steps": steps})
+            self._chains[workflow_id] = chain
+            self._chains.move_to_end(workflow_id)
+            while len(self._chains) > self.MAX_CHAINS:
+                old_id, old = self._chains.popitem(last=False)
+                self._evicted[old_id] = {k: v for k, v in old.items() if k != "state"}
+            while len(self._evicted) > self.MAX_CHAINS:
+                self._evicted.popitem(last=False)
+
+        _WRITER.submit(self.gics, cp_key, fields, on_error=lambda: self._reset_chain(workflow_id))
+
+    def _reload_chain(self, workflow_id: str, meta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Rebuild an evicted chain from its base snapshot and deltas in GICS."""
+        self.flush()
+        try:
+            items = self.gics.scan(prefix=f"wf:{workflow_id}:cp:", include_fields=True)
         except Exception as e:
-            logger.error("Failed to push checkpoint for %s to GICS: %s", workflow_id, e)
+            logger.warning("Failed to reload checkpoint chain for %s: %s", workflow_id, e)
+            return None
+        records = []
+        for item in items:
+            fields = item.get("fields", {})
+            key = self._key_for(workflow_id, fields)
+            if key == meta["base_key"] or fields.get("base_key") == meta["base_key"]:
+                records.append((key, fields))
+        records.sort(key=lambda r: r[1].get("timestamp") or 0)
+        states: Dict[str, Any] = {}
+        for key, fields in records:
+            self._restore_state(key, fields, states)
+        state = states.get(meta["key"])
+        if state is None:
+            return None  # the next checkpoint starts a new base
+        return {**meta, "state": state}
+
+    def drop_chain(self, workflow_id: str) -> None:
+        """Forget the chain of a finished workflow or of one whose checkpoints are gone."""
+        with self._chains_lock:
+            self._chains.pop(workflow_id, None)
+            self._evicted.pop(workflow_id, None)
+
+    def _reset_chain(self, workflow_id: str) -> None:
+        # A lost write breaks the delta chain; force the next checkpoint to be a base.
+        with self._chains_lock:
+            chain = self._chains.get(workflow_id) or self._evicted.get(workflow_id)
+            if chain:
+                chain["steps"] = self.base_snapshot_interval
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until queued checkpoint writes reached GICS."""
+        return _WRITER.flush(timeout)
 
     def get_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
         if not self.gics:
             return None
-            
+
         try:
             result = self.gics.get(f"wf:{workflow_id}")
             if result and "fields" in result:
@@ -80,33 +305,58 @@ class WorkflowStorage:
                 }
         except Exception as e:
             logger.error("Failed to get workflow from GICS: %s", e)
-            
+
         return None
 
     def list_checkpoints(self, workflow_id: str) -> List[Dict[str, Any]]:
         if not self.gics:
             return []
-            
+
+        self.flush()
         try:
             prefix = f"wf:{workflow_id}:cp:"
             items = self.gics.scan(prefix=prefix, include_fields=True)
-            checkpoints = []
+            records = []
             for item in items:
                 fields = item.get("fields", {})
+                records.append((self._key_for(workflow_id, fields), fields))
+            records.sort(key=lambda r: r[1].get("timestamp") or 0)
+
+            states: Dict[str, Any] = {}
+            checkpoints = []
+            for key, fields in records:
+                state = self._restore_state(key, fields, states)
                 checkpoints.append({
                     "workflow_id": fields.get("workflow_id"),
                     "node_id": fields.get("node_id"),
-                    "state": self._maybe_parse_json(fields.get("state")),
+                    "state": state,
                     "output": self._maybe_parse_json(fields.get("output")),
                     "status": fields.get("status"),
                     "timestamp": fields.get("timestamp"),
                 })
-            checkpoints.sort(key=lambda x: x.get("timestamp") or 0)
             return checkpoints
         except Exception as e:
             logger.error("Failed to list checkpoints from GICS: %s", e)
             return []
 
+    @staticmethod
+    def _key_for(workflow_id: str, fields: Dict[str, Any]) -> str:
+        return f"wf:{workflow_id}:cp:{fields.get('timestamp')}:{fields.get('node_id')}"
+
+    def _restore_state(self, key: str, fields: Dict[str, Any], states: Dict[str, Any]) -> Any:
+        if fields.get("kind") != "delta":
+            # Base snapshots and legacy full checkpoints.
+            state = self._maybe_parse_json(fields.get("state"))
+        else:
+            parent = states.get(str(fields.get("parent_key")), _MISSING)
+            if parent is _MISSING or parent is None:
+                logger.warning("Checkpoint %s has a broken delta chain; state unavailable", key)
+                state = None
+            else:
+                state = json_patch_apply(parent, self._maybe_parse_json(fields.get("patch")) or [])
+        states[key] = state
+        return state
+
     def _maybe_parse_json(self, value: Any) -> Any:
         if value is None:
             return None
@@ -45,6 +45,9 @@ class StorageService:
     def list_checkpoints(self, workflow_id: str) -> List[Dict[str, Any]]:
         return self.workflows.list_checkpoints(workflow_id)
 
+    def end_checkpoint_chain(self, workflow_id: str) -> None:
+        return self.workflows.drop_chain(workflow_id)
+
     # --- Trust Domain ---
     def save_trust_event(self, event: TrustEvent | Dict[str, Any]) -> None:
         return self.trust.save_trust_event(event)
@@ -1,8 +1,10 @@
+import asyncio
 import json
+import os
 import shutil
 import uuid
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from tools.gimo_server.models import SubAgent, SubAgentConfig
 from tools.gimo_server.services.provider_service import ProviderService
@@ -12,46 +14,144 @@ from tools.gimo_server.services.provider_catalog_service import ProviderCatalogS
 
 logger = logging.getLogger("orchestrator.sub_agent_manager")
 
+# Legacy single-file inventory; per-agent records live in the sibling ``sub_agents/`` dir.
 INVENTORY_FILE = WORKTREES_DIR.parent / "runtime" / "sub_agents.json"
+POOL_PREFIX = "pool-"
+
 
 class SubAgentManager:
-    """Gestiona el ciclo de vida, spawn y estado de agentes secundarios."""
+    """Gestiona el ciclo de vida, spawn y estado de agentes secundarios.
+
+    Each agent is persisted as its own record, rewritten only when that agent
+    changes. Worktrees come from a recycled pool (reset with ``checkout -f``
+    and ``clean``) instead of being added/removed per agent, and
+    ``execute_task`` runs through a bounded queue per model.
+    """
     _sub_agents: Dict[str, SubAgent] = {}
     _synced_models: set[str] = set()
 
+    WORKTREE_POOL_MAX = 4
+    DEFAULT_MODEL_CONCURRENCY = 4
+    LOCAL_MODEL_CONCURRENCY = 1
+    MAX_QUEUED_PER_MODEL = 16
+    _worktree_pool: List[Path] = []
+    # model -> (loop, semaphore, queued count)
+    _model_slots: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore, int]] = {}
+
     @classmethod
     def _ensure_worktrees_dir(cls):
         WORKTREES_DIR.mkdir(parents=True, exist_ok=True)
 
+    # ── Record store ──────────────────────────────────────────────────────
+
+    @classmethod
+    def _records_dir(cls) -> Path:
+        return INVENTORY_FILE.parent / INVENTORY_FILE.stem
+
     @classmethod
     def _load_inventory(cls) -> Dict[str, SubAgent]:
-        """Load persisted sub-agent inventory from disk."""
-        if not INVENTORY_FILE.exists():
-            return {}
+        """Load persisted sub-agent records (plus any legacy single-file inventory)."""
+        result: Dict[str, SubAgent] = {}
+        if INVENTORY_FILE.exists():
+            try:
+                data = json.loads(INVENTORY_FILE.read_text(encoding="utf-8"))
+                for agent_id, agent_data in data.items():
+                    result[agent_id] = SubAgent(**agent_data)
+            except Exception as e:
+                logger.warning("Failed to load sub-agent inventory: %s", e)
+        records = cls._records_dir()
+        if records.exists():
+            for path in records.glob("*.json"):
+                try:
+                    agent = SubAgent.model_validate_json(path.read_text(encoding="utf-8"))
+                    result[agent.id] = agent
+                except Exception as e:
+                    logger.warning("Failed to load sub-agent record %s: %s", path.name, e)
+        return result
+
+    @classmethod
+    def _persist_agent(cls, agent: SubAgent):
+        """Atomically persist one sub-agent record."""
+        records = cls._records_dir()
+        path = records / f"{agent.id}.json"
+        tmp = path.with_suffix(f".tmp.{os.urandom(4).hex()}")
         try:
-            data = json.loads(INVENTORY_FILE.read_text(encoding="utf-8"))
-            result = {}
-            for agent_id, agent_data in data.items():
-                result[agent_id] = SubAgent(**agent_data)
-            return result
+            records.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(agent.model_dump_json(indent=2), encoding="utf-8")
+            os.replace(tmp, path)
         except Exception as e:
-            logger.warning("Failed to load sub-agent inventory: %s", e)
-            return {}
+            logger.error("Failed to persist sub-agent %s: %s", agent.id, e)
+            tmp.unlink(missing_ok=True)
+
+    @classmethod
+    def _delete_record(cls, agent_id: str):
+        (cls._records_dir() / f"{agent_id}.json").unlink(missing_ok=True)
+
+    # ── Worktree pool ─────────────────────────────────────────────────────
+
+    @classmethod
+    def _acquire_worktree(cls) -> Path:
+        """Reuse a pooled worktree reset to the repo HEAD, or add a new one."""
+        cls._ensure_worktrees_dir()
+        head = GitService.get_head_commit(REPO_ROOT_DIR)
+        while cls._worktree_pool:
+            slot = cls._worktree_pool.pop()
+            try:
+                GitService.reset_worktree(slot, head)
+                return slot
+            except Exception as e:
+                logger.warning("Discarding pooled worktree %s: %s", slot.name, e)
+                cls._discard_worktree(slot)
+        slot = WORKTREES_DIR / f"{POOL_PREFIX}{uuid.uuid4().hex[:12]}"
+        # We add worktree relative to REPO_ROOT_DIR
+        GitService.add_worktree(REPO_ROOT_DIR, slot)
+        return slot
 
     @classmethod
-    def _persist(cls):
-        """Atomically persist sub-agent inventory to disk."""
-        INVENTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
-        tmp = INVENTORY_FILE.with_suffix(".tmp")
+    def _release_worktree(cls, path: Path):
+        if path.name.startswith(POOL_PREFIX) and path.exists() and len(cls._worktree_pool) < cls.WORKTREE_POOL_MAX:
+            cls._worktree_pool.append(path)
+        else:
+            cls._discard_worktree(path)
+
+    @classmethod
+    def _discard_worktree(cls, path: Path):
         try:
-            data = {}
-            for agent_id, agent in cls._sub_agents.items():
-                data[agent_id] = agent.model_dump() if hasattr(agent, 'model_dump') else agent.__dict__
-            tmp.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
-            tmp.rename(INVENTORY_FILE)
+            GitService.remove_worktree(REPO_ROOT_DIR, path)
         except Exception as e:
-            logger.error("Failed to persist sub-agent inventory: %s", e)
-            tmp.unlink(missing_ok=True)
+            logger.warning("Failed to remove worktree %s: %s", path, e)
+            shutil.rmtree(path, ignore_errors=True)
+
+    # ── Per-model execution queue ─────────────────────────────────────────
+
+    @classmethod
+    def _model_limit(cls, agent: SubAgent) -> int:
+        # Local Ollama models serve one generation at a time
+        if agent.id.startswith("ollama_") or agent.model in cls._synced_models:
+            return cls.LOCAL_MODEL_CONCURRENCY
+        return cls.DEFAULT_MODEL_CONCURRENCY
+
+    @classmethod
+    def _enter_queue(cls, agent: SubAgent) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        entry = cls._model_slots.get(agent.model)
+        if entry is None or entry[0] is not loop:
+            entry = (loop, asyncio.Semaphore(cls._model_limit(agent)), 0)
+        if entry[2] >= cls.MAX_QUEUED_PER_MODEL:
+            raise RuntimeError(f"Execution queue for model {agent.model} is full")
+        cls._model_slots[agent.model] = (entry[0], entry[1], entry[2] + 1)
+        return entry[1]
+
+    @classmethod
+    def _leave_queue(cls, model: str):
+        loop, sem, queued = cls._model_slots[model]
+        cls._model_slots[model] = (loop, sem, queued - 1)
+
+    @classmethod
+    def queue_depth(cls, model: str) -> int:
+        """Tasks for ``model`` currently running or waiting for a slot."""
+        entry = cls._model_slots.get(model)
+        return entry[2] if entry else 0
 
     @classmethod
     async def startup_reconcile(cls):
@@ -60,29 +160,36 @@ class SubAgentManager:
         disk_worktrees = set()
         if WORKTREES_DIR.exists():
             disk_worktrees = {p.name for p in WORKTREES_DIR.iterdir() if p.is_dir()}
-        stored_ids = set(stored.keys())
 
-        # GC orphan worktrees (on disk but not in inventory)
-        for orphan in disk_worktrees - stored_ids:
-            orphan_path = WORKTREES_DIR / orphan
+        # Remove ghost entries (worktree recorded but gone from disk)
+        for ghost in [agent_id for agent_id, agent in stored.items()
+                      if agent.worktreePath and Path(agent.worktreePath).name not in disk_worktrees]:
+            del stored[ghost]
+            cls._delete_record(ghost)
+            logger.info("Removed ghost sub-agent: %s", ghost)
+
+        in_use = {Path(a.worktreePath).name for a in stored.values() if a.worktreePath}
+        cls._worktree_pool = []
+        for name in sorted(disk_worktrees - in_use):
+            path = WORKTREES_DIR / name
+            if name.startswith(POOL_PREFIX) and (path / ".git").exists():
+                # Idle pooled worktree: keep it for reuse (or drop it if the pool is full)
+                cls._release_worktree(path)
+                continue
+            # GC orphan worktrees (on disk but not in inventory)
             try:
-                shutil.rmtree(orphan_path, ignore_errors=True)
-                logger.info("Cleaned orphan worktree: %s", orphan)
+                shutil.rmtree(path, ignore_errors=True)
+                logger.info("Cleaned orphan worktree: %s", name)
             except Exception as e:
-                logger.warning("Failed to clean orphan worktree %s: %s", orphan, e)
-
-        # Remove ghost entries (in inventory but not on disk)
-        for ghost in stored_ids - disk_worktrees:
-            agent = stored.get(ghost)
-            if agent and getattr(agent, 'worktreePath', None):
-                del stored[ghost]
-                logger.info("Removed ghost sub-agent: %s", ghost)
+                logger.warning("Failed to clean orphan worktree %s: %s", name, e)
 
         cls._sub_agents = stored
-        cls._persist()
+        for agent in stored.values():
+            cls._persist_agent(agent)
+        INVENTORY_FILE.unlink(missing_ok=True)  # migrated to per-agent records
         await cls.sync_with_ollama()
-        logger.info("SubAgent reconcile complete: %d agents, %d worktrees",
-                     len(cls._sub_agents), len(disk_worktrees & stored_ids))
+        logger.info("SubAgent reconcile complete: %d agents, %d worktrees in use, %d pooled",
+                     len(cls._sub_agents), len(in_use), len(cls._worktree_pool))
 
     @classmethod
     async def create_sub_agent(cls, parent_id: str, request) -> SubAgent:
@@ -98,13 +205,10 @@ class SubAgentManager:
             max_tokens=constraints.get("maxTokens", 2048)
         )
         
-        # Create isolated worktree
-        cls._ensure_worktrees_dir()
-        worktree_path = WORKTREES_DIR / sub_id
+        # Isolated worktree from the recycled pool
         try:
-            # We add worktree relative to REPO_ROOT_DIR
-            GitService.add_worktree(REPO_ROOT_DIR, worktree_path)
-            logger.info(f"Created isolated worktree at {worktree_path}")
+            worktree_path = await asyncio.to_thread(cls._acquire_worktree)
+            logger.info(f"Assigned isolated worktree at {worktree_path}")
         except Exception as e:
             logger.error(f"Failed to create worktree for sub-agent {sub_id}: {e}")
             worktree_path = None
@@ -119,7 +223,7 @@ class SubAgentManager:
             worktreePath=str(worktree_path) if worktree_path else None
         )
         cls._sub_agents[sub_id] = agent
-        cls._persist()
+        cls._persist_agent(agent)
         logger.info(f"Created sub-agent {sub_id} for parent {parent_id}")
         
         return agent
@@ -172,14 +276,12 @@ class SubAgentManager:
             agent.status = "terminated"
             
             if agent.worktreePath:
-                try:
-                    GitService.remove_worktree(REPO_ROOT_DIR, Path(agent.worktreePath))
-                    logger.info(f"Removed isolated worktree for sub-agent {sub_id}")
-                except Exception as e:
-                    logger.error(f"Failed to remove worktree for sub-agent {sub_id}: {e}")
+                await asyncio.to_thread(cls._release_worktree, Path(agent.worktreePath))
+                agent.worktreePath = None
+                logger.info(f"Released isolated worktree for sub-agent {sub_id}")
             
             logger.info(f"Terminated sub-agent {sub_id}")
-            cls._persist()
+            cls._persist_agent(agent)
 
     @classmethod
     async def execute_task(cls, sub_id: str, task: str) -> str:
@@ -190,8 +292,20 @@ class SubAgentManager:
         if agent.status == "terminated":
              raise ValueError(f"SubAgent {sub_id} is terminated")
 
+        slots = cls._enter_queue(agent)
+        model = agent.model
+        try:
+            async with slots:
+                return await cls._run_task(agent, task)
+        finally:
+            cls._leave_queue(model)
+
+    @classmethod
+    async def _run_task(cls, agent: SubAgent, task: str) -> str:
+        sub_id = agent.id
         agent.status = "working"
         agent.currentTask = task
+        cls._persist_agent(agent)
         
         try:
             logger.info(f"Sub-agent {sub_id} executing task: {task[:50]}...")
@@ -214,10 +328,12 @@ class SubAgentManager:
             agent.status = "idle"
             agent.currentTask = None
             agent.result = response
+            cls._persist_agent(agent)
             
             return response
         except Exception as e:
             agent.status = "failed"
             agent.currentTask = None
+            cls._persist_agent(agent)
             logger.error(f"Sub-agent {sub_id} failed: {e}")
             raise e
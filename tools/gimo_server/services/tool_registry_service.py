@@ -1,78 +1,200 @@
 from __future__ import annotations
 
 import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
 
-from ..config import OPS_DATA_DIR
 from ..config import OPS_DATA_DIR
 from ..ops_models import ToolEntry, McpServerConfig
+from .config_snapshot import ConfigSnapshotCache
+
+logger = logging.getLogger("orchestrator.services.tool_registry")
+
+
+def _parse_registry(raw: str) -> Dict[str, Dict]:
+    try:
+        data = json.loads(raw)
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+@dataclass(frozen=True)
+class _RegistryIndex:
+    """Immutable view of the merged registry; replaced wholesale, never mutated."""
+
+    version: int
+    source: Tuple[Any, ...]
+    registry: Mapping[str, Dict] = field(default_factory=dict)
+    discovered: Mapping[str, Dict] = field(default_factory=dict)
+    entries: Mapping[str, ToolEntry] = field(default_factory=dict)
+    # Tools with no role restriction, and role -> tools listing that role.
+    unrestricted: FrozenSet[str] = frozenset()
+    by_role: Mapping[str, FrozenSet[str]] = field(default_factory=dict)
+    checked_at: float = 0.0
 
 
 class ToolRegistryService:
-    """Allowlist registry for tools (fail-closed on unknown tools)."""
+    """Allowlist registry for tools (fail-closed on unknown tools).
+
+    Both JSON files are compiled into an immutable :class:`_RegistryIndex`
+    (name -> entry plus role -> allowed names). Lookups read the current index
+    without I/O; writers persist and then swap in a new index under ``_write_lock``.
+    Edits made to the files by other processes are picked up by a stat check at
+    most every ``RELOAD_CHECK_SECONDS``.
+    """
 
     REGISTRY_PATH: Path = OPS_DATA_DIR / "tool_registry.json"
     DISCOVERED_PATH: Path = OPS_DATA_DIR / "tool_registry_discovered.json"
+    RELOAD_CHECK_SECONDS: float = 1.0
+
+    _file_cache: ConfigSnapshotCache[Dict[str, Dict]] = ConfigSnapshotCache()
+    _index: Optional[_RegistryIndex] = None
+    _index_versions = 0
+    _write_lock = threading.RLock()
 
     @classmethod
     def _load(cls) -> Dict[str, Dict]:
-        if not cls.REGISTRY_PATH.exists():
-            return {}
-        try:
-            raw = json.loads(cls.REGISTRY_PATH.read_text(encoding="utf-8"))
-            if isinstance(raw, dict):
-                return raw
-            return {}
-        except Exception:
-            return {}
+        return dict(cls._current_index().registry)
 
     @classmethod
     def _save(cls, data: Dict[str, Dict]) -> None:
-        cls.REGISTRY_PATH.parent.mkdir(parents=True, exist_ok=True)
-        cls.REGISTRY_PATH.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        cls._commit(registry=data)
 
     @classmethod
     def _load_discovered(cls) -> Dict[str, Dict]:
-        if not cls.DISCOVERED_PATH.exists():
-            return {}
-        try:
-            raw = json.loads(cls.DISCOVERED_PATH.read_text(encoding="utf-8"))
-            if isinstance(raw, dict):
-                return raw
-            return {}
-        except Exception:
-            return {}
+        return dict(cls._current_index().discovered)
 
     @classmethod
     def _save_discovered(cls, data: Dict[str, Dict]) -> None:
-        cls.DISCOVERED_PATH.parent.mkdir(parents=True, exist_ok=True)
-        cls.DISCOVERED_PATH.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        cls._commit(discovered=data)
 
     @classmethod
-    def list_tools(cls) -> List[ToolEntry]:
-        data = cls._load()
-        discovered = cls._load_discovered()
-        merged = {**discovered, **data}
-        out: List[ToolEntry] = []
-        for name, payload in merged.items():
+    def _read_snapshot(cls, path: Path) -> Tuple[Optional[int], Dict[str, Dict]]:
+        try:
+            snapshot = cls._file_cache.get(path, _parse_registry)
+        except OSError:
+            return None, {}
+        if snapshot is None:
+            return None, {}
+        return snapshot.version, snapshot.value
+
+    @classmethod
+    def _current_index(cls) -> _RegistryIndex:
+        index = cls._index
+        now = time.monotonic()
+        if (
+            index is not None
+            and index.source[0] == cls.REGISTRY_PATH
+            and index.source[2] == cls.DISCOVERED_PATH
+            and now - index.checked_at < cls.RELOAD_CHECK_SECONDS
+        ):
+            return index
+        with cls._write_lock:
+            reg_version, registry = cls._read_snapshot(cls.REGISTRY_PATH)
+            disc_version, discovered = cls._read_snapshot(cls.DISCOVERED_PATH)
+            source = (cls.REGISTRY_PATH, reg_version, cls.DISCOVERED_PATH, disc_version)
+            index = cls._index
+            if index is not None and index.source == source:
+                index = replace(index, checked_at=now)
+            else:
+                index = cls._build_index(source, registry, discovered, now)
+            cls._index = index
+            return index
+
+    @classmethod
+    def _build_index(
+        cls, source: Tuple[Any, ...], registry: Dict[str, Dict], discovered: Dict[str, Dict], now: float
+    ) -> _RegistryIndex:
+        entries: Dict[str, ToolEntry] = {}
+        for name, payload in {**discovered, **registry}.items():
+            if not payload:
+                continue
             item = dict(payload)
             item.setdefault("name", name)
-            out.append(ToolEntry.model_validate(item))
-        out.sort(key=lambda t: t.name)
-        return out
+            try:
+                entries[name] = ToolEntry.model_validate(item)
+            except Exception as exc:
+                logger.warning("Skipping invalid tool registry entry %s: %s", name, exc)
+
+        unrestricted = set()
+        by_role: Dict[str, set] = {}
+        for name, entry in entries.items():
+            if not entry.allowed_roles:
+                unrestricted.add(name)
+            for role in entry.allowed_roles:
+                by_role.setdefault(role, set()).add(name)
+
+        cls._index_versions += 1
+        return _RegistryIndex(
+            version=cls._index_versions,
+            source=source,
+            registry=MappingProxyType(dict(registry)),
+            discovered=MappingProxyType(dict(discovered)),
+            entries=MappingProxyType(entries),
+            unrestricted=frozenset(unrestricted),
+            by_role=MappingProxyType({role: frozenset(names) for role, names in by_role.items()}),
+            checked_at=now,
+        )
+
+    @classmethod
+    def _write_file(cls, path: Path, data: Dict[str, Dict]) -> Optional[int]:
+        raw = json.dumps(data, indent=2, ensure_ascii=False)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(raw, encoding="utf-8")
+        return cls._file_cache.publish(path, data, raw).version
+
+    @classmethod
+    def _commit(
+        cls,
+        *,
+        registry: Optional[Dict[str, Dict]] = None,
+        discovered: Optional[Dict[str, Dict]] = None,
+    ) -> _RegistryIndex:
+        """Persist the given file contents and swap in the index built from them."""
+        with cls._write_lock:
+            current = cls._current_index()
+            _, reg_version, _, disc_version = current.source
+            if registry is not None:
+                reg_version = cls._write_file(cls.REGISTRY_PATH, registry)
+            if discovered is not None:
+                disc_version = cls._write_file(cls.DISCOVERED_PATH, discovered)
+            source = (cls.REGISTRY_PATH, reg_version, cls.DISCOVERED_PATH, disc_version)
+            index = cls._build_index(
+                source,
+                registry if registry is not None else dict(current.registry),
+                discovered if discovered is not None else dict(current.discovered),
+                time.monotonic(),
+            )
+            cls._index = index
+            return index
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the in-memory index; the next lookup re-reads both files."""
+        with cls._write_lock:
+            cls._index = None
+            cls._file_cache.invalidate()
+
+    @classmethod
+    def list_tools(cls) -> List[ToolEntry]:
+        entries = sorted(cls._current_index().entries.values(), key=lambda t: t.name)
+        return [entry.model_copy(deep=True) for entry in entries]
+
+    @classmethod
+    def snapshot(cls) -> _RegistryIndex:
+        """The current immutable index, for callers that make several lookups per decision."""
+        return cls._current_index()
 
     @classmethod
-    def get_tool(cls, name: str) -> Optional[ToolEntry]:
-        data = cls._load()
-        payload = data.get(name)
-        if not payload:
-            payload = cls._load_discovered().get(name)
-        if not payload:
-            return None
-        item = dict(payload)
-        item.setdefault("name", name)
-        return ToolEntry.model_validate(item)
+    def get_tool(cls, name: str, *, index: Optional[_RegistryIndex] = None) -> Optional[ToolEntry]:
+        entry = (index or cls._current_index()).entries.get(name)
+        return entry.model_copy(deep=True) if entry is not None else None
 
     @classmethod
     def report_tool(
@@ -91,8 +213,35 @@ class ToolRegistryService:
 
         Discovered tools default to admin-only + requires_hitl to preserve fail-closed behavior.
         """
-        discovered = cls._load_discovered()
-        payload = dict(discovered.get(name) or {})
+        with cls._write_lock:
+            discovered = cls._load_discovered()
+            entry = cls._discovered_entry(
+                discovered.get(name),
+                name=name,
+                description=description,
+                risk=risk,
+                inputs=inputs,
+                outputs=outputs,
+                estimated_cost=estimated_cost,
+                requires_hitl=requires_hitl,
+            )
+            discovered[name] = {**entry.model_dump(), "discovered": True}
+            cls._save_discovered(discovered)
+        return entry
+
+    @staticmethod
+    def _discovered_entry(
+        existing: Optional[Dict],
+        *,
+        name: str,
+        description: str,
+        risk: str,
+        inputs: Optional[Dict],
+        outputs: Optional[Dict],
+        estimated_cost: float,
+        requires_hitl: bool,
+    ) -> ToolEntry:
+        payload = dict(existing or {})
         payload.update(
             {
                 "name": name,
@@ -107,39 +256,41 @@ class ToolRegistryService:
                 "discovered": True,
             }
         )
-        entry = ToolEntry.model_validate(payload)
-        discovered[name] = entry.model_dump()
-        discovered[name]["discovered"] = True
-        cls._save_discovered(discovered)
-        return entry
+        return ToolEntry.model_validate(payload)
 
     @classmethod
     def upsert_tool(cls, entry: ToolEntry) -> ToolEntry:
-        data = cls._load()
-        data[entry.name] = entry.model_dump()
-        cls._save(data)
+        with cls._write_lock:
+            data = cls._load()
+            data[entry.name] = entry.model_dump()
+            cls._save(data)
         return entry
 
     @classmethod
     def delete_tool(cls, name: str) -> bool:
-        data = cls._load()
-        if name not in data:
-            return False
-        data.pop(name, None)
-        cls._save(data)
+        with cls._write_lock:
+            data = cls._load()
+            if name not in data:
+                return False
+            data.pop(name, None)
+            cls._save(data)
         return True
 
     @classmethod
-    def is_allowed(cls, name: str, *, role: Optional[str] = None) -> bool:
-        tool = cls.get_tool(name)
-        if not tool:
+    def is_allowed(
+        cls, name: str, *, role: Optional[str] = None, index: Optional[_RegistryIndex] = None
+    ) -> bool:
+        index = index or cls._current_index()
+        if name not in index.entries:
             return False
+        if name in index.unrestricted:
+            return True
         # Fail-closed when caller role is unknown and tool is not generally operator-safe.
-        if role is None and tool.allowed_roles and "operator" not in set(tool.allowed_roles):
-            return False
-        if role and tool.allowed_roles and role not in set(tool.allowed_roles):
-            return False
-        return True
+        if role is None:
+            role = "operator"
+        elif not role:
+            return True
+        return name in index.by_role.get(role, frozenset())
 
     @classmethod
     async def sync_mcp_tools(cls, server_name: str, config: McpServerConfig) -> List[ToolEntry]:
@@ -153,36 +304,34 @@ class ToolRegistryService:
             tools = await client.list_tools()
         
         registered = []
-        for tool in tools:
-            # Prefix tool name with server name to avoid collisions
-            # E.g. "github_read_file" -> "github_read_file"? 
-            # Or "github:read_file"?
-            # Let's use underscore for now as it's safer for function calling conventions in some LLMs
-            tool_name = tool.get("name")
-            if not tool_name:
-                continue
-                
-            full_name = f"{server_name}_{tool_name}"
-            
-            # Map MCP tool definition to ToolEntry
-            # MCP inputs schema is JSON Schema.
-            inputs = tool.get("inputSchema") or {}
-            description = tool.get("description") or ""
-            
-            entry = cls.report_tool(
-                name=full_name,
-                description=description,
-                inputs=inputs,
-                risk="read", # Default to read, admin can override
-                requires_hitl=True, # Default to HITL for safety
-            )
-            # Update metadata ensuring we persist the link
-            entry.metadata.update({
-                "mcp_server": server_name,
-                "mcp_tool": tool_name
-            })
-            cls.upsert_tool(entry) # Persist metadata updates
-            
-            registered.append(entry)
-            
+        with cls._write_lock:
+            registry = cls._load()
+            discovered = cls._load_discovered()
+            for tool in tools:
+                # Prefix with the server name to avoid collisions; underscores are the
+                # safest separator for function-calling conventions in some LLMs.
+                tool_name = tool.get("name")
+                if not tool_name:
+                    continue
+                full_name = f"{server_name}_{tool_name}"
+
+                # MCP inputs schema is JSON Schema.
+                entry = cls._discovered_entry(
+                    discovered.get(full_name),
+                    name=full_name,
+                    description=tool.get("description") or "",
+                    risk="read",  # Default to read, admin can override
+                    inputs=tool.get("inputSchema") or {},
+                    outputs=None,
+                    estimated_cost=0.0,
+                    requires_hitl=True,  # Default to HITL for safety
+                )
+                discovered[full_name] = {**entry.model_dump(), "discovered": True}
+                # Persist the link to the MCP server on the registry entry.
+                entry.metadata.update({"mcp_server": server_name, "mcp_tool": tool_name})
+                registry[full_name] = entry.model_dump()
+                registered.append(entry)
+
+            # One swap for the whole batch so readers never see a partial sync.
+            cls._commit(registry=registry, discovered=discovered)
         return registered
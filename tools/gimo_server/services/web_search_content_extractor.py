@@ -1,18 +1,259 @@
-"""Content extraction — fetches and cleans page content for search results."""
+"""Content extraction — fetches and cleans page content for search results.
+
+Pages are fetched through one pooled keep-alive client, parsed in a single
+streaming pass that stops once ``_MAX_CONTENT_LENGTH`` characters of text have
+been collected, and cached on disk keyed by the URL without its fragment.
+Stale cache entries are revalidated with ``If-None-Match`` /
+``If-Modified-Since``. Reads bump an entry's mtime, and every
+``_PRUNE_EVERY_WRITES`` writes the cache drops entries unused for
+``_CACHE_MAX_AGE_SECONDS``, then the least recently used ones until it fits
+``_CACHE_MAX_ENTRIES`` / ``_CACHE_MAX_BYTES``. Cache I/O runs off the event
+loop.
+"""
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
 import logging
+import os
 import re
-from typing import List
+import threading
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urldefrag
 
 import httpx
 
+from ..config import OPS_DATA_DIR
 from ..models.web_search import WebSearchResult
 
 logger = logging.getLogger("orchestrator.services.web_search_content")
 _EXTRACT_TIMEOUT = 8.0
 _MAX_CONTENT_LENGTH = 5000
+_USER_AGENT = "GIMO-Agent/1.0"
+_CACHE_DIR = OPS_DATA_DIR / "web_content_cache"
+_CACHE_TTL_SECONDS = 6 * 3600
+_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
+_CACHE_MAX_ENTRIES = 2000
+_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_PRUNE_EVERY_WRITES = 64
+_POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0)
+
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg"}
+_BLOCK_TAGS = {"p", "div", "br", "li", "tr", "td", "th", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article"}
+_WS_RE = re.compile(r"\s+")
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_client_lock = threading.Lock()
+_CLOSE_TASKS: Set[asyncio.Task] = set()
+_prune_lock = threading.Lock()
+_writes_since_prune = _PRUNE_EVERY_WRITES  # prune on the first write after start-up
+
+
+class _TextExtractor(HTMLParser):
+    """Single-pass HTML-to-text converter that stops collecting at ``limit`` chars."""
+
+    def __init__(self, limit: int = _MAX_CONTENT_LENGTH):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self._parts: List[str] = []
+        self._size = 0
+        self._skip_depth = 0
+        self._pending_space = False
+
+    @property
+    def done(self) -> bool:
+        return self._size >= self.limit
+
+    def handle_starttag(self, tag: str, attrs: Any) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._pending_space = True
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in _BLOCK_TAGS:
+            self._pending_space = True
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth or self.done:
+            return
+        if data[:1].isspace():
+            self._pending_space = True
+        text = _WS_RE.sub(" ", data).strip()
+        if not text:
+            return
+        if self._pending_space and self._parts:
+            text = " " + text
+        self._pending_space = data[-1:].isspace()
+        text = text[: self.limit - self._size]
+        self._parts.append(text)
+        self._size += len(text)
+
+    def text(self) -> str:
+        return "".join(self._parts).strip()
+
+
+def _clean_html(html: str, limit: int = _MAX_CONTENT_LENGTH) -> str:
+    parser = _TextExtractor(limit)
+    parser.feed(html)
+    parser.close()
+    return parser.text()
+
+
+def _cache_key(url: str) -> str:
+    """The URL as requested, minus its fragment (never sent to the server)."""
+    return urldefrag(url.strip()).url
+
+
+def _cache_path(url: str) -> Path:
+    digest = hashlib.sha256(_cache_key(url).encode("utf-8")).hexdigest()
+    return _CACHE_DIR / digest[:2] / f"{digest}.json"
+
+
+def _read_cache(url: str) -> Optional[Dict[str, Any]]:
+    path = _cache_path(url)
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        os.utime(path)  # mtime tracks last use for LRU pruning
+        return entry
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(url: str, entry: Dict[str, Any]) -> None:
+    global _writes_since_prune
+    path = _cache_path(url)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".tmp.{os.urandom(4).hex()}")
+        tmp.write_text(json.dumps(entry), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.debug("Content cache write failed for %s: %s", url, exc)
+        return
+    with _prune_lock:
+        _writes_since_prune += 1
+        if _writes_since_prune < _PRUNE_EVERY_WRITES:
+            return
+        _writes_since_prune = 0
+    _prune_cache()
+
+
+def _prune_cache() -> None:
+    """Drop entries unused for ``_CACHE_MAX_AGE_SECONDS``, then LRU until under the caps."""
+    now = time.time()
+    entries = []
+    for path in _CACHE_DIR.glob("*/*"):
+        is_entry = path.suffix == ".json"
+        # Anything else is a temp file left behind by an interrupted write.
+        cutoff = now - (_CACHE_MAX_AGE_SECONDS if is_entry else 3600)
+        try:
+            st = path.stat()
+            if st.st_mtime < cutoff:
+                path.unlink()
+            elif is_entry:
+                entries.append((st.st_mtime, st.st_size, path))
+        except OSError:
+            continue
+    entries.sort(key=lambda item: item[0])
+    total = sum(size for _, size, _ in entries)
+    excess = len(entries) - _CACHE_MAX_ENTRIES
+    for _, size, path in entries:
+        if excess <= 0 and total <= _CACHE_MAX_BYTES:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        excess -= 1
+        total -= size
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Process-wide pooled client, recreated if the event loop changed.
+
+    The client of the previous loop is closed: on that loop while it still runs,
+    otherwise on the current one.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        if _client is not None and not _client.is_closed and _client_loop is loop:
+            return _client
+        stale, stale_loop = _client, _client_loop
+        _client = httpx.AsyncClient(
+            timeout=_EXTRACT_TIMEOUT,
+            follow_redirects=True,
+            limits=_POOL_LIMITS,
+            headers={"User-Agent": _USER_AGENT},
+        )
+        _client_loop = loop
+    if stale is not None and not stale.is_closed:
+        if stale_loop is not None and stale_loop.is_running():
+            asyncio.run_coroutine_threadsafe(_aclose_quietly(stale), stale_loop)
+        else:
+            task = loop.create_task(_aclose_quietly(stale))
+            _CLOSE_TASKS.add(task)
+            task.add_done_callback(_CLOSE_TASKS.discard)
+    return _client
+
+
+async def _aclose_quietly(client: httpx.AsyncClient) -> None:
+    try:
+        await client.aclose()
+    except Exception as exc:  # connections bound to a closed loop cannot shut down cleanly
+        logger.debug("Closing stale content client failed: %s", exc)
+
+
+async def aclose_client() -> None:
+    global _client, _client_loop
+    with _client_lock:
+        client, _client, _client_loop = _client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+async def _fetch_content(url: str) -> Optional[str]:
+    cached = await asyncio.to_thread(_read_cache, url)
+    now = time.time()
+    if cached and now - float(cached.get("fetched_at", 0)) < _CACHE_TTL_SECONDS:
+        return cached.get("content")
+
+    headers: Dict[str, str] = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    async with _get_client().stream("GET", url, headers=headers) as resp:
+        if resp.status_code == 304 and cached:
+            cached["fetched_at"] = now
+            await asyncio.to_thread(_write_cache, url, cached)
+            return cached.get("content")
+        resp.raise_for_status()
+        parser = _TextExtractor(_MAX_CONTENT_LENGTH)
+        async for chunk in resp.aiter_text():
+            parser.feed(chunk)
+            if parser.done:
+                break  # leaving the block closes the stream; the rest is never downloaded
+        parser.close()
+        entry = {
+            "url": url,
+            "content": parser.text(),
+            "etag": resp.headers.get("etag"),
+            "last_modified": resp.headers.get("last-modified"),
+            "fetched_at": now,
+        }
+    await asyncio.to_thread(_write_cache, url, entry)
+    return entry["content"]
 
 
 async def extract_content_for_results(
@@ -26,21 +267,9 @@ async def extract_content_for_results(
             return result
         async with sem:
             try:
-                async with httpx.AsyncClient(timeout=_EXTRACT_TIMEOUT, follow_redirects=True) as client:
-                    resp = await client.get(result.url, headers={"User-Agent": "GIMO-Agent/1.0"})
-                    resp.raise_for_status()
-                    result.content = _clean_html(resp.text)[:_MAX_CONTENT_LENGTH]
+                result.content = await _fetch_content(result.url)
             except Exception as exc:
                 logger.debug("Content extraction failed for %s: %s", result.url, exc)
             return result
 
     return await asyncio.gather(*[_fetch_one(r) for r in results])
-
-
-def _clean_html(html: str) -> str:
-    text = re.sub(r"<script[^>]*>.*?</script>", " ", html, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<style[^>]*>.*?</style>", " ", text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = text.replace("&amp;", "&").replace("&lt;", "<").replace("&gt;", ">")
-    text = text.replace("&quot;", '"').replace("&#39;", "'").replace("&nbsp;", " ")
-    return re.sub(r"\s+", " ", text).strip()
@@ -3,8 +3,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import re
 import time
-from typing import Dict, List, Set, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 from ..models.web_search import (
@@ -13,62 +15,193 @@ from ..models.web_search import (
     WebSearchQuery,
     WebSearchResult,
 )
+from .latency_histogram import LatencyHistogram
 from .web_search_providers import PROVIDER_REGISTRY
 
 logger = logging.getLogger("orchestrator.services.web_search")
 
+# (normalized query, providers, max_results)
+CacheKey = Tuple[str, Tuple[str, ...], int]
+# provider -> (results, failure reason)
+ProviderOutcome = Tuple[str, List[WebSearchResult], Optional[str]]
+
 
 class WebSearchService:
-    """Parallel multi-provider web search with result fusion and cross-reference ranking."""
+    """Parallel multi-provider web search with result fusion and cross-reference ranking.
 
-    @staticmethod
-    async def search(query: WebSearchQuery) -> WebSearchFusionResponse:
+    Fused responses are cached per (normalized query, provider set, max_results)
+    for ``CACHE_TTL_SECONDS``, unless no provider returned results. Each
+    provider's timeout is derived from its own latency histogram once it has
+    enough samples, capped by the query timeout.
+    With ``early_quorum`` the search returns as soon as that many fused results
+    are in; providers still running finish in the background and refresh the
+    cached response.
+    """
+
+    CACHE_TTL_SECONDS = 600.0
+    CACHE_MAX_ENTRIES = 256
+    LATENCY_MIN_SAMPLES = 20
+    TIMEOUT_QUANTILE = 0.95
+    TIMEOUT_MULTIPLIER = 3.0
+    MIN_PROVIDER_TIMEOUT = 2.0
+
+    _cache: "OrderedDict[CacheKey, Tuple[float, WebSearchFusionResponse]]" = OrderedDict()
+    _latency: Dict[str, LatencyHistogram] = {}
+    _background: Set[asyncio.Task] = set()
+
+    @classmethod
+    async def search(cls, query: WebSearchQuery) -> WebSearchFusionResponse:
         start = time.monotonic()
         providers = list(query.providers or ["duckduckgo"])
         if "duckduckgo" not in providers:
             providers.append("duckduckgo")
 
-        tasks = {}
+        key = cls._cache_key(query, providers)
+        if query.use_cache:
+            cached = cls._cache_get(key)
+            if cached is not None:
+                cached.cached = True
+                cached.fusion_time_ms = round((time.monotonic() - start) * 1000, 1)
+                return cached
+
+        tasks: Dict[asyncio.Task, str] = {}
         for provider in providers:
             search_fn = PROVIDER_REGISTRY.get(provider)
             if search_fn:
-                tasks[provider] = asyncio.create_task(
-                    asyncio.wait_for(
-                        search_fn(query.query, query.max_results),
-                        timeout=query.timeout_seconds,
-                    )
+                task = asyncio.create_task(
+                    cls._run_provider(provider, search_fn, query, cls.provider_timeout(provider, query.timeout_seconds))
                 )
+                tasks[task] = provider
+
+        outcomes: List[ProviderOutcome] = []
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            outcomes.extend(task.result() for task in done)
+            if query.early_quorum and pending and cls._fused_count(outcomes) >= query.early_quorum:
+                break
 
+        response = cls._build_response(query, outcomes, [tasks[t] for t in tasks if t in pending])
+        response.fusion_time_ms = round((time.monotonic() - start) * 1000, 1)
+        if cls._has_results(outcomes):
+            cls._cache_put(key, response)
+        if pending:
+            enrich = asyncio.create_task(cls._enrich_cache(key, query, outcomes, pending))
+            cls._background.add(enrich)
+            enrich.add_done_callback(cls._background.discard)
+        return response
+
+    @classmethod
+    async def _run_provider(cls, provider: str, search_fn, query: WebSearchQuery, timeout: float) -> ProviderOutcome:
+        started = time.monotonic()
+        try:
+            results = await asyncio.wait_for(search_fn(query.query, query.max_results), timeout=timeout)
+        except asyncio.TimeoutError:
+            # Censored sample: the provider took at least this long.
+            cls._record_latency(provider, timeout)
+            return provider, [], "timeout"
+        except Exception as exc:
+            return provider, [], str(exc)[:50]
+        cls._record_latency(provider, time.monotonic() - started)
+        if not results:
+            return provider, [], "empty"
+        return provider, list(results), None
+
+    @classmethod
+    async def _enrich_cache(
+        cls,
+        key: CacheKey,
+        query: WebSearchQuery,
+        outcomes: List[ProviderOutcome],
+        pending: Set[asyncio.Task],
+    ) -> None:
+        done, _ = await asyncio.wait(pending)
+        outcomes = outcomes + [task.result() for task in done]
+        if cls._has_results(outcomes):
+            cls._cache_put(key, cls._build_response(query, outcomes, []))
+
+    @classmethod
+    def _build_response(
+        cls, query: WebSearchQuery, outcomes: List[ProviderOutcome], pending: List[str]
+    ) -> WebSearchFusionResponse:
         all_results: List[WebSearchResult] = []
         providers_used: List[WebSearchProvider] = []
         providers_failed: List[str] = []
+        for provider, results, failure in outcomes:
+            if failure is None:
+                all_results.extend(results)
+                providers_used.append(provider)
+            else:
+                providers_failed.append(f"{provider}:{failure}")
 
-        for provider, task in tasks.items():
-            try:
-                results = await task
-                if results:
-                    all_results.extend(results)
-                    providers_used.append(provider)
-                else:
-                    providers_failed.append(f"{provider}:empty")
-            except asyncio.TimeoutError:
-                providers_failed.append(f"{provider}:timeout")
-            except Exception as exc:
-                providers_failed.append(f"{provider}:{str(exc)[:50]}")
-
-        fused, dedup_count = WebSearchService._fuse_results(all_results)
-        elapsed_ms = (time.monotonic() - start) * 1000
-
+        fused, dedup_count = cls._fuse_results(all_results)
         return WebSearchFusionResponse(
             query=query.query,
             results=fused[: query.max_results],
             providers_used=providers_used,
             providers_failed=providers_failed,
+            providers_pending=pending,
             total_results=len(fused),
-            fusion_time_ms=round(elapsed_ms, 1),
             deduplicated_count=dedup_count,
         )
 
+    @staticmethod
+    def _has_results(outcomes: List[ProviderOutcome]) -> bool:
+        """Whether any provider answered; outages and timeouts are not worth caching."""
+        return any(failure is None for _, _, failure in outcomes)
+
+    @classmethod
+    def _fused_count(cls, outcomes: List[ProviderOutcome]) -> int:
+        return len({cls._normalize_url(r.url) for _, results, _ in outcomes for r in results})
+
+    # ── Latency-driven timeouts ────────────────────────────────────────────
+
+    @classmethod
+    def _record_latency(cls, provider: str, seconds: float) -> None:
+        hist = cls._latency.get(provider)
+        if hist is None:
+            hist = cls._latency[provider] = LatencyHistogram(0.01, max_count=1000)
+        hist.add(seconds)
+
+    @classmethod
+    def provider_timeout(cls, provider: str, ceiling: float) -> float:
+        """Per-provider timeout: a multiple of its p95 latency, within [MIN_PROVIDER_TIMEOUT, ceiling]."""
+        hist = cls._latency.get(provider)
+        if hist is None or hist.count < cls.LATENCY_MIN_SAMPLES:
+            return ceiling
+        timeout = hist.quantile(cls.TIMEOUT_QUANTILE) * cls.TIMEOUT_MULTIPLIER
+        return min(ceiling, max(cls.MIN_PROVIDER_TIMEOUT, timeout))
+
+    # ── Query cache ────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _cache_key(query: WebSearchQuery, providers: List[str]) -> CacheKey:
+        normalized = re.sub(r"\s+", " ", query.query).strip().lower()
+        return normalized, tuple(sorted(set(providers))), query.max_results
+
+    @classmethod
+    def _cache_get(cls, key: CacheKey) -> Optional[WebSearchFusionResponse]:
+        entry = cls._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            cls._cache.pop(key, None)
+            return None
+        cls._cache.move_to_end(key)
+        return response.model_copy(deep=True)
+
+    @classmethod
+    def _cache_put(cls, key: CacheKey, response: WebSearchFusionResponse) -> None:
+        cls._cache[key] = (time.monotonic() + cls.CACHE_TTL_SECONDS, response.model_copy(deep=True))
+        cls._cache.move_to_end(key)
+        while len(cls._cache) > cls.CACHE_MAX_ENTRIES:
+            cls._cache.popitem(last=False)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        cls._cache.clear()
+
     @staticmethod
     def _fuse_results(results: List[WebSearchResult]) -> Tuple[List[WebSearchResult], int]:
         seen: Dict[str, WebSearchResult] = {}
@@ -76,6 +209,8 @@ class WebSearchService:
         dedup_count = 0
 
         for result in results:
+            # Boosts are applied to copies so provider results can be fused again.
+            result = result.model_copy()
             norm = WebSearchService._normalize_url(result.url)
             if norm in seen:
                 dedup_count += 1
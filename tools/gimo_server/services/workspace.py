@@ -10,7 +10,7 @@ from datetime import datetime, timezone
 
 from ..config import (
     BASE_DIR, REPO_ROOT_DIR, VITAMINIZE_PACKAGE, ALLOWED_EXTENSIONS, 
-    SEARCH_EXCLUDE_DIRS, AUDIT_LOG_PATH, MAX_BYTES, MAX_LINES, SUBPROCESS_TIMEOUT
+    SEARCH_EXCLUDE_DIRS, MAX_BYTES, MAX_LINES, SUBPROCESS_TIMEOUT
 )
 from ..security import audit_log, redact_sensitive_data
 from .snapshot_service import SnapshotService
@@ -48,13 +48,9 @@ class WorkspaceService:
 
     @staticmethod
     def tail_audit_lines(limit: int = 200) -> List[str]:
-        if not AUDIT_LOG_PATH.exists():
-            return []
-        try:
-            lines = AUDIT_LOG_PATH.read_text(encoding="utf-8", errors="ignore").splitlines()
-            return lines[-limit:]
-        except Exception:
-            return []
+        from .file_service import FileService
+
+        return FileService.tail_audit_lines(limit)
 
     @staticmethod
     def get_file_content(